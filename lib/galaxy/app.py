@@ -96,6 +96,7 @@ from galaxy.tool_shed.galaxy_install.installed_repository_manager import Install
 from galaxy.tool_shed.galaxy_install.update_repository_manager import UpdateRepositoryManager
 from galaxy.tool_util.deps import containers
 from galaxy.tool_util.deps.dependencies import AppInfo
+from galaxy.tool_util.deps.requirements_cache import RequirementsResolutionCache
 from galaxy.tool_util.deps.views import DependencyResolversView
 from galaxy.tool_util.verify.test_data import TestDataResolver
 from galaxy.tools.biotools import get_galaxy_biotools_metadata_source
@@ -323,7 +324,10 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
             mulled_resolution_cache = CacheManager(**parse_cache_config_options(cache_opts)).get_cache(
                 "mulled_resolution"
             )
-        self.container_finder = containers.ContainerFinder(app_info, mulled_resolution_cache=mulled_resolution_cache)
+        requirements_cache = RequirementsResolutionCache(self.config.requirements_resolution_cache_size)
+        self.container_finder = containers.ContainerFinder(
+            app_info, mulled_resolution_cache=mulled_resolution_cache, requirements_cache=requirements_cache
+        )
         self._set_enabled_container_types()
         index_help = getattr(self.config, "index_tool_help", True)
         self.toolbox_search = self._register_singleton(
@@ -336,6 +340,15 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
         self.toolbox_search.build_index(tool_cache=self.tool_cache, toolbox=self.toolbox)
         self.tool_cache.reset_status()
 
+    @property
+    def builds_tool_search_index(self) -> bool:
+        """Whether this process builds the tool search index shared by all processes."""
+        database_heartbeat = getattr(self, "database_heartbeat", None)
+        if database_heartbeat is None:
+            return self.is_webapp
+        # Like the config file watchers, the index is maintained by a single process
+        return database_heartbeat.is_config_watcher
+
     def _set_enabled_container_types(self):
         container_types_to_destinations = collections.defaultdict(list)
         for destinations in self.job_config.destinations.values():
@@ -390,7 +403,7 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
         self.object_store = build_object_store_from_config(self.config, **kwds)
 
     def _configure_security(self):
-        self.security = IdEncodingHelper(id_secret=self.config.id_secret)
+        self.security = IdEncodingHelper(id_secret=self.config.id_secret, id_cache_size=self.config.id_cache_size)
         BaseDatabaseIdField.security = self.security
 
     def _configure_tool_shed_registry(self):
@@ -722,6 +735,7 @@ class UniverseApplication(StructuredApp, GalaxyManagerApplication):
 
         self.database_heartbeat = DatabaseHeartbeat(application_stack=self.application_stack)
         self.database_heartbeat.add_change_callback(self.watchers.change_state)
+        self.database_heartbeat.add_change_callback(self._tool_search_index_builder_changed)
         self.application_stack.register_postfork_function(self.database_heartbeat.start)
 
         # Start web stack message handling
@@ -751,6 +765,11 @@ class UniverseApplication(StructuredApp, GalaxyManagerApplication):
     def _shutdown_watcher(self):
         self.watchers.shutdown()
 
+    def _tool_search_index_builder_changed(self, is_config_watcher):
+        if is_config_watcher:
+            # Catch up on toolbox reloads that happened while another process built the index
+            send_local_control_task(self, "rebuild_toolbox_search_index")
+
     def _shutdown_database_heartbeat(self):
         self.database_heartbeat.shutdown()
 
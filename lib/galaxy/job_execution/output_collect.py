@@ -10,6 +10,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -56,6 +57,8 @@ from galaxy.util import (
 )
 
 DATASET_ID_TOKEN = "DATASET_ID"
+# Time spent by the job staging its outputs when collecting metadata, relative to the job directory
+STAGING_SECONDS_FILE = os.path.join("metadata", "staging_seconds")
 
 log = logging.getLogger(__name__)
 
@@ -89,6 +92,11 @@ class PermissionProvider(AbstractPermissionProvider):
         if permissions is not UNSET:
             self._security_agent.set_all_dataset_permissions(primary_data.dataset, permissions, new=True, flush=False)
 
+    def set_default_hda_permissions_for_datasets(self, datasets):
+        permissions = self.permissions
+        if permissions is not UNSET:
+            self._security_agent.set_new_datasets_permissions([hda.dataset for hda in datasets], permissions)
+
     def copy_dataset_permissions(self, init_from, primary_data):
         self._security_agent.copy_dataset_permissions(init_from.dataset, primary_data.dataset)
 
@@ -599,9 +607,13 @@ def walk_over_extra_files(target_dir, extra_file_collector, job_working_director
     def _walk(target_dir, extra_file_collector, job_working_directory, matchable, parent_paths):
         directory = discover_target_directory(target_dir, job_working_directory)
         if os.path.isdir(directory):
-            for filename in os.listdir(directory):
+            # scandir provides the entry type from the directory listing, avoiding a stat call per file
+            with os.scandir(directory) as it:
+                entries = list(it)
+            for entry in entries:
+                filename = entry.name
                 path = os.path.join(directory, filename)
-                if os.path.isdir(path):
+                if entry.is_dir():
                     if extra_file_collector.recurse:
                         new_parent_paths = parent_paths[:]
                         new_parent_paths.append(filename)
@@ -658,6 +670,8 @@ class DatasetCollector:
         self.assign_primary_output = dataset_collection_description.assign_primary_output
         self.recurse = dataset_collection_description.recurse
         self.match_relative_path = dataset_collection_description.match_relative_path
+        # Most recently used (pattern, compiled pattern), all files of an output are matched against the same pattern
+        self._compiled_pattern: Optional[Tuple[str, "re.Pattern[str]"]] = None
 
     def _pattern_for_dataset(self, dataset_instance=None):
         token_replacement = r"\d+"
@@ -665,11 +679,18 @@ class DatasetCollector:
             token_replacement = str(dataset_instance.id)
         return self.pattern.replace(DATASET_ID_TOKEN, token_replacement)
 
-    def match(self, dataset_instance, filename, path=None, parent_paths=None):
+    def _compiled_pattern_for_dataset(self, dataset_instance=None) -> "re.Pattern[str]":
         pattern = self._pattern_for_dataset(dataset_instance)
+        cached = self._compiled_pattern
+        if cached is None or cached[0] != pattern:
+            cached = self._compiled_pattern = (pattern, re.compile(pattern))
+        return cached[1]
+
+    def match(self, dataset_instance, filename, path=None, parent_paths=None):
+        compiled_pattern = self._compiled_pattern_for_dataset(dataset_instance)
         if self.match_relative_path and parent_paths:
             filename = os.path.join(*parent_paths, filename)
-        re_match = re.match(pattern, filename)
+        re_match = compiled_pattern.match(filename)
         match_object = None
         if re_match:
             match_object = RegexCollectedDatasetMatch(re_match, self, filename, path=path)
@@ -739,6 +760,8 @@ def collect_extra_files(object_store, dataset, job_working_directory):
                     file_name=os.path.join(root, f),
                     create=True,
                     preserve_symlinks=True,
+                    # the job working directory is discarded after the job
+                    hardlink_ok=True,
                 )
     except Exception as e:
         log.debug("Error in collect_associated_files: %s", unicodify(e))
@@ -22,10 +22,15 @@ GALAXY_MEMORY_MB_KEY = "galaxy_memory_mb"
 START_EPOCH_KEY = "start_epoch"
 END_EPOCH_KEY = "end_epoch"
 RUNTIME_SECONDS_KEY = "runtime_seconds"
+# recorded by Galaxy rather than the plugin, see MinimalJobWrapper.finish
+STAGING_SECONDS_KEY = "staging_seconds"
 
 
 class CorePluginFormatter(JobMetricFormatter):
     def format(self, key: str, value: Any) -> FormattedMetric:
+        if key == STAGING_SECONDS_KEY:
+            # usually well below a second
+            return FormattedMetric("Output Staging Time", f"{float(value):.3f} seconds")
         value = int(value)
         if key == GALAXY_SLOTS_KEY:
             return FormattedMetric("Cores Allocated", "%d" % value)
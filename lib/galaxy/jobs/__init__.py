@@ -19,12 +19,14 @@ from typing import (
     Dict,
     Iterable,
     List,
+    Optional,
     TYPE_CHECKING,
 )
 
 import packaging.version
 import yaml
 from pulsar.client.staging import COMMAND_VERSION_FILENAME
+from sqlalchemy.orm import selectinload
 
 from galaxy import (
     model,
@@ -42,6 +44,7 @@ from galaxy.job_execution.compute_environment import SharedComputeEnvironment
 from galaxy.job_execution.output_collect import (
     collect_extra_files,
     collect_shrinked_content_from_path,
+    STAGING_SECONDS_FILE,
 )
 from galaxy.job_execution.setup import (
     create_working_directory_for_job,
@@ -50,6 +53,12 @@ from galaxy.job_execution.setup import (
     TOOL_PROVIDED_JOB_METADATA_FILE,
     TOOL_PROVIDED_JOB_METADATA_KEYS,
 )
+from galaxy.job_metrics.instrumenters.core import STAGING_SECONDS_KEY
+from galaxy.jobs.finish import (
+    extra_files_sizes,
+    FinishPhaseTimers,
+    output_file_sizes,
+)
 from galaxy.jobs.mapper import (
     JobMappingException,
     JobRunnerMapper,
@@ -60,6 +69,7 @@ from galaxy.jobs.runners import (
 )
 from galaxy.metadata import get_metadata_compute_strategy
 from galaxy.model import store
+from galaxy.model.job_fingerprint import set_job_fingerprint
 from galaxy.model.store.discover import MaxDiscoveredFilesExceededError
 from galaxy.objectstore import ObjectStorePopulator
 from galaxy.structured_app import MinimalManagerApp
@@ -995,6 +1005,10 @@ class MinimalJobWrapper(HasResourceParameters):
         if job.params:
             self.params = loads(job.params)
         self.runner_command_line = None
+        # Set once prepare() has been called ahead of the runner's queue_job() by the job preparation pool
+        self.prepared = False
+        self.preparation_exception: Optional[Exception] = None
+        self._staging_seconds = 0.0
 
         # Wrapper holding the info required to restore and clean up from files used for setting metadata externally
         self.__external_output_metadata = None
@@ -1591,6 +1605,18 @@ class MinimalJobWrapper(HasResourceParameters):
         object_store_id = self.get_destination_configuration("object_store_id", None)
         if object_store_id:
             object_store_populator.object_store_id = object_store_id
+        elif self.object_store.colocates_outputs():
+            # Give the object store a chance to co-locate outputs with the inputs,
+            # only load the input associations if it may do so.
+            input_object_store_ids = [
+                da.dataset.dataset.object_store_id
+                for da in job.input_datasets + job.input_library_datasets
+                if da.dataset is not None
+            ]
+            if input_object_store_ids:
+                object_store_populator.object_store_id = self.object_store.select_colocated_store_id(
+                    input_object_store_ids
+                )
 
         # Ideally we would do this without loading the actual job association
         # objects but change_state isn't yet optimized to do that so we need to
@@ -1605,10 +1631,21 @@ class MinimalJobWrapper(HasResourceParameters):
         job.object_store_id = object_store_populator.object_store_id
         self._setup_working_directory(job=job)
 
-    def _finish_dataset(self, output_name, dataset, job, context, final_job_state, remote_metadata_directory):
+    def _finish_dataset(
+        self,
+        output_name,
+        dataset,
+        job,
+        context,
+        final_job_state,
+        remote_metadata_directory,
+        output_file_sizes=None,
+    ):
         implicit_collection_jobs = job.implicit_collection_jobs_association
         purged = dataset.dataset.purged
-        if not purged and dataset.dataset.external_filename is None:
+        # Sizes of output files already checked by _check_output_files
+        output_file_sizes = output_file_sizes or {}
+        if not purged and dataset.dataset.external_filename is None and dataset.dataset.id not in output_file_sizes:
             trynum = 0
             while trynum < self.app.config.retry_job_output_collection:
                 try:
@@ -1632,12 +1669,16 @@ class MinimalJobWrapper(HasResourceParameters):
             # Ensure white space between entries
             dataset.info = f"{dataset.info.rstrip()}\n{context['stderr'].strip()}"
         dataset.tool_version = self.version_string
+        if not dataset.dataset.file_size and output_file_sizes.get(dataset.dataset.id):
+            dataset.dataset.file_size = output_file_sizes[dataset.dataset.id]
         dataset.set_size()
         if "uuid" in context:
             dataset.dataset.uuid = context["uuid"]
         self.__update_output(job, dataset)
         if not purged:
+            staging_start = time.time()
             collect_extra_files(self.object_store, dataset, self.working_directory)
+            self._staging_seconds += time.time() - staging_start
         if job.states.ERROR == final_job_state:
             dataset.blurb = "error"
             if not implicit_collection_jobs:
@@ -1722,6 +1763,42 @@ class MinimalJobWrapper(HasResourceParameters):
 
         # default post job setup
         job = self.get_job()
+        phase_timers = FinishPhaseTimers(self.app.execution_timer_factory, job_id=self.job_id, tool_id=job.tool_id)
+        try:
+            return self._finish(
+                job,
+                phase_timers,
+                tool_stdout,
+                tool_stderr,
+                tool_exit_code=tool_exit_code,
+                job_stdout=job_stdout,
+                job_stderr=job_stderr,
+                check_output_detected_state=check_output_detected_state,
+                remote_metadata_directory=remote_metadata_directory,
+                job_metrics_directory=job_metrics_directory,
+            )
+        finally:
+            # also report the timings of jobs failed (or raising) while finishing
+            phase_timers.stop()
+            log.debug(finish_timer.to_str(job_id=self.job_id, tool_id=job.tool_id))
+            log.debug("(%s) job_wrapper.finish phases: %s", self.job_id, phase_timers)
+
+    def _finish(
+        self,
+        job,
+        phase_timers,
+        tool_stdout,
+        tool_stderr,
+        tool_exit_code=None,
+        job_stdout=None,
+        job_stderr=None,
+        check_output_detected_state=None,
+        remote_metadata_directory=None,
+        job_metrics_directory=None,
+    ):
+        phase_timers.start("check_output")
+        # time spent moving outputs and their extra files into place
+        self._staging_seconds = 0.0
 
         def fail(message=job.info, exception=None):
             if not isinstance(exception, (AssertionError, MessageException)):
@@ -1781,6 +1858,7 @@ class MinimalJobWrapper(HasResourceParameters):
 
         if not extended_metadata and self.outputs_to_working_directory and not self.__link_file_check():
             # output will be moved by job if metadata_strategy is extended_metadata, so skip moving here
+            staging_start = time.time()
             for dataset_path in self.job_io.get_output_fnames():
                 try:
                     shutil.move(dataset_path.false_path, dataset_path.real_path)
@@ -1798,8 +1876,10 @@ class MinimalJobWrapper(HasResourceParameters):
                         # Prior to fail we need to set job.state
                         job.set_state(final_job_state)
                         return fail(f"Job {job.id}'s output dataset(s) could not be read")
+            self._staging_seconds += time.time() - staging_start
 
         job_context = ExpressionContext(dict(stdout=job.stdout, stderr=job.stderr))
+        phase_timers.start("collect_outputs")
         if extended_metadata:
             try:
                 import_options = store.ImportOptions(allow_dataset_object_edit=True, allow_edit=True)
@@ -1836,6 +1916,13 @@ class MinimalJobWrapper(HasResourceParameters):
                 final_job_state = job.states.ERROR
                 job.job_messages = [str(e)]
 
+            phase_timers.start("finish_datasets")
+            finish_dataset_associations = [
+                dataset_assoc
+                for dataset_assoc in output_dataset_associations
+                if not getattr(dataset_assoc.dataset, "discovered", False)
+            ]
+            file_sizes = self._check_output_files(finish_dataset_associations)
             for dataset_assoc in output_dataset_associations:
                 if getattr(dataset_assoc.dataset, "discovered", False):
                     # skip outputs that have been discovered
@@ -1851,7 +1938,15 @@ class MinimalJobWrapper(HasResourceParameters):
                     output_name = dataset_assoc.name
 
                     # Handles retry internally on error for instance...
-                    self._finish_dataset(output_name, dataset, job, context, final_job_state, remote_metadata_directory)
+                    self._finish_dataset(
+                        output_name,
+                        dataset,
+                        job,
+                        context,
+                        final_job_state,
+                        remote_metadata_directory,
+                        output_file_sizes=file_sizes,
+                    )
                 if (
                     not final_job_state == job.states.ERROR
                     and not dataset_assoc.dataset.dataset.state == job.states.ERROR
@@ -1860,6 +1955,7 @@ class MinimalJobWrapper(HasResourceParameters):
                     # We don't set datsets in error state to OK because discover_outputs may have already set the state to error
                     dataset_assoc.dataset.dataset.state = model.Dataset.states.OK
 
+        phase_timers.start("post_job_actions")
         if job.states.ERROR == final_job_state:
             for dataset_assoc in output_dataset_associations:
                 log.debug("(%s) setting dataset %s state to ERROR", job.id, dataset_assoc.dataset.dataset.id)
@@ -1882,15 +1978,22 @@ class MinimalJobWrapper(HasResourceParameters):
             job.exit_code = tool_exit_code
         # custom post process setup
 
+        phase_timers.start("disk_usage")
         collected_bytes = 0
         # Once datasets are collected, set the total dataset size (includes extra files)
-        for dataset_assoc in job.output_datasets:
-            if not dataset_assoc.dataset.dataset.purged:
-                collected_bytes += dataset_assoc.dataset.set_total_size()
+        collected_datasets = [
+            dataset_assoc.dataset.dataset
+            for dataset_assoc in job.output_datasets
+            if not dataset_assoc.dataset.dataset.purged
+        ]
+        extra_sizes = self._extra_files_sizes(collected_datasets)
+        for dataset in collected_datasets:
+            collected_bytes += dataset.set_total_size(extra_files_size=extra_sizes.get(dataset.id, 0))
 
         if job.user:
             job.user.adjust_total_disk_usage(collected_bytes)
 
+        phase_timers.start("exec_after_process")
         # Certain tools require tasks to be completed after job execution
         # ( this used to be performed in the "exec_after_process" hook, but hooks are deprecated ).
         param_dict = self.get_param_dict(job)
@@ -1924,21 +2027,56 @@ class MinimalJobWrapper(HasResourceParameters):
         # differently and deadlocks can occur (one thread updates user and
         # waits on invocation and the other updates invocation and waits on
         # user).
+        phase_timers.start("set_final_state")
         self.sa_session.flush()
 
+        if final_job_state == job.states.OK:
+            # Inputs are final now, record the fingerprint if the job was created before they were ready
+            set_job_fingerprint(self.sa_session, job)
         # Finally set the job state.  This should only happen *after* all
         # dataset creation, and will allow us to eliminate force_history_refresh.
         job.set_final_state(final_job_state, supports_skip_locked=self.app.application_stack.supports_skip_locked())
         if not job.tasks:
             # If job was composed of tasks, don't attempt to recollect statistics
             self._collect_metrics(job, job_metrics_directory)
+            self._record_staging_time(job)
         self.sa_session.flush()
         if job.state == job.states.ERROR:
             self._report_error()
+        phase_timers.start("cleanup")
         cleanup_job = self.cleanup_job
         delete_files = cleanup_job == "always" or (job.state == job.states.OK and cleanup_job == "onsuccess")
         self.cleanup(delete_files=delete_files)
-        log.debug(finish_timer.to_str(job_id=self.job_id, tool_id=job.tool_id))
+
+    def _check_output_files(self, output_dataset_associations):
+        """Check the primary files of the outputs concurrently and return their sizes by dataset id.
+
+        Outputs whose file cannot be found are left out, :meth:`_finish_dataset`
+        checks those one by one.
+        """
+        datasets = {}
+        for dataset_assoc in output_dataset_associations:
+            dataset = dataset_assoc.dataset.dataset
+            if not dataset.purged and dataset.external_filename is None:
+                datasets[dataset.id] = dataset
+        if not datasets:
+            return {}
+        # load the associations _finish_dataset updates for all outputs at once
+        self.sa_session.query(model.Dataset).filter(model.Dataset.id.in_(list(datasets.keys()))).options(
+            selectinload(model.Dataset.history_associations), selectinload(model.Dataset.library_associations)
+        ).all()
+        filenames = self.object_store.get_filenames(list(datasets.values()))
+        paths = {dataset_id: filename for dataset_id, filename in zip(datasets.keys(), filenames) if filename}
+        return output_file_sizes(paths, retries=self.app.config.retry_job_output_collection)
+
+    def _extra_files_sizes(self, datasets):
+        """Measure the extra files directories of ``datasets`` concurrently and return their sizes by dataset id."""
+        paths = {}
+        for dataset in datasets:
+            rel_path = dataset._extra_files_rel_path
+            if rel_path is not None and self.object_store.exists(dataset, extra_dir=rel_path, dir_only=True):
+                paths[dataset.id] = dataset.extra_files_path
+        return extra_files_sizes(paths)
 
     def discover_outputs(self, job, inp_data, out_data, out_collections, final_job_state):
         # Try to just recover input_ext and dbkey from job parameters (used and set in
@@ -1976,13 +2114,30 @@ class MinimalJobWrapper(HasResourceParameters):
             final_job_state=final_job_state,
         )
 
-    def check_tool_output(self, tool_stdout, tool_stderr, tool_exit_code, job, job_stdout=None, job_stderr=None):
+    def check_tool_output(
+        self,
+        tool_stdout,
+        tool_stderr,
+        tool_exit_code,
+        job,
+        job_stdout=None,
+        job_stderr=None,
+        tool_stdout_path=None,
+        tool_stderr_path=None,
+    ):
         job_id_tag = "<unknown job id>"
         if job is not None:
             job_id_tag = job.get_id_tag()
 
         state, tool_stdout, tool_stderr, job_messages = check_output(
-            self.tool.stdio_regexes, self.tool.stdio_exit_codes, tool_stdout, tool_stderr, tool_exit_code, job_id_tag
+            self.tool.stdio_regexes,
+            self.tool.stdio_exit_codes,
+            tool_stdout,
+            tool_stderr,
+            tool_exit_code,
+            job_id_tag,
+            stdout_path=tool_stdout_path,
+            stderr_path=tool_stderr_path,
         )
 
         # Store the modified stdout and stderr in the job:
@@ -2027,6 +2182,19 @@ class MinimalJobWrapper(HasResourceParameters):
                 if metric_value is not None:
                     has_metrics.add_metric(plugin, metric_name, metric_value)
 
+    def _record_staging_time(self, job):
+        staging_seconds = self._staging_seconds
+        # add the time spent staging outputs by the job itself when it collects metadata
+        staging_seconds_path = os.path.join(self.working_directory, STAGING_SECONDS_FILE)
+        if os.path.exists(staging_seconds_path):
+            try:
+                with open(staging_seconds_path) as fh:
+                    staging_seconds += float(fh.read())
+            except (OSError, ValueError):
+                log.warning("(%s) Could not read staging time from %s", self.get_id_tag(), staging_seconds_path)
+        if staging_seconds:
+            job.add_metric("core", STAGING_SECONDS_KEY, staging_seconds)
+
     def get_output_sizes(self):
         sizes = []
         output_paths = self.job_io.get_output_fnames()
@@ -0,0 +1,105 @@
+"""
+Helpers used by :meth:`galaxy.jobs.MinimalJobWrapper.finish`.
+
+Finishing a job touches the file system once per output - waiting out NFS
+attribute caching, measuring the primary file and walking extra files
+directories. For jobs with many outputs these checks run concurrently in a
+small thread pool. Only plain paths are handed to the pool; all model objects
+stay on the calling thread, which owns the database session.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    List,
+    TypeVar,
+)
+
+log = logging.getLogger(__name__)
+
+# Upper bound of threads checking the outputs of a single job.
+DEFAULT_FINISH_IO_THREADS = 8
+# Seconds to wait before checking a missing output file again.
+OUTPUT_RETRY_INTERVAL = 2
+
+T = TypeVar("T")
+
+
+def _map_paths(func: Callable[[str], T], paths: Dict[int, str], max_workers: int) -> Dict[int, T]:
+    if len(paths) < 2 or max_workers < 2:
+        return {key: func(path) for key, path in paths.items()}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths)), thread_name_prefix="job-finish") as executor:
+        return dict(zip(paths.keys(), executor.map(func, paths.values())))
+
+
+def output_file_size(path: str, retries: int = 1) -> int:
+    """Return the size of the output file ``path``, checking up to ``retries`` times while it is missing.
+
+    Returns 0 if the file cannot be found.
+    """
+    trynum = 0
+    while trynum < retries:
+        try:
+            # Attempt to short circuit NFS attribute caching
+            os.stat(path)
+            os.chown(path, os.getuid(), -1)
+            return os.path.getsize(path)
+        except OSError as e:
+            trynum += 1
+            log.warning("Error accessing output file %s, will retry: %s", path, e)
+            if trynum < retries:
+                time.sleep(OUTPUT_RETRY_INTERVAL)
+    return 0
+
+
+def output_file_sizes(
+    paths: Dict[int, str], retries: int = 1, max_workers: int = DEFAULT_FINISH_IO_THREADS
+) -> Dict[int, int]:
+    """Return the :func:`output_file_size` of each of ``paths``, keyed like ``paths``."""
+    return _map_paths(lambda path: output_file_size(path, retries=retries), paths, max_workers)
+
+
+def extra_files_size(path: str) -> int:
+    """Return the total size of the files below the extra files directory ``path``."""
+    total_size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                total_size += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return total_size
+
+
+def extra_files_sizes(paths: Dict[int, str], max_workers: int = DEFAULT_FINISH_IO_THREADS) -> Dict[int, int]:
+    """Return the :func:`extra_files_size` of each of ``paths``, keyed like ``paths``."""
+    return _map_paths(extra_files_size, paths, max_workers)
+
+
+class FinishPhaseTimers:
+    """Time consecutive phases of finishing a job with timers from the app's execution timer factory.
+
+    Each phase is reported as ``internals.galaxy.jobs.job_wrapper_finish.<phase>``.
+    """
+
+    def __init__(self, execution_timer_factory, **tags):
+        self.execution_timer_factory = execution_timer_factory
+        self.tags = tags
+        self.timings: List[str] = []
+        self._timer = None
+
+    def start(self, name: str) -> None:
+        """Stop the running phase and start timing phase ``name``."""
+        self.stop()
+        self._timer = self.execution_timer_factory.get_timer(f"internals.galaxy.jobs.job_wrapper_finish.{name}", name)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self.timings.append(self._timer.to_str(**self.tags))
+            self._timer = None
+
+    def __str__(self):
+        return ", ".join(self.timings)
@@ -34,6 +34,7 @@ from galaxy.jobs import (
     TaskWrapper,
 )
 from galaxy.jobs.mapper import JobNotReadyException
+from galaxy.jobs.runners import JobPreparationPool
 from galaxy.structured_app import MinimalManagerApp
 from galaxy.util import unicodify
 from galaxy.util.custom_logging import get_logger
@@ -65,6 +66,8 @@ log = get_logger(__name__)
     "user_over_total_walltime",
 )
 DEFAULT_JOB_PUT_FAILURE_MESSAGE = "Unable to run job due to a misconfiguration of the Galaxy job running system.  Please contact a site administrator."
+# Job states counted against per destination concurrency limits
+DISPATCHED_JOB_STATES = (model.Job.states.QUEUED, model.Job.states.RUNNING)
 
 
 class JobHandlerI:
@@ -798,48 +801,51 @@ class JobHandlerQueue(Monitors):
         return None
 
     def __clear_job_count(self):
+        self.job_state_counts = None
         self.user_job_count = None
         self.user_job_count_per_destination = None
         self.total_job_count_per_destination = None
 
+    def __query_job_state_counts(self, user_id=None):
+        """
+        Query the active job counts per user, destination and state from the
+        job_state_count table, which database triggers keep up to date for all
+        handlers.
+        """
+        query = select(
+            [
+                model.JobStateCount.user_id,
+                model.JobStateCount.destination_id,
+                model.JobStateCount.state,
+                model.JobStateCount.job_count,
+            ]
+        ).where(model.JobStateCount.job_count > 0)
+        if user_id is not None:
+            query = query.where(model.JobStateCount.user_id == user_id)
+        return self.sa_session.execute(query).fetchall()
+
+    def __cache_job_state_counts(self):
+        # Read the (small) job_state_count table at most once per iteration
+        if self.job_state_counts is None:
+            self.job_state_counts = self.__query_job_state_counts()
+        return self.job_state_counts
+
     def get_user_job_count(self, user_id):
         self.__cache_user_job_count()
         # This could have been incremented by a previous job dispatched on this iteration, even if we're not caching
         rval = self.user_job_count.get(user_id, 0)
         if not self.app.config.cache_user_job_count:
-            result = self.sa_session.execute(
-                select([func.count(model.Job.table.c.id)]).where(
-                    and_(
-                        model.Job.table.c.state.in_(
-                            (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
-                        ),
-                        (model.Job.table.c.user_id == user_id),
-                    )
-                )
-            )
-            for row in result:
-                # there should only be one row
-                rval += row[0]
+            for row in self.__query_job_state_counts(user_id):
+                rval += row.job_count
         return rval
 
     def __cache_user_job_count(self):
         # Cache the job count if necessary
         if self.user_job_count is None and self.app.config.cache_user_job_count:
             self.user_job_count = {}
-            query = self.sa_session.execute(
-                select([model.Job.table.c.user_id, func.count(model.Job.table.c.user_id)])
-                .where(
-                    and_(
-                        model.Job.table.c.state.in_(
-                            (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
-                        ),
-                        (model.Job.table.c.user_id != null()),
-                    )
-                )
-                .group_by(model.Job.table.c.user_id)
-            )
-            for row in query:
-                self.user_job_count[row[0]] = row[1]
+            for row in self.__cache_job_state_counts():
+                if row.user_id:
+                    self.user_job_count[row.user_id] = self.user_job_count.get(row.user_id, 0) + row.job_count
         elif self.user_job_count is None:
             self.user_job_count = {}
 
@@ -855,42 +861,20 @@ class JobHandlerQueue(Monitors):
             # queue.
             rval = {}
             rval.update(cached)
-            result = self.sa_session.execute(
-                select(
-                    [model.Job.table.c.destination_id, func.count(model.Job.table.c.destination_id).label("job_count")]
-                )
-                .where(
-                    and_(
-                        model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING)),
-                        (model.Job.table.c.user_id == user_id),
-                    )
-                )
-                .group_by(model.Job.table.c.destination_id)
-            )
-            for row in result:
-                # Add the count from the database to the cached count
-                rval[row["destination_id"]] = rval.get(row["destination_id"], 0) + row["job_count"]
+            for row in self.__query_job_state_counts(user_id):
+                if row.state in DISPATCHED_JOB_STATES:
+                    # Add the count from the database to the cached count
+                    rval[row.destination_id] = rval.get(row.destination_id, 0) + row.job_count
         return rval
 
     def __cache_user_job_count_per_destination(self):
         # Cache the job count if necessary
         if self.user_job_count_per_destination is None and self.app.config.cache_user_job_count:
             self.user_job_count_per_destination = {}
-            result = self.sa_session.execute(
-                select(
-                    [
-                        model.Job.table.c.user_id,
-                        model.Job.table.c.destination_id,
-                        func.count(model.Job.table.c.user_id).label("job_count"),
-                    ]
-                )
-                .where(and_(model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING))))
-                .group_by(model.Job.table.c.user_id, model.Job.table.c.destination_id)
-            )
-            for row in result:
-                if row["user_id"] not in self.user_job_count_per_destination:
-                    self.user_job_count_per_destination[row["user_id"]] = {}
-                self.user_job_count_per_destination[row["user_id"]][row["destination_id"]] = row["job_count"]
+            for row in self.__cache_job_state_counts():
+                if row.user_id and row.state in DISPATCHED_JOB_STATES:
+                    per_destination = self.user_job_count_per_destination.setdefault(row.user_id, {})
+                    per_destination[row.destination_id] = per_destination.get(row.destination_id, 0) + row.job_count
         elif self.user_job_count_per_destination is None:
             self.user_job_count_per_destination = {}
 
@@ -976,15 +960,11 @@ class JobHandlerQueue(Monitors):
         # Cache the job count if necessary
         if self.total_job_count_per_destination is None:
             self.total_job_count_per_destination = {}
-            result = self.sa_session.execute(
-                select(
-                    [model.Job.table.c.destination_id, func.count(model.Job.table.c.destination_id).label("job_count")]
-                )
-                .where(and_(model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING))))
-                .group_by(model.Job.table.c.destination_id)
-            )
-            for row in result:
-                self.total_job_count_per_destination[row["destination_id"]] = row["job_count"]
+            for row in self.__cache_job_state_counts():
+                if row.state in DISPATCHED_JOB_STATES:
+                    self.total_job_count_per_destination[row.destination_id] = (
+                        self.total_job_count_per_destination.get(row.destination_id, 0) + row.job_count
+                    )
 
     def get_total_job_count_per_destination(self):
         self.__cache_total_job_count_per_destination()
@@ -1206,8 +1186,17 @@ class DefaultJobDispatcher:
         # dict by the plugin.
         self.app.job_config.convert_legacy_destinations(self.job_runners)
         log.debug(f"Loaded job runners plugins: {':'.join(self.job_runners.keys())}")
+        self.preparation_pool = None
+        if self.app.config.job_preparation_workers > 0:
+            self.preparation_pool = JobPreparationPool(
+                app, self.app.config.job_preparation_workers, self.app.config.job_preparation_queue_size
+            )
+            for runner in self.job_runners.values():
+                runner.preparation_pool = self.preparation_pool
 
     def start(self):
+        if self.preparation_pool is not None:
+            self.preparation_pool.start()
         for runner in self.job_runners.values():
             runner.start()
 
@@ -1289,6 +1278,8 @@ class DefaultJobDispatcher:
 
     def shutdown(self):
         failures = []
+        if self.preparation_pool is not None:
+            self.preparation_pool.shutdown()
         for name, runner in self.job_runners.items():
             try:
                 runner.shutdown()
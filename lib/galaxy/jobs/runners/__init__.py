@@ -12,6 +12,7 @@ import traceback
 import typing
 from queue import (
     Empty,
+    Full,
     Queue,
 )
 
@@ -81,9 +82,74 @@ class RunnerParams(ParamsWithSpecs):
         raise Exception(JOB_RUNNER_PARAMETER_VALIDATION_FAILED_MESSAGE % name)
 
 
+class JobPreparationPool:
+    """
+    Bounded pool of worker threads preparing jobs for the job runners of a handler.
+
+    Preparing a job (evaluating the command template, staging inputs, writing
+    config files and metadata setup) happens here instead of on the runners'
+    worker threads, which then only build the command line and submit the job.
+    At most ``queue_size`` jobs wait for preparation, :meth:`put` blocks the
+    handler beyond that, so it doesn't dispatch more jobs than can be prepared.
+    """
+
+    def __init__(self, app: "GalaxyManagerApplication", nworkers: int, queue_size: int):
+        self.app = app
+        self.nworkers = nworkers
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.work_threads: typing.List[threading.Thread] = []
+        self._should_stop = False
+
+    def start(self):
+        log.debug(f"Starting {self.nworkers} job preparation workers")
+        for i in range(self.nworkers):
+            worker = threading.Thread(name="JobPreparationPool.work_thread-%d" % i, target=self.run_next)
+            worker.daemon = True
+            worker.start()
+            self.work_threads.append(worker)
+
+    def put(self, runner: "BaseJobRunner", job_wrapper: "MinimalJobWrapper"):
+        """Prepare the job and queue it in ``runner`` afterwards, wait while the pool is busy."""
+        wait_timer = runner.get_phase_timer("wait")
+        while not self._should_stop:
+            try:
+                self.queue.put((runner, job_wrapper, wait_timer), timeout=1)
+                return
+            except Full:
+                continue
+
+    def run_next(self):
+        """Prepare the next job in the queue and hand it over to its runner"""
+        while not self._should_stop:
+            try:
+                (runner, job_wrapper, wait_timer) = self.queue.get(timeout=1)
+            except Empty:
+                continue
+            if runner is STOP_SIGNAL:
+                return
+            try:
+                log.trace(wait_timer.to_str(job_id=job_wrapper.get_id_tag()))
+                runner.prepare_job_wrapper(job_wrapper)
+            except Exception:
+                log.exception("(%s) Unhandled exception preparing job", job_wrapper.job_id)
+            runner.work_queue.put((runner.queue_job, job_wrapper))
+
+    def shutdown(self):
+        log.info("Sending stop signal to %s job preparation worker threads", len(self.work_threads))
+        self._should_stop = True
+        for _ in range(len(self.work_threads)):
+            try:
+                self.queue.put_nowait((STOP_SIGNAL, None, None))
+            except Full:
+                break
+
+
 class BaseJobRunner:
 
     runner_name = "BaseJobRunner"
+    # Whether jobs can be prepared by the handler's JobPreparationPool before queue_job() is called,
+    # runners that prepare jobs for a different compute environment must disable this.
+    supports_preparation_pool = True
 
     start_methods = ["_init_monitor_thread", "_init_worker_threads"]
     DEFAULT_SPECS = dict(recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0))
@@ -101,6 +167,7 @@ class BaseJobRunner:
             log.debug("Loading %s with params: %s", self.runner_name, kwargs)
         self.runner_params = RunnerParams(specs=runner_param_specs, params=kwargs)
         self.runner_state_handlers = build_state_handlers()
+        self.preparation_pool: typing.Optional[JobPreparationPool] = None
         self._should_stop = False
 
     def start(self):
@@ -178,7 +245,30 @@ class BaseJobRunner:
             log.debug(f"Job [{job_wrapper.job_id}] queued {put_timer}")
 
     def mark_as_queued(self, job_wrapper: "MinimalJobWrapper"):
-        self.work_queue.put((self.queue_job, job_wrapper))
+        if self.preparation_pool is not None and self.supports_preparation_pool:
+            self.preparation_pool.put(self, job_wrapper)
+        else:
+            self.work_queue.put((self.queue_job, job_wrapper))
+
+    def get_phase_timer(self, phase: str):
+        """Return a timer recording the latency of a job preparation ``phase``."""
+        timer_id = f"internals.galaxy.jobs.runners.{self.__class__.__name__.lower()}.preparation.{phase}"
+        return self.app.execution_timer_factory.get_timer(timer_id, f"job ${{job_id}} preparation phase {phase}")
+
+    def prepare_job_wrapper(self, job_wrapper: "MinimalJobWrapper"):
+        """Prepare a queued job ahead of queue_job(), failures are reported by prepare_job()."""
+        if job_wrapper.get_state() != model.Job.states.QUEUED:
+            return
+        try:
+            self._prepare_job_wrapper(job_wrapper)
+        except Exception as e:
+            job_wrapper.preparation_exception = e
+        job_wrapper.prepared = True
+
+    def _prepare_job_wrapper(self, job_wrapper: "MinimalJobWrapper"):
+        timer = self.get_phase_timer("prepare")
+        job_wrapper.prepare()
+        log.trace(timer.to_str(job_id=job_wrapper.get_id_tag()))
 
     def shutdown(self):
         """Attempts to gracefully shut down the worker threads"""
@@ -259,7 +349,11 @@ class BaseJobRunner:
 
         # Prepare the job
         try:
-            job_wrapper.prepare()
+            if job_wrapper.preparation_exception is not None:
+                raise job_wrapper.preparation_exception
+            if not job_wrapper.prepared:
+                self._prepare_job_wrapper(job_wrapper)
+            timer = self.get_phase_timer("command_line")
             job_wrapper.runner_command_line = self.build_command_line(
                 job_wrapper,
                 include_metadata=include_metadata,
@@ -267,6 +361,7 @@ class BaseJobRunner:
                 modify_command_for_container=modify_command_for_container,
                 stream_stdout_stderr=stream_stdout_stderr,
             )
+            log.trace(timer.to_str(job_id=job_id))
         except Exception as e:
             log.exception("(%s) Failure preparing job", job_id)
             job_wrapper.fail(unicodify(e), exception=True)
@@ -580,16 +675,19 @@ class BaseJobRunner:
             if not os.path.exists(outputs_directory):
                 outputs_directory = job_wrapper.working_directory
 
-            tool_stdout_path = os.path.join(outputs_directory, "tool_stdout")
-            tool_stderr_path = os.path.join(outputs_directory, "tool_stderr")
+            tool_stdout_path: typing.Optional[str] = os.path.join(outputs_directory, "tool_stdout")
+            tool_stderr_path: typing.Optional[str] = os.path.join(outputs_directory, "tool_stderr")
             # TODO: These might not exist for running jobs at the upgrade to 19.XX, remove that
             # assumption in 20.XX.
+            # Only the beginning and the end of the streams are kept for the database,
+            # stdio regexes are matched against the complete files in chunks.
             if os.path.exists(tool_stdout_path):
                 with open(tool_stdout_path, "rb") as stdout_file:
                     tool_stdout = self._job_io_for_db(stdout_file)
             else:
                 # Legacy job, were getting a merged output - assume it is mostly tool output.
                 tool_stdout = job_stdout
+                tool_stdout_path = None
                 job_stdout = None
 
             if os.path.exists(tool_stderr_path):
@@ -598,6 +696,7 @@ class BaseJobRunner:
             else:
                 # Legacy job, were getting a merged output - assume it is mostly tool output.
                 tool_stderr = job_stderr
+                tool_stderr_path = None
                 job_stderr = None
 
             check_output_detected_state = job_wrapper.check_tool_output(
@@ -607,6 +706,8 @@ class BaseJobRunner:
                 job=job,
                 job_stdout=job_stdout,
                 job_stderr=job_stderr,
+                tool_stdout_path=tool_stdout_path,
+                tool_stderr_path=tool_stderr_path,
             )
             job_ok = check_output_detected_state == DETECTED_JOB_STATE.OK
 
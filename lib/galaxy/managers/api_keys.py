@@ -3,6 +3,7 @@ from typing import (
     TYPE_CHECKING,
 )
 
+from galaxy.managers.users import invalidate_api_key_cache
 from galaxy.model import User
 from galaxy.structured_app import BasicSharedApp
 
@@ -32,6 +33,8 @@ class ApiKeyManager:
         sa_session = self.app.model.context
         sa_session.add(new_key)
         sa_session.flush()
+        # The new key expires all previous keys of the user.
+        invalidate_api_key_cache(self.app, user.id)
         return new_key
 
     def get_or_create_api_key(self, user: User) -> str:
@@ -52,3 +55,4 @@ class ApiKeyManager:
             api_key.deleted = True
             sa_session.add(api_key)
         sa_session.flush()
+        invalidate_api_key_cache(self.app, user.id)
@@ -34,6 +34,7 @@ from typing import (
     Callable,
     Dict,
     Generic,
+    Iterable,
     List,
     NamedTuple,
     Optional,
@@ -732,6 +733,14 @@ class ModelSerializer(HasAModelManager[T]):
         # Note: it may not be best to encode the id at this layer
         return self.app.security.encode_id(id) if id is not None else None
 
+    def prefetch_encoded_ids(self, items: Iterable[Any], key: str = "id"):
+        """
+        Encode the `key` ids of all `items` in one batch, so that serializing
+        the items afterwards finds them in the id encoding cache.
+        """
+        ids = [getattr(item, key, None) for item in items]
+        self.app.security.encode_ids([id for id in ids if id is not None])
+
     def serialize_type_id(self, item: Any, key: str, **context):
         """
         Serialize an type-id for `item`.
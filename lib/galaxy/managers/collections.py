@@ -1,9 +1,11 @@
 import logging
+from collections import defaultdict
 from typing import (
     Any,
     Dict,
     List,
     overload,
+    Set,
     Union,
 )
 from zipfile import ZipFile
@@ -11,6 +13,7 @@ from zipfile import ZipFile
 from sqlalchemy.orm import (
     joinedload,
     Query,
+    selectinload,
 )
 from typing_extensions import Literal
 
@@ -19,8 +22,10 @@ from galaxy.datatypes.registry import Registry
 from galaxy.exceptions import (
     ItemAccessibilityException,
     MessageException,
+    ObjectNotFound,
     RequestParameterInvalidException,
 )
+from galaxy.managers.base import security_check
 from galaxy.managers.collections_util import validate_input_element_identifiers
 from galaxy.managers.hdas import (
     HDAManager,
@@ -48,6 +53,8 @@ log = logging.getLogger(__name__)
 
 ERROR_INVALID_ELEMENTS_SPECIFICATION = "Create called with invalid parameters, must specify element identifiers."
 ERROR_NO_COLLECTION_TYPE = "Create called without specifying a collection type."
+# Number of ids per IN query when loading collection elements.
+ELEMENT_QUERY_BATCH_SIZE = 1000
 
 
 class DatasetCollectionManager:
@@ -575,33 +582,91 @@ class DatasetCollectionManager:
         elements.update(new_elements)
 
     def __load_elements(self, trans, element_identifiers, hide_source_items=False, copy_elements=False, history=None):
-        elements = {}
+        """Load the objects described by ``element_identifiers`` keyed by element name.
+
+        HDAs, LDDAs and HDCAs are fetched with one ``IN`` query per type and batch
+        of ids, together with the relationships the access checks, copies and tags
+        need. Hidden source HDAs are updated with a single statement per batch.
+        """
+        history = history or trans.history
+        # (name, src_type, decoded id or previously created object, id as requested, tags)
+        sources = []
+        ids_by_src_type: Dict[str, Set[int]] = defaultdict(set)
         for element_identifier in element_identifiers:
-            elements[element_identifier["name"]] = self.__load_element(
-                trans,
-                element_identifier=element_identifier,
-                hide_source_items=hide_source_items,
-                copy_elements=copy_elements,
-                history=history,
-            )
-        return elements
+            name = element_identifier["name"]
+            if "__object__" in element_identifier:
+                sources.append((name, None, self.__load_created_object(element_identifier), None, None))
+                continue
+            src_type, element_id = self.__decode_element_identifier(trans, element_identifier)
+            tags = element_identifier.pop("tags", None)
+            ids_by_src_type[src_type].add(element_id)
+            sources.append((name, src_type, element_id, element_identifier["id"], tags))
+
+        hdas = self.__load_hdas(ids_by_src_type["hda"])
+        lddas = self.__load_lddas(ids_by_src_type["ldda"])
+        hdcas = self.__load_hdcas(ids_by_src_type["hdca"])
+        tag_names = [str(tag) for *_, tags in sources for tag in tags or []]
+        if tag_names:
+            # Look up (or create) all tags at once, applying them below then finds them in the session.
+            self.tag_handler.get_or_create_tags(name for name, _ in self.tag_handler.parse_tags(",".join(tag_names)))
 
-    def __load_element(self, trans, element_identifier, hide_source_items, copy_elements, history=None):
-        # if not isinstance( element_identifier, dict ):
-        #    # Is allowing this to just be the id of an hda too clever? Somewhat
-        #    # consistent with other API methods though.
-        #    element_identifier = dict( src='hda', id=str( element_identifier ) )
+        elements = {}
+        hide_hda_ids = []
+        for name, src_type, element_id, requested_id, tags in sources:
+            if src_type is None:
+                elements[name] = element_id
+                continue
+            tag_str = ",".join(str(_) for _ in tags) if tags else ""
+            if src_type == "hda":
+                hda = hdas.get(element_id)
+                if hda is None:
+                    raise ObjectNotFound("HistoryDatasetAssociation not found")
+                self.hda_manager.error_unless_accessible(hda, trans.user)
+                if copy_elements:
+                    element: model.HistoryDatasetAssociation = self.hda_manager.copy(
+                        hda, history=history, hide_copy=True, flush=False
+                    )
+                else:
+                    element = hda
+                if hide_source_items and self.hda_manager.error_unless_owner(hda, trans.user, current_history=history):
+                    hide_hda_ids.append(hda.id)
+                self.tag_handler.apply_item_tags(user=trans.user, item=element, tags_str=tag_str, flush=False)
+                elements[name] = element
+            elif src_type == "ldda":
+                ldda = lddas.get(element_id)
+                if ldda is None:
+                    raise MessageException(f"Invalid LibraryDatasetDatasetAssociation id ( {requested_id} ) specified")
+                security_check(trans, ldda, check_accessible=True)
+                element3 = ldda.to_history_dataset_association(
+                    history, add_to_history=True, visible=not hide_source_items
+                )
+                self.tag_handler.apply_item_tags(user=trans.user, item=element3, tags_str=tag_str, flush=False)
+                elements[name] = element3
+            else:
+                hdca = hdcas.get(element_id)
+                if hdca is None:
+                    raise RequestParameterInvalidException(
+                        f"History dataset collection association {requested_id} not found"
+                    )
+                self.history_manager.error_unless_accessible(
+                    hdca.history, trans.user, current_history=getattr(trans, "history", hdca.history)
+                )
+                # TODO: Option to copy? Force copy? Copy or allow if not owned?
+                elements[name] = hdca.collection
+        self.__hide_hdas(hide_hda_ids)
+        return elements
 
+    def __load_created_object(self, element_identifier):
         # Previously created collection already found in request, just pass
         # through as is.
-        if "__object__" in element_identifier:
-            the_object = element_identifier["__object__"]
-            if the_object is not None and the_object.id:
-                context = self.model.context
-                if the_object not in context:
-                    the_object = context.query(type(the_object)).get(the_object.id)
-            return the_object
-
+        the_object = element_identifier["__object__"]
+        if the_object is not None and the_object.id:
+            context = self.model.context
+            if the_object not in context:
+                the_object = context.query(type(the_object)).get(the_object.id)
+        return the_object
+
+    def __decode_element_identifier(self, trans, element_identifier):
         # dataset_identifier is dict {src=hda|ldda|hdca|new_collection, id=<encoded_id>}
         try:
             src_type = element_identifier.get("src", "hda")
@@ -612,37 +677,50 @@ class DatasetCollectionManager:
             message_template = "Problem decoding element identifier %s - must contain a 'src' and a 'id'."
             message = message_template % element_identifier
             raise RequestParameterInvalidException(message)
+        # TODO: ldca.
+        if src_type not in ("hda", "ldda", "hdca"):
+            raise RequestParameterInvalidException(f"Unknown src_type parameter supplied '{src_type}'.")
+        if isinstance(element_id, str):
+            element_id = trans.app.security.decode_id(element_id)
+        return src_type, int(element_id)
+
+    def __load_by_ids(self, model_class, ids, *options):
+        loaded = {}
+        ids = sorted(ids)
+        for i in range(0, len(ids), ELEMENT_QUERY_BATCH_SIZE):
+            batch = ids[i : i + ELEMENT_QUERY_BATCH_SIZE]
+            query = self.model.context.query(model_class).filter(model_class.id.in_(batch)).options(*options)
+            loaded.update((item.id, item) for item in query)
+        return loaded
+
+    def __load_hdas(self, ids):
+        HDA = model.HistoryDatasetAssociation
+        return self.__load_by_ids(
+            HDA,
+            ids,
+            selectinload(HDA.dataset).selectinload(model.Dataset.actions),
+            selectinload(HDA.history).joinedload(model.History.user),
+            selectinload(HDA.tags),
+            selectinload(HDA.annotations),
+        )
 
-        tags = element_identifier.pop("tags", None)
-        tag_str = ""
-        if tags:
-            tag_str = ",".join(str(_) for _ in tags)
-        if src_type == "hda":
-            hda = self.hda_manager.get_accessible(element_id, trans.user)
-            if copy_elements:
-                element: model.HistoryDatasetAssociation = self.hda_manager.copy(
-                    hda, history=history or trans.history, hide_copy=True, flush=False
-                )
-            else:
-                element = hda
-            if hide_source_items and self.hda_manager.get_owned(
-                hda.id, user=trans.user, current_history=history or trans.history
-            ):
-                hda.visible = False
-            self.tag_handler.apply_item_tags(user=trans.user, item=element, tags_str=tag_str, flush=False)
-            return element
-        elif src_type == "ldda":
-            element2 = self.ldda_manager.get(trans, element_id, check_accessible=True)
-            element3 = element2.to_history_dataset_association(
-                history or trans.history, add_to_history=True, visible=not hide_source_items
+    def __load_lddas(self, ids):
+        LDDA = model.LibraryDatasetDatasetAssociation
+        return self.__load_by_ids(
+            LDDA, ids, selectinload(LDDA.dataset).selectinload(model.Dataset.actions), selectinload(LDDA.tags)
+        )
+
+    def __load_hdcas(self, ids):
+        HDCA = model.HistoryDatasetCollectionAssociation
+        return self.__load_by_ids(HDCA, ids, selectinload(HDCA.history), selectinload(HDCA.collection))
+
+    def __hide_hdas(self, hda_ids):
+        HDA = model.HistoryDatasetAssociation
+        for i in range(0, len(hda_ids), ELEMENT_QUERY_BATCH_SIZE):
+            batch = hda_ids[i : i + ELEMENT_QUERY_BATCH_SIZE]
+            self.model.context.query(HDA).filter(HDA.id.in_(batch)).update(
+                {HDA.visible: False}, synchronize_session="evaluate"
             )
-            self.tag_handler.apply_item_tags(user=trans.user, item=element3, tags_str=tag_str, flush=False)
-            return element3
-        elif src_type == "hdca":
-            # TODO: Option to copy? Force copy? Copy or allow if not owned?
-            return self.__get_history_collection_instance(trans, element_id).collection
-        # TODO: ldca.
-        raise RequestParameterInvalidException(f"Unknown src_type parameter supplied '{src_type}'.")
 
     def match_collections(self, collections_to_match):
         """
@@ -824,6 +902,11 @@ class DatasetCollectionManager:
         contents = contents_qry.with_session(trans.sa_session()).all()
         return contents
 
+    def iter_collection_contents(self, trans, parent_id, limit=None, offset=None):
+        """Like get_collection_contents, but fetch the contents with a server side cursor as they are iterated."""
+        contents_qry = self._get_collection_contents_qry(parent_id, limit=limit, offset=offset)
+        return contents_qry.with_session(trans.sa_session()).yield_per(model.YIELD_PER_ROWS)
+
     def _get_collection_contents_qry(self, parent_id, limit=None, offset=None):
         """Build query to find first level of collection contents by containing collection parent_id"""
         DCE = model.DatasetCollectionElement
@@ -9,6 +9,7 @@ import logging
 import os
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
     Optional,
@@ -49,6 +50,23 @@ class HistoryDatasetAssociationNoHistoryException(Exception):
     pass
 
 
+def dataset_file_name_getter(hda: model.HistoryDatasetAssociation) -> Callable[[], str]:
+    """
+    Return a callable resolving the file name of ``hda`` without touching the database.
+
+    For object stores with a cache, resolving the file name may fetch the dataset,
+    the callable can be handed to a thread so that this happens in parallel. Raises
+    ``ObjectNotFound`` right away if the dataset has no file.
+    """
+    dataset = hda.dataset
+    # Load everything the object store reads from the dataset on this thread.
+    for attribute in ("id", "uuid", "object_store_id", "external_filename", "purged", "state"):
+        getattr(dataset, attribute)
+    if dataset.purged or (not dataset.external_filename and not dataset.object_store.exists(dataset)):
+        raise exceptions.ObjectNotFound(f"The file of dataset '{hda.name}' could not be found.")
+    return dataset.get_file_name
+
+
 class HDAManager(
     datasets.DatasetAssociationManager,
     secured.OwnableManagerMixin,
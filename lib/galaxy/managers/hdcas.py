@@ -8,6 +8,7 @@ import logging
 from typing import Dict
 
 from galaxy import model
+from galaxy.datatypes.data import Data
 from galaxy.managers import (
     annotatable,
     base,
@@ -17,6 +18,7 @@ from galaxy.managers import (
     taggable,
 )
 from galaxy.managers.collections_util import get_hda_and_element_identifiers
+from galaxy.managers.hdas import dataset_file_name_getter
 from galaxy.model.tags import GalaxyTagHandler
 from galaxy.structured_app import (
     MinimalManagerApp,
@@ -43,6 +45,15 @@ def write_dataset_collection(dataset_collection_instance, archive):
     for name, hda in zip(names, hdas):
         if hda.state != hda.states.OK:
             continue
+        if (
+            isinstance(archive, ZipstreamWrapper)
+            and type(hda.datatype).to_archive is Data.to_archive
+            and not hda.datatype.composite_type
+            and not hda.extension.endswith("html")
+        ):
+            # Single file dataset, let the archive fetch it in parallel with other elements.
+            archive.write_lazy(dataset_file_name_getter(hda), f"{name}.{hda.extension}")
+            continue
         for file_path, relpath in hda.datatype.to_archive(dataset=hda, name=name):
             archive.write(file_path, relpath)
     return archive
@@ -122,6 +122,26 @@ class HistoryContentsManager(base.SortableManager):
             container, filters=filters, limit=limit, offset=offset, order_by=order_by, **kwargs
         )
 
+    def contents_batches(
+        self, container, filters=None, limit=None, offset=None, order_by=None, batch_size=model.YIELD_PER_ROWS, **kwargs
+    ):
+        """
+        Like `contents`, but fetches the contents with a server side cursor and
+        yields them in lists of up to `batch_size` items, so that not all
+        contents have to be held in memory at once.
+        """
+        contents_query = self._union_of_contents_query(
+            container, filters=filters, limit=limit, offset=offset, order_by=order_by, **kwargs
+        )
+        contents_results = []
+        for result in contents_query.yield_per(batch_size):
+            contents_results.append(result)
+            if len(contents_results) >= batch_size:
+                yield self._expand_union_results(contents_results, filters=filters, **kwargs)
+                contents_results = []
+        if contents_results:
+            yield self._expand_union_results(contents_results, filters=filters, **kwargs)
+
     def contents_count(self, container, filters=None, limit=None, offset=None, order_by=None, **kwargs):
         """
         Returns a count of both/all types of contents, based on the given filters.
@@ -255,7 +275,13 @@ class HistoryContentsManager(base.SortableManager):
         contents_results = self._union_of_contents_query(container, **kwargs).all()
         if not expand_models:
             return contents_results
+        return self._expand_union_results(contents_results, **kwargs)
 
+    def _expand_union_results(self, contents_results, **kwargs):
+        """
+        Load the models of the union query rows `contents_results` and return
+        them in the same order, dropping those rejected by function filters.
+        """
         # partition ids into a map of { component_class names -> list of ids } from the above union query
         id_map: Dict[str, List[int]] = dict(
             [(self.contained_class_type_name, []), (self.subcontainer_class_type_name, [])]
@@ -39,6 +39,14 @@ from galaxy.model.index_filter_util import (
     raw_text_column_filter,
     text_column_filter,
 )
+from galaxy.model.job_fingerprint import (
+    compute_fingerprint,
+    get_path_key,
+    IDENTIFIER_SUFFIX,
+    input_identity_from_session,
+    is_fingerprinted_parameter,
+    RUNTIME_VALUE,
+)
 from galaxy.model.scoped_session import galaxy_scoped_session
 from galaxy.schema.schema import (
     JobIndexQueryPayload,
@@ -64,25 +72,6 @@ class JobLock(BaseModel):
     active: bool = Field(title="Job lock status", description="If active, jobs will not dispatch")
 
 
-def get_path_key(path_tuple):
-    path_key = ""
-    tuple_elements = len(path_tuple)
-    for i, p in enumerate(path_tuple):
-        if isinstance(p, int):
-            sep = "_"
-        else:
-            sep = "|"
-        if i == (tuple_elements - 2) and p == "values":
-            # dataset inputs are always wrapped in lists. To avoid 'rep_factorName_0|rep_factorLevel_2|countsFile|values_0',
-            # we remove the last 2 items of the path tuple (values and list index)
-            return path_key
-        if path_key:
-            path_key = f"{path_key}{sep}{p}"
-        else:
-            path_key = p
-    return path_key
-
-
 class JobManager:
     def __init__(self, app: StructuredApp):
         self.app = app
@@ -296,6 +285,20 @@ class JobSearch:
             return key, value
 
         wildcard_param_dump = remap(param_dump, visit=populate_input_data_input_id)
+        fingerprint = self.__fingerprint(tool_id, tool_version, user, input_data, param_dump)
+        if fingerprint is not None:
+            job = self.__search_by_fingerprint(
+                fingerprint=fingerprint,
+                user=user,
+                job_state=job_state,
+                param_dump=param_dump,
+            )
+            if job is not None:
+                return job
+        # Jobs created before fingerprints were recorded (or whose inputs were
+        # not fingerprintable) can only be found by comparing parameters, jobs
+        # with a fingerprint have already been compared above if the request
+        # could be fingerprinted.
         return self.__search(
             tool_id=tool_id,
             tool_version=tool_version,
@@ -304,10 +307,91 @@ class JobSearch:
             job_state=job_state,
             param_dump=param_dump,
             wildcard_param_dump=wildcard_param_dump,
+            unfingerprinted_only=fingerprint is not None,
+        )
+
+    def __job_state_conditions(self, job_state):
+        if job_state is None:
+            return [
+                model.Job.state.in_(
+                    [
+                        model.Job.states.NEW,
+                        model.Job.states.QUEUED,
+                        model.Job.states.WAITING,
+                        model.Job.states.RUNNING,
+                        model.Job.states.OK,
+                    ]
+                )
+            ]
+        elif isinstance(job_state, str):
+            return [model.Job.state == job_state]
+        elif isinstance(job_state, list):
+            return [or_(*(model.Job.state == s for s in job_state))]
+        return []
+
+    def __fingerprint(self, tool_id, tool_version, user, input_data, param_dump):
+        """Return the fingerprint of the requested tool run, or None if it can't be fingerprinted."""
+        if not tool_version:
+            # Jobs of any tool version match, a fingerprint is specific to one version
+            return None
+        identifiers = {}
+        for path_key, input_list in input_data.items():
+            for type_values in input_list:
+                if type_values["identifier"] is not None:
+                    identifiers.setdefault(path_key, type_values["identifier"])
+        return compute_fingerprint(
+            tool_id,
+            tool_version,
+            user.id if user else None,
+            param_dump,
+            identifiers,
+            input_identity_from_session(self.sa_session),
         )
 
+    def __search_by_fingerprint(self, fingerprint, user, job_state, param_dump):
+        """Look up an equivalent job by the fingerprint of the requested tool run."""
+        search_timer = ExecutionTimer()
+        # Parameters the fingerprint leaves out, but the request still needs to match
+        unhashed_parameters = {}
+        for k, v in param_dump.items():
+            if is_fingerprinted_parameter(k) or k.endswith(IDENTIFIER_SUFFIX):
+                continue
+            if v == RUNTIME_VALUE:
+                v = None
+            elif k == "chromInfo" and "?.len" in v:
+                continue
+            unhashed_parameters[k] = json.dumps(v, sort_keys=True)
+        query = (
+            self.sa_session.query(model.Job)
+            .filter(
+                model.Job.cache_fingerprint == fingerprint,
+                model.Job.user == user,
+                model.Job.copied_from_job_id.is_(None),
+                model.Job.any_output_dataset_collection_instances_deleted == false(),
+                model.Job.any_output_dataset_deleted == false(),
+                *self.__job_state_conditions(job_state),
+            )
+            .order_by(model.Job.id.desc())
+        )
+        for job in query:
+            if unhashed_parameters:
+                job_parameters = {parameter.name: parameter.value for parameter in job.parameters}
+                if any(job_parameters.get(k) != v for k, v in unhashed_parameters.items()):
+                    continue
+            log.info("Found equivalent job by fingerprint %s", search_timer)
+            return job
+        return None
+
     def __search(
-        self, tool_id, tool_version, user, input_data, job_state=None, param_dump=None, wildcard_param_dump=None
+        self,
+        tool_id,
+        tool_version,
+        user,
+        input_data,
+        job_state=None,
+        param_dump=None,
+        wildcard_param_dump=None,
+        unfingerprinted_only=False,
     ):
         search_timer = ExecutionTimer()
 
@@ -333,26 +417,10 @@ class JobSearch:
         if tool_version:
             job_conditions.append(model.Job.tool_version == str(tool_version))
 
-        if job_state is None:
-            job_conditions.append(
-                model.Job.state.in_(
-                    [
-                        model.Job.states.NEW,
-                        model.Job.states.QUEUED,
-                        model.Job.states.WAITING,
-                        model.Job.states.RUNNING,
-                        model.Job.states.OK,
-                    ]
-                )
-            )
-        else:
-            if isinstance(job_state, str):
-                job_conditions.append(model.Job.state == job_state)
-            elif isinstance(job_state, list):
-                o = []
-                for s in job_state:
-                    o.append(model.Job.state == s)
-                job_conditions.append(or_(*o))
+        if unfingerprinted_only:
+            job_conditions.append(model.Job.cache_fingerprint.is_(None))
+
+        job_conditions.extend(self.__job_state_conditions(job_state))
 
         for k, v in wildcard_param_dump.items():
             wildcard_value = None
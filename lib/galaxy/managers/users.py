@@ -5,9 +5,14 @@ import hashlib
 import logging
 import random
 import socket
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import (
+    Optional,
+    Tuple,
+)
 
 from markupsafe import escape
 from sqlalchemy import (
@@ -58,6 +63,87 @@ can also copy and paste it into your browser.
 """
 TXT_ACTIVATION_EMAIL_TEMPLATE_RELPATH = "mail/activation-email.txt"
 HTML_ACTIVATION_EMAIL_TEMPLATE_RELPATH = "mail/activation-email.html"
+API_KEY_CACHE_MAX_SIZE = 10000
+
+
+class ApiKeyCache:
+    """
+    Short-lived, per process mapping of API keys to the ids of the users they
+    authenticate.
+
+    Use :func:`invalidate_api_key_cache` to drop the entries of a user in all
+    processes when their keys change or they are deleted.
+    """
+
+    def __init__(self, ttl: float, max_size: int = API_KEY_CACHE_MAX_SIZE, app=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.app = app
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, api_key: str) -> Optional[int]:
+        """Return the id of the user authenticated by `api_key` if known and not expired."""
+        if not self.enabled:
+            return None
+        user_id = None
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    user_id = entry[0]
+                else:
+                    del self._entries[api_key]
+            if user_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self._count("hit" if user_id is not None else "miss")
+        return user_id
+
+    def set(self, api_key: str, user_id: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.pop(api_key, None)
+            # Entries share a TTL, so the first inserted expires first.
+            self._entries[api_key] = (user_id, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for api_key in [key for key, entry in self._entries.items() if entry[0] == user_id]:
+                del self._entries[api_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _count(self, outcome: str) -> None:
+        execution_timer_factory = getattr(self.app, "execution_timer_factory", None)
+        statsd_client = getattr(execution_timer_factory, "galaxy_statsd_client", None)
+        if statsd_client:
+            statsd_client.incr(f"internals.galaxy.auth.api_key_cache.{outcome}")
+
+
+def invalidate_api_key_cache(app, user_id: int) -> None:
+    """
+    Drop the cached API key authentications of a user in this process and,
+    through the control queue, in all other Galaxy processes.
+    """
+    user_manager = getattr(app, "user_manager", None)
+    if user_manager is not None:
+        user_manager.api_key_cache.invalidate_user(user_id)
+    queue_worker = getattr(app, "queue_worker", None)
+    if queue_worker is not None:
+        queue_worker.send_control_task("invalidate_api_key_cache", noop_self=True, kwargs={"user_id": user_id})
 
 
 class UserManager(base.ModelManager, deletable.PurgableManagerMixin):
@@ -71,6 +157,7 @@ class UserManager(base.ModelManager, deletable.PurgableManagerMixin):
     def __init__(self, app: BasicSharedApp):
         self.model_class = app.model.User
         super().__init__(app)
+        self.api_key_cache = ApiKeyCache(getattr(app.config, "api_key_cache_ttl", 0), app=app)
 
     def register(self, trans, email=None, username=None, password=None, confirm=None, subscribe=False):
         """
@@ -142,6 +229,7 @@ class UserManager(base.ModelManager, deletable.PurgableManagerMixin):
                 "The configuration of this Galaxy instance does not allow admins to delete users."
             )
         super().delete(user, flush=flush)
+        invalidate_api_key_cache(self.app, user.id)
 
     def undelete(self, user, flush=True):
         """Remove the deleted flag for the given user."""
@@ -264,6 +352,13 @@ class UserManager(base.ModelManager, deletable.PurgableManagerMixin):
         if self.check_bootstrap_admin_api_key(api_key=api_key):
             return schema.BootstrapAdminUser()
         sa_session = sa_session or self.app.model.session
+        user_id = self.api_key_cache.get(api_key)
+        if user_id is not None:
+            user = sa_session.query(self.app.model.User).get(user_id)
+            if user is not None and not user.deleted:
+                return user
+            # Missed the invalidation, check the key again.
+            self.api_key_cache.invalidate_user(user_id)
         try:
             provided_key = sa_session.query(self.app.model.APIKeys).filter(self.app.model.APIKeys.key == api_key).one()
         except NoResultFound:
@@ -274,6 +369,7 @@ class UserManager(base.ModelManager, deletable.PurgableManagerMixin):
         newest_key = provided_key.user.api_keys[0]
         if newest_key.key != provided_key.key:
             raise exceptions.AuthenticationFailed("Provided API key has expired.")
+        self.api_key_cache.set(api_key, provided_key.user.id)
         return provided_key.user
 
     def check_bootstrap_admin_api_key(self, api_key):
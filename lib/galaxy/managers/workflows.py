@@ -1,12 +1,19 @@
+import copy
 import json
 import logging
 import os
+import threading
 import uuid
-from collections import namedtuple
+from collections import (
+    namedtuple,
+    OrderedDict,
+)
 from typing import (
     Any,
+    Callable,
     cast,
     Dict,
+    Hashable,
     List,
     Optional,
     Tuple,
@@ -99,6 +106,7 @@ from galaxy.workflow.steps import attach_ordered_steps
 
 log = logging.getLogger(__name__)
 
+DEFAULT_WORKFLOW_VIEW_CACHE_SIZE = 100
 
 INDEX_SEARCH_FILTERS = {
     "name": "name",
@@ -517,10 +525,69 @@ class WorkflowSerializer(sharable.SharableModelSerializer):
         self.serializers.update({})
 
 
+class WorkflowViewCache:
+    """Bounded LRU cache of serialized workflow views.
+
+    Workflow versions do not change once created, so a view only has to be
+    rebuilt when something else it depends on changes - the key must capture
+    that (e.g. the toolbox generation). Views are deep-copied going in and
+    out because callers modify the dictionaries they are handed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_WORKFLOW_VIEW_CACHE_SIZE):
+        self.max_size = max_size
+        self._views: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Optional[Hashable], build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the view cached for ``key``, building and caching it if needed; a ``None`` key is never cached."""
+        if key is None or self.max_size <= 0:
+            return build()
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(view)
+            self.misses += 1
+        view = build()
+        with self._lock:
+            self._views[key] = copy.deepcopy(view)
+            while len(self._views) > self.max_size:
+                self._views.popitem(last=False)
+        return view
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+    def __len__(self):
+        return len(self._views)
+
+
 class WorkflowContentsManager(UsesAnnotations):
     def __init__(self, app: MinimalManagerApp):
         self.app = app
         self._resource_mapper_function = get_resource_mapper_function(app)
+        self.view_cache = WorkflowViewCache(
+            getattr(app.config, "workflow_view_cache_size", DEFAULT_WORKFLOW_VIEW_CACHE_SIZE)
+        )
+
+    def _view_cache_key(self, trans, workflow, style, *args) -> Optional[Hashable]:
+        """Key a view of ``workflow`` on its id, the toolbox generation, the tool data
+        table versions (tool forms list their entries) and the requesting user.
+
+        Unsaved workflows are never cached.
+        """
+        if workflow is None or workflow.id is None:
+            return None
+        reload_count = getattr(self.app.toolbox, "_reload_count", 0)
+        tool_data_tables = getattr(self.app, "tool_data_tables", None)
+        data_table_versions = tool_data_tables.content_versions() if tool_data_tables is not None else None
+        user_id = trans.user.id if trans.user else None
+        return (workflow.id, style, reload_count, data_table_versions, user_id) + args
 
     def ensure_raw_description(self, dict_or_raw_description):
         if not isinstance(dict_or_raw_description, RawWorkflowDescription):
@@ -861,11 +928,26 @@ class WorkflowContentsManager(UsesAnnotations):
         """
         Builds workflow dictionary used by run workflow form
         """
+        trans.workflow_building_mode = workflow_building_modes.USE_HISTORY
+        # Tool forms list the history's datasets, HDA and HDCA changes bump the history's update_time.
+        history_key = (history.id, history.update_time) if history else None
+        key = self._view_cache_key(trans, workflow, "run", history_key)
+        data = self.view_cache.get_or_build(key, lambda: self.__workflow_to_dict_run(trans, workflow, history))
+        return {
+            "id": trans.app.security.encode_id(stored.id),
+            "history_id": trans.app.security.encode_id(history.id) if history else None,
+            "name": stored.name,
+            "steps": data["steps"],
+            "step_version_changes": data["step_version_changes"],
+            "has_upgrade_messages": data["has_upgrade_messages"],
+            "workflow_resource_parameters": self._workflow_resource_parameters(trans, stored, workflow),
+        }
+
+    def __workflow_to_dict_run(self, trans, workflow, history):
         if len(workflow.steps) == 0:
             raise exceptions.MessageException("Workflow cannot be run because it does not have any steps.")
         if attach_ordered_steps(workflow):
             raise exceptions.MessageException("Workflow cannot be run because it contains cycles.")
-        trans.workflow_building_mode = workflow_building_modes.USE_HISTORY
         module_injector = WorkflowModuleInjector(trans)
         has_upgrade_messages = False
         step_version_changes = []
@@ -940,13 +1022,9 @@ class WorkflowContentsManager(UsesAnnotations):
                 step_model["messages"] = step.upgrade_messages
             step_models.append(step_model)
         return {
-            "id": trans.app.security.encode_id(stored.id),
-            "history_id": trans.app.security.encode_id(history.id) if history else None,
-            "name": stored.name,
             "steps": step_models,
             "step_version_changes": step_version_changes,
             "has_upgrade_messages": has_upgrade_messages,
-            "workflow_resource_parameters": self._workflow_resource_parameters(trans, stored, workflow),
         }
 
     def _workflow_to_dict_preview(self, trans, workflow):
@@ -1069,6 +1147,17 @@ class WorkflowContentsManager(UsesAnnotations):
         return self._resource_mapper_function(trans=trans, stored_workflow=stored, workflow=workflow)
 
     def _workflow_to_dict_editor(self, trans, stored, workflow, tooltip=True, is_subworkflow=False):
+        # Subworkflow modules build the editor view of their subworkflow, so
+        # a subworkflow used by several steps or workflows is built only once.
+        key = self._view_cache_key(trans, workflow, "editor", tooltip, is_subworkflow)
+        data = self.view_cache.get_or_build(
+            key, lambda: self.__workflow_to_dict_editor(trans, workflow, tooltip, is_subworkflow)
+        )
+        # The annotation belongs to the stored workflow and may change without a new version.
+        data["annotation"] = self.get_item_annotation_str(trans.sa_session, trans.user, stored) or ""
+        return data
+
+    def __workflow_to_dict_editor(self, trans, workflow, tooltip, is_subworkflow):
         # Pack workflow data into a dictionary and return
         data = {}
         data["name"] = workflow.name
@@ -1078,7 +1167,7 @@ class WorkflowContentsManager(UsesAnnotations):
         data["license"] = workflow.license
         data["creator"] = workflow.creator_metadata
         data["source_metadata"] = workflow.source_metadata
-        data["annotation"] = self.get_item_annotation_str(trans.sa_session, trans.user, stored) or ""
+        data["annotation"] = ""
 
         output_label_index = set()
         input_step_types = set(workflow.input_step_types)
@@ -1302,13 +1391,25 @@ class WorkflowContentsManager(UsesAnnotations):
                 if annotations and len(annotations) > 0:
                     annotation_str = util.unicodify(annotations[0].annotation)
 
+        key = None
+        if stored is None or stored.id:
+            key = self._view_cache_key(trans, workflow, "export", internal, allow_upgrade)
+        data = self.view_cache.get_or_build(
+            key, lambda: self.__workflow_to_dict_export(trans, workflow, internal, allow_upgrade)
+        )
+        # Annotation and tags belong to the stored workflow and may change without a new version.
+        data["annotation"] = annotation_str
+        data["tags"] = tag_str
+        return data
+
+    def __workflow_to_dict_export(self, trans, workflow, internal, allow_upgrade):
         # Pack workflow data into a dictionary and return
         data: Dict[str, Any] = {}
         data["a_galaxy_workflow"] = "true"  # Placeholder for identifying galaxy workflow
         data["format-version"] = "0.1"
         data["name"] = workflow.name
-        data["annotation"] = annotation_str
-        data["tags"] = tag_str
+        data["annotation"] = ""
+        data["tags"] = ""
         if workflow.uuid is not None:
             data["uuid"] = str(workflow.uuid)
         steps: Dict[int, Dict[str, Any]] = {}
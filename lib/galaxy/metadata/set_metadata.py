@@ -15,6 +15,7 @@ import json
 import logging
 import os
 import sys
+import time
 import traceback
 from pathlib import Path
 from typing import Optional
@@ -37,6 +38,7 @@ from galaxy.job_execution.output_collect import (
     default_exit_code_file,
     read_exit_code_from,
     SessionlessJobContext,
+    STAGING_SECONDS_FILE,
 )
 from galaxy.job_execution.setup import TOOL_PROVIDED_JOB_METADATA_KEYS
 from galaxy.model import (
@@ -62,6 +64,7 @@ from galaxy.tool_util.parser.stdio import (
 )
 from galaxy.tool_util.provided_metadata import parse_tool_provided_metadata
 from galaxy.util import (
+    DATABASE_MAX_STRING_SIZE,
     safe_contains,
     stringify_dictionary_keys,
 )
@@ -216,12 +219,17 @@ def set_metadata_portable(
             (outputs_directory, "tool_"),
             (tool_job_working_directory, ""),
         ]
+        tool_stdout_path = tool_stderr_path = None
         for directory, prefix in locations:
             if directory and os.path.exists(os.path.join(directory, f"{prefix}stdout")):
-                with open(os.path.join(directory, f"{prefix}stdout"), "rb") as f:
-                    tool_stdout = f.read(MAX_STDIO_READ_BYTES)
-                with open(os.path.join(directory, f"{prefix}stderr"), "rb") as f:
-                    tool_stderr = f.read(MAX_STDIO_READ_BYTES)
+                # stdio regexes are matched against the complete files, the contents are only needed for the
+                # default stderr check and the expression context
+                tool_stdout_path = os.path.join(directory, f"{prefix}stdout")
+                tool_stderr_path = os.path.join(directory, f"{prefix}stderr")
+                with open(tool_stdout_path, "rb") as f:
+                    tool_stdout = f.read(DATABASE_MAX_STRING_SIZE)
+                with open(tool_stderr_path, "rb") as f:
+                    tool_stderr = f.read(DATABASE_MAX_STRING_SIZE)
                 break
         else:
             if os.path.exists(os.path.join(tool_job_working_directory, "task_0")):
@@ -255,7 +263,14 @@ def set_metadata_portable(
         tool_exit_code = read_exit_code_from(exit_code_file, job_id_tag)
 
         check_output_detected_state, tool_stdout, tool_stderr, job_messages = check_output(
-            stdio_regexes, stdio_exit_codes, tool_stdout, tool_stderr, tool_exit_code, job_id_tag
+            stdio_regexes,
+            stdio_exit_codes,
+            tool_stdout,
+            tool_stderr,
+            tool_exit_code,
+            job_id_tag,
+            stdout_path=tool_stdout_path,
+            stderr_path=tool_stderr_path,
         )
         if check_output_detected_state == DETECTED_JOB_STATE.OK and not tool_provided_metadata.has_failed_outputs():
             final_job_state = Job.states.OK
@@ -358,6 +373,7 @@ def set_metadata_portable(
                 if filename and object_id:
                     unnamed_id_to_path[object_id] = os.path.join(job_context.job_working_directory, filename)
 
+    staging_seconds = 0.0
     for output_name, output_dict in outputs.items():
         dataset_instance_id = output_dict["id"]
         klass = getattr(galaxy.model, output_dict.get("model_class", "HistoryDatasetAssociation"))
@@ -425,7 +441,9 @@ def set_metadata_portable(
                 # so skip set_meta here.
                 set_meta(dataset, file_dict)
                 if extended_metadata_collection:
+                    staging_start = time.time()
                     collect_extra_files(object_store, dataset, ".")
+                    staging_seconds += time.time() - staging_start
                     dataset_state = "deferred" if (is_deferred and final_job_state == "ok") else final_job_state
                     if not dataset.state == dataset.states.ERROR:
                         # Don't overwrite failed state (for invalid content) here
@@ -438,7 +456,11 @@ def set_metadata_portable(
                 if not is_deferred and not link_data_only and os.path.getsize(external_filename):
                     # Here we might be updating a disk based objectstore when outputs_to_working_directory is used,
                     # or a remote object store from its cache path.
-                    object_store.update_from_file(dataset.dataset, file_name=external_filename, create=True)
+                    staging_start = time.time()
+                    object_store.update_from_file(
+                        dataset.dataset, file_name=external_filename, create=True, hardlink_ok=True
+                    )
+                    staging_seconds += time.time() - staging_start
                 # TODO: merge expression_context into tool_provided_metadata so we don't have to special case this (here and in _finish_dataset)
                 meta = tool_provided_metadata.get_dataset_meta(output_name, dataset.dataset.id, dataset.dataset.uuid)
                 if meta:
@@ -488,6 +510,9 @@ def set_metadata_portable(
     if export_store:
         export_store.push_metadata_files()
         export_store._finalize()
+    if staging_seconds:
+        with open(tool_job_working_directory / STAGING_SECONDS_FILE, "w") as fh:
+            fh.write(str(staging_seconds))
     write_job_metadata(tool_job_working_directory, job_metadata, set_meta, tool_provided_metadata)
 
 
@@ -1001,6 +1001,7 @@ class Job(Base, JobLike, UsesCreateAndUpdateTime, Dictifiable, Serializable):
     imported = Column(Boolean, default=False, index=True)
     params = Column(TrimmedString(255), index=True)
     handler = Column(TrimmedString(255), index=True)
+    cache_fingerprint = Column(String(64), index=True, nullable=True)
 
     user = relationship("User")
     galaxy_session = relationship("GalaxySession")
@@ -1893,6 +1894,25 @@ class JobParameter(Base, RepresentById):
         return JobParameter(name=self.name, value=self.value)
 
 
+class JobStateCount(Base, RepresentById):
+    """
+    Number of jobs per user, destination and state for the states job
+    concurrency limits are enforced on, maintained by the triggers in
+    galaxy.model.triggers.job_state_count. Anonymous jobs are counted with
+    user_id 0, jobs without destination with an empty destination_id.
+    """
+
+    __tablename__ = "job_state_count"
+
+    user_id = Column(Integer, primary_key=True, nullable=False)
+    destination_id = Column(String(255), primary_key=True, nullable=False)
+    state = Column(String(64), primary_key=True, nullable=False)
+    job_count = Column(Integer, nullable=False, default=0)
+
+    # This class should never be instantiated, rows are maintained by database triggers.
+    __init__ = None  # type: ignore[assignment]
+
+
 class JobToInputDatasetAssociation(Base, RepresentById):
     __tablename__ = "job_to_input_dataset"
 
@@ -3612,10 +3632,17 @@ class Dataset(Base, StorableObject, Serializable, _HasTable):
         db_session.flush()
         return self.total_size
 
-    def set_total_size(self):
+    def set_total_size(self, extra_files_size=None):
+        """Sets the size of the data on disk, including extra files.
+
+        Pass ``extra_files_size`` if the size of the extra files has already been measured.
+        """
         if self.file_size is None:
             self.set_size()
         self.total_size = self.file_size or 0
+        if extra_files_size is not None:
+            self.total_size += extra_files_size
+            return self.total_size
         rel_path = self._extra_files_rel_path
         if rel_path is not None:
             if self.object_store.exists(self, extra_dir=rel_path, dir_only=True):
@@ -4043,8 +4070,8 @@ class DatasetInstance(UsesCreateAndUpdateTime, _HasTable):
     def get_total_size(self):
         return self.dataset.get_total_size()
 
-    def set_total_size(self):
-        return self.dataset.set_total_size()
+    def set_total_size(self, **kwds):
+        return self.dataset.set_total_size(**kwds)
 
     def has_data(self):
         """Detects whether there is any data"""
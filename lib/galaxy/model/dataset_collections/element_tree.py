@@ -0,0 +1,125 @@
+""" Load all elements of a (nested) dataset collection at once.
+
+Walking ``DatasetCollection.elements`` and ``DatasetCollectionElement.child_collection``
+lazily issues a query per collection at every nesting level, which dominates
+mapping a tool over large nested collections (e.g. ``list:paired`` with tens
+of thousands of pairs). :class:`CollectionElementTree` fetches every element
+of the collection tree with a single recursive query and keeps them in one
+array ordered by collection and element index. The loaded elements are
+attached to the ``elements`` relationships of all collections in the tree,
+so computing the structure for matching, walking it and slicing
+subcollections happens in memory.
+"""
+import logging
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import (
+    inspect,
+    select,
+)
+from sqlalchemy.orm import (
+    joinedload,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+
+from galaxy import model
+from galaxy.model.orm.util import get_object_session
+
+log = logging.getLogger(__name__)
+
+
+class CollectionElementTree:
+    """All elements of a dataset collection and its nested collections.
+
+    ``elements`` holds the elements of all collections in the tree, grouped by
+    collection and ordered by element index within each group; the elements
+    of a collection are the slice of ``elements`` recorded for its id.
+    """
+
+    def __init__(self, collection, elements: List[model.DatasetCollectionElement], dataset_instances_loaded=False):
+        self.collection = collection
+        self.elements = elements
+        self.dataset_instances_loaded = dataset_instances_loaded
+        self._slices: Dict[int, Tuple[int, int]] = {}
+        # structures of the root collection by collection type, see get_structure
+        self.structures: Dict[str, Any] = {}
+        start = 0
+        for i in range(1, len(elements) + 1):
+            if i == len(elements) or elements[i].dataset_collection_id != elements[start].dataset_collection_id:
+                self._slices[elements[start].dataset_collection_id] = (start, i)
+                start = i
+
+    @staticmethod
+    def load(collection, load_dataset_instances=False) -> "CollectionElementTree":
+        """Fetch the elements of ``collection`` and all of its nested collections with one query.
+
+        With ``load_dataset_instances`` the HDAs of the dataset elements and
+        their datasets are loaded as well.
+        """
+        sa_session = get_object_session(collection)
+        DCE = model.DatasetCollectionElement
+        tree = (
+            select(DCE.id, DCE.child_collection_id)
+            .where(DCE.dataset_collection_id == collection.id)
+            .cte("collection_element_tree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(DCE.id, DCE.child_collection_id).join(tree, DCE.dataset_collection_id == tree.c.child_collection_id)
+        )
+        query = (
+            sa_session.query(DCE)
+            .join(tree, tree.c.id == DCE.id)
+            .options(joinedload(DCE.child_collection))
+            .order_by(DCE.dataset_collection_id, DCE.element_index)
+        )
+        if load_dataset_instances:
+            query = query.options(selectinload(DCE.hda).joinedload(model.HistoryDatasetAssociation.dataset))
+        element_tree = CollectionElementTree(collection, query.all(), dataset_instances_loaded=load_dataset_instances)
+        element_tree._attach()
+        return element_tree
+
+    def children(self, collection_id: int) -> List[model.DatasetCollectionElement]:
+        """Return the elements of the collection with id ``collection_id`` in element index order."""
+        start, stop = self._slices.get(collection_id, (0, 0))
+        return self.elements[start:stop]
+
+    def dataset_elements(self, collection_id: Optional[int] = None) -> Iterator[model.DatasetCollectionElement]:
+        """Yield the dataset elements below a collection (the root by default) depth first."""
+        for element in self.children(self.collection.id if collection_id is None else collection_id):
+            if element.child_collection_id is not None:
+                yield from self.dataset_elements(element.child_collection_id)
+            else:
+                yield element
+
+    def _attach(self):
+        collections = [self.collection]
+        collections.extend(element.child_collection for element in self.elements if element.child_collection)
+        for collection in collections:
+            if "elements" in inspect(collection).unloaded:
+                set_committed_value(collection, "elements", self.children(collection.id))
+
+
+def load_collection_element_tree(collection, load_dataset_instances=False) -> Optional[CollectionElementTree]:
+    """Return the :class:`CollectionElementTree` of a persisted ``collection``, loading it if needed.
+
+    The tree of a populated collection is remembered on the collection so
+    that structure computation, matching and slicing share it. Return None
+    for collections that are not persisted.
+    """
+    state = inspect(collection, raiseerr=False)
+    if state is None or not state.persistent:
+        return None
+    element_tree = getattr(collection, "_element_tree", None)
+    if element_tree is None or (load_dataset_instances and not element_tree.dataset_instances_loaded):
+        element_tree = CollectionElementTree.load(collection, load_dataset_instances=load_dataset_instances)
+        if collection.populated:
+            collection._element_tree = element_tree
+    return element_tree
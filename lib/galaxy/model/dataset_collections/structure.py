@@ -2,6 +2,8 @@
 """
 import logging
 
+from .element_tree import load_collection_element_tree
+
 log = logging.getLogger(__name__)
 
 
@@ -195,4 +197,10 @@ def get_structure(dataset_collection_instance, collection_type_description, leaf
             return UninitializedTree(collection_type_description)
 
     collection = dataset_collection_instance.collection
-    return Tree.for_dataset_collection(collection, collection_type_description)
+    element_tree = load_collection_element_tree(collection)
+    if element_tree is None:
+        return Tree.for_dataset_collection(collection, collection_type_description)
+    collection_type = collection_type_description.collection_type
+    if collection_type not in element_tree.structures:
+        element_tree.structures[collection_type] = Tree.for_dataset_collection(collection, collection_type_description)
+    return element_tree.structures[collection_type]
@@ -1,8 +1,10 @@
 from galaxy import exceptions
+from .element_tree import load_collection_element_tree
 
 
 def split_dataset_collection_instance(dataset_collection_instance, collection_type):
     """Split up collection into collection."""
+    load_collection_element_tree(dataset_collection_instance.collection)
     return _split_dataset_collection(dataset_collection_instance.collection, collection_type)
 
 
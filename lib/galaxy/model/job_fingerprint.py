@@ -0,0 +1,208 @@
+"""
+Content addressed fingerprints of jobs for the job cache.
+
+A fingerprint hashes the tool id and version, the user, the tool parameters
+and the identity of each input: the underlying dataset, extension, metadata
+and name (or element identifier) of HDAs, the collection and name of HDCAs,
+the child collection and identifier of collection elements and the id of
+LDDAs. Parameters that do not affect the outputs in the job cache's sense
+(``__``-prefixed parameters, ``chromInfo``, ``dbkey`` and element identifiers,
+which are folded into the input identities) are left out, exactly like
+:class:`galaxy.managers.jobs.JobSearch` ignores them.
+
+Fingerprints are stored in the indexed ``job.cache_fingerprint`` column when
+a job is created (if its inputs are ready) or when it finishes successfully,
+so that finding an equivalent job for "use cached job" is an index probe.
+Input identities describe the current state of the inputs, so jobs whose
+input datasets changed after they were created or consumed (e.g. by a
+datatype change) are not fingerprinted later on and are only found by
+comparing parameters, like :class:`galaxy.managers.jobs.JobSearch` does.
+"""
+import hashlib
+import json
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from galaxy import model
+
+log = logging.getLogger(__name__)
+
+FINGERPRINT_VERSION = 1
+# Parameters JobSearch does not count when comparing jobs.
+IGNORED_PARAMETERS = {"chromInfo", "dbkey"}
+IDENTIFIER_SUFFIX = "|__identifier__"
+RUNTIME_VALUE = {"__class__": "RuntimeValue"}
+INPUT_SOURCES = {"hda", "hdca", "dce", "ldda"}
+
+InputIdentity = Callable[[str, int, Optional[str]], Optional[List[Any]]]
+
+
+class NotFingerprintable(Exception):
+    """Raised if a job or search cannot be fingerprinted, e.g. because an input is not ready yet."""
+
+
+def get_path_key(path_tuple):
+    path_key = ""
+    tuple_elements = len(path_tuple)
+    for i, p in enumerate(path_tuple):
+        if isinstance(p, int):
+            sep = "_"
+        else:
+            sep = "|"
+        if i == (tuple_elements - 2) and p == "values":
+            # dataset inputs are always wrapped in lists. To avoid 'rep_factorName_0|rep_factorLevel_2|countsFile|values_0',
+            # we remove the last 2 items of the path tuple (values and list index)
+            return path_key
+        if path_key:
+            path_key = f"{path_key}{sep}{p}"
+        else:
+            path_key = p
+    return path_key
+
+
+def is_fingerprinted_parameter(name: str) -> bool:
+    return not (name.startswith("__") or name.endswith(IDENTIFIER_SUFFIX) or name in IGNORED_PARAMETERS)
+
+
+def compute_fingerprint(
+    tool_id: str,
+    tool_version: Optional[str],
+    user_id: Optional[int],
+    param_dump: Dict[str, Any],
+    identifiers: Dict[str, Any],
+    input_identity: InputIdentity,
+) -> Optional[str]:
+    """Return the fingerprint of running ``tool_id`` with the nested parameters ``param_dump``.
+
+    ``identifiers`` maps input path keys (as in ``<path_key>|__identifier__``)
+    to element identifiers and ``input_identity(src, id, identifier)``
+    describes an input. Returns None if the job cannot be fingerprinted.
+    """
+
+    def normalize(value, path: Tuple):
+        if isinstance(value, dict):
+            if value == RUNTIME_VALUE:
+                return None
+            if value.get("src") in INPUT_SOURCES and "id" in value:
+                identity = input_identity(value["src"], value["id"], identifiers.get(get_path_key(path[:-2])))
+                if identity is None:
+                    raise NotFingerprintable()
+                return identity
+            return {k: normalize(v, path + (k,)) for k, v in value.items()}
+        if isinstance(value, list):
+            return [normalize(v, path + (i,)) for i, v in enumerate(value)]
+        return value
+
+    try:
+        parameters = {
+            name: normalize(value, (name,)) for name, value in param_dump.items() if is_fingerprinted_parameter(name)
+        }
+    except NotFingerprintable:
+        return None
+    document = [FINGERPRINT_VERSION, tool_id, str(tool_version), user_id, parameters]
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def input_identity_from_session(sa_session, require_ready: bool = False) -> InputIdentity:
+    """Return an ``input_identity`` function loading inputs from ``sa_session``.
+
+    With ``require_ready`` HDAs whose dataset is not in the ``ok`` state can
+    not be fingerprinted, as their extension and metadata may still change.
+    """
+
+    def input_identity(src: str, id: int, identifier: Optional[str]) -> Optional[List[Any]]:
+        if src == "hda":
+            hda = sa_session.get(model.HistoryDatasetAssociation, id)
+            if hda is None or (require_ready and hda.dataset.state != model.Dataset.states.OK):
+                return None
+            metadata = json.dumps(hda._metadata or {}, sort_keys=True, default=str)
+            name = ["identifier", identifier] if identifier is not None else ["name", hda.name]
+            return [src, hda.dataset_id, hda.extension, hashlib.sha1(metadata.encode("utf-8")).hexdigest(), *name]
+        elif src == "hdca":
+            hdca = sa_session.get(model.HistoryDatasetCollectionAssociation, id)
+            if hdca is None:
+                return None
+            return [src, hdca.collection_id, hdca.name]
+        elif src == "dce":
+            dce = sa_session.get(model.DatasetCollectionElement, id)
+            if dce is None or dce.child_collection_id is None:
+                return None
+            return [src, dce.child_collection_id, dce.element_identifier]
+        elif src == "ldda":
+            return [src, id]
+        return None
+
+    return input_identity
+
+
+def inputs_unchanged(job) -> bool:
+    """Return True if the input datasets of ``job`` are still in the state the job consumed.
+
+    Like the legacy job search, an input is unchanged if the ``dataset_version``
+    recorded when the job became ready is 0 (not recorded) or the current
+    version of the HDA, or if the HDA hasn't been updated since the job was
+    created.
+    """
+    for input_dataset in job.input_datasets:
+        hda = input_dataset.dataset
+        if hda is None:
+            continue
+        if input_dataset.dataset_version in (0, None, hda.version):
+            continue
+        if hda.update_time is None or job.create_time is None or hda.update_time >= job.create_time:
+            return False
+    return True
+
+
+def job_fingerprint(sa_session, job, require_ready: bool = False, check_inputs_unchanged: bool = True) -> Optional[str]:
+    """Return the fingerprint of ``job`` from its recorded parameters, or None.
+
+    With ``check_inputs_unchanged`` jobs whose inputs may have changed since
+    they were consumed are not fingerprinted, see :func:`inputs_unchanged`.
+    This can only be skipped while the job is being created.
+    """
+    if job.copied_from_job_id is not None:
+        # JobSearch only ever returns original jobs
+        return None
+    if check_inputs_unchanged and not inputs_unchanged(job):
+        return None
+    param_dump = {}
+    identifiers = {}
+    for parameter in job.parameters:
+        if parameter.value is None:
+            return None
+        try:
+            value = json.loads(parameter.value)
+        except ValueError:
+            return None
+        if parameter.name.endswith(IDENTIFIER_SUFFIX):
+            identifiers[parameter.name[: -len(IDENTIFIER_SUFFIX)]] = value
+        else:
+            param_dump[parameter.name] = value
+    return compute_fingerprint(
+        job.tool_id,
+        job.tool_version,
+        job.user_id,
+        param_dump,
+        identifiers,
+        input_identity_from_session(sa_session, require_ready=require_ready),
+    )
+
+
+def set_job_fingerprint(sa_session, job, require_ready: bool = False, check_inputs_unchanged: bool = True) -> None:
+    """Set ``job.cache_fingerprint`` unless it is already set."""
+    if job.cache_fingerprint is not None:
+        return
+    try:
+        job.cache_fingerprint = job_fingerprint(
+            sa_session, job, require_ready=require_ready, check_inputs_unchanged=check_inputs_unchanged
+        )
+    except Exception:
+        log.exception("Failed to compute job cache fingerprint for job %s", job.id)
@@ -11,6 +11,7 @@ from galaxy.model import mapper_registry
 from galaxy.model.base import SharedModelMapping
 from galaxy.model.orm.engine_factory import build_engine
 from galaxy.model.security import GalaxyRBACAgent
+from galaxy.model.triggers.job_state_count import install as install_job_state_count_triggers
 from galaxy.model.triggers.update_audit_table import install as install_timestamp_triggers
 from galaxy.model.view.utils import install_views
 
@@ -66,6 +67,7 @@ def init(
 
 def create_additional_database_objects(engine):
     install_timestamp_triggers(engine)
+    install_job_state_count_triggers(engine)
     install_views(engine)
 
 
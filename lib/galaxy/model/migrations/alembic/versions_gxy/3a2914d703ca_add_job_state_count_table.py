@@ -0,0 +1,48 @@
+"""add job state count table
+
+Revision ID: 3a2914d703ca
+Revises: c39f1de47a04
+Create Date: 2022-10-28 09:41:12.532118
+
+"""
+from alembic import op
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+)
+
+from galaxy.model.triggers.job_state_count import (
+    get_drop_sql,
+    get_install_sql,
+)
+
+# revision identifiers, used by Alembic.
+revision = "3a2914d703ca"
+down_revision = "c39f1de47a04"
+branch_labels = None
+depends_on = None
+
+
+# database object names used in this revision
+table_name = "job_state_count"
+
+
+def upgrade():
+    op.create_table(
+        table_name,
+        Column("user_id", Integer, primary_key=True, nullable=False),
+        Column("destination_id", String(255), primary_key=True, nullable=False),
+        Column("state", String(64), primary_key=True, nullable=False),
+        Column("job_count", Integer, nullable=False, default=0),
+    )
+    bind = op.get_bind()
+    version = bind.dialect.server_version_info[0] if "postgres" in bind.dialect.name else None
+    for statement in get_install_sql(bind.dialect.name, version):
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in get_drop_sql(op.get_bind().dialect.name):
+        op.execute(statement)
+    op.drop_table(table_name)
@@ -0,0 +1,40 @@
+"""add job cache fingerprint column
+
+Revision ID: c39f1de47a04
+Revises: e0e3bb173ee6
+Create Date: 2022-10-21 11:02:37.104512
+
+"""
+from alembic import op
+from sqlalchemy import (
+    Column,
+    String,
+)
+
+from galaxy.model.migrations.util import (
+    column_exists,
+    drop_column,
+)
+
+# revision identifiers, used by Alembic.
+revision = "c39f1de47a04"
+down_revision = "e0e3bb173ee6"
+branch_labels = None
+depends_on = None
+
+
+# database object names used in this revision
+table_name = "job"
+column_name = "cache_fingerprint"
+index_name = "ix_job_cache_fingerprint"
+
+
+def upgrade():
+    if not column_exists(table_name, column_name):
+        op.add_column(table_name, Column(column_name, String(64), nullable=True))
+        op.create_index(index_name, table_name, [column_name])
+
+
+def downgrade():
+    op.drop_index(index_name, table_name)
+    drop_column(table_name, column_name)
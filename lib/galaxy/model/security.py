@@ -897,17 +897,8 @@ class GalaxyRBACAgent(RBACAgent):
         Permission looks like: { Action : [ Role, Role ] }
         """
         # Make sure that DATASET_MANAGE_PERMISSIONS is associated with at least 1 role
-        has_dataset_manage_permissions = False
         permissions = permissions or {}
-        for action, roles in permissions.items():
-            if isinstance(action, Action):
-                if action == self.permitted_actions.DATASET_MANAGE_PERMISSIONS and roles:
-                    has_dataset_manage_permissions = True
-                    break
-            elif action == self.permitted_actions.DATASET_MANAGE_PERMISSIONS.action and roles:
-                has_dataset_manage_permissions = True
-                break
-        if not has_dataset_manage_permissions:
+        if not self._has_dataset_manage_permissions(permissions):
             return "At least 1 role must be associated with manage permissions on this dataset."
         flush_needed = False
         # Delete all of the current permissions on the dataset
@@ -916,6 +907,44 @@ class GalaxyRBACAgent(RBACAgent):
                 self.sa_session.delete(dp)
                 flush_needed = True
         # Add the new permissions on the dataset
+        for action, role_id in self._permission_action_role_ids(permissions):
+            dp = self.model.DatasetPermissions(action, dataset, role_id=role_id)
+            self.sa_session.add(dp)
+            flush_needed = True
+        if flush_needed and flush:
+            self.sa_session.flush()
+        return ""
+
+    def set_new_datasets_permissions(self, datasets, permissions=None):
+        """
+        Set the same full permissions on many newly created datasets without
+        flushing. Permissions are validated and resolved to role IDs once for
+        the whole batch. Permission looks like: { Action : [ Role, Role ] }
+        """
+        permissions = permissions or {}
+        if not self._has_dataset_manage_permissions(permissions):
+            return "At least 1 role must be associated with manage permissions on this dataset."
+        action_role_ids = self._permission_action_role_ids(permissions)
+        self.sa_session.add_all(
+            [
+                self.model.DatasetPermissions(action, dataset, role_id=role_id)
+                for dataset in datasets
+                for action, role_id in action_role_ids
+            ]
+        )
+        return ""
+
+    def _has_dataset_manage_permissions(self, permissions):
+        for action, roles in permissions.items():
+            if isinstance(action, Action):
+                if action == self.permitted_actions.DATASET_MANAGE_PERMISSIONS and roles:
+                    return True
+            elif action == self.permitted_actions.DATASET_MANAGE_PERMISSIONS.action and roles:
+                return True
+        return False
+
+    def _permission_action_role_ids(self, permissions):
+        action_role_ids = []
         for action, roles in permissions.items():
             if isinstance(action, Action):
                 action = action.action
@@ -924,12 +953,8 @@ class GalaxyRBACAgent(RBACAgent):
                     role_id = role.id
                 else:
                     role_id = role
-                dp = self.model.DatasetPermissions(action, dataset, role_id=role_id)
-                self.sa_session.add(dp)
-                flush_needed = True
-        if flush_needed and flush:
-            self.sa_session.flush()
-        return ""
+                action_role_ids.append((action, role_id))
+        return action_role_ids
 
     def set_dataset_permission(self, dataset, permission=None):
         """
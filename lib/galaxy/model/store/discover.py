@@ -8,6 +8,7 @@ corresponding to files in other contexts.
 import abc
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Callable,
@@ -40,6 +41,7 @@ log = logging.getLogger(__name__)
 
 UNSET = object()
 DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_OBJECT_STORE_UPDATE_WORKERS = 4
 
 
 class MaxDiscoveredFilesExceededError(ValueError):
@@ -59,6 +61,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
     job_working_directory: str  # TODO: rename
     max_discovered_files = float("inf")
     discovered_file_count: int
+    # Number of discovered files moved into the object store concurrently
+    object_store_update_workers = DEFAULT_OBJECT_STORE_UPDATE_WORKERS
 
     def create_dataset(
         self,
@@ -83,6 +87,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
         final_job_state="ok",
         creating_job_id=None,
         storage_callbacks=None,
+        set_default_permissions=True,
     ):
         tag_list = tag_list or []
         sources = sources or []
@@ -123,7 +128,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                 if init_from:
                     self.permission_provider.copy_dataset_permissions(init_from, primary_data)
                     primary_data.state = init_from.state
-                else:
+                elif set_default_permissions:
                     self.permission_provider.set_default_hda_permissions(primary_data)
             else:
                 ld = galaxy.model.LibraryDataset(folder=library_folder, name=name)
@@ -342,6 +347,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                 hashes=hashes,
                 created_from_basename=created_from_basename,
                 final_job_state=final_job_state,
+                # Permissions are set for all datasets of the chunk at once below.
+                set_default_permissions=False,
             )
             log.debug(
                 "(%s) Created dynamic collection dataset for path [%s] with element identifier [%s] for output [%s] %s",
@@ -357,6 +364,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             element_datasets["tag_lists"].append(discovered_file.match.tag_list)
             element_datasets["paths"].append(filename)
 
+        self.permission_provider.set_default_hda_permissions_for_datasets(element_datasets["datasets"])
         self.add_tags_to_datasets(datasets=element_datasets["datasets"], tag_lists=element_datasets["tag_lists"])
         for (element_identifiers, dataset) in zip(
             element_datasets["element_identifiers"], element_datasets["datasets"]
@@ -388,14 +396,38 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
 
     def add_tags_to_datasets(self, datasets, tag_lists):
         if any(tag_lists):
-            for dataset, tags in zip(datasets, tag_lists):
-                self.tag_handler.add_tags_from_list(self.user, dataset, tags, flush=False)
+            self.tag_handler.add_tags_from_lists(self.user, datasets, tag_lists, flush=False)
 
     def update_object_store_with_datasets(self, datasets, paths, extra_files):
-        for dataset, path, extra_file in zip(datasets, paths, extra_files):
-            self.object_store.update_from_file(dataset.dataset, file_name=path, create=True)
+        def update_from_file(dataset, path, extra_file, create=True):
+            self.object_store.update_from_file(dataset.dataset, file_name=path, create=create)
+            if extra_file:
+                persist_extra_files(self.object_store, extra_file, dataset)
+
+        updates = list(zip(datasets, paths, extra_files))
+        if updates:
+            # The first update may flush the session to assign the IDs object store
+            # paths are built from, so keep it (and any flush) on this thread.
+            update_from_file(*updates[0])
+        remaining_updates = updates[1:]
+        workers = min(self.object_store_update_workers, len(remaining_updates))
+        if workers > 1:
+            # Worker threads must not use the session, load everything the object
+            # store reads from the model objects on this thread. Creating the objects
+            # here also assigns the object store ids (e.g. distributed object stores
+            # pick a backend), so that workers don't modify the model objects.
+            for dataset, _, extra_file in remaining_updates:
+                _load_object_store_attributes(dataset, extra_file)
+                self.object_store.create(dataset.dataset)
+            # Moving files into the object store is I/O bound, run it concurrently.
+            # Results are consumed to re-raise exceptions from the worker threads.
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda update: update_from_file(*update, create=False), remaining_updates))
+        else:
+            for update in remaining_updates:
+                update_from_file(*update)
+        for dataset, extra_file in zip(datasets, extra_files):
             if extra_file:
-                persist_extra_files(self.object_store, extra_files, dataset)
                 dataset.set_size()
             else:
                 dataset.set_size(no_extra_files=True)
@@ -497,6 +529,11 @@ class PermissionProvider(metaclass=abc.ABCMeta):
     def set_default_hda_permissions(self, primary_data):
         return
 
+    def set_default_hda_permissions_for_datasets(self, datasets):
+        """Set default permissions for a batch of newly created datasets."""
+        for primary_data in datasets:
+            self.set_default_hda_permissions(primary_data)
+
     @abc.abstractmethod
     def copy_dataset_permissions(self, init_from, primary_data):
         """Copy dataset permissions from supplied input dataset."""
@@ -580,8 +617,7 @@ class SessionlessModelPersistenceContext(ModelPersistenceContext):
     def add_tags_to_datasets(self, datasets, tag_lists):
         user = galaxy.model.User()
         if any(tag_lists):
-            for dataset, tags in zip(datasets, tag_lists):
-                self.tag_handler.add_tags_from_list(user, dataset, tags, flush=False)
+            self.tag_handler.add_tags_from_lists(user, datasets, tag_lists, flush=False)
 
     def add_library_dataset_to_folder(self, library_folder, ld):
         library_folder.datasets.append(ld)
@@ -636,6 +672,14 @@ class SessionlessModelPersistenceContext(ModelPersistenceContext):
         """No-op, no job context."""
 
 
+def _load_object_store_attributes(primary_data, extra_files):
+    dataset = primary_data.dataset
+    for attribute in ("id", "uuid", "object_store_id", "external_filename", "_extra_files_path"):
+        getattr(dataset, attribute)
+    if extra_files:
+        primary_data.extra_files_path
+
+
 def persist_extra_files(object_store, src_extra_files_path, primary_data):
     if src_extra_files_path and os.path.exists(src_extra_files_path):
         primary_data.dataset.create_extra_files_path()
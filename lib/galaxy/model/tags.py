@@ -1,14 +1,30 @@
 import logging
 import re
+import threading
+from collections import (
+    defaultdict,
+    OrderedDict,
+)
 from typing import (
     Dict,
+    Iterable,
     List,
     Optional,
     Tuple,
 )
 
+from sqlalchemy import (
+    inspect,
+    or_,
+)
+from sqlalchemy.dialects import (
+    postgresql,
+    sqlite,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import select
 from sqlalchemy.sql.expression import func
 
@@ -21,6 +37,11 @@ from galaxy.util import (
 
 log = logging.getLogger(__name__)
 
+# Number of tag name to id resolutions kept per process.
+DEFAULT_TAG_ID_CACHE_SIZE = 10000
+# Maximum number of names or ids in a single ``IN`` clause of the batch queries.
+TAG_QUERY_BATCH_SIZE = 1000
+
 
 # Item-specific information needed to perform tagging.
 class ItemTagAssocInfo:
@@ -30,13 +51,58 @@ class ItemTagAssocInfo:
         self.item_id_col = item_id_col
 
 
+class TagIdCache:
+    """Bounded, thread safe cache of tag names to tag ids.
+
+    Tags are never renamed or removed, so an entry stays valid for the
+    lifetime of the process.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TAG_ID_CACHE_SIZE):
+        self.max_size = max_size
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> Optional[int]:
+        with self._lock:
+            tag_id = self._ids.get(name)
+            if tag_id is not None:
+                self._ids.move_to_end(name)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return tag_id
+
+    def set(self, name: str, tag_id: int) -> None:
+        with self._lock:
+            self._ids[name] = tag_id
+            self._ids.move_to_end(name)
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._ids.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def __len__(self):
+        return len(self._ids)
+
+
 class TagHandler:
     """
     Manages CRUD operations related to tagging objects.
     """
 
-    def __init__(self, sa_session: galaxy_scoped_session) -> None:
+    def __init__(self, sa_session: galaxy_scoped_session, tag_id_cache: Optional[TagIdCache] = None) -> None:
         self.sa_session = sa_session
+        # Tag name to id resolutions, shared with the handler sessions created from this handler.
+        self.tag_id_cache = tag_id_cache if tag_id_cache is not None else TagIdCache()
         # Minimum tag length.
         self.min_tag_len = 1
         # Maximum tag length.
@@ -52,7 +118,7 @@ class TagHandler:
 
     def create_tag_handler_session(self):
         # Creates a transient tag handler that avoids repeated flushes
-        return GalaxyTagHandlerSession(self.sa_session)
+        return GalaxyTagHandlerSession(self.sa_session, tag_id_cache=self.tag_id_cache)
 
     def add_tags_from_list(self, user, item, new_tags_list, flush=True):
         new_tags_set = set(new_tags_list)
@@ -60,6 +126,30 @@ class TagHandler:
             new_tags_set.update(self.get_tags_str(item.tags).split(","))
         return self.set_tags_from_list(user, item, new_tags_set, flush=flush)
 
+    def add_tags_from_lists(self, user, items, new_tags_lists, flush=True):
+        """Batch version of :meth:`add_tags_from_list`, adding ``new_tags_lists[i]`` to ``items[i]``.
+
+        The current tags of all persisted items are loaded with one query per
+        item class, and all tags named are looked up - and missing ones
+        created - together, so tagging many items does not cost a few queries
+        per item and tag.
+        """
+        items_and_tags = [(item, tags) for item, tags in zip(items, new_tags_lists) if tags]
+        self.load_item_tags([item for item, _ in items_and_tags])
+        new_tags_sets = []
+        for item, new_tags_list in items_and_tags:
+            new_tags_set = set(new_tags_list)
+            if item.tags:
+                new_tags_set.update(self.get_tags_str(item.tags).split(","))
+            new_tags_sets.append(new_tags_set)
+        self.get_or_create_tags(
+            name for new_tags_set in new_tags_sets for name, _ in self.parse_tags(",".join(new_tags_set))
+        )
+        for (item, _), new_tags_set in zip(items_and_tags, new_tags_sets):
+            self.set_tags_from_list(user, item, new_tags_set, flush=False)
+        if flush:
+            self.sa_session.flush()
+
     def remove_tags_from_list(self, user, item, tag_to_remove_list, flush=True):
         tag_to_remove_set = set(tag_to_remove_list)
         tags_set = {_.strip() for _ in self.get_tags_str(item.tags).split(",")}
@@ -227,9 +317,76 @@ class TagHandler:
     def get_tag_by_name(self, tag_name):
         """Get a Tag object from a tag name (string)."""
         if tag_name:
-            return self.sa_session.query(galaxy.model.Tag).filter_by(name=tag_name.lower()).first()
+            tag_name = tag_name.lower()
+            tag_id = self.tag_id_cache.get(tag_name)
+            if tag_id is not None:
+                tag = self.sa_session.get(galaxy.model.Tag, tag_id)
+                if tag is not None:
+                    return tag
+                self.tag_id_cache.invalidate(tag_name)
+            tag = self.sa_session.query(galaxy.model.Tag).filter_by(name=tag_name).first()
+            if tag is not None and tag.id is not None:
+                self.tag_id_cache.set(tag_name, tag.id)
+            return tag
         return None
 
+    def get_or_create_tags(self, tag_strs: Iterable[str]) -> Dict[str, Optional["galaxy.model.Tag"]]:
+        """Get or create the tags named in ``tag_strs`` in bulk.
+
+        Existing tags are fetched with one query per batch of names, missing
+        tags (and their missing parent tags) are inserted with one upsert per
+        hierarchy level. Return a dictionary of scrubbed, lowercase tag names
+        to tags - or None for names that could not be created. The tags are
+        left in this handler's session, so resolving them again afterwards
+        with :meth:`get_tag_by_name` does not query the database.
+        """
+        hierarchies = {}
+        for tag_str in tag_strs:
+            scrubbed_tag_str = self._scrub_tag_name(tag_str)
+            if scrubbed_tag_str:
+                name = scrubbed_tag_str.lower()
+                if name not in hierarchies:
+                    hierarchies[name] = self._tag_hierarchy(name)
+        if not hierarchies:
+            return {}
+        names = set(hierarchies)
+        for hierarchy in hierarchies.values():
+            names.update(hierarchy)
+        tags = self._get_tags_by_names(names)
+        missing = {name: hierarchy for name, hierarchy in hierarchies.items() if name not in tags and hierarchy}
+        if missing:
+            self._create_tags(missing, tags)
+        return {
+            name: tags.get(name) or (tags.get(hierarchy[-1]) if hierarchy else None)
+            for name, hierarchy in hierarchies.items()
+        }
+
+    def load_item_tags(self, items) -> None:
+        """Load the tags of all persisted ``items`` whose tags are not loaded yet, one query per item class."""
+        by_class = defaultdict(list)
+        for item in items:
+            state = inspect(item, raiseerr=False)
+            if state is not None and state.persistent and "tags" in state.unloaded:
+                by_class[item.__class__.__name__].append(item)
+        for item_class_name, class_items in by_class.items():
+            item_tag_assoc_info = self.item_tag_assoc_info.get(item_class_name)
+            if item_tag_assoc_info is None:
+                continue
+            tag_assoc_class = item_tag_assoc_info.tag_assoc_class
+            item_id_col = item_tag_assoc_info.item_id_col
+            tag_assocs = defaultdict(list)
+            item_ids = [item.id for item in class_items]
+            for i in range(0, len(item_ids), TAG_QUERY_BATCH_SIZE):
+                query = (
+                    self.sa_session.query(tag_assoc_class)
+                    .filter(item_id_col.in_(item_ids[i : i + TAG_QUERY_BATCH_SIZE]))
+                    .order_by(tag_assoc_class.id)
+                )
+                for tag_assoc in query:
+                    tag_assocs[getattr(tag_assoc, item_id_col.key)].append(tag_assoc)
+            for item in class_items:
+                set_committed_value(item, "tags", tag_assocs[item.id])
+
     def _create_tag(self, tag_str: str):
         """Create a Tag object from a tag string."""
         tag_hierarchy = tag_str.split(self.hierarchy_separator)
@@ -254,6 +411,100 @@ class TagHandler:
     def _get_tag(self, tag_name):
         return self.sa_session.query(galaxy.model.Tag).filter_by(name=tag_name).first()
 
+    def _tag_hierarchy(self, tag_str: str) -> List[str]:
+        """Return the names of the tags :meth:`_create_tag` creates for ``tag_str``, root first."""
+        names = []
+        tag_prefix = ""
+        for sub_tag in tag_str.split(self.hierarchy_separator):
+            sub_tag_name = self._scrub_tag_name(sub_tag)
+            if sub_tag_name:
+                tag_name = tag_prefix + sub_tag_name
+                names.append(tag_name)
+                tag_prefix = tag_name + self.hierarchy_separator
+        return names
+
+    def _get_tags_by_names(self, names) -> Dict[str, "galaxy.model.Tag"]:
+        """Fetch existing tags by name, using the tag id cache and the session's identity map where possible."""
+        tags = {}
+        ids_by_name = {}
+        unresolved = []
+        for name in names:
+            tag_id = self.tag_id_cache.get(name)
+            if tag_id is None:
+                unresolved.append(name)
+                continue
+            tag = self.sa_session.identity_map.get(identity_key(galaxy.model.Tag, tag_id))
+            if tag is not None:
+                tags[name] = tag
+            else:
+                ids_by_name[name] = tag_id
+        ids = list(ids_by_name.values())
+        for i in range(0, max(len(ids), len(unresolved)), TAG_QUERY_BATCH_SIZE):
+            batch_ids = ids[i : i + TAG_QUERY_BATCH_SIZE]
+            batch_names = unresolved[i : i + TAG_QUERY_BATCH_SIZE]
+            query = self.sa_session.query(galaxy.model.Tag).filter(
+                or_(galaxy.model.Tag.id.in_(batch_ids), galaxy.model.Tag.name.in_(batch_names))
+            )
+            for tag in query:
+                tags[tag.name] = tag
+                self.tag_id_cache.set(tag.name, tag.id)
+        for name in ids_by_name:
+            if name not in tags:
+                # Stale cache entry, create the tag again.
+                self.tag_id_cache.invalidate(name)
+        return tags
+
+    def _insert_tags_statement(self, dialect_name: str):
+        """Return an insert statement for the tag table that ignores existing names, or None if unsupported."""
+        if dialect_name == "postgresql":
+            return postgresql.insert(galaxy.model.Tag.table).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            return sqlite.insert(galaxy.model.Tag.table).on_conflict_do_nothing()
+        return None
+
+    def _create_tags(self, hierarchies: Dict[str, List[str]], tags: Dict[str, "galaxy.model.Tag"]) -> None:
+        """Create the tags (and parent tags) in ``hierarchies`` that are not in ``tags`` yet, adding them to ``tags``.
+
+        Like :meth:`_create_tag_instance` tags are created in a separate
+        session and committed right away, so that they exist regardless of
+        the outcome of the current transaction.
+        """
+        Session = sessionmaker(self.sa_session.bind)
+        with Session() as separate_session:
+            insert_statement = self._insert_tags_statement(separate_session.get_bind().dialect.name)
+            if insert_statement is None:
+                for name, hierarchy in hierarchies.items():
+                    tag = self._create_tag(hierarchy[-1])
+                    if tag is not None:
+                        tags[tag.name] = tag
+                return
+            tag_ids = {name: tag.id for name, tag in tags.items()}
+            depth = max(len(hierarchy) for hierarchy in hierarchies.values())
+            for level in range(depth):
+                level_names = {}
+                for hierarchy in hierarchies.values():
+                    if len(hierarchy) > level and hierarchy[level] not in tag_ids:
+                        level_names[hierarchy[level]] = hierarchy[level - 1] if level else None
+                if not level_names:
+                    continue
+                separate_session.execute(
+                    insert_statement,
+                    [
+                        {"type": 0, "name": name, "parent_id": tag_ids.get(parent)}
+                        for name, parent in level_names.items()
+                    ],
+                )
+                separate_session.commit()
+                names = list(level_names)
+                for i in range(0, len(names), TAG_QUERY_BATCH_SIZE):
+                    query = select([galaxy.model.Tag.id, galaxy.model.Tag.name]).where(
+                        galaxy.model.Tag.name.in_(names[i : i + TAG_QUERY_BATCH_SIZE])
+                    )
+                    for tag_id, name in separate_session.execute(query):
+                        tag_ids[name] = tag_id
+                        self.tag_id_cache.set(name, tag_id)
+        tags.update(self._get_tags_by_names([name for name in tag_ids if name not in tags]))
+
     def _create_tag_instance(self, tag_name):
         # For good performance caller should first check if there's already an appropriate tag
         tag = galaxy.model.Tag(type=0, name=tag_name)
@@ -378,10 +629,10 @@ class TagHandler:
 
 
 class GalaxyTagHandler(TagHandler):
-    def __init__(self, sa_session: galaxy_scoped_session):
+    def __init__(self, sa_session: galaxy_scoped_session, tag_id_cache: Optional[TagIdCache] = None):
         from galaxy import model
 
-        TagHandler.__init__(self, sa_session)
+        TagHandler.__init__(self, sa_session, tag_id_cache=tag_id_cache)
         self.item_tag_assoc_info["History"] = ItemTagAssocInfo(
             model.History, model.HistoryTagAssociation, model.HistoryTagAssociation.history_id
         )
@@ -416,8 +667,8 @@ class GalaxyTagHandler(TagHandler):
 class GalaxyTagHandlerSession(GalaxyTagHandler):
     """Like GalaxyTagHandler, but avoids one flush per created tag."""
 
-    def __init__(self, sa_session):
-        super().__init__(sa_session)
+    def __init__(self, sa_session, tag_id_cache: Optional[TagIdCache] = None):
+        super().__init__(sa_session, tag_id_cache=tag_id_cache)
         self.created_tags = {}
 
     def _get_tag(self, tag_name):
@@ -441,6 +692,17 @@ class GalaxySessionlessTagHandler(GalaxyTagHandlerSession):
     def get_tag_by_name(self, tag_name):
         return self.created_tags.get(tag_name)
 
+    def get_or_create_tags(self, tag_strs):
+        tags = {}
+        for tag_str in tag_strs:
+            scrubbed_tag_str = self._scrub_tag_name(tag_str)
+            if scrubbed_tag_str:
+                tags[scrubbed_tag_str.lower()] = self._get_or_create_tag(scrubbed_tag_str.lower())
+        return tags
+
+    def load_item_tags(self, items):
+        pass
+
 
 class CommunityTagHandler(TagHandler):
     def __init__(self, sa_session):
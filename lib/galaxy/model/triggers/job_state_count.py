@@ -0,0 +1,164 @@
+"""
+Triggers maintaining the job_state_count table.
+
+The table holds the number of jobs per user, destination and state for the
+states job handlers enforce concurrency limits on. It is updated whenever a
+job is created or deleted, or its state, destination or user changes, so all
+handlers read consistent counts from a handful of rows instead of each of
+them aggregating the job table on every iteration. Anonymous jobs are counted
+with user_id 0 and jobs without a destination with an empty destination_id.
+"""
+
+from galaxy.model.triggers.utils import execute_statements
+
+# job states counted in job_state_count, see JobHandlerQueue
+COUNTED_STATES = ("queued", "running", "resubmitted")
+
+fn_name = "update_job_state_count"
+trigger_label = "job_state_count"
+
+
+def install(engine):
+    """Install job_state_count triggers and recount the active jobs"""
+    version = engine.dialect.server_version_info[0] if "postgres" in engine.name else None
+    execute_statements(engine, get_install_sql(engine.name, version))
+
+
+def remove(engine):
+    """Uninstall job_state_count triggers"""
+    execute_statements(engine, get_drop_sql(engine.name))
+
+
+def get_install_sql(variant, version=None):
+    """
+    Generate a list of SQL statements installing the triggers and populating
+    job_state_count from the current content of the job table.
+    """
+    sql = get_drop_sql(variant)
+    if "postgres" in variant:
+        sql.append(_pg_function())
+        # In the syntax of CREATE TRIGGER, the keywords FUNCTION and PROCEDURE are equivalent,
+        # PROCEDURE is deprecated but required before PostgreSQL 11.
+        function_keyword = "FUNCTION" if version is None or version > 10 else "PROCEDURE"
+        sql.extend(_pg_triggers(function_keyword))
+    else:
+        sql.extend(_sqlite_triggers())
+    sql.extend(get_recount_sql())
+    return sql
+
+
+def get_drop_sql(variant):
+    """
+    Generate a list of statements to drop the job_state_count triggers
+    """
+    if "postgres" in variant:
+        return [f"DROP FUNCTION IF EXISTS {fn_name}() CASCADE;"]
+    return [f"DROP TRIGGER IF EXISTS {_trigger_name(operation)};" for operation in ("INSERT", "UPDATE", "DELETE")]
+
+
+def get_recount_sql():
+    """
+    Generate the statements replacing the content of job_state_count with the
+    counts of the job table.
+    """
+    return [
+        "DELETE FROM job_state_count;",
+        f"""
+            INSERT INTO job_state_count (user_id, destination_id, state, job_count)
+            SELECT COALESCE(user_id, 0), COALESCE(destination_id, ''), state, COUNT(*)
+            FROM job
+            WHERE state IN {_counted_states()}
+            GROUP BY COALESCE(user_id, 0), COALESCE(destination_id, ''), state;
+        """,
+    ]
+
+
+def _counted_states():
+    return "({})".format(", ".join(f"'{state}'" for state in COUNTED_STATES))
+
+
+def _trigger_name(operation):
+    return f"trigger_{trigger_label}_a{operation.lower()[0]}r"
+
+
+def _key(row):
+    return f"user_id = COALESCE({row}.user_id, 0) AND destination_id = COALESCE({row}.destination_id, '') AND state = {row}.state"
+
+
+def _pg_function():
+    return f"""
+        CREATE OR REPLACE FUNCTION {fn_name}()
+            RETURNS TRIGGER
+            LANGUAGE 'plpgsql'
+        AS $BODY$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.state IN {_counted_states()} THEN
+                    UPDATE job_state_count SET job_count = job_count - 1 WHERE {_key("OLD")};
+                END IF;
+                IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.state IN {_counted_states()} THEN
+                    INSERT INTO job_state_count (user_id, destination_id, state, job_count)
+                    VALUES (COALESCE(NEW.user_id, 0), COALESCE(NEW.destination_id, ''), NEW.state, 1)
+                    ON CONFLICT (user_id, destination_id, state)
+                    DO UPDATE SET job_count = job_state_count.job_count + 1;
+                END IF;
+                RETURN NULL;
+            END;
+        $BODY$
+    """
+
+
+def _pg_triggers(function_keyword):
+    changed = (
+        "OLD.state IS DISTINCT FROM NEW.state"
+        " OR OLD.destination_id IS DISTINCT FROM NEW.destination_id"
+        " OR OLD.user_id IS DISTINCT FROM NEW.user_id"
+    )
+    conditions = {
+        "INSERT": f"NEW.state IN {_counted_states()}",
+        "UPDATE": changed,
+        "DELETE": f"OLD.state IN {_counted_states()}",
+    }
+    return [
+        f"""
+            CREATE TRIGGER {_trigger_name(operation)}
+            AFTER {operation} ON job
+            FOR EACH ROW
+            WHEN ({condition})
+            EXECUTE {function_keyword} {fn_name}();
+        """
+        for operation, condition in conditions.items()
+    ]
+
+
+def _sqlite_triggers():
+    def decrement():
+        return f"""
+                    UPDATE job_state_count SET job_count = job_count - 1
+                    WHERE {_key("OLD")} AND OLD.state IN {_counted_states()};
+        """
+
+    def increment():
+        return f"""
+                    INSERT OR IGNORE INTO job_state_count (user_id, destination_id, state, job_count)
+                    SELECT COALESCE(NEW.user_id, 0), COALESCE(NEW.destination_id, ''), NEW.state, 0
+                    WHERE NEW.state IN {_counted_states()};
+                    UPDATE job_state_count SET job_count = job_count + 1
+                    WHERE {_key("NEW")} AND NEW.state IN {_counted_states()};
+        """
+
+    bodies = {
+        "INSERT": ("AFTER INSERT", increment()),
+        "UPDATE": ("AFTER UPDATE OF state, destination_id, user_id", decrement() + increment()),
+        "DELETE": ("AFTER DELETE", decrement()),
+    }
+    return [
+        f"""
+            CREATE TRIGGER {_trigger_name(operation)}
+                {when} ON job
+                FOR EACH ROW
+                BEGIN
+                    {body}
+                END;
+        """
+        for operation, (when, body) in bodies.items()
+    ]
@@ -12,10 +12,18 @@ import random
 import shutil
 import threading
 import time
+from collections import (
+    Counter,
+    defaultdict,
+)
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Dict,
+    Iterable,
     List,
+    Optional,
+    Sequence,
     Tuple,
     Type,
 )
@@ -26,6 +34,17 @@ from galaxy.exceptions import (
     ObjectInvalid,
     ObjectNotFound,
 )
+from galaxy.objectstore.path_cache import (
+    DEFAULT_PATH_CACHE_SIZE,
+    DiskPathCache,
+)
+from galaxy.objectstore.placement import (
+    BackendLookupCache,
+    BackendPlacement,
+    PLACEMENT_CAPACITY,
+    PLACEMENT_STRATEGIES,
+    PLACEMENT_WEIGHTED,
+)
 from galaxy.util import (
     asbool,
     directory_hash_id,
@@ -39,6 +58,13 @@ from galaxy.util.path import (
     safe_relpath,
 )
 from galaxy.util.sleeper import Sleeper
+from galaxy.util.staging import stage_file
+
+# Number of deletes run concurrently by ``delete_many`` by default.
+DEFAULT_DELETE_WORKERS = 8
+# Seconds a legacy (unhashed) path found missing is remembered as such by the
+# disk object store - new objects are never created at legacy paths.
+OLD_STYLE_MISSING_TTL = 300.0
 
 NO_SESSION_ERROR_MESSAGE = (
     "Attempted to 'create' object store entity in configuration with no database session present."
@@ -311,6 +337,17 @@ class BaseObjectStore(ObjectStore):
         """
         return True
 
+    def colocates_outputs(self) -> bool:
+        """Return True if :meth:`select_colocated_store_id` may place job outputs with their inputs."""
+        return False
+
+    def select_colocated_store_id(self, object_store_ids: Iterable[Optional[str]]) -> Optional[str]:
+        """Return an object store id to create a job's outputs in, given the ids its inputs are stored in.
+
+        Return None to let the object store place the outputs itself.
+        """
+        return None
+
     @classmethod
     def parse_xml(clazz, config_xml):
         """Parse an XML description of a configuration for this object store.
@@ -365,12 +402,58 @@ class BaseObjectStore(ObjectStore):
     def delete(self, obj, **kwargs):
         return self._invoke("delete", obj, **kwargs)
 
+    def delete_many(
+        self, objs_and_kwargs: Sequence[Tuple[Any, Dict[str, Any]]], max_workers: int = DEFAULT_DELETE_WORKERS
+    ) -> List[Any]:
+        """Delete many objects, running up to ``max_workers`` deletes concurrently.
+
+        ``objs_and_kwargs`` is a sequence of ``(obj, kwargs)`` pairs, ``kwargs``
+        being the keyword arguments :meth:`delete` would be called with. Return
+        the result of each delete - or the exception it raised - in order.
+        Subclasses that can delete several objects in a single request should
+        override this.
+        """
+
+        def delete(obj_and_kwargs):
+            obj, kwargs = obj_and_kwargs
+            try:
+                return self.delete(obj, **kwargs)
+            except Exception as e:
+                return e
+
+        if max_workers <= 1 or len(objs_and_kwargs) <= 1:
+            return [delete(obj_and_kwargs) for obj_and_kwargs in objs_and_kwargs]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(objs_and_kwargs))) as executor:
+            return list(executor.map(delete, objs_and_kwargs))
+
     def get_data(self, obj, **kwargs):
         return self._invoke("get_data", obj, **kwargs)
 
     def get_filename(self, obj, **kwargs):
         return self._invoke("get_filename", obj, **kwargs)
 
+    def exists_many(self, objs: Sequence[Any], **kwargs) -> List[bool]:
+        """Return whether each of ``objs`` exists, in order.
+
+        ``kwargs`` are the keyword arguments :meth:`exists` would be called
+        with and apply to every object.
+        """
+        return [self.exists(obj, **kwargs) for obj in objs]
+
+    def get_filenames(self, objs: Sequence[Any], **kwargs) -> List[Optional[str]]:
+        """Return the file name of each of ``objs`` in order, None for objects that do not exist.
+
+        ``kwargs`` are the keyword arguments :meth:`get_filename` would be
+        called with and apply to every object.
+        """
+        filenames: List[Optional[str]] = []
+        for obj in objs:
+            try:
+                filenames.append(self.get_filename(obj, **kwargs))
+            except ObjectNotFound:
+                filenames.append(None)
+        return filenames
+
     def update_from_file(self, obj, **kwargs):
         return self._invoke("update_from_file", obj, **kwargs)
 
@@ -471,6 +554,11 @@ class DiskObjectStore(ConcreteObjectStore):
         """
         super().__init__(config, config_dict)
         self.file_path = os.path.abspath(config_dict.get("files_dir") or config.file_path)
+        self.path_cache_size = int(config_dict.get("path_cache_size", DEFAULT_PATH_CACHE_SIZE))
+        # Seconds a missing (hashed) path is remembered as such, off by default
+        # since jobs create files behind the object store's back.
+        self.missing_ttl = float(config_dict.get("missing_ttl", 0))
+        self.path_cache = DiskPathCache(max_size=self.path_cache_size)
 
     @classmethod
     def parse_xml(clazz, config_xml):
@@ -483,6 +571,12 @@ class DiskObjectStore(ConcreteObjectStore):
             name = config_xml.attrib.get("name", None)
             if name is not None:
                 config_dict["name"] = name
+            path_cache_size = config_xml.attrib.get("path_cache_size", None)
+            if path_cache_size is not None:
+                config_dict["path_cache_size"] = int(path_cache_size)
+            missing_ttl = config_xml.attrib.get("missing_ttl", None)
+            if missing_ttl is not None:
+                config_dict["missing_ttl"] = float(missing_ttl)
             for e in config_xml:
                 if e.tag == "files_dir":
                     config_dict["files_dir"] = e.get("path")
@@ -497,6 +591,8 @@ class DiskObjectStore(ConcreteObjectStore):
     def to_dict(self):
         as_dict = super().to_dict()
         as_dict["files_dir"] = self.file_path
+        as_dict["path_cache_size"] = self.path_cache_size
+        as_dict["missing_ttl"] = self.missing_ttl
         return as_dict
 
     def __get_filename(
@@ -519,7 +615,7 @@ class DiskObjectStore(ConcreteObjectStore):
         )
         # For backward compatibility: check the old style root path first;
         # otherwise construct hashed path.
-        if not os.path.exists(path):
+        if not self._path_exists(path, old_style=True):
             return self._construct_path(
                 obj,
                 base_dir=base_dir,
@@ -572,6 +668,12 @@ class DiskObjectStore(ConcreteObjectStore):
             hash id (e.g., /files/dataset_10.dat (old) vs.
             /files/000/dataset_10.dat (new))
         """
+        obj_id = self._get_object_id(obj)
+        # The path only depends on these, and is only cached once validated below.
+        cache_key = (obj_id, old_style, base_dir, dir_only, extra_dir, extra_dir_at_root, alt_name, obj_dir)
+        path = self.path_cache.get(cache_key) if obj_id is not None else None
+        if path is not None:
+            return path
         base = os.path.abspath(self.extra_dirs.get(base_dir, self.file_path))
         # extra_dir should never be constructed from provided data but just
         # make sure there are no shenannigans afoot
@@ -583,7 +685,6 @@ class DiskObjectStore(ConcreteObjectStore):
         if alt_name and not safe_relpath(alt_name):
             log.warning("alt_name would locate path outside dir: %s", alt_name)
             raise ObjectInvalid("The requested object is invalid")
-        obj_id = self._get_object_id(obj)
         if old_style:
             if extra_dir is not None:
                 path = os.path.join(base, extra_dir)
@@ -607,7 +708,19 @@ class DiskObjectStore(ConcreteObjectStore):
                 obj_id is not None
             ), f"The effective dataset identifier consumed by object store [{self.store_by}] must be set before a path can be constructed."
             path = os.path.join(path, alt_name if alt_name else f"dataset_{obj_id}.dat")
-        return os.path.abspath(path)
+        path = os.path.abspath(path)
+        if obj_id is not None:
+            self.path_cache.set(cache_key, path)
+        return path
+
+    def _path_exists(self, path, old_style=False):
+        """Check whether ``path`` exists, remembering paths found missing for a while."""
+        if self.path_cache.is_missing(path):
+            return False
+        if os.path.exists(path):
+            return True
+        self.path_cache.set_missing(path, OLD_STYLE_MISSING_TTL if old_style else self.missing_ttl)
+        return False
 
     def _exists(self, obj, **kwargs):
         """Override `ObjectStore`'s stub and check on disk."""
@@ -615,9 +728,9 @@ class DiskObjectStore(ConcreteObjectStore):
             path = self._construct_path(obj, old_style=True, **kwargs)
             # For backward compatibility: check root path first; otherwise
             # construct and check hashed path.
-            if os.path.exists(path):
+            if self._path_exists(path, old_style=True):
                 return True
-        return os.path.exists(self._construct_path(obj, **kwargs))
+        return self._path_exists(self._construct_path(obj, **kwargs))
 
     def _create(self, obj, **kwargs):
         """Override `ObjectStore`'s stub by creating any files and folders on disk."""
@@ -631,6 +744,7 @@ class DiskObjectStore(ConcreteObjectStore):
             if not dir_only:
                 open(path, "w").close()  # Should be rb?
                 umask_fix_perms(path, self.config.umask, 0o666)
+            self.path_cache.invalidate(path)
 
     def _empty(self, obj, **kwargs):
         """Override `ObjectStore`'s stub by checking file size on disk."""
@@ -661,6 +775,7 @@ class DiskObjectStore(ConcreteObjectStore):
         path = self._get_filename(obj, **kwargs)
         extra_dir = kwargs.get("extra_dir", None)
         obj_dir = kwargs.get("obj_dir", False)
+        self.path_cache.invalidate(path)
         try:
             if entire_dir and (extra_dir or obj_dir):
                 shutil.rmtree(path)
@@ -693,28 +808,36 @@ class DiskObjectStore(ConcreteObjectStore):
             path = self._construct_path(obj, old_style=True, **kwargs)
             # For backward compatibility, check root path first; otherwise,
             # construct and return hashed path
-            if os.path.exists(path):
+            if self._path_exists(path, old_style=True):
                 return path
         path = self._construct_path(obj, **kwargs)
-        if not os.path.exists(path):
+        if not self._path_exists(path):
             raise ObjectNotFound
         return path
 
     def _update_from_file(self, obj, file_name=None, create=False, **kwargs):
-        """`create` parameter is not used in this implementation."""
+        """`create` parameter is not used in this implementation.
+
+        If ``hardlink_ok`` is true, the stored file may become a hard link to
+        ``file_name`` (if it can't be reflinked), callers must not modify it
+        afterwards.
+        """
         preserve_symlinks = kwargs.pop("preserve_symlinks", False)
+        hardlink_ok = kwargs.pop("hardlink_ok", False)
         # FIXME: symlinks and the object store model may not play well together
         # these should be handled better, e.g. registering the symlink'd file
         # as an object
         if create:
             self._create(obj, **kwargs)
+        else:
+            self.path_cache.invalidate(self._construct_path(obj, **kwargs))
         if file_name and self._exists(obj, **kwargs):
             try:
                 if preserve_symlinks and os.path.islink(file_name):
                     force_symlink(os.readlink(file_name), self._get_filename(obj, **kwargs))
                 else:
                     path = self._get_filename(obj, **kwargs)
-                    shutil.copy(file_name, path)
+                    stage_file(file_name, path, hardlink=hardlink_ok)
                     umask_fix_perms(path, self.config.umask, 0o666)
             except shutil.SameFileError:
                 # That's ok, we need to ignore this so that remote object stores can update
@@ -838,7 +961,9 @@ class DistributedObjectStore(NestedObjectStore):
 
     When getting objects the first store where the object exists is used.
     When creating objects they are created in a store selected randomly, but
-    with weighting.
+    with weighting. With the ``capacity`` placement strategy the weights are
+    scaled by each backend's free space and recent write throughput, see
+    :class:`galaxy.objectstore.placement.BackendPlacement`.
     """
 
     store_type = "distributed"
@@ -866,6 +991,11 @@ class DistributedObjectStore(NestedObjectStore):
         self.max_percent_full = {}
         self.global_max_percent_full = config_dict.get("global_max_percent_full", 0)
         self.search_for_missing = config_dict.get("search_for_missing", True)
+        self.placement_strategy = config_dict.get("placement", PLACEMENT_WEIGHTED)
+        if self.placement_strategy not in PLACEMENT_STRATEGIES:
+            raise Exception(f"Unknown distributed object store placement strategy [{self.placement_strategy}]")
+        self.colocate_outputs = config_dict.get("colocate_outputs", False)
+        self.lookup_cache = BackendLookupCache()
         random.seed()
 
         for backend_def in config_dict["backends"]:
@@ -885,9 +1015,15 @@ class DistributedObjectStore(NestedObjectStore):
                 self.weighted_backend_ids.append(backened_id)
 
         self.original_weighted_backend_ids = self.weighted_backend_ids
+        # Backend usage is fed to the placement engine by the filesystem monitor.
+        self.placement = BackendPlacement(Counter(self.original_weighted_backend_ids))
 
         self.sleeper = None
-        if fsmon and (self.global_max_percent_full or [_ for _ in self.max_percent_full.values() if _ != 0.0]):
+        if fsmon and (
+            self.global_max_percent_full
+            or [_ for _ in self.max_percent_full.values() if _ != 0.0]
+            or self.placement_strategy == PLACEMENT_CAPACITY
+        ):
             self.sleeper = Sleeper()
             self.filesystem_monitor_thread = threading.Thread(target=self.__filesystem_monitor, args=[self.sleeper])
             self.filesystem_monitor_thread.daemon = True
@@ -905,6 +1041,8 @@ class DistributedObjectStore(NestedObjectStore):
         config_dict = {
             "search_for_missing": asbool(backends_root.get("search_for_missing", True)),
             "global_max_percent_full": float(backends_root.get("maxpctfull", 0)),
+            "placement": backends_root.get("placement", PLACEMENT_WEIGHTED),
+            "colocate_outputs": asbool(backends_root.get("colocate_outputs", False)),
             "backends": backends,
         }
 
@@ -951,6 +1089,8 @@ class DistributedObjectStore(NestedObjectStore):
         as_dict = super().to_dict()
         as_dict["global_max_percent_full"] = self.global_max_percent_full
         as_dict["search_for_missing"] = self.search_for_missing
+        as_dict["placement"] = self.placement_strategy
+        as_dict["colocate_outputs"] = self.colocate_outputs
         backends: List[Dict[str, Any]] = []
         for backend_id, backend in self.backends.items():
             backend_as_dict = backend.to_dict()
@@ -969,21 +1109,47 @@ class DistributedObjectStore(NestedObjectStore):
 
     def __filesystem_monitor(self, sleeper: Sleeper):
         while self.running:
-            new_weighted_backend_ids = self.original_weighted_backend_ids
-            for id, backend in self.backends.items():
-                maxpct = self.max_percent_full[id] or self.global_max_percent_full
-                pct = backend.get_store_usage_percent()
-                if pct > maxpct:
-                    new_weighted_backend_ids = [_ for _ in new_weighted_backend_ids if _ != id]
-            self.weighted_backend_ids = new_weighted_backend_ids
+            self.weighted_backend_ids = self._update_placement_usage()
             sleeper.sleep(120)  # Test free space every 2 minutes
 
+    def _update_placement_usage(self) -> List[str]:
+        """Feed backend usage to the placement engine and return the weighted ids of backends not too full."""
+        new_weighted_backend_ids = self.original_weighted_backend_ids
+        for id, backend in self.backends.items():
+            maxpct = self.max_percent_full[id] or self.global_max_percent_full
+            pct = backend.get_store_usage_percent()
+            self.placement.update_usage(id, pct, maxpct)
+            if maxpct and pct > maxpct:
+                new_weighted_backend_ids = [_ for _ in new_weighted_backend_ids if _ != id]
+        return new_weighted_backend_ids
+
+    def _select_backend_id(self) -> str:
+        if self.placement_strategy == PLACEMENT_CAPACITY:
+            backend_id = self.placement.choose(set(self.weighted_backend_ids))
+            if backend_id is None:
+                raise IndexError("No backend with free space available")
+            return backend_id
+        return random.choice(self.weighted_backend_ids)
+
+    def colocates_outputs(self):
+        return self.colocate_outputs
+
+    def select_colocated_store_id(self, object_store_ids):
+        """Return the eligible backend holding most of ``object_store_ids`` if ``colocate_outputs`` is enabled."""
+        if not self.colocate_outputs:
+            return None
+        eligible = set(self.weighted_backend_ids)
+        counts = Counter(i for i in object_store_ids if i in eligible)
+        if not counts:
+            return None
+        return counts.most_common(1)[0][0]
+
     def _create(self, obj, **kwargs):
         """The only method in which obj.object_store_id may be None."""
         if obj.object_store_id is None or not self._exists(obj, **kwargs):
             if obj.object_store_id is None or obj.object_store_id not in self.backends:
                 try:
-                    obj.object_store_id = random.choice(self.weighted_backend_ids)
+                    obj.object_store_id = self._select_backend_id()
                 except IndexError:
                     raise ObjectInvalid(
                         "objectstore.create, could not generate "
@@ -999,6 +1165,63 @@ class DistributedObjectStore(NestedObjectStore):
                     % (obj.object_store_id, obj.__class__.__name__, obj.id)
                 )
             self.backends[obj.object_store_id].create(obj, **kwargs)
+            self.lookup_cache.invalidate(self._lookup_cache_key(obj))
+
+    def _delete(self, obj, **kwargs):
+        rval = super()._delete(obj, **kwargs)
+        self.lookup_cache.invalidate(self._lookup_cache_key(obj))
+        return rval
+
+    def delete_many(self, objs_and_kwargs, max_workers=DEFAULT_DELETE_WORKERS):
+        """Group the objects by backend and let each backend delete its share in bulk."""
+        results: List[Any] = [False] * len(objs_and_kwargs)
+        by_backend: Dict[str, List[int]] = defaultdict(list)
+        for index, (obj, kwargs) in enumerate(objs_and_kwargs):
+            object_store_id = self.__get_store_id_for(obj, **kwargs)
+            if object_store_id is not None:
+                by_backend[object_store_id].append(index)
+            self.lookup_cache.invalidate(self._lookup_cache_key(obj))
+        for object_store_id, indexes in by_backend.items():
+            backend_results = self.backends[object_store_id].delete_many(
+                [objs_and_kwargs[i] for i in indexes], max_workers=max_workers
+            )
+            for index, result in zip(indexes, backend_results):
+                results[index] = result
+        return results
+
+    def exists_many(self, objs, **kwargs):
+        """Group the objects by backend and check each backend's share in one call."""
+        return self.__call_many("exists_many", objs, False, **kwargs)
+
+    def get_filenames(self, objs, **kwargs):
+        """Group the objects by backend and resolve each backend's share in one call."""
+        return self.__call_many("get_filenames", objs, None, **kwargs)
+
+    def __call_many(self, method, objs, default, **kwargs):
+        results: List[Any] = [default] * len(objs)
+        by_backend: Dict[str, List[int]] = defaultdict(list)
+        for index, obj in enumerate(objs):
+            object_store_id = self.__get_store_id_for(obj, **kwargs)
+            if object_store_id is not None:
+                by_backend[object_store_id].append(index)
+        for object_store_id, indexes in by_backend.items():
+            backend_results = getattr(self.backends[object_store_id], method)([objs[i] for i in indexes], **kwargs)
+            for index, result in zip(indexes, backend_results):
+                results[index] = result
+        return results
+
+    def _update_from_file(self, obj, **kwargs):
+        file_name = kwargs.get("file_name")
+        start = time.time()
+        rval = super()._update_from_file(obj, **kwargs)
+        if self.placement_strategy == PLACEMENT_CAPACITY and file_name and obj.object_store_id in self.backends:
+            try:
+                size = os.path.getsize(file_name)
+            except OSError:
+                pass
+            else:
+                self.placement.record_write(obj.object_store_id, size, time.time() - start)
+        return rval
 
     def _call_method(self, method, obj, default, default_is_exception, **kwargs):
         object_store_id = self.__get_store_id_for(obj, **kwargs)
@@ -1025,15 +1248,30 @@ class DistributedObjectStore(NestedObjectStore):
             # if this instance has been switched from a non-distributed to a
             # distributed object store, or if the object's store id is invalid,
             # try to locate the object
+            obj_key = self._lookup_cache_key(obj)
+            lookup_key = tuple(sorted((k, str(v)) for k, v in kwargs.items()))
+            cached_id = self.lookup_cache.get(obj_key, lookup_key) if obj.id is not None else BackendLookupCache.MISSING
+            if cached_id is None:
+                return None
+            elif cached_id is not BackendLookupCache.MISSING:
+                obj.object_store_id = cached_id
+                return cached_id
             for id, store in self.backends.items():
                 if store.exists(obj, **kwargs):
                     log.warning(
                         f"{obj.__class__.__name__} object with ID {obj.id} found in backend object store with ID {id}"
                     )
                     obj.object_store_id = id
+                    if obj.id is not None:
+                        self.lookup_cache.set(obj_key, id)
                     return id
+            if obj.id is not None:
+                self.lookup_cache.set(obj_key, None, lookup_key)
         return None
 
+    def _lookup_cache_key(self, obj):
+        return (obj.__class__.__name__, obj.id)
+
 
 class HierarchicalObjectStore(NestedObjectStore):
 
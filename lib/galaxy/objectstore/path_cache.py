@@ -0,0 +1,91 @@
+"""Path resolution caches for the disk object store.
+
+:class:`DiskPathCache` remembers the absolute paths
+:meth:`~galaxy.objectstore.DiskObjectStore._construct_path` builds - they only
+depend on the object's id and the path arguments, so they never go stale - and
+which paths were recently found not to exist, so that repeated existence checks
+of missing files (most commonly the legacy, unhashed paths probed when
+``object_store_check_old_style`` is set) do not stat the file system each time.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Hashable,
+    Optional,
+)
+
+# Number of constructed paths kept per disk object store.
+DEFAULT_PATH_CACHE_SIZE = 10000
+# Number of paths remembered as missing per disk object store.
+DEFAULT_MISSING_CACHE_SIZE = 10000
+
+
+class DiskPathCache:
+    """Bounded LRU cache of constructed paths plus a TTL cache of missing paths."""
+
+    def __init__(self, max_size: int = DEFAULT_PATH_CACHE_SIZE, max_missing: int = DEFAULT_MISSING_CACHE_SIZE):
+        self.max_size = max_size
+        self.max_missing = max_missing
+        self._paths: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._missing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached path for ``key`` or None."""
+        with self._lock:
+            path = self._paths.get(key)
+            if path is not None:
+                self._paths.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return path
+
+    def set(self, key: Hashable, path: str) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._paths[key] = path
+            self._paths.move_to_end(key)
+            while len(self._paths) > self.max_size:
+                self._paths.popitem(last=False)
+
+    def is_missing(self, path: str) -> bool:
+        """Return True if ``path`` was recently found not to exist."""
+        with self._lock:
+            expires = self._missing.get(path)
+            if expires is None:
+                return False
+            if expires > time.monotonic():
+                return True
+            del self._missing[path]
+            return False
+
+    def set_missing(self, path: str, ttl: float) -> None:
+        """Remember for ``ttl`` seconds that ``path`` does not exist."""
+        if ttl <= 0 or self.max_missing <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._missing) >= self.max_missing:
+                self._missing = {p: e for p, e in self._missing.items() if e > now}
+                if len(self._missing) >= self.max_missing:
+                    self._missing.clear()
+            self._missing[path] = now + ttl
+
+    def invalidate(self, path: str) -> None:
+        """Forget that ``path`` was missing."""
+        with self._lock:
+            self._missing.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+            self._missing.clear()
+
+    def __len__(self):
+        return len(self._paths)
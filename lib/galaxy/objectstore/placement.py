@@ -0,0 +1,167 @@
+"""Backend placement and lookup helpers for the distributed object store.
+
+:class:`BackendPlacement` picks the backend new objects are created in. Each
+backend's configured weight is scaled by its live free space and by how its
+recent write throughput compares to the other backends.
+:class:`BackendLookupCache` remembers which backend holds objects that carry
+no ``object_store_id``, so that finding them does not have to probe every
+backend each time.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Union,
+)
+
+# Placement strategies understood by the distributed object store.
+PLACEMENT_WEIGHTED = "weighted"
+PLACEMENT_CAPACITY = "capacity"
+PLACEMENT_STRATEGIES = (PLACEMENT_WEIGHTED, PLACEMENT_CAPACITY)
+
+# Smoothing factor of the exponentially weighted write throughput average.
+THROUGHPUT_SMOOTHING = 0.2
+# Bounds applied to a backend's relative throughput factor so that a single
+# slow or fast sample cannot starve or flood a backend.
+MIN_THROUGHPUT_FACTOR = 0.5
+MAX_THROUGHPUT_FACTOR = 2.0
+# Writes smaller than this say more about latency than throughput.
+MIN_THROUGHPUT_SAMPLE_BYTES = 1024 * 1024
+
+DEFAULT_LOOKUP_CACHE_SIZE = 10000
+DEFAULT_NEGATIVE_LOOKUP_TTL = 60
+
+
+class BackendPlacement:
+    """Choose backends for new objects weighted by capacity and throughput.
+
+    The effective weight of a backend is ``weight * free_fraction ** 2 *
+    throughput_factor``, where ``free_fraction`` is the share of the backend
+    that is still usable below its maximum fill percentage, and
+    ``throughput_factor`` is the square root of the backend's recent write
+    rate relative to the mean rate of all backends with samples (1 until it
+    has samples). Squaring the free fraction steers writes away from fuller
+    backends quickly enough for them to fill evenly, while the square root
+    keeps throughput a secondary concern.
+    """
+
+    def __init__(self, weights: Dict[str, int], rng: Optional[random.Random] = None):
+        self.weights = dict(weights)
+        self._free_fraction: Dict[str, float] = {backend_id: 1.0 for backend_id in weights}
+        self._throughput: Dict[str, float] = {}
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def update_usage(self, backend_id: str, percent_used: float, max_percent_full: float = 0):
+        """Record how full ``backend_id`` is; ``max_percent_full`` of 0 means 100."""
+        limit = max_percent_full or 100.0
+        free_fraction = max(0.0, (limit - percent_used) / limit)
+        with self._lock:
+            self._free_fraction[backend_id] = min(free_fraction, 1.0)
+
+    def record_write(self, backend_id: str, nbytes: int, seconds: float):
+        """Record that ``nbytes`` were written to ``backend_id`` in ``seconds``."""
+        if nbytes < MIN_THROUGHPUT_SAMPLE_BYTES or seconds <= 0:
+            return
+        rate = nbytes / seconds
+        with self._lock:
+            previous = self._throughput.get(backend_id)
+            if previous is None:
+                self._throughput[backend_id] = rate
+            else:
+                self._throughput[backend_id] = previous + THROUGHPUT_SMOOTHING * (rate - previous)
+
+    def effective_weights(self, eligible: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Return the current effective weight of each eligible backend."""
+        backend_ids = self.weights.keys() if eligible is None else [i for i in eligible if i in self.weights]
+        with self._lock:
+            rates = list(self._throughput.values())
+            mean_rate = sum(rates) / len(rates) if rates else None
+            effective = {}
+            for backend_id in backend_ids:
+                factor = 1.0
+                rate = self._throughput.get(backend_id)
+                if rate is not None and mean_rate:
+                    factor = min(max((rate / mean_rate) ** 0.5, MIN_THROUGHPUT_FACTOR), MAX_THROUGHPUT_FACTOR)
+                free_fraction = self._free_fraction.get(backend_id, 1.0)
+                effective[backend_id] = self.weights[backend_id] * free_fraction**2 * factor
+        return effective
+
+    def choose(self, eligible: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Pick a backend among ``eligible`` (all backends if None), or None if there is none."""
+        effective = {k: v for k, v in self.effective_weights(eligible).items() if v > 0}
+        if not effective:
+            return None
+        backend_ids = list(effective.keys())
+        return self._rng.choices(backend_ids, weights=[effective[i] for i in backend_ids])[0]
+
+
+class BackendLookupCache:
+    """Bounded cache of object to backend resolutions.
+
+    Objects are keyed by ``obj_key`` (e.g. class name and id). A positive
+    entry (the backend an object was found in) applies to any lookup of the
+    object and is kept until evicted or invalidated. Negative entries (object
+    found in no backend) are kept per ``lookup_key`` - the extra arguments of
+    the lookup - and expire after ``negative_ttl`` seconds since the object
+    may show up later.
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_size: int = DEFAULT_LOOKUP_CACHE_SIZE, negative_ttl: float = DEFAULT_NEGATIVE_LOOKUP_TTL):
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Hashable, Union[str, Dict[Hashable, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj_key, lookup_key=None):
+        """Return the cached backend id, None for a cached miss or ``MISSING``."""
+        with self._lock:
+            entry = self._entries.get(obj_key)
+            if isinstance(entry, str):
+                self._entries.move_to_end(obj_key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                expires = entry.get(lookup_key)
+                if expires is not None:
+                    if expires > time.monotonic():
+                        self.hits += 1
+                        return None
+                    del entry[lookup_key]
+            self.misses += 1
+            return self.MISSING
+
+    def set(self, obj_key, backend_id: Optional[str], lookup_key=None):
+        """Record that the object lives in ``backend_id``, or in no backend if it is None."""
+        with self._lock:
+            if backend_id is not None:
+                self._entries[obj_key] = backend_id
+            else:
+                entry = self._entries.get(obj_key)
+                if not isinstance(entry, dict):
+                    entry = {}
+                    self._entries[obj_key] = entry
+                entry[lookup_key] = time.monotonic() + self.negative_ttl
+            self._entries.move_to_end(obj_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, obj_key):
+        with self._lock:
+            self._entries.pop(obj_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
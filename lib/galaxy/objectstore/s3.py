@@ -8,6 +8,7 @@ import shutil
 import subprocess
 import threading
 import time
+from collections import defaultdict
 from datetime import datetime
 
 try:
@@ -36,6 +37,7 @@ from .s3_multipart_upload import multipart_upload
 from ..objectstore import (
     ConcreteObjectStore,
     convert_bytes,
+    DEFAULT_DELETE_WORKERS,
 )
 
 NO_BOTO_ERROR_MESSAGE = (
@@ -43,6 +45,9 @@ NO_BOTO_ERROR_MESSAGE = (
     "Please install and properly configure boto or modify object store configuration."
 )
 
+# Maximum number of keys S3 accepts in one multi-object delete request.
+MAX_DELETE_KEYS = 1000
+
 log = logging.getLogger(__name__)
 logging.getLogger("boto").setLevel(logging.INFO)  # Otherwise boto is quite noisy
 
@@ -682,6 +687,53 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
             log.exception("%s delete error", self._get_filename(obj, **kwargs))
         return False
 
+    def delete_many(self, objs_and_kwargs, max_workers=DEFAULT_DELETE_WORKERS):
+        """Delete objects with multi-object delete requests of up to ``MAX_DELETE_KEYS`` keys.
+
+        Unlike :meth:`delete`, deleting a key that does not exist counts as
+        success. Deletes relative to a ``base_dir`` are done one by one.
+        """
+        results = [True] * len(objs_and_kwargs)
+        fallback_indexes = []
+        key_indexes = defaultdict(list)
+        for index, (obj, kwargs) in enumerate(objs_and_kwargs):
+            kwargs = dict(kwargs)
+            entire_dir = kwargs.pop("entire_dir", False)
+            if kwargs.get("base_dir"):
+                fallback_indexes.append(index)
+                continue
+            try:
+                rel_path = self._construct_path(obj, **kwargs)
+                if entire_dir and kwargs.get("extra_dir"):
+                    shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                    for key in self._bucket.list(prefix=rel_path):
+                        key_indexes[key.name].append(index)
+                else:
+                    unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                    key_indexes[rel_path].append(index)
+            except Exception as e:
+                results[index] = e
+        key_names = list(key_indexes.keys())
+        for start in range(0, len(key_names), MAX_DELETE_KEYS):
+            chunk = key_names[start : start + MAX_DELETE_KEYS]
+            try:
+                errors = [
+                    (error.key, f"{error.code}: {error.message}")
+                    for error in self._bucket.delete_keys(chunk, quiet=True).errors
+                ]
+            except S3ResponseError as e:
+                log.exception("Could not delete %d keys from S3", len(chunk))
+                errors = [(key_name, e) for key_name in chunk]
+            for key_name, error in errors:
+                log.error("Could not delete key '%s' from S3: %s", key_name, error)
+                for index in key_indexes[key_name]:
+                    results[index] = False
+        if fallback_indexes:
+            fallback_results = super().delete_many([objs_and_kwargs[i] for i in fallback_indexes], max_workers)
+            for index, result in zip(fallback_indexes, fallback_results):
+                results[index] = result
+        return results
+
     def _get_data(self, obj, start=0, count=-1, **kwargs):
         rel_path = self._construct_path(obj, **kwargs)
         # Check cache first and get file if not there
@@ -23,6 +23,7 @@ from kombu.pools import producers
 import galaxy.queues
 from galaxy import util
 from galaxy.config import reload_config_options
+from galaxy.tool_util.deps import views
 from galaxy.tools import ToolBox
 from galaxy.tools.data_manager.manager import DataManagers
 from galaxy.tools.special_tools import load_lib_tools
@@ -153,6 +154,10 @@ def reload_tool(app, **kwargs):
     log.debug(f"Executing reload tool task for {tool_id}")
     if tool_id:
         app.toolbox.reload_tool_by_id(tool_id)
+        # Workflow views embed tool forms, a full toolbox reload changes their cache key instead.
+        workflow_contents_manager = getattr(app, "workflow_contents_manager", None)
+        if workflow_contents_manager is not None:
+            workflow_contents_manager.view_cache.clear()
     else:
         log.error("Reload tool invoked without tool id.")
 
@@ -238,11 +243,28 @@ def reload_tool_data_tables(app, **kwargs):
 
 
 def rebuild_toolbox_search_index(app, **kwargs):
-    if app.is_webapp:
+    if app.builds_tool_search_index:
         if app.toolbox_search.index_count < app.toolbox._reload_count:
             app.reindex_tool_search()
     else:
-        log.debug("App is not a webapp, not building a search index")
+        log.debug("Process is not the designated tool search index builder, not building a search index")
+        if app.is_webapp:
+            app.tool_cache.reset_status()
+
+
+def invalidate_api_key_cache(app, **kwargs):
+    user_id = kwargs.get("user_id")
+    user_manager = getattr(app, "user_manager", None)
+    if user_manager is None:
+        return
+    if user_id is not None:
+        user_manager.api_key_cache.invalidate_user(user_id)
+    else:
+        user_manager.api_key_cache.clear()
+
+
+def invalidate_requirements_cache(app, **kwargs):
+    views.invalidate_requirements_cache(app)
 
 
 def reload_job_rules(app, **kwargs):
@@ -315,6 +337,8 @@ control_message_to_task = {
     "reconfigure_watcher": reconfigure_watcher,
     "reload_tour": reload_tour,
     "reload_core_config": reload_core_config,
+    "invalidate_api_key_cache": invalidate_api_key_cache,
+    "invalidate_requirements_cache": invalidate_requirements_cache,
 }
 
 
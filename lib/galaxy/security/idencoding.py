@@ -1,7 +1,12 @@
 import codecs
 import collections
 import logging
+import threading
 from typing import (
+    Any,
+    Hashable,
+    Iterable,
+    List,
     Optional,
     Union,
 )
@@ -22,6 +27,9 @@ MAXIMUM_ID_SECRET_LENGTH = int(MAXIMUM_ID_SECRET_BITS / 8)
 KIND_TOO_LONG_MESSAGE = (
     "Galaxy coding error, keep encryption 'kinds' smaller to utilize more bites of randomness from id_secret values."
 )
+# Number of encoded and decoded ids each kept in memory by an IdEncodingHelper.
+DEFAULT_ID_CACHE_SIZE = 2**16
+ENCODED_ID_BLOCK_LENGTH = 16
 
 
 class IdEncodingHelper:
@@ -33,16 +41,48 @@ class IdEncodingHelper:
         per_kind_id_secret_base = config.get("per_kind_id_secret_base", self.id_secret)
         self.id_ciphers_for_kind = _cipher_cache(per_kind_id_secret_base)
 
+        id_cache_size = config.get("id_cache_size", DEFAULT_ID_CACHE_SIZE)
+        self._encoded_id_cache = _LRUCache(id_cache_size)
+        self._decoded_id_cache = _LRUCache(id_cache_size)
+
     def encode_id(self, obj_id, kind=None):
         if obj_id is None:
             raise galaxy.exceptions.MalformedId("Attempted to encode None id")
-        id_cipher = self.__id_cipher(kind)
-        # Convert to bytes
-        s = smart_str(obj_id)
-        # Pad to a multiple of 8 with leading "!"
-        s = (b"!" * (8 - len(s) % 8)) + s
-        # Encrypt
-        return unicodify(codecs.encode(id_cipher.encrypt(s), "hex"))
+        # the type is part of the key as e.g. True == 1 but they are encoded differently
+        key = (kind, type(obj_id), obj_id)
+        encoded_id = self._encoded_id_cache.get(key)
+        if encoded_id is None:
+            id_cipher = self.__id_cipher(kind)
+            # Encrypt
+            encoded_id = id_cipher.encrypt(_pad_id(obj_id)).hex()
+            self._encoded_id_cache.put(key, encoded_id)
+        return encoded_id
+
+    def encode_ids(self, obj_ids: Iterable[Any], kind=None) -> List[str]:
+        """
+        Encode many ids at once, ids not found in the cache are encrypted in
+        a single cipher operation.
+        """
+        keys = [(kind, type(obj_id), obj_id) for obj_id in obj_ids]
+        encoded_ids = self._encoded_id_cache.get_many(keys)
+        missing = [i for i, encoded_id in enumerate(encoded_ids) if encoded_id is None]
+        if missing:
+            padded_ids = []
+            for i in missing:
+                obj_id = keys[i][2]
+                if obj_id is None:
+                    raise galaxy.exceptions.MalformedId("Attempted to encode None id")
+                padded_ids.append(_pad_id(obj_id))
+            # ECB mode encrypts each 8 byte block independently, so the concatenated
+            # ids can be encrypted at once and split up again afterwards.
+            encrypted = self.__id_cipher(kind).encrypt(b"".join(padded_ids)).hex()
+            start = 0
+            for i, padded_id in zip(missing, padded_ids):
+                end = start + 2 * len(padded_id)
+                encoded_ids[i] = encrypted[start:end]
+                start = end
+            self._encoded_id_cache.put_many((keys[i], encoded_ids[i]) for i in missing)
+        return encoded_ids
 
     def encode_dict_ids(self, a_dict, kind=None, skip_startswith=None):
         """
@@ -61,33 +101,62 @@ class IdEncodingHelper:
         with '_id' excluding `tool_id` which are consumed and produced as is
         via the API.
         """
+        if not isinstance(rval, dict):
+            return rval
+        # Collect the ids to encode first, so that they can be encoded in one batch.
+        targets: List[tuple] = []
+        self.__collect_all_ids(rval, recursive, targets)
+        if targets:
+            try:
+                encoded_ids = self.encode_ids([obj_id for _, _, obj_id in targets])
+            except Exception:
+                encoded_ids = []
+                for _, _, obj_id in targets:
+                    try:
+                        encoded_ids.append(self.encode_id(obj_id))
+                    except Exception:
+                        encoded_ids.append(obj_id)  # probably already encoded
+            for (container, key, _), encoded_id in zip(targets, encoded_ids):
+                container[key] = encoded_id
+        return rval
+
+    def __collect_all_ids(self, rval, recursive, targets):
         if not isinstance(rval, dict):
             return rval
         for k, v in rval.items():
             if (k == "id" or k.endswith("_id")) and v is not None and k not in ["tool_id", "external_id"]:
-                try:
-                    rval[k] = self.encode_id(v)
-                except Exception:
-                    pass  # probably already encoded
+                if isinstance(v, (int, str)):
+                    targets.append((rval, k, v))
+                else:
+                    try:
+                        rval[k] = self.encode_id(v)
+                    except Exception:
+                        pass  # probably already encoded
             if k.endswith("_ids") and isinstance(v, list):
-                try:
-                    o = []
-                    for i in v:
-                        o.append(self.encode_id(i))
+                if all(isinstance(i, (int, str)) for i in v):
+                    o = list(v)
+                    targets.extend((o, index, i) for index, i in enumerate(o))
                     rval[k] = o
-                except Exception:
-                    pass
+                else:
+                    try:
+                        rval[k] = [self.encode_id(i) for i in v]
+                    except Exception:
+                        pass
             else:
                 if recursive and isinstance(v, dict):
-                    rval[k] = self.encode_all_ids(v, recursive)
+                    rval[k] = self.__collect_all_ids(v, recursive, targets)
                 elif recursive and isinstance(v, list):
-                    rval[k] = [self.encode_all_ids(el, True) for el in v]
+                    rval[k] = [self.__collect_all_ids(el, True, targets) for el in v]
         return rval
 
     def decode_id(self, obj_id, kind=None, object_name: Optional[str] = None):
+        key = (kind, obj_id)
+        decoded_id = self._decoded_id_cache.get(key)
+        if decoded_id is not None:
+            return decoded_id
         try:
             id_cipher = self.__id_cipher(kind)
-            return int(unicodify(id_cipher.decrypt(codecs.decode(obj_id, "hex"))).lstrip("!"))
+            decoded_id = int(unicodify(id_cipher.decrypt(codecs.decode(obj_id, "hex"))).lstrip("!"))
         except TypeError:
             raise galaxy.exceptions.MalformedId(
                 f"Malformed {object_name if object_name is not None else ''} id ( {obj_id} ) specified, unable to decode."
@@ -96,6 +165,35 @@ class IdEncodingHelper:
             raise galaxy.exceptions.MalformedId(
                 f"Wrong {object_name if object_name is not None else ''} id ( {obj_id} ) specified, unable to decode."
             )
+        self._decoded_id_cache.put(key, decoded_id)
+        return decoded_id
+
+    def decode_ids(self, obj_ids: Iterable[Any], kind=None, object_name: Optional[str] = None) -> List[int]:
+        """
+        Decode many ids at once, ids not found in the cache are decrypted in
+        a single cipher operation.
+        """
+        obj_ids = list(obj_ids)
+        if not all(
+            isinstance(obj_id, str) and obj_id and not len(obj_id) % ENCODED_ID_BLOCK_LENGTH for obj_id in obj_ids
+        ):
+            # Let decode_id report the malformed id(s).
+            return [self.decode_id(obj_id, kind=kind, object_name=object_name) for obj_id in obj_ids]
+        keys = [(kind, obj_id) for obj_id in obj_ids]
+        decoded_ids = self._decoded_id_cache.get_many(keys)
+        missing = [i for i, decoded_id in enumerate(decoded_ids) if decoded_id is None]
+        if missing:
+            try:
+                decrypted = self.__id_cipher(kind).decrypt(codecs.decode("".join(obj_ids[i] for i in missing), "hex"))
+                start = 0
+                for i in missing:
+                    end = start + len(obj_ids[i]) // 2
+                    decoded_ids[i] = int(unicodify(decrypted[start:end]).lstrip("!"))
+                    start = end
+            except (TypeError, ValueError):
+                return [self.decode_id(obj_id, kind=kind, object_name=object_name) for obj_id in obj_ids]
+            self._decoded_id_cache.put_many((keys[i], decoded_ids[i]) for i in missing)
+        return decoded_ids
 
     def encode_guid(self, session_key):
         # Session keys are strings
@@ -137,7 +235,64 @@ class _cipher_cache(collections.defaultdict):
     def __missing__(self, key):
         assert len(key) < 15, KIND_TOO_LONG_MESSAGE
         secret = f"{self.secret_base}__{key}"
-        return Blowfish.new(_last_bits(secret), mode=Blowfish.MODE_ECB)
+        cipher = Blowfish.new(_last_bits(secret), mode=Blowfish.MODE_ECB)
+        # Setting up the key schedule is expensive, keep the cipher around.
+        self[key] = cipher
+        return cipher
+
+
+class _LRUCache:
+    """A small thread-safe LRU mapping, values must not be None."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "collections.OrderedDict[Hashable, Any]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[Hashable]) -> List[Any]:
+        values = []
+        with self._lock:
+            items = self._items
+            for key in keys:
+                try:
+                    value = items.get(key)
+                except TypeError:
+                    # unhashable, never cached
+                    value = None
+                if value is not None:
+                    items.move_to_end(key)
+                values.append(value)
+        return values
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, key_values: Iterable[tuple]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            items = self._items
+            for key, value in key_values:
+                try:
+                    items[key] = value
+                except TypeError:
+                    continue
+                items.move_to_end(key)
+            while len(items) > self.max_size:
+                items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _pad_id(obj_id) -> bytes:
+    # Convert to bytes
+    s = smart_str(obj_id)
+    # Pad to a multiple of 8 with leading "!"
+    return (b"!" * (8 - len(s) % 8)) + s
 
 
 def _last_bits(secret):
@@ -3,6 +3,10 @@ import os
 import shutil
 
 from galaxy.util import safe_makedirs
+from galaxy.util.staging import (
+    stage_file,
+    stage_tree,
+)
 from .cwltool_deps import ref_resolver
 from .parser import (
     JOB_JSON_FILE,
@@ -37,7 +41,7 @@ class PathFileDescription:
 
     def write_to(self, destination):
         # TODO: Move if we can be sure this is in the working directory for instance...
-        shutil.copy(self.path, destination)
+        stage_file(self.path, destination)
 
 
 class PathDirectoryDescription:
@@ -45,7 +49,7 @@ class PathDirectoryDescription:
         self.path = path
 
     def write_to(self, destination):
-        shutil.copytree(self.path, destination)
+        stage_tree(self.path, destination)
 
 
 class LiteralFileDescription:
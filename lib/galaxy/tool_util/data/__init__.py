@@ -23,6 +23,7 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     Type,
     Union,
 )
@@ -39,6 +40,12 @@ from ._schema import (
     ToolDataEntry,
     ToolDataEntryList,
 )
+from .columnar import (
+    ColumnarFields,
+    SIDECAR_SUFFIX,
+    source_key,
+    ToolDataFields,
+)
 
 log = logging.getLogger(__name__)
 
@@ -211,6 +218,8 @@ class TabularToolDataTable(ToolDataTable):
     dict_export_visible_keys = ["name", "data", "largest_index", "columns", "missing_index_file"]
 
     type_key = "tabular"
+    # whether parsed files may be stored in columnar sidecar files (see tool_data_table_columnar_cache)
+    columnar_cache_supported = True
 
     def __init__(
         self,
@@ -318,7 +327,7 @@ class TabularToolDataTable(ToolDataTable):
 
             errors: List[str] = []
             if found:
-                self.extend_data_with(filename, errors=errors)
+                self.extend_data_with(filename, errors=errors, allow_sidecar=tmp_file is None)
                 self._update_version()
             else:
                 self.missing_index_file = filename
@@ -366,6 +375,7 @@ class TabularToolDataTable(ToolDataTable):
             )
             self.allow_duplicate_entries = False
             self._deduplicate_data()
+            self._update_version()
         # add data entries and return current data table version
         return self.add_entries(
             other_table.data, allow_duplicates=allow_duplicates, persist=persist, entry_source=entry_source, **kwd
@@ -374,6 +384,7 @@ class TabularToolDataTable(ToolDataTable):
     def handle_found_index_file(self, filename):
         self.missing_index_file = None
         self.extend_data_with(filename)
+        self._update_version()
 
     def get_fields(self):
         return self.data
@@ -437,12 +448,41 @@ class TabularToolDataTable(ToolDataTable):
         if "name" not in self.columns:
             self.columns["name"] = self.columns["value"]
 
-    def extend_data_with(self, filename, errors=None):
+    def extend_data_with(self, filename, errors=None, allow_sidecar=True):
         here = os.path.dirname(os.path.abspath(filename))
-        self.data.extend(self.parse_file_fields(filename, errors=errors, here=here))
+        if allow_sidecar and self.use_columnar_cache:
+            self._extend_data_with_sidecar(filename, errors=errors, here=here)
+        else:
+            self.data.extend(self.parse_file_fields(filename, errors=errors, here=here))
         if not self.allow_duplicate_entries:
             self._deduplicate_data()
 
+    @property
+    def use_columnar_cache(self):
+        return self.columnar_cache_supported and util.asbool(
+            self.other_config_dict.get("tool_data_table_columnar_cache", False)
+        )
+
+    def _extend_data_with_sidecar(self, filename, errors=None, here="__HERE__"):
+        """
+        Add the fields of ``filename`` from a memory mapped columnar sidecar
+        file, which is (re)built from the parsed file if it is missing or the
+        file changed.
+        """
+
+        def parse():
+            parse_errors: List[str] = []
+            rows = self.parse_file_fields(filename, errors=parse_errors, here=here)
+            return rows, {"errors": parse_errors}
+
+        key = source_key(filename, self.separator, self.comment_char, self.largest_index, here)
+        fields = ColumnarFields.load(f"{filename}{SIDECAR_SUFFIX}", key, parse)
+        if errors is not None:
+            errors.extend(fields.metadata.get("errors", []))
+        if not isinstance(self.data, ToolDataFields):
+            self.data = ToolDataFields(self.data)
+        self.data.add_segment(fields)
+
     def parse_file_fields(self, filename, errors: Optional[List[str]] = None, here="__HERE__"):
         """
         Parse separated lines from file and return a list of tuples.
@@ -510,17 +550,21 @@ class TabularToolDataTable(ToolDataTable):
                 return default
         rval = []
         # Look for table entry.
-        for fields in self.get_fields():
-            if fields[query_col] == query_val:
-                if return_attr is None:
-                    field_dict = {}
-                    for i, col_name in enumerate(self.get_column_name_list()):
-                        field_dict[col_name or i] = fields[i]
-                    rval.append(field_dict)
-                else:
-                    rval.append(fields[return_col])
-                if limit is not None and len(rval) == limit:
-                    break
+        all_fields = self.get_fields()
+        if isinstance(all_fields, ToolDataFields):
+            matching_fields = all_fields.find(query_col, query_val)
+        else:
+            matching_fields = (fields for fields in all_fields if fields[query_col] == query_val)
+        for fields in matching_fields:
+            if return_attr is None:
+                field_dict = {}
+                for i, col_name in enumerate(self.get_column_name_list()):
+                    field_dict[col_name or i] = fields[i]
+                rval.append(field_dict)
+            else:
+                rval.append(fields[return_col])
+            if limit is not None and len(rval) == limit:
+                break
         return rval or default
 
     def get_filename_for_source(self, source, default=None):
@@ -681,7 +725,9 @@ class TabularToolDataTable(ToolDataTable):
         rval = super().to_dict(view=view)
         if view == "element":
             rval["columns"] = sorted(self.columns.keys(), key=lambda x: self.columns[x])
-            rval["fields"] = self.get_fields()
+            rval["fields"] = list(self.get_fields())
+        elif view == "export":
+            rval["data"] = list(self.data)
         return rval
 
 
@@ -752,6 +798,7 @@ class ToolDataTableManager(Dictifiable):
 
     data_tables: Dict[str, "ToolDataTable"]
     tool_data_table_types = {cls.type_key: cls for cls in tool_data_table_types_list}
+    _json_cache: Optional[Tuple[Tuple[Tuple[str, int, int], ...], str]] = None
 
     def __init__(
         self,
@@ -800,9 +847,21 @@ class ToolDataTableManager(Dictifiable):
     def to_dict(self, view: str = "collection", value_mapper=None):
         return {name: data_table.to_dict(view="export") for name, data_table in self.data_tables.items()}
 
+    def content_versions(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Return a value that changes whenever a table is replaced or its content changes."""
+        return tuple(
+            (name, id(data_table), data_table._loaded_content_version) for name, data_table in self.data_tables.items()
+        )
+
     def to_json(self, path: Union[str, os.PathLike]) -> None:
+        # Written for every job setting metadata remotely, reuse the serialized
+        # tables as long as none of them has been replaced or changed.
+        versions = self.content_versions()
+        json_cache = self._json_cache
+        if json_cache is None or json_cache[0] != versions:
+            json_cache = self._json_cache = (versions, json.dumps(self.to_dict()))
         with open(path, "w") as out:
-            out.write(json.dumps(self.to_dict()))
+            out.write(json_cache[1])
 
     def load_from_config_file(
         self, config_filename: ConfigFilesT, tool_data_path: Union[str, os.PathLike], from_shed_config: bool = False
@@ -0,0 +1,316 @@
+"""
+Compact, memory mapped storage for the fields of tabular tool data tables.
+
+Keeping every line of a large ``.loc`` file as a list of Python strings costs
+hundreds of bytes per field in every Galaxy process. :class:`ColumnarFields`
+instead stores the parsed fields of one file in a binary sidecar file next to
+it - interned strings in one UTF-8 blob, with arrays of string offsets, of the
+string ids of every field and of the first field of every row. The sidecar is
+memory mapped, so its pages are shared between all processes reading the same
+table, and it is only rebuilt if the source file (or the way it is parsed)
+changes. Rows are decoded into lists of strings on access.
+
+:class:`ToolDataFields` is the list-like container a table keeps its fields
+in; it chains read-only columnar segments with plain lists holding entries
+added at runtime.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import (
+    MutableSequence,
+    Sequence,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+log = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".columnar"
+FORMAT_VERSION = 1
+MAGIC = b"GXTDTC01"
+# magic, source key, row count, field count, string count, blob length, metadata length
+HEADER = struct.Struct("=8s20sQQQQQ")
+ALIGNMENT = 8
+
+
+def source_key(filename: str, *parse_parameters: Any) -> bytes:
+    """Return the key identifying the content of ``filename`` parsed with ``parse_parameters``."""
+    stat = os.stat(filename)
+    parts = [
+        FORMAT_VERSION,
+        os.path.realpath(filename),
+        stat.st_size,
+        stat.st_mtime_ns,
+        sys.byteorder,
+        *parse_parameters,
+    ]
+    return hashlib.sha1(json.dumps(parts, default=str).encode("utf-8")).digest()
+
+
+def _padding(length: int) -> bytes:
+    return b"\0" * (-length % ALIGNMENT)
+
+
+class ColumnarFields(Sequence):
+    """Read-only sequence of rows (lists of strings) backed by a columnar buffer."""
+
+    def __init__(self, buffer, metadata: Optional[Dict[str, Any]] = None):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        _, _, row_count, field_count, string_count, blob_length, metadata_length = HEADER.unpack_from(view)
+        offset = HEADER.size
+        self._row_offsets = view[offset : offset + (row_count + 1) * 8].cast("Q")
+        offset += (row_count + 1) * 8
+        self._fields = view[offset : offset + field_count * 4].cast("I")
+        offset += field_count * 4
+        offset += -offset % ALIGNMENT
+        self._string_offsets = view[offset : offset + (string_count + 1) * 8].cast("Q")
+        offset += (string_count + 1) * 8
+        self._blob_offset = offset
+        self._blob = view[offset : offset + blob_length]
+        offset += blob_length
+        if metadata is None:
+            metadata = json.loads(bytes(view[offset : offset + metadata_length]) or b"{}")
+        self.metadata = metadata
+        self._row_count = row_count
+
+    @staticmethod
+    def serialize(rows: List[List[str]], key: bytes = b"\0" * 20, metadata: Optional[Dict[str, Any]] = None) -> bytes:
+        """Return the columnar representation of ``rows``, interning identical strings."""
+        string_ids: Dict[str, int] = {}
+        encoded: List[bytes] = []
+        row_offsets = array("Q", [0])
+        fields = array("I")
+        for row in rows:
+            for field in row:
+                string_id = string_ids.get(field)
+                if string_id is None:
+                    string_id = string_ids[field] = len(encoded)
+                    encoded.append(field.encode("utf-8", "surrogateescape"))
+                fields.append(string_id)
+            row_offsets.append(len(fields))
+        string_offsets = array("Q", [0])
+        for value in encoded:
+            string_offsets.append(string_offsets[-1] + len(value))
+        blob = b"".join(encoded)
+        metadata_bytes = json.dumps(metadata or {}).encode("utf-8")
+        fields_bytes = fields.tobytes()
+        return b"".join(
+            (
+                HEADER.pack(
+                    MAGIC, key, len(row_offsets) - 1, len(fields), len(encoded), len(blob), len(metadata_bytes)
+                ),
+                row_offsets.tobytes(),
+                fields_bytes,
+                _padding(HEADER.size + len(fields_bytes)),
+                string_offsets.tobytes(),
+                blob,
+                metadata_bytes,
+            )
+        )
+
+    @classmethod
+    def from_rows(cls, rows: List[List[str]], metadata: Optional[Dict[str, Any]] = None) -> "ColumnarFields":
+        return cls(cls.serialize(rows, metadata=metadata), metadata=metadata)
+
+    @classmethod
+    def load(
+        cls, sidecar_path: str, key: bytes, build: Callable[[], Tuple[List[List[str]], Dict[str, Any]]]
+    ) -> "ColumnarFields":
+        """Memory map ``sidecar_path`` if it was built for ``key``, otherwise (re)build it.
+
+        ``build`` returns the parsed rows and metadata to store. If the sidecar
+        cannot be written, the columnar representation is kept in memory.
+        """
+        columnar = cls._open(sidecar_path, key)
+        if columnar is not None:
+            return columnar
+        rows, metadata = build()
+        content = cls.serialize(rows, key=key, metadata=metadata)
+        tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(content)
+            os.replace(tmp_path, sidecar_path)
+        except OSError as e:
+            log.debug("Could not write tool data table sidecar '%s', keeping it in memory: %s", sidecar_path, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return cls(content, metadata=metadata)
+        return cls._open(sidecar_path, key) or cls(content, metadata=metadata)
+
+    @classmethod
+    def _open(cls, sidecar_path: str, key: bytes) -> Optional["ColumnarFields"]:
+        try:
+            with open(sidecar_path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size < HEADER.size:
+                    return None
+                buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        magic, sidecar_key = HEADER.unpack_from(buffer)[:2]
+        if magic != MAGIC or sidecar_key != key:
+            buffer.close()
+            return None
+        return cls(buffer)
+
+    def _string(self, string_id: int) -> str:
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._blob[start:end]).decode("utf-8", "surrogateescape")
+
+    def _string_id(self, value: str) -> Optional[int]:
+        """Return the id of the interned string ``value``, or None if no field has this value."""
+        encoded = value.encode("utf-8", "surrogateescape")
+        offsets = self._string_offsets
+        string_count = len(offsets) - 1
+        if not encoded:
+            for string_id in range(string_count):
+                if offsets[string_id] == offsets[string_id + 1]:
+                    return string_id
+            return None
+        blob_end = self._blob_offset + len(self._blob)
+        position = self._buffer.find(encoded, self._blob_offset, blob_end)
+        while position != -1:
+            start = position - self._blob_offset
+            # the id of the string starting at or before start
+            string_id = bisect_right(offsets, start) - 1
+            if offsets[string_id] == start:
+                # skip empty strings sharing the offset
+                while string_id < string_count and offsets[string_id + 1] == start:
+                    string_id += 1
+                if string_id < string_count and offsets[string_id + 1] - start == len(encoded):
+                    return string_id
+            position = self._buffer.find(encoded, position + 1, blob_end)
+        return None
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._row_count))]
+        if index < 0:
+            index += self._row_count
+        if not 0 <= index < self._row_count:
+            raise IndexError("row index out of range")
+        fields = self._fields
+        return [self._string(fields[i]) for i in range(self._row_offsets[index], self._row_offsets[index + 1])]
+
+    def find(self, column: int, value: str) -> Iterator[List[str]]:
+        """Yield the rows whose field ``column`` is ``value`` without decoding the other rows."""
+        string_id = self._string_id(value)
+        if string_id is None:
+            return
+        row_offsets = self._row_offsets
+        fields = self._fields
+        for index in range(self._row_count):
+            start = row_offsets[index]
+            if start + column < row_offsets[index + 1] and fields[start + column] == string_id:
+                yield self[index]
+
+
+class ToolDataFields(MutableSequence):
+    """List of the fields of a tool data table, chaining read-only columnar segments with plain lists."""
+
+    def __init__(self, rows=None):
+        self._segments: List[Any] = []
+        if rows:
+            self._segments.append(list(rows))
+
+    def add_segment(self, rows) -> None:
+        """Add ``rows`` (e.g. a :class:`ColumnarFields`) without copying them."""
+        self._segments.append(rows)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for segment_index, segment in enumerate(self._segments):
+                if index < len(segment):
+                    return segment_index, index
+                index -= len(segment)
+        raise IndexError("list index out of range")
+
+    def _writable_segment(self, segment_index: int) -> List[List[str]]:
+        segment = self._segments[segment_index]
+        if not isinstance(segment, list):
+            segment = self._segments[segment_index] = list(segment)
+        return segment
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self._segments)
+
+    def __iter__(self):
+        for segment in self._segments:
+            yield from segment
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        segment_index, index = self._locate(index)
+        return self._segments[segment_index][index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            rows = list(self)
+            rows[index] = value
+            self._segments = [rows]
+            return
+        segment_index, index = self._locate(index)
+        self._writable_segment(segment_index)[index] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            rows = list(self)
+            del rows[index]
+            self._segments = [rows]
+            return
+        segment_index, index = self._locate(index)
+        del self._writable_segment(segment_index)[index]
+
+    def insert(self, index: int, value) -> None:
+        if index >= len(self) or not self._segments:
+            if not self._segments or not isinstance(self._segments[-1], list):
+                self._segments.append([])
+            self._segments[-1].append(value)
+            return
+        segment_index, index = self._locate(max(index, -len(self)))
+        self._writable_segment(segment_index).insert(index, value)
+
+    def find(self, column: int, value: str) -> Iterator[List[str]]:
+        """Yield the rows whose field ``column`` is ``value``."""
+        for segment in self._segments:
+            if isinstance(segment, ColumnarFields):
+                yield from segment.find(column, value)
+            else:
+                for fields in segment:
+                    if fields[column] == value:
+                        yield fields
+
+    def __reduce__(self):
+        # copies and pickles hold plain lists, memory maps cannot be shared that way
+        return (ToolDataFields, (list(self),))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ToolDataFields)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ToolDataFields({list(self)!r})"
@@ -27,6 +27,11 @@ from .requirements import (
     ToolRequirement,
     ToolRequirements,
 )
+from .requirements_cache import (
+    DEFAULT_REQUIREMENTS_RESOLUTION_CACHE_SIZE,
+    requirements_cache_key,
+    RequirementsResolutionCache,
+)
 from .resolvers import (
     ContainerDependency,
     NullDependency,
@@ -39,6 +44,15 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 CONFIG_VAL_NOT_FOUND = object()
+# Keyword arguments of dependency_shell_commands() that memoized resolutions may differ in.
+MEMOIZED_SHELL_COMMANDS_KWDS = {
+    "installed_tool_dependencies",
+    "tool_dir",
+    "job_directory",
+    "preserve_python_environment",
+    "metadata",
+    "tool_instance",
+}
 
 
 def build_dependency_manager(
@@ -146,6 +160,20 @@ class DependencyManager:
         self.dependency_resolvers = self.__parse_resolver_conf_plugins(plugin_source)
         self._enabled_container_types: List[str] = []
         self._destination_for_container_type: Dict[str, Dict[str, "JobDestination"]] = {}
+        self.requirements_cache = RequirementsResolutionCache(
+            int(self.get_app_option("requirements_resolution_cache_size", DEFAULT_REQUIREMENTS_RESOLUTION_CACHE_SIZE)),
+            watch_paths=[self.default_base_path],
+        )
+        # Package directories below these are watched as well, as new versions are installed into them.
+        self._package_base_paths = {self.default_base_path}
+        for resolver in self.dependency_resolvers:
+            conda_context = getattr(resolver, "conda_context", None)
+            if conda_context is not None:
+                self.requirements_cache.watch(conda_context.envs_path)
+            base_path = getattr(resolver, "base_path", None)
+            if isinstance(base_path, str):
+                self._package_base_paths.add(base_path)
+                self.requirements_cache.watch(base_path)
 
     def set_enabled_container_types(self, container_types_to_destinations):
         """Set the union of all enabled container types."""
@@ -196,7 +224,56 @@ class DependencyManager:
         return string_as_bool(self.get_app_option("precache_dependencies", True))
 
     def dependency_shell_commands(self, requirements: ToolRequirements, **kwds: Any) -> List[str]:
-        requirements_to_dependencies = self.requirements_to_dependencies(requirements, **kwds)
+        """Return the commands activating the dependencies of ``requirements``.
+
+        Outcomes are memoized per requirement set in ``requirements_cache``,
+        unless a requirement could not be resolved or the commands refer to
+        the job directory.
+        """
+        if not set(kwds).issubset(MEMOIZED_SHELL_COMMANDS_KWDS):
+            return self._dependency_shell_commands(requirements, **kwds)
+        tool = kwds.get("tool_instance")
+        job_directory = kwds.get("job_directory")
+
+        def resolve():
+            requirements_to_dependencies = self.requirements_to_dependencies(requirements, **kwds)
+            resolved_all = len(requirements_to_dependencies) == len(requirements.resolvable) and not any(
+                isinstance(dependency, NullDependency) for dependency in requirements_to_dependencies.values()
+            )
+            commands = self._shell_commands(requirements_to_dependencies)
+            return commands, getattr(tool, "dependencies", None), resolved_all
+
+        def cacheable(resolved):
+            commands, _, resolved_all = resolved
+            if not resolved_all:
+                return False
+            return not job_directory or not any(job_directory in command for command in commands)
+
+        if self.requirements_cache.enabled:
+            for requirement in requirements:
+                if requirement.type == "package" and requirement.name:
+                    for base_path in self._package_base_paths:
+                        self.requirements_cache.watch(os.path.join(base_path, requirement.name))
+
+        key = requirements_cache_key(
+            [r.to_dict() for r in requirements],
+            [[d.id, d.name, d.version, d.type, d.status] for d in (kwds.get("installed_tool_dependencies") or [])],
+            kwds.get("tool_dir"),
+            kwds.get("preserve_python_environment"),
+            kwds.get("metadata"),
+            tool and [tool.id, tool.version, [c.to_dict() for c in tool.containers]],
+            self.enabled_container_types,
+        )
+        commands, dependencies, _ = self.requirements_cache.get(key, resolve, cacheable=cacheable)
+        if tool is not None and dependencies is not None:
+            tool.dependencies = dependencies
+        return list(commands)
+
+    def _dependency_shell_commands(self, requirements: ToolRequirements, **kwds: Any) -> List[str]:
+        return self._shell_commands(self.requirements_to_dependencies(requirements, **kwds))
+
+    @staticmethod
+    def _shell_commands(requirements_to_dependencies) -> List[str]:
         ordered_dependencies = OrderedSet(requirements_to_dependencies.values())
         return [
             dependency.shell_commands()
@@ -406,7 +483,7 @@ class CachedDependencyManager(DependencyManager):
                 return
         [dep.build_cache(hashed_dependencies_dir) for dep in cacheable_dependencies]
 
-    def dependency_shell_commands(self, requirements, **kwds):
+    def _dependency_shell_commands(self, requirements, **kwds):
         """
         Runs a set of requirements through the dependency resolvers and returns
         a list of commands required to activate the dependencies. If dependencies
@@ -459,6 +536,7 @@ class NullDependencyManager(DependencyManager):
         self._enabled_container_types = []
         self._destination_for_container_type = {}
         self.default_base_path = None
+        self.requirements_cache = RequirementsResolutionCache(0)
 
     def uses_tool_shed_dependencies(self):
         return False
@@ -33,6 +33,10 @@ from .container_resolvers.mulled import (
     MulledSingularityContainerResolver,
 )
 from .requirements import ContainerDescription
+from .requirements_cache import (
+    RequirementsResolutionCache,
+    tool_info_cache_key,
+)
 
 if TYPE_CHECKING:
     from beaker.cache import Cache
@@ -54,10 +58,15 @@ ResolvedContainerDescription = collections.namedtuple(
 
 
 class ContainerFinder:
-    def __init__(self, app_info, mulled_resolution_cache=None):
+    def __init__(self, app_info, mulled_resolution_cache=None, requirements_cache=None):
         self.app_info = app_info
         self.mulled_resolution_cache = mulled_resolution_cache
-        self.default_container_registry = ContainerRegistry(app_info, mulled_resolution_cache=mulled_resolution_cache)
+        self.requirements_cache = requirements_cache
+        if requirements_cache is not None:
+            requirements_cache.watch(getattr(app_info, "container_image_cache_path", None))
+        self.default_container_registry = ContainerRegistry(
+            app_info, mulled_resolution_cache=mulled_resolution_cache, requirements_cache=requirements_cache
+        )
         self.destination_container_registeries = {}
 
     def _enabled_container_types(self, destination_info):
@@ -84,6 +93,7 @@ class ContainerFinder:
                     self.app_info,
                     destination_info=destination_info,
                     mulled_resolution_cache=self.mulled_resolution_cache,
+                    requirements_cache=self.requirements_cache,
                 )
                 self.destination_container_registeries[destination_id] = destination_container_registry
         elif not destination_id and "container_resolvers" in destination_info:
@@ -170,6 +180,11 @@ class ContainerFinder:
     def resolution_cache(self):
         return self.default_container_registry.get_resolution_cache()
 
+    def invalidate_requirements_cache(self):
+        """Forget memoized container resolutions, e.g. after new images have been installed."""
+        if self.requirements_cache is not None:
+            self.requirements_cache.invalidate()
+
     def __overridden_container_id(self, container_type, destination_info):
         if not self.__container_type_enabled(container_type, destination_info):
             return None
@@ -238,12 +253,23 @@ class ContainerRegistry:
         app_info: "AppInfo",
         destination_info: Optional[Dict[str, Any]] = None,
         mulled_resolution_cache: Optional["Cache"] = None,
+        requirements_cache: Optional[RequirementsResolutionCache] = None,
     ) -> None:
         self.resolver_classes = self.__resolvers_dict()
         self.enable_mulled_containers = app_info.enable_mulled_containers
         self.app_info = app_info
         self.container_resolvers = self.__build_container_resolvers(app_info, destination_info)
         self.mulled_resolution_cache = mulled_resolution_cache
+        # Registries built for destinations without an id are not reused, so only memoize for
+        # the default registry and registries of identified destinations.
+        self.destination_id = (destination_info or {}).get("id")
+        if destination_info is not None and not self.destination_id:
+            requirements_cache = None
+        self.requirements_cache = requirements_cache
+        if requirements_cache is not None:
+            for container_resolver in self.container_resolvers:
+                cache_directory = getattr(container_resolver, "cache_directory", None)
+                requirements_cache.watch(getattr(cache_directory, "path", None))
 
     def __build_container_resolvers(self, app_info, destination_info):
         app_conf_file = getattr(app_info, "container_resolvers_config_file", None)
@@ -316,12 +342,24 @@ class ContainerRegistry:
         self, enabled_container_types: List[str], tool_info: "ToolInfo", **kwds: Any
     ) -> Optional[ContainerDescription]:
         """Yield best container description of supplied types matching tool info."""
-        try:
-            resolved_container_description = self.resolve(enabled_container_types, tool_info, **kwds)
-        except Exception:
-            log.exception("Could not get container description for tool '%s'", tool_info.tool_id)
-            return None
-        return None if resolved_container_description is None else resolved_container_description.container_description
+        failed = []
+
+        def find_best():
+            try:
+                resolved_container_description = self.resolve(enabled_container_types, tool_info, **kwds)
+            except Exception:
+                log.exception("Could not get container description for tool '%s'", tool_info.tool_id)
+                failed.append(True)
+                return None
+            if resolved_container_description is None:
+                return None
+            return resolved_container_description.container_description
+
+        if self.requirements_cache is None or kwds:
+            return find_best()
+        key = tool_info_cache_key(tool_info, sorted(enabled_container_types), self.destination_id)
+        # Not finding a container isn't remembered, the image may be pulled or built at any time.
+        return self.requirements_cache.get(key, find_best, cacheable=lambda found: not failed and found is not None)
 
     def resolve(
         self,
@@ -0,0 +1,139 @@
+"""Per process memoization of container and dependency resolution for recurring requirement sets.
+
+Resolving the containers or dependencies of a job walks the full resolver
+chain, and mulled resolvers may shell out to ``docker images``, list the
+singularity image cache or query conda environments. The same tool
+requirements recur for most jobs, so :class:`RequirementsResolutionCache`
+remembers the outcome per requirement set (and container types and
+destination) until it is invalidated explicitly - e.g. after images have been
+pulled or an admin installed dependencies - or until the modification time of
+one of the watched directories (image caches, conda environments, package
+directories) changes. Resolutions that found nothing are not remembered.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_REQUIREMENTS_RESOLUTION_CACHE_SIZE = 1000
+
+T = TypeVar("T")
+
+
+def requirements_cache_key(*parts: Any) -> str:
+    """Return a stable hash of JSON serializable ``parts`` describing a resolution request."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def tool_info_cache_key(tool_info, *parts: Any) -> str:
+    """Return the cache key of resolving containers for a :class:`galaxy.tool_util.deps.dependencies.ToolInfo`."""
+    return requirements_cache_key(
+        [r.to_dict() for r in tool_info.requirements],
+        [c.to_dict() for c in tool_info.container_descriptions],
+        tool_info.requires_galaxy_python_environment,
+        tool_info.tool_id,
+        tool_info.tool_version,
+        *parts,
+    )
+
+
+class RequirementsResolutionCache:
+    """Thread safe LRU cache of resolution outcomes keyed by :func:`requirements_cache_key`.
+
+    A ``max_size`` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_REQUIREMENTS_RESOLUTION_CACHE_SIZE, watch_paths: Iterable[str] = ()):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._watched: Dict[str, Optional[float]] = {}
+        for path in watch_paths:
+            self.watch(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def watch(self, path: Optional[str]) -> None:
+        """Invalidate the cache whenever the modification time of directory ``path`` changes."""
+        if path:
+            path = os.path.abspath(path)
+            with self._lock:
+                if path not in self._watched:
+                    self._watched[path] = self._mtime(path)
+
+    def get(self, key: str, resolve: Callable[[], T], cacheable: Callable[[T], bool] = lambda value: True) -> T:
+        """Return the cached outcome for ``key``, calling ``resolve`` to compute and remember it if needed.
+
+        Outcomes for which ``cacheable`` returns False are returned but not remembered.
+        """
+        if not self.enabled:
+            return resolve()
+        self._check_watched()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = resolve()
+        if cacheable(value):
+            with self._lock:
+                self._entries[key] = value
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for path in self._watched:
+                self._watched[path] = self._mtime(path)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _check_watched(self) -> None:
+        changed: Tuple[str, ...] = ()
+        with self._lock:
+            for path, mtime in self._watched.items():
+                if self._mtime(path) != mtime:
+                    changed += (path,)
+        if changed:
+            log.debug("Directories %s changed, invalidating requirements resolution cache", ", ".join(changed))
+            self.invalidate()
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
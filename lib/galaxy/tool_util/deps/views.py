@@ -340,6 +340,20 @@ class ContainerResolutionView:
     def show(self, index):
         return self._container_resolver(index).to_dict()
 
+    def requirements_cache(self):
+        """Describe the memoized container and dependency resolutions of this process."""
+        return {
+            "containers": self._requirements_cache_dict(self._app.container_finder),
+            "dependencies": self._requirements_cache_dict(self._app.toolbox.dependency_manager),
+        }
+
+    def invalidate_requirements_cache(self):
+        """Forget memoized container and dependency resolutions in all Galaxy processes."""
+        invalidate_requirements_cache(self._app)
+        queue_worker = getattr(self._app, "queue_worker", None)
+        if queue_worker is not None:
+            queue_worker.send_control_task("invalidate_requirements_cache", noop_self=True)
+
     def resolve(self, index=None, **kwds):
         find_best_kwds = {
             "install": False,
@@ -409,6 +423,19 @@ class ContainerResolutionView:
         index = int(index)
         return self._container_resolvers[index]
 
+    @staticmethod
+    def _requirements_cache_dict(owner):
+        requirements_cache = getattr(owner, "requirements_cache", None)
+        return requirements_cache.to_dict() if requirements_cache is not None else None
+
+
+def invalidate_requirements_cache(app):
+    """Forget the memoized container and dependency resolutions of this process."""
+    container_finder = getattr(app, "container_finder", None)
+    if hasattr(container_finder, "invalidate_requirements_cache"):
+        container_finder.invalidate_requirements_cache()
+    app.toolbox.dependency_manager.requirements_cache.invalidate()
+
 
 def pop_tool_ids(kwds):
     tool_ids = None
@@ -1,6 +1,14 @@
+import os
 import re
 from enum import Enum
+from functools import lru_cache
 from logging import getLogger
+from typing import (
+    List,
+    Match,
+    Optional,
+    Pattern,
+)
 
 from galaxy.tool_util.parser.stdio import StdioErrorLevel
 from galaxy.util import unicodify
@@ -15,9 +23,59 @@ class DETECTED_JOB_STATE(str, Enum):
 
 
 ERROR_PEEK_SIZE = 2000
+# Tool output files are scanned STREAM_CHUNK_SIZE characters at a time, matches
+# spanning a chunk boundary are found if they are at most STREAM_MATCH_OVERLAP long.
+STREAM_CHUNK_SIZE = 2**20
+STREAM_MATCH_OVERLAP = 2**12
 
 
-def check_output_regex(job_id_tag, regex, stream, stream_name, job_messages, max_error_level):
+@lru_cache(maxsize=1024)
+def compile_stdio_regex(match: str) -> Pattern:
+    return re.compile(match, re.IGNORECASE)
+
+
+def search_stream_file(
+    path: str, regexes, chunk_size: int = STREAM_CHUNK_SIZE, overlap: int = STREAM_MATCH_OVERLAP
+) -> List[Optional[Match]]:
+    """
+    search a tool output file for each regex without loading it into memory
+
+    returns the first match of each regex in the file (or None), in the order of regexes
+    """
+    patterns = [compile_stdio_regex(regex.match) for regex in regexes]
+    matches: List[Optional[Match]] = [None] * len(patterns)
+    pending = set(range(len(patterns)))
+    window = ""
+    window_offset = pos = 0
+    with open(path, encoding="utf-8", errors="replace", newline="") as stream:
+        while pending:
+            chunk = stream.read(chunk_size)
+            final = len(chunk) < chunk_size
+            window += chunk.replace("\0", "")
+            # The next window starts with the last overlap + 1 characters of this one, matches
+            # starting at its first character have been searched for in this window.
+            # Searching from 1 rather than 0 also keeps ``^`` from matching mid-stream.
+            carry_start = max(len(window) - overlap - 1, 0)
+            next_pos = 0 if window_offset + carry_start == 0 else 1
+            for i in list(pending):
+                match = patterns[i].search(window, pos)
+                if not match:
+                    continue
+                # A match touching the end of the window (or a trailing newline, for ``$``)
+                # may continue in the next chunk, if it starts in the carried over part it
+                # is found again (in full) there.
+                if final or match.end() < len(window) - 1 or match.start() < carry_start + next_pos:
+                    matches[i] = match
+                    pending.discard(i)
+            if final:
+                break
+            window = window[carry_start:]
+            window_offset += carry_start
+            pos = next_pos
+    return matches
+
+
+def check_output_regex(job_id_tag, regex, stream, stream_name, job_messages, max_error_level, regex_match=False):
     """
     check a single regex against a stream
 
@@ -25,9 +83,11 @@ def check_output_regex(job_id_tag, regex, stream, stream_name, job_messages, max
     stream the stream to search in
     job_messages a list where the descriptions of the detected regexes can be appended
     max_error_level the maximum error level that has been detected so far
+    regex_match the result of searching the stream already, if the stream has been scanned by search_stream_file
     returns the max of the error_level of the regex and the given max_error_level
     """
-    regex_match = re.search(regex.match, stream, re.IGNORECASE)
+    if regex_match is False:
+        regex_match = compile_stdio_regex(regex.match).search(stream)
     if regex_match:
         reason = __regex_err_msg(regex_match, stream_name, regex)
         job_messages.append(reason)
@@ -35,7 +95,16 @@ def check_output_regex(job_id_tag, regex, stream, stream_name, job_messages, max
     return max_error_level
 
 
-def check_output(stdio_regexes, stdio_exit_codes, stdout, stderr, tool_exit_code, job_id_tag):
+def check_output(
+    stdio_regexes,
+    stdio_exit_codes,
+    stdout,
+    stderr,
+    tool_exit_code,
+    job_id_tag,
+    stdout_path=None,
+    stderr_path=None,
+):
     """
     Check the output of a tool - given the stdout, stderr, and the tool's
     exit code, return DETECTED_JOB_STATE.OK if the tool exited succesfully or
@@ -43,6 +112,10 @@ def check_output(stdio_regexes, stdio_exit_codes, stdout, stderr, tool_exit_code
     an exception, it returns OK so that the workflow can continue;
     otherwise, a bug in this code could halt workflow progress.
 
+    If stdout_path or stderr_path are given, regexes are matched against the
+    complete files (read in chunks) instead of the (possibly shrunk) stdout
+    and stderr strings, which are only returned for storing in the database.
+
     Note that, if the tool did not define any exit code handling or
     any stdio/stderr handling, then it reverts back to previous behavior:
     if stderr contains anything, then False is returned.
@@ -112,6 +185,8 @@ def check_output(stdio_regexes, stdio_exit_codes, stdout, stderr, tool_exit_code
                 # If warning, then we still set the job's state to OK
                 # but include a message. We'll do this if we haven't seen
                 # a fatal error yet
+                stderr_matches = _search_stream_file(stderr_path, [r for r in stdio_regexes if r.stderr_match])
+                stdout_matches = _search_stream_file(stdout_path, [r for r in stdio_regexes if r.stdout_match])
                 for regex in stdio_regexes:
                     # If ( this regex should be matched against stdout )
                     #   - Run the regex's match pattern against stdout
@@ -119,14 +194,26 @@ def check_output(stdio_regexes, stdio_exit_codes, stdout, stderr, tool_exit_code
                     #       o If it was fatal, then we're done - break.
                     if regex.stderr_match:
                         max_error_level = check_output_regex(
-                            job_id_tag, regex, stderr, "stderr", job_messages, max_error_level
+                            job_id_tag,
+                            regex,
+                            stderr,
+                            "stderr",
+                            job_messages,
+                            max_error_level,
+                            regex_match=next(stderr_matches, False),
                         )
                         if max_error_level >= StdioErrorLevel.MAX:
                             break
 
                     if regex.stdout_match:
                         max_error_level = check_output_regex(
-                            job_id_tag, regex, stdout, "stdout", job_messages, max_error_level
+                            job_id_tag,
+                            regex,
+                            stdout,
+                            "stdout",
+                            job_messages,
+                            max_error_level,
+                            regex_match=next(stdout_matches, False),
                         )
                         if max_error_level >= StdioErrorLevel.MAX:
                             break
@@ -159,6 +246,13 @@ def check_output(stdio_regexes, stdio_exit_codes, stdout, stderr, tool_exit_code
     return state, stdout, stderr, job_messages
 
 
+def _search_stream_file(path, regexes):
+    """Return an iterator over the matches of regexes in the file at path, or an empty iterator without a path."""
+    if not path or not regexes or not os.path.exists(path):
+        return iter(())
+    return iter(search_stream_file(path, regexes))
+
+
 def __regex_err_msg(match, stream, regex):
     """
     Return a message about the match on tool output using the given
@@ -77,7 +77,10 @@ from galaxy.tools.actions import (
 from galaxy.tools.actions.data_manager import DataManagerToolAction
 from galaxy.tools.actions.data_source import DataSourceToolAction
 from galaxy.tools.actions.model_operations import ModelOperationToolAction
-from galaxy.tools.cache import ToolDocumentCache
+from galaxy.tools.cache import (
+    ToolDocumentCache,
+    ToolFormModelCache,
+)
 from galaxy.tools.evaluation import global_tool_errors
 from galaxy.tools.imp_exp import JobImportHistoryArchiveWrapper
 from galaxy.tools.parameters import (
@@ -639,6 +642,7 @@ class Tool(Dictifiable):
         self.python_template_version: Optional[packaging.version.Version] = None
         self._lineage = None
         self.dependencies: List = []
+        self.form_model_cache = ToolFormModelCache()
         # populate toolshed repository info, if available
         self.populate_tool_shed_info(tool_shed_repository)
         # add tool resource parameters
@@ -2452,10 +2456,12 @@ class Tool(Dictifiable):
         # create tool help
         tool_help = ""
         if self.help:
-            tool_help = self.help.render(
-                static_path=self.app.url_for("/static"), host_url=self.app.url_for("/", qualified=True)
+            static_path = self.app.url_for("/static")
+            host_url = self.app.url_for("/", qualified=True)
+            tool_help = self.form_model_cache.get(
+                ("help", static_path, host_url),
+                lambda: unicodify(self.help.render(static_path=static_path, host_url=host_url), "utf-8"),
             )
-            tool_help = unicodify(tool_help, "utf-8")
 
         if isinstance(self.action, tuple):
             action = self.action[0] + self.app.url_for(self.action[1])
@@ -2532,8 +2538,7 @@ class Tool(Dictifiable):
                 self.populate_model(request_context, input.inputs, group_state, tool_dict["inputs"], other_values)
             else:
                 try:
-                    initial_value = input.get_initial_value(request_context, other_values)
-                    tool_dict = input.to_dict(request_context, other_values=other_values)
+                    initial_value, tool_dict = self._get_input_model(request_context, input, other_values)
                     tool_dict["value"] = input.value_to_basic(
                         state_inputs.get(input.name, initial_value), self.app, use_security=True
                     )
@@ -2551,6 +2556,23 @@ class Tool(Dictifiable):
             else:
                 group_inputs[input_index] = tool_dict
 
+    def _get_input_model(self, request_context, input, other_values):
+        """
+        Return the initial value and the form model of a parameter, reusing them
+        across requests if they don't depend on the history or the user.
+        """
+
+        def compute():
+            initial_value = input.get_initial_value(request_context, other_values)
+            return initial_value, input.to_dict(request_context, other_values=other_values)
+
+        cache_key = input.get_form_cache_key(request_context, other_values)
+        if cache_key is None:
+            return compute()
+        initial_value, tool_dict = self.form_model_cache.get(("input", input, cache_key), compute)
+        # the copy receives the state of this request
+        return initial_value, dict(tool_dict)
+
     def _map_source_to_history(self, trans, tool_inputs, params):
         # Need to remap dataset parameters. Job parameters point to original
         # dataset used; parameter should be the analygous dataset in the
@@ -3574,6 +3596,9 @@ class TagFromFileTool(DatabaseOperationTool):
         new_tags_dataset_assoc = incoming["tags"]
         new_elements = {}
         new_datasets = []
+        # Tagged in one batch once all elements are copied
+        items_to_tag = []
+        tags_to_add = []
 
         def add_copied_value_to_new_elements(new_tags_dict, dce):
             if getattr(dce.element_object, "history_content_type", None) == "dataset":
@@ -3591,9 +3616,8 @@ class TagFromFileTool(DatabaseOperationTool):
                         elif how == "remove":
                             old_tags = old_tags - set(new_tags)
                         new_tags = old_tags
-                    tag_handler.add_tags_from_list(
-                        user=history.user, item=copied_value, new_tags_list=new_tags, flush=False
-                    )
+                    items_to_tag.append(copied_value)
+                    tags_to_add.append(new_tags)
             else:
                 # We have a collection, and we copy the elements so that we don't manipulate the original tags
                 copied_value = dce.element_object.copy(element_destination=history)
@@ -3612,9 +3636,8 @@ class TagFromFileTool(DatabaseOperationTool):
                             elif how == "remove":
                                 old_tags = old_tags - set(new_tags)
                         new_tags = old_tags
-                    tag_handler.add_tags_from_list(
-                        user=history.user, item=new_element.element_object, new_tags_list=new_tags, flush=False
-                    )
+                    items_to_tag.append(new_element.element_object)
+                    tags_to_add.append(new_tags)
             new_elements[dce.element_identifier] = copied_value
 
         new_tags_path = new_tags_dataset_assoc.file_name
@@ -3626,6 +3649,7 @@ class TagFromFileTool(DatabaseOperationTool):
         new_tags_dict = {item[0]: item[1:] for item in source_new_tags}
         for dce in hdca.collection.elements:
             add_copied_value_to_new_elements(new_tags_dict, dce)
+        tag_handler.add_tags_from_lists(history.user, items_to_tag, tags_to_add, flush=False)
         self._add_datasets_to_history(history, new_datasets)
         output_collections.create_collection(
             next(iter(self.outputs.values())), "output", elements=new_elements, propagate_hda_tags=False
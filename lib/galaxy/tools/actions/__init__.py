@@ -22,6 +22,7 @@ from galaxy.model import (
     WorkflowRequestInputParameter,
 )
 from galaxy.model.dataset_collections.builder import CollectionBuilder
+from galaxy.model.job_fingerprint import set_job_fingerprint
 from galaxy.model.none_like import NoneDataset
 from galaxy.tools.parameters import update_dataset_ids
 from galaxy.tools.parameters.basic import (
@@ -647,6 +648,8 @@ class DefaultToolAction(ToolAction):
             job.params = dumps(job_params)
         if completed_job:
             job.set_copied_from_job_id(completed_job.id)
+        else:
+            set_job_fingerprint(trans.sa_session, job, require_ready=True, check_inputs_unchanged=False)
         trans.sa_session.add(job)
         # Remap any outputs if this is a rerun and the user chose to continue dependent jobs
         # This functionality requires tracking jobs in the database.
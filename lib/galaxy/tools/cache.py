@@ -5,7 +5,13 @@ import shutil
 import sqlite3
 import tempfile
 import zlib
+from collections import OrderedDict
 from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+)
 
 from sqlitedict import SqliteDict
 
@@ -15,6 +21,7 @@ from galaxy.util.hash_util import md5_hash_file
 log = logging.getLogger(__name__)
 
 CURRENT_TOOL_CACHE_VERSION = 0
+DEFAULT_FORM_MODEL_CACHE_SIZE = 256
 
 
 def encoder(obj):
@@ -268,3 +275,43 @@ class ToolHash:
         if self._tool_hash is None:
             self._tool_hash = md5_hash_file(self.path)
         return self._tool_hash
+
+
+class ToolFormModelCache:
+    """
+    LRU cache of the parts of a tool's form model that are the same for every
+    request, e.g. the rendered help and the options of select parameters
+    generated from files or data tables.
+
+    A cache belongs to a single tool instance, so reloading the tool discards
+    it. Keys must change whenever the cached value would, e.g. they include
+    the version of the data tables options are read from.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_FORM_MODEL_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the value cached for ``key``, calling ``compute`` to create it if necessary."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -63,6 +63,7 @@ class RefgenieToolDataTable(TabularToolDataTable):
     dict_export_visible_keys = ["name", "data", "rg_asset", "largest_index", "columns", "missing_index_file"]
 
     type_key = "refgenie"
+    columnar_cache_supported = False
 
     def __init__(
         self,
@@ -212,6 +212,14 @@ class ToolParameter(Dictifiable):
         """
         return []
 
+    def get_form_cache_key(self, trans, other_values):
+        """
+        Return a key under which the form model of this parameter, i.e. the
+        result of `to_dict` and `get_initial_value`, can be reused across
+        requests, or None if it depends on the history or the user.
+        """
+        return None
+
     def to_json(self, value, app, use_security):
         """Convert a value to a string representation suitable for persisting"""
         return unicodify(value)
@@ -1097,6 +1105,15 @@ class SelectToolParameter(ToolParameter):
         else:
             return []
 
+    def get_form_cache_key(self, trans, other_values):
+        # only options generated from files or data tables are worth caching
+        if self.dynamic_options is not None or not isinstance(self.options, dynamic_options.DynamicOptions):
+            return None
+        options_key = self.options.get_cache_key()
+        if options_key is None:
+            return None
+        return (bool(trans.workflow_building_mode), is_runtime_context(trans, other_values), options_key)
+
     def to_dict(self, trans, other_values=None):
         other_values = other_values or {}
         d = super().to_dict(trans, other_values)
@@ -1281,6 +1298,9 @@ class SelectTagParameter(SelectToolParameter):
     def get_dependencies(self):
         return [self.data_ref]
 
+    def get_form_cache_key(self, trans, other_values):
+        return None
+
     def to_dict(self, trans, other_values=None):
         other_values = other_values or {}
         d = super().to_dict(trans, other_values=other_values)
@@ -1491,6 +1511,9 @@ class ColumnListParameter(SelectToolParameter):
     def get_dependencies(self):
         return [self.data_ref]
 
+    def get_form_cache_key(self, trans, other_values):
+        return None
+
     def to_dict(self, trans, other_values=None):
         other_values = other_values or {}
         d = super().to_dict(trans, other_values=other_values)
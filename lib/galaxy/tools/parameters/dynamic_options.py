@@ -3,10 +3,21 @@ Support for generating the options for a SelectToolParameter dynamically (based
 on the values of other parameters or other aspects of the current state)
 """
 import copy
+import itertools
 import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from io import StringIO
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from galaxy.model import (
     HistoryDatasetAssociation,
@@ -19,6 +30,73 @@ from . import validation
 
 log = logging.getLogger(__name__)
 
+# number of parsed from_dataset option sources kept in memory
+DEFAULT_DATASET_OPTIONS_CACHE_SIZE = 32
+# from_dataset options are read from at most this many bytes of the dataset
+MAX_DATASET_OPTIONS_BYTES = 1048576
+
+
+class IndexedFields:
+    """
+    A list of option fields with lookup indexes on their columns, built the
+    first time a column is looked up.
+    """
+
+    def __init__(self, fields: List[List[str]]):
+        self.fields = fields
+        self._indexes: Dict[int, Dict[str, List[int]]] = {}
+
+    def lookup(self, column: int, values) -> List[List[str]]:
+        """Return the fields whose ``column`` holds one of ``values``, in their original order."""
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for position, fields in enumerate(self.fields):
+                index.setdefault(fields[column], []).append(position)
+            self._indexes[column] = index
+        positions = itertools.chain.from_iterable(index.get(value, ()) for value in set(values))
+        return [self.fields[position] for position in sorted(positions)]
+
+
+class DatasetOptionsCache:
+    """
+    LRU cache of option fields parsed from datasets, keyed by dataset and
+    update time and by the way the options are parsed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_DATASET_OPTIONS_CACHE_SIZE):
+        self.max_size = max_size
+        self._fields: "OrderedDict[Hashable, List[List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[List[str]]]:
+        with self._lock:
+            fields = self._fields.get(key)
+            if fields is not None:
+                self._fields.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return fields
+
+    def set(self, key: Hashable, fields: List[List[str]]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._fields[key] = fields
+            self._fields.move_to_end(key)
+            while len(self._fields) > self.max_size:
+                self._fields.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fields.clear()
+
+
+dataset_options_cache = DatasetOptionsCache()
+
 
 class Filter:
     """
@@ -40,10 +118,24 @@ class Filter:
         """Returns the name of any dependencies, otherwise None"""
         return None
 
+    def depends_on_request(self):
+        """Returns True if the filtered options depend on the user or on the values of other parameters"""
+        return self.get_dependency_name() is not None
+
     def filter_options(self, options, trans, other_values):
         """Returns a list of options after the filter is applied"""
         raise TypeError("Abstract Method")
 
+    def filter_indexed_options(self, indexed, trans, other_values):
+        """
+        Returns a list of options after the filter is applied to the
+        IndexedFields ``indexed``, filters comparing a column with a value
+        override this to look the value up instead of scanning all options.
+        The cached ``indexed.fields`` are never passed on, filters may modify
+        or return the options list they are given.
+        """
+        return self.filter_options(list(indexed.fields), trans, other_values)
+
 
 class StaticValueFilter(Filter):
     """
@@ -68,18 +160,31 @@ class StaticValueFilter(Filter):
         self.column = d_option.column_spec_to_index(column)
         self.keep = string_as_bool(elem.get("keep", "True"))
 
-    def filter_options(self, options, trans, other_values):
-        rval = []
+    def depends_on_request(self):
+        # the value may reference user properties, see User.expand_user_properties
+        return "$" in self.value
+
+    def get_filter_value(self, trans):
         filter_value = self.value
         try:
             filter_value = User.expand_user_properties(trans.user, filter_value)
         except Exception:
             pass
+        return filter_value
+
+    def filter_options(self, options, trans, other_values):
+        rval = []
+        filter_value = self.get_filter_value(trans)
         for fields in options:
             if self.keep == (filter_value == fields[self.column]):
                 rval.append(fields)
         return rval
 
+    def filter_indexed_options(self, indexed, trans, other_values):
+        if not self.keep:
+            return super().filter_indexed_options(indexed, trans, other_values)
+        return indexed.lookup(self.column, [self.get_filter_value(trans)])
+
 
 class RegexpFilter(Filter):
     """
@@ -104,6 +209,10 @@ class RegexpFilter(Filter):
         self.column = d_option.column_spec_to_index(column)
         self.keep = string_as_bool(elem.get("keep", "True"))
 
+    def depends_on_request(self):
+        # the value may reference user properties, see User.expand_user_properties
+        return "$" in self.value
+
     def filter_options(self, options, trans, other_values):
         rval = []
         filter_value = self.value
@@ -262,9 +371,7 @@ class ParamValueFilter(Filter):
     def get_dependency_name(self):
         return self.ref_name
 
-    def filter_options(self, options, trans, other_values):
-        if trans is not None and trans.workflow_building_mode:
-            return []
+    def get_ref_values(self, other_values):
         ref = other_values.get(self.ref_name, None)
         if ref is None:
             ref = []
@@ -286,14 +393,23 @@ class ParamValueFilter(Filter):
                     break
                 r = getattr(r, ref_attribute)
             ref_values.append(r)
-        ref_values = [str(_) for _ in ref_values]
+        return [str(_) for _ in ref_values]
 
+    def filter_options(self, options, trans, other_values):
+        if trans is not None and trans.workflow_building_mode:
+            return []
+        ref_values = self.get_ref_values(other_values)
         rval = []
         for fields in options:
             if self.keep == (fields[self.column] in ref_values):
                 rval.append(fields)
         return rval
 
+    def filter_indexed_options(self, indexed, trans, other_values):
+        if not self.keep or (trans is not None and trans.workflow_building_mode):
+            return super().filter_indexed_options(indexed, trans, other_values)
+        return indexed.lookup(self.column, self.get_ref_values(other_values))
+
 
 class UniqueValueFilter(Filter):
     """
@@ -462,6 +578,10 @@ class RemoveValueFilter(Filter):
         self.multiple = string_as_bool(elem.get("multiple", "False"))
         self.separator = elem.get("separator", ",")
 
+    def depends_on_request(self):
+        # values are not removed while building workflows
+        return True
+
     def filter_options(self, options, trans, other_values):
         from galaxy.tools.wrappers import DatasetFilenameWrapper
 
@@ -561,6 +681,8 @@ class DynamicOptions:
         self.line_startswith = elem.get("startswith", None)
         data_file = elem.get("from_file", None)
         self.index_file = None
+        self.index_file_path = None
+        self._index_file_stat = None
         self.missing_index_file = None
         dataset_file = elem.get("from_dataset", None)
         from_parameter = elem.get("from_parameter", None)
@@ -583,8 +705,8 @@ class DynamicOptions:
                     full_path = os.path.join(self.tool_param.tool.app.config.tool_data_path, data_file)
                     if os.path.exists(full_path):
                         self.index_file = data_file
-                        with open(full_path) as fh:
-                            self.file_fields = self.parse_file_fields(fh)
+                        self.index_file_path = full_path
+                        self._load_index_file()
                     else:
                         self.missing_index_file = data_file
             elif dataset_file is not None:
@@ -599,6 +721,12 @@ class DynamicOptions:
         # Load filters
         for filter_elem in elem.findall("filter"):
             self.filters.append(Filter.from_element(self, filter_elem))
+        # Filters at the start of the chain yield the same options for every request,
+        # get_fields caches their result together with the version of the options source
+        self._num_static_filters = len(
+            list(itertools.takewhile(lambda filter: not filter.depends_on_request(), self.filters))
+        )
+        self._static_fields: Optional[Tuple[Any, IndexedFields]] = None
 
         # Load Validators
         for validator in elem.findall("validator"):
@@ -648,6 +776,15 @@ class DynamicOptions:
         if "name" not in self.columns:
             self.columns["name"] = self.columns["value"]
 
+    def _load_index_file(self):
+        """Parse the from_file options file unless it is unchanged since it was last parsed."""
+        stat = os.stat(self.index_file_path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        if stat_key != self._index_file_stat:
+            with open(self.index_file_path) as fh:
+                self.file_fields = self.parse_file_fields(fh)
+            self._index_file_stat = stat_key
+
     def parse_file_fields(self, reader):
         rval = []
         field_count = None
@@ -687,6 +824,33 @@ class DynamicOptions:
                 rval.append(depend)
         return rval
 
+    def get_cache_key(self):
+        """
+        Return a key identifying the options generated for any request, or None
+        if they depend on the user, the history or the values of other parameters.
+        """
+        if self.dataset_ref_name or any(filter.depends_on_request() for filter in self.filters):
+            return None
+        if self.tool_data_table_name and self.tool_data_table is None:
+            return None
+        return self._get_source_version()
+
+    def _get_source_version(self):
+        """
+        Return a key identifying the content of the data table, file or parameter
+        options are read from, reloading the file if it has been modified.
+        """
+        tool_data_table = self.tool_data_table
+        if tool_data_table:
+            return (id(tool_data_table), tool_data_table._loaded_content_version)
+        elif self.index_file_path:
+            try:
+                self._load_index_file()
+            except OSError:
+                log.warning(f"Could not reload dynamic options from {self.index_file_path}", exc_info=True)
+            return self._index_file_stat
+        return id(self.file_fields)
+
     def get_fields(self, trans, other_values):
         if self.dataset_ref_name:
             try:
@@ -703,39 +867,85 @@ class DynamicOptions:
                 return []
 
             options = []
-            meta_file_key = self.meta_file_key
             for dataset in datasets:
-                if meta_file_key:
-                    dataset = getattr(dataset.metadata, meta_file_key, None)
-                    if not isinstance(dataset, MetadataFile):
-                        log.warning(
-                            f"The meta_file_key `{meta_file_key}` was invalid or the referred object was not a valid file type metadata!"
-                        )
-                        continue
-                    if getattr(dataset, "purged", False) or getattr(dataset, "deleted", False):
-                        log.warning(f"The metadata file inferred from key `{meta_file_key}` was deleted!")
-                        continue
-                if not hasattr(dataset, "file_name"):
-                    continue
-                # Ensure parsing dynamic options does not consume more than a megabyte worth memory.
-                path = dataset.file_name
-                if os.path.getsize(path) < 1048576:
-                    with open(path) as fh:
-                        options += self.parse_file_fields(fh)
-                else:
-                    # Pass just the first megabyte to parse_file_fields.
-                    log.warning("Attempting to load options from large file, reading just first megabyte")
-                    with open(path) as fh:
-                        contents = fh.read(1048576)
-                    options += self.parse_file_fields(StringIO(contents))
-        elif self.tool_data_table:
-            options = self.tool_data_table.get_fields()
+                options += self._get_dataset_fields(dataset)
+            filters = self.filters
+        else:
+            indexed = self._get_static_fields()
+            filters = self.filters[self._num_static_filters :]
+            if not filters:
+                return list(indexed.fields)
+            options = filters[0].filter_indexed_options(indexed, trans, other_values)
+            filters = filters[1:]
+        for filter in filters:
+            options = filter.filter_options(options, trans, other_values)
+        return options
+
+    def _get_static_fields(self):
+        """
+        Return the options of the data table, file or parameter filtered by the
+        request independent filters at the start of the filter chain.
+        """
+        version = self._get_source_version()
+        static_fields = self._static_fields
+        if static_fields is not None and static_fields[0] == version:
+            return static_fields[1]
+        tool_data_table = self.tool_data_table
+        if tool_data_table:
+            options = tool_data_table.get_fields()
         elif self.file_fields:
             options = list(self.file_fields)
         else:
             options = []
-        for filter in self.filters:
-            options = filter.filter_options(options, trans, other_values)
+        for filter in self.filters[: self._num_static_filters]:
+            options = filter.filter_options(options, None, {})
+        indexed = IndexedFields(options)
+        self._static_fields = (version, indexed)
+        return indexed
+
+    def _get_dataset_fields(self, dataset):
+        meta_file_key = self.meta_file_key
+        if meta_file_key:
+            dataset = getattr(dataset.metadata, meta_file_key, None)
+            if not isinstance(dataset, MetadataFile):
+                log.warning(
+                    f"The meta_file_key `{meta_file_key}` was invalid or the referred object was not a valid file type metadata!"
+                )
+                return []
+            if getattr(dataset, "purged", False) or getattr(dataset, "deleted", False):
+                log.warning(f"The metadata file inferred from key `{meta_file_key}` was deleted!")
+                return []
+        if not hasattr(dataset, "file_name"):
+            return []
+        path = dataset.file_name
+        cache_key = None
+        dataset_id = getattr(dataset, "id", None)
+        update_time = getattr(dataset, "update_time", None)
+        if dataset_id is not None and update_time is not None:
+            cache_key = (
+                type(dataset).__name__,
+                dataset_id,
+                update_time,
+                path,
+                self.separator,
+                self.line_startswith,
+                self.largest_index,
+            )
+            options = dataset_options_cache.get(cache_key)
+            if options is not None:
+                return options
+        # Ensure parsing dynamic options does not consume more than a megabyte worth memory.
+        if os.path.getsize(path) < MAX_DATASET_OPTIONS_BYTES:
+            with open(path) as fh:
+                options = self.parse_file_fields(fh)
+        else:
+            # Pass just the first megabyte to parse_file_fields.
+            log.warning("Attempting to load options from large file, reading just first megabyte")
+            with open(path) as fh:
+                contents = fh.read(MAX_DATASET_OPTIONS_BYTES)
+            options = self.parse_file_fields(StringIO(contents))
+        if cache_key is not None:
+            dataset_options_cache.set(cache_key, options)
         return options
 
     def get_fields_by_value(self, value, trans, other_values):
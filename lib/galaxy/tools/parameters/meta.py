@@ -12,6 +12,7 @@ from galaxy.model.dataset_collections import (
     matching,
     subcollections,
 )
+from galaxy.model.dataset_collections.element_tree import load_collection_element_tree
 from galaxy.util import permutations
 from . import visit_input_values
 
@@ -257,12 +258,14 @@ def __expand_collection_parameter(trans, input_key, incoming_val, collections_to
     hdc_id = trans.app.security.decode_id(encoded_hdc_id)
     hdc = trans.sa_session.query(model.HistoryDatasetCollectionAssociation).get(hdc_id)
     collections_to_match.add(input_key, hdc, subcollection_type=subcollection_type, linked=linked)
+    # Load the whole collection tree at once, matching and slicing below reuse it.
+    element_tree = load_collection_element_tree(hdc.collection, load_dataset_instances=True)
     if subcollection_type is not None:
         subcollection_elements = subcollections.split_dataset_collection_instance(hdc, subcollection_type)
         return subcollection_elements
     else:
         hdas = []
-        for element in hdc.collection.dataset_elements:
+        for element in element_tree.dataset_elements():
             hda = element.dataset_instance
             hda.element_identifier = element.element_identifier
             hdas.append(hda)
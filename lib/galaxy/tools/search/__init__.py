@@ -18,19 +18,38 @@ Tokenizers - these take an attribute (e.g. name) and parse it into "tokens" to
     default tokenizer will break an entry into words, so that single word
     matches are possible.
 
+Updates - the index is shared by all Galaxy processes, but only the process
+    designated as config watcher by the database heartbeat builds it. All
+    other processes only read it and switch to a fresh searcher whenever a new
+    index generation has been committed, closing the replaced searcher once
+    no search uses it anymore. Each indexed document stores a hash of its
+    content, so a rebuild only writes documents that were added, changed or
+    removed. Documents are only created for tools that were loaded or moved
+    since the previous rebuild of the process. While the designation moves to
+    another process, the index write lock may still be held by the previous
+    builder; the update is then kept pending and retried before the next
+    search.
+
 Filters - various filters are available for processing content as the index is
     built. A StopFilter removes common articles 'a', 'for', 'and' etc. A
     StemmingFilter removes suffixes from words to create a 'base work' e.g.
     stemming -> stem; opened -> open; philosophy -> philosoph.
 
 """
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
+import threading
 from typing import (
+    Any,
     Dict,
     List,
+    Optional,
+    Set,
+    Tuple,
     Union,
 )
 
@@ -45,6 +64,7 @@ from whoosh.fields import (
     Schema,
     TEXT,
 )
+from whoosh.index import LockError
 from whoosh.qparser import (
     MultifieldParser,
     OrGroup,
@@ -54,10 +74,14 @@ from whoosh.scoring import (
     Frequency,
     MultiWeighting,
 )
-from whoosh.writing import AsyncWriter
+from whoosh.searching import Searcher
 
 from galaxy.config import GalaxyAppConfiguration
-from galaxy.util import ExecutionTimer
+from galaxy.util import (
+    ExecutionTimer,
+    StructuredExecutionTimer,
+    unicodify,
+)
 from galaxy.web.framework.helpers import to_unicode
 
 log = logging.getLogger(__name__)
@@ -65,6 +89,10 @@ log = logging.getLogger(__name__)
 CanConvertToFloat = Union[str, int, float]
 CanConvertToInt = Union[str, int, float]
 
+# seconds to wait for the index write lock held by another process
+INDEX_LOCK_TIMEOUT = 5.0
+INDEX_LOCK_DELAY = 0.25
+
 
 def get_or_create_index(index_dir, schema):
     """Get or create a reference to the index."""
@@ -89,6 +117,7 @@ class ToolBoxSearch:
     """
 
     def __init__(self, toolbox, index_dir: str, index_help: bool = True):
+        self.app = toolbox.app
         panel_searches = {}
         for panel_view in toolbox.panel_views():
             panel_view_id = panel_view.id
@@ -116,7 +145,16 @@ class ToolBoxSearch:
         if panel_view not in self.panel_searches:
             raise KeyError(f"Unknown panel_view specified {panel_view}")
         panel_search = self.panel_searches[panel_view]
-        return panel_search.search(*args, **kwd)
+        timer_args = ("internals.galaxy.tools.search", "Tool search in panel view ${panel_view} finished")
+        # The execution timer factory is set up after the toolbox search.
+        execution_timer_factory = getattr(self.app, "execution_timer_factory", None)
+        if execution_timer_factory:
+            search_timer = execution_timer_factory.get_timer(*timer_args)
+        else:
+            search_timer = StructuredExecutionTimer(*timer_args)
+        results = panel_search.search(*args, **kwd)
+        log.debug(search_timer.to_str(panel_view=panel_view))
+        return results
 
 
 class ToolPanelViewSearch:
@@ -136,6 +174,8 @@ class ToolPanelViewSearch:
         schema_conf = {
             # The stored ID field is not searchable
             "id": ID(stored=True, unique=True),
+            # Hash of the indexed document, used to only update changed tools
+            "tool_hash": ID(stored=True),
             # This exact field is searchable by exact matches only
             "id_exact": TEXT(
                 field_boost=(config.tool_id_boost * config.tool_name_exact_multiplier),
@@ -190,67 +230,115 @@ class ToolPanelViewSearch:
         self.index_dir = index_dir
         self.panel_view_id = panel_view_id
         self.index = self._index_setup()
+        self.help_bm25f_k1 = config.tool_help_bm25f_k1
+        self._searcher: Optional[Searcher] = None
+        # number of running searches by searcher id, replaced searchers are closed by the last one
+        self._searcher_users: Dict[int, int] = {}
+        self._searcher_lock = threading.Lock()
+        # documents created by the previous rebuild, by tool id: (tool, doc key, document)
+        self._tool_docs: Dict[str, Tuple[Any, Tuple, Dict[str, str]]] = {}
+        # arguments of a rebuild that could not obtain the index write lock
+        self._pending_update: Optional[Tuple[Any, Any, bool]] = None
 
     def _index_setup(self) -> index.Index:
         """Get or create a reference to the index."""
         return get_or_create_index(self.index_dir, self.schema)
 
-    def build_index(self, tool_cache, toolbox, index_help: bool = True) -> None:
+    def build_index(
+        self, tool_cache, toolbox, index_help: bool = True, lock_timeout: float = INDEX_LOCK_TIMEOUT
+    ) -> None:
         """Prepare search index for tools loaded in toolbox.
 
-        Use `tool_cache` to determine which tools need indexing and which
-        should be removed.
+        Only documents whose content hash differs from the indexed one are
+        written, and tools no longer in the panel view are removed. If another
+        process holds the index write lock for more than ``lock_timeout``
+        seconds, the update is retried before the next search.
         """
         log.debug(f"Starting to build toolbox index of panel {self.panel_view_id}.")
         execution_timer = ExecutionTimer()
+        self._pending_update = None
 
         with self.index.reader() as reader:
-            # Index ocasionally contains empty stored fields
-            self.indexed_tool_ids = {f["id"] for f in reader.all_stored_fields() if f}
-
-        tool_ids_to_remove = self._get_tools_to_remove(tool_cache)
-        tools_to_index = self._get_tool_list(
-            toolbox,
-            tool_cache,
-        )
-
-        with AsyncWriter(self.index) as writer:
-            for tool_id in tool_ids_to_remove:
-                writer.delete_by_term("id", tool_id)
-            for tool in tools_to_index:
+            indexed_tool_hashes = self._indexed_tool_hashes(reader)
+
+        docs = {}
+        tool_docs = {}
+        for tool in self._get_tool_list(toolbox, tool_cache):
+            doc_key = self._doc_key(tool, index_help)
+            cached = self._tool_docs.get(tool.id)
+            if cached is not None and cached[0] is tool and cached[1] == doc_key:
+                add_doc_kwds = cached[2]
+            else:
                 add_doc_kwds = self._create_doc(
                     tool=tool,
                     index_help=index_help,
                 )
+            tool_docs[tool.id] = (tool, doc_key, add_doc_kwds)
+            if add_doc_kwds:
+                docs[add_doc_kwds["id"]] = add_doc_kwds
+        self._tool_docs = tool_docs
+
+        tool_ids_to_remove, docs_to_update = self._index_changes(docs, indexed_tool_hashes)
+        if not tool_ids_to_remove and not docs_to_update:
+            log.debug(f"Toolbox index of panel {self.panel_view_id} is up to date {execution_timer}")
+            return
+
+        try:
+            writer = self.index.writer(timeout=lock_timeout, delay=INDEX_LOCK_DELAY)
+        except LockError:
+            log.debug(
+                f"Toolbox index of panel {self.panel_view_id} is locked by another process, retrying before the next search"
+            )
+            self._pending_update = (tool_cache, toolbox, index_help)
+            return
+        try:
+            # The index may have been updated while waiting for the lock
+            with writer.reader() as reader:
+                indexed_tool_hashes = self._indexed_tool_hashes(reader)
+        except Exception:
+            writer.cancel()
+            raise
+        tool_ids_to_remove, docs_to_update = self._index_changes(docs, indexed_tool_hashes)
+        if not tool_ids_to_remove and not docs_to_update:
+            writer.cancel()
+            log.debug(f"Toolbox index of panel {self.panel_view_id} is up to date {execution_timer}")
+            return
+        with writer:
+            for tool_id in tool_ids_to_remove:
+                writer.delete_by_term("id", tool_id)
+            for add_doc_kwds in docs_to_update:
                 # Add tool document to index (or overwrite if existing)
                 writer.update_document(**add_doc_kwds)
 
-        log.debug(f"Toolbox index of panel {self.panel_view_id}" f" finished {execution_timer}")
-
-    def _get_tools_to_remove(self, tool_cache) -> list:
-        """Return list of tool IDs to be removed from index."""
-        tool_ids_to_remove = (self.indexed_tool_ids - set(tool_cache._tool_paths_by_id.keys())).union(
-            tool_cache._removed_tool_ids
+        log.debug(
+            f"Toolbox index of panel {self.panel_view_id} finished {execution_timer}, "
+            f"{len(docs_to_update)} tools updated and {len(tool_ids_to_remove)} removed"
         )
 
-        for indexed_tool_id in self.indexed_tool_ids:
-            indexed_tool = tool_cache.get_tool_by_id(indexed_tool_id)
-            if indexed_tool:
-                if indexed_tool.is_latest_version:
-                    continue
-                latest_version = indexed_tool.latest_version
-                if latest_version and latest_version.hidden:
-                    continue
-            tool_ids_to_remove.add(indexed_tool_id)
-
-        return list(tool_ids_to_remove)
+    def _indexed_tool_hashes(self, reader) -> Dict[str, Optional[str]]:
+        """Return the content hashes of the documents in the index, by tool id."""
+        # Index ocasionally contains empty stored fields
+        indexed_tool_hashes = {f["id"]: f.get("tool_hash") for f in reader.all_stored_fields() if f}
+        self.indexed_tool_ids = set(indexed_tool_hashes)
+        return indexed_tool_hashes
+
+    def _index_changes(
+        self, docs: Dict[str, Dict[str, str]], indexed_tool_hashes: Dict[str, Optional[str]]
+    ) -> Tuple[Set[str], List[Dict[str, str]]]:
+        """Return the ids of tools to remove from the index and the documents to add or update."""
+        tool_ids_to_remove = set(indexed_tool_hashes) - set(docs)
+        docs_to_update = [doc for tool_id, doc in docs.items() if indexed_tool_hashes.get(tool_id) != doc["tool_hash"]]
+        return tool_ids_to_remove, docs_to_update
+
+    def _doc_key(self, tool, index_help: bool) -> Tuple:
+        """Return the attributes of the document of ``tool`` that may change without reloading the tool."""
+        return (index_help, tuple(tool.get_panel_section()), tuple(tool.labels or ()))
 
     def _get_tool_list(self, toolbox, tool_cache) -> list:
-        """Return list of tools to add and remove from index."""
+        """Return list of tools that should be in the index of this panel view."""
         tools_to_index = []
 
-        for tool_id in tool_cache._new_tool_ids - self.indexed_tool_ids:
-            tool = toolbox.get_tool(tool_id)
+        for tool_id, tool in toolbox.tools():
             if tool and tool.is_latest_version and toolbox.panel_has_tool(tool, self.panel_view_id):
                 if tool.hidden:
                     # Check if there is an older tool we can return
@@ -310,6 +398,9 @@ class ToolPanelViewSearch:
                     pass
 
         add_doc_kwds["name_exact"] = add_doc_kwds["name"]
+        add_doc_kwds["tool_hash"] = hashlib.md5(
+            json.dumps(add_doc_kwds, sort_keys=True, default=unicodify).encode("utf-8")
+        ).hexdigest()
 
         return add_doc_kwds
 
@@ -319,13 +410,10 @@ class ToolPanelViewSearch:
         config: GalaxyAppConfiguration,
     ) -> List[str]:
         """Perform search on the in-memory index."""
-        # Change field boosts for searcher
-        self.searcher = self.index.searcher(
-            weighting=MultiWeighting(
-                Frequency(),
-                help=BM25F(K1=config.tool_help_bm25f_k1),
-            )
-        )
+        pending_update = self._pending_update
+        if pending_update is not None:
+            tool_cache, toolbox, index_help = pending_update
+            self.build_index(tool_cache, toolbox, index_help=index_help, lock_timeout=0)
         fields = [
             "id",
             "id_exact",
@@ -345,11 +433,48 @@ class ToolPanelViewSearch:
             group=OrGroup,
         )
         parsed_query = self.parser.parse(q)
-        hits = self.searcher.search(
-            parsed_query,
-            limit=None,
-            sortedby="",
-            terms=True,
-        )
-
-        return [hit["id"] for hit in hits]
+        searcher = self._acquire_searcher()
+        try:
+            hits = searcher.search(
+                parsed_query,
+                limit=None,
+                sortedby="",
+                terms=True,
+            )
+            return [hit["id"] for hit in hits]
+        finally:
+            self._release_searcher(searcher)
+
+    def _acquire_searcher(self) -> Searcher:
+        """Return a searcher for the latest committed version of the index.
+
+        When another process has committed a new index generation, a new
+        searcher is created and swapped in. The previous searcher is closed
+        right away if no search is using it, otherwise by the last search
+        releasing it. Every acquired searcher must be released with
+        ``_release_searcher``.
+        """
+        with self._searcher_lock:
+            searcher = self._searcher
+            if searcher is None or searcher.reader().generation() != self.index.latest_generation():
+                if searcher is not None and id(searcher) not in self._searcher_users:
+                    searcher.close()
+                # Change field boosts for searcher
+                searcher = self.index.searcher(
+                    weighting=MultiWeighting(
+                        Frequency(),
+                        help=BM25F(K1=self.help_bm25f_k1),
+                    )
+                )
+                self._searcher = searcher
+            self._searcher_users[id(searcher)] = self._searcher_users.get(id(searcher), 0) + 1
+        return searcher
+
+    def _release_searcher(self, searcher: Searcher) -> None:
+        """Release a searcher returned by ``_acquire_searcher``, closing it if it has been replaced."""
+        with self._searcher_lock:
+            users = self._searcher_users.pop(id(searcher)) - 1
+            if users:
+                self._searcher_users[id(searcher)] = users
+            elif searcher is not self._searcher:
+                searcher.close()
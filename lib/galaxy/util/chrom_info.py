@@ -0,0 +1,237 @@
+"""
+Indexed chromosome length tables for dbkeys.
+
+``.len`` files list one ``<chrom><tab><length>`` line per sequence and can
+hold millions of scaffolds. Instead of reopening and parsing them on every
+request, :class:`ChromInfoStore` converts each file once into a compact binary
+index (fixed width records plus a name sorted lookup table) stored in a cache
+directory and memory maps it. Index files are written atomically and keyed by
+the source path, so all Galaxy processes sharing the cache directory map the
+same file, and they are rebuilt whenever the source file's size or
+modification time changes.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import (
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+log = logging.getLogger(__name__)
+
+# Number of chromosome length tables each process keeps open.
+DEFAULT_CHROM_INFO_CACHE_SIZE = 100
+
+INDEX_MAGIC = b"GXCHROM1"
+# magic, source size, source mtime (ns), record count, line count
+HEADER = struct.Struct("<8sQqQQ")
+# chromosome length, line number, name offset, name length
+RECORD = struct.Struct("<QQII")
+SORTED_ENTRY = struct.Struct("<I")
+
+
+def build_index(path: str) -> bytes:
+    """Return the binary index of the ``.len`` file ``path``.
+
+    Comment lines and lines without an integer length are skipped, but still
+    counted for the line numbers stored with each sequence.
+    """
+    stat = os.stat(path)
+    records = []
+    names = []
+    name_offset = 0
+    line_count = 0
+    with open(path, "rb") as fh:
+        for line_num, line in enumerate(fh):
+            line_count += 1
+            if line.startswith(b"#"):
+                continue
+            fields = line.split(b"\t")
+            if len(fields) < 2:
+                continue
+            try:
+                length = int(fields[1])
+            except ValueError:
+                continue
+            records.append((length, line_num, name_offset, len(fields[0])))
+            names.append(fields[0])
+            name_offset += len(fields[0])
+    # stable sort, so the first record is found for duplicated names
+    sorted_indices = sorted(range(len(names)), key=names.__getitem__)
+    parts = [HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(records), line_count)]
+    parts.extend(RECORD.pack(*record) for record in records)
+    parts.extend(SORTED_ENTRY.pack(i) for i in sorted_indices)
+    parts.extend(names)
+    return b"".join(parts)
+
+
+class ChromLengths:
+    """Read-only view of an indexed ``.len`` file, backed by a memory map or a bytes buffer."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self._buffer = buffer
+        magic, self.source_size, self.source_mtime_ns, self._count, self.line_count = HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError("Not a chromosome length index")
+        self._records_offset = HEADER.size
+        self._sorted_offset = self._records_offset + self._count * RECORD.size
+        self._names_offset = self._sorted_offset + self._count * SORTED_ENTRY.size
+
+    @classmethod
+    def from_len_file(cls, path: str) -> "ChromLengths":
+        """Index ``path`` in memory, without a cache directory."""
+        return cls(build_index(path))
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        return self.source_size == stat.st_size and self.source_mtime_ns == stat.st_mtime_ns
+
+    def __len__(self):
+        return self._count
+
+    def record(self, index: int) -> Tuple[str, int, int]:
+        """Return ``(chrom, length, line_number)`` of the ``index``-th sequence in file order."""
+        length, line_num, name_offset, name_length = RECORD.unpack_from(
+            self._buffer, self._records_offset + index * RECORD.size
+        )
+        start = self._names_offset + name_offset
+        return self._buffer[start : start + name_length].decode("utf-8", errors="replace"), length, line_num
+
+    def _name(self, index: int) -> bytes:
+        _, _, name_offset, name_length = RECORD.unpack_from(self._buffer, self._records_offset + index * RECORD.size)
+        start = self._names_offset + name_offset
+        return self._buffer[start : start + name_length]
+
+    def _line_number(self, index: int) -> int:
+        return RECORD.unpack_from(self._buffer, self._records_offset + index * RECORD.size)[1]
+
+    def index(self, chrom: str) -> Optional[int]:
+        """Return the file order position of the first sequence named ``chrom``, or None."""
+        encoded = chrom.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            (record_index,) = SORTED_ENTRY.unpack_from(self._buffer, self._sorted_offset + mid * SORTED_ENTRY.size)
+            if self._name(record_index) < encoded:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count:
+            (record_index,) = SORTED_ENTRY.unpack_from(self._buffer, self._sorted_offset + low * SORTED_ENTRY.size)
+            if self._name(record_index) == encoded:
+                return record_index
+        return None
+
+    def index_at_line(self, line_num: int) -> int:
+        """Return the position of the first sequence listed on or after line ``line_num``."""
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._line_number(mid) < line_num:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def get(self, chrom: str, default: Optional[int] = None) -> Optional[int]:
+        """Return the length of ``chrom``."""
+        index = self.index(chrom)
+        if index is None:
+            return default
+        return self.record(index)[1]
+
+    def __contains__(self, chrom):
+        return self.index(chrom) is not None
+
+    def items(self, start: int = 0) -> Iterator[Tuple[str, int]]:
+        """Yield ``(chrom, length)`` pairs in file order, starting at position ``start``."""
+        for index in range(start, self._count):
+            chrom, length, _ = self.record(index)
+            yield chrom, length
+
+
+class ChromInfoStore:
+    """Process wide, read-through cache of :class:`ChromLengths` tables keyed by ``.len`` file path."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = DEFAULT_CHROM_INFO_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._tables: "OrderedDict[str, ChromLengths]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Optional[str]) -> Optional[ChromLengths]:
+        """Return the chromosome lengths listed in ``path``, or None if the file does not exist."""
+        if not path:
+            return None
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            table = self._tables.get(path)
+            if table is not None and table.is_current(stat):
+                self._tables.move_to_end(path)
+                self.hits += 1
+                return table
+            self.misses += 1
+        table = self._load(path, stat)
+        if self.max_size > 0:
+            with self._lock:
+                self._tables[path] = table
+                self._tables.move_to_end(path)
+                while len(self._tables) > self.max_size:
+                    self._tables.popitem(last=False)
+        return table
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Forget the table of ``path``, or all tables."""
+        with self._lock:
+            if path is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(os.path.abspath(path), None)
+
+    def index_path(self, path: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(path.encode('utf-8')).hexdigest()}.idx")
+
+    def _load(self, path: str, stat: os.stat_result) -> ChromLengths:
+        index_path = self.index_path(path)
+        if index_path is None:
+            return ChromLengths.from_len_file(path)
+        table = self._map(index_path)
+        if table is not None and table.is_current(stat):
+            return table
+        index = build_index(path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as fh:
+                fh.write(index)
+            os.replace(fh.name, index_path)
+        except OSError:
+            log.warning("Failed to write chromosome length index for '%s' to '%s'", path, self.cache_dir, exc_info=True)
+            return ChromLengths(index)
+        return self._map(index_path) or ChromLengths(index)
+
+    def _map(self, index_path: str) -> Optional[ChromLengths]:
+        try:
+            with open(index_path, "rb") as fh:
+                buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return ChromLengths(buffer)
+        except (ValueError, struct.error):
+            buffer.close()
+            return None
@@ -4,6 +4,7 @@ Functionality for dealing with dbkeys.
 import logging
 import os.path
 import re
+import threading
 from json import loads
 
 from galaxy.util import (
@@ -11,6 +12,7 @@ from galaxy.util import (
     sanitize_lists_to_string,
     unicodify,
 )
+from galaxy.util.chrom_info import ChromInfoStore
 
 log = logging.getLogger(__name__)
 
@@ -79,6 +81,28 @@ class GenomeBuilds:
             self._static_dbkeys = list(read_dbnames(app.config.builds_file_path))
         else:
             self._static_dbkeys = []
+        self.chrom_info_store = ChromInfoStore(cache_dir=getattr(app.config, "chrom_info_cache_dir", None))
+        # Build names and len paths of the dbkey data table, rebuilt when the table is reloaded or changed
+        self._table_lock = threading.Lock()
+        self._table_snapshot = (None, None, [], {})
+
+    def _dbkey_table_entries(self):
+        """Return the (name list, dbkey to len path dict) of the dbkey data table's current version."""
+        dbkey_table = self._app.tool_data_tables.get(self._data_table_name, None)
+        if dbkey_table is None:
+            return [], {}
+        version = dbkey_table._loaded_content_version
+        table, table_version, names, len_paths = self._table_snapshot
+        if table is dbkey_table and table_version == version:
+            return names, len_paths
+        with self._table_lock:
+            names = []
+            len_paths = {}
+            for field_dict in dbkey_table.get_named_fields_list():
+                names.append((field_dict["value"], field_dict["name"]))
+                len_paths.setdefault(field_dict["value"], field_dict.get("len_path"))
+            self._table_snapshot = (dbkey_table, version, names, len_paths)
+        return names, len_paths
 
     def get_genome_build_names(self, trans=None):
         # FIXME: how to deal with key duplicates?
@@ -104,10 +128,7 @@ class GenomeBuilds:
         # Load old builds.txt static keys
         rval.extend(self._static_dbkeys)
         # load dbkeys from dbkey data table
-        dbkey_table = self._app.tool_data_tables.get(self._data_table_name, None)
-        if dbkey_table is not None:
-            for field_dict in dbkey_table.get_named_fields_list():
-                rval.append((field_dict["value"], field_dict["name"]))
+        rval.extend(self._dbkey_table_entries()[0])
         return rval
 
     def get_chrom_info(self, dbkey, trans=None, custom_build_hack_get_len_from_fasta_conversion=True):
@@ -148,9 +169,7 @@ class GenomeBuilds:
                         )
         # Check Data table
         if not chrom_info:
-            dbkey_table = self._app.tool_data_tables.get(self._data_table_name, None)
-            if dbkey_table is not None:
-                chrom_info = dbkey_table.get_entry("value", dbkey, "len_path", default=None)
+            chrom_info = self._dbkey_table_entries()[1].get(dbkey)
         # use configured server len path
         if not chrom_info:
             # Default to built-in build.
@@ -158,3 +177,8 @@ class GenomeBuilds:
             chrom_info = os.path.join(self._static_chrom_info_path, f"{sanitize_lists_to_string(dbkey)}.len")
         chrom_info = os.path.abspath(chrom_info)
         return (chrom_info, db_dataset)
+
+    def get_chrom_lengths(self, dbkey, trans=None):
+        """Return the indexed chromosome lengths of ``dbkey``, or None if it has no len file."""
+        chrom_info, _ = self.get_chrom_info(dbkey, trans=trans)
+        return self.chrom_info_store.get(chrom_info)
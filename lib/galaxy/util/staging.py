@@ -0,0 +1,124 @@
+"""
+Stage files and directory trees as cheaply as the file system allows.
+
+:func:`stage_file` places the content of a file at a target path using, in
+order of preference, a reflink (a copy-on-write clone sharing the data blocks
+of the source, supported by e.g. XFS, Btrfs and OpenZFS), a hard link (only if
+the caller allows the target to share the inode of the source, i.e. neither is
+modified in place afterwards) and finally a regular copy. :func:`stage_tree`
+does the same for all files below a directory, staging large trees in
+parallel.
+"""
+import errno
+import logging
+import os
+import shutil
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+log = logging.getLogger(__name__)
+
+# ioctl request cloning a whole file on Linux, see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+COPY = "copy"
+SAME_FILE = "same_file"
+
+# trees with at least this many files are staged by several threads
+PARALLEL_TREE_THRESHOLD = 32
+DEFAULT_TREE_WORKERS = 4
+
+
+def reflink(source: str, target: str) -> None:
+    """Clone ``source`` to the new file ``target``, raise ``OSError`` if the file system can't."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are only supported on Linux")
+    import fcntl
+
+    with open(source, "rb") as source_fh:
+        target_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            fcntl.ioctl(target_fd, FICLONE, source_fh.fileno())
+        except OSError:
+            os.close(target_fd)
+            os.unlink(target)
+            raise
+        os.close(target_fd)
+    shutil.copymode(source, target)
+
+
+def stage_file(source: str, target: str, hardlink: bool = False) -> str:
+    """Place the content of ``source`` at ``target``, replacing it, and return how it was staged.
+
+    ``target`` is replaced atomically, so readers never see a partially
+    staged file. If ``hardlink`` is true, ``target`` may become a hard link
+    to ``source`` if reflinks are not supported.
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return SAME_FILE
+    staging_path = f"{target}.{os.getpid()}.{threading.get_ident()}.staging"
+    try:
+        method = _stage_new_file(source, staging_path, hardlink)
+        os.replace(staging_path, target)
+    except BaseException:
+        try:
+            os.unlink(staging_path)
+        except OSError:
+            pass
+        raise
+    return method
+
+
+def _stage_new_file(source: str, target: str, hardlink: bool) -> str:
+    try:
+        reflink(source, target)
+        return REFLINK
+    except OSError as e:
+        log.debug("Could not reflink %s to %s: %s", source, target, e)
+    # like a copy, the staged file must belong to the staging user
+    if hardlink and os.stat(source).st_uid == os.getuid():
+        try:
+            os.link(source, target)
+            return HARDLINK
+        except OSError as e:
+            log.debug("Could not hard link %s to %s: %s", source, target, e)
+    shutil.copy(source, target)
+    return COPY
+
+
+def stage_tree(
+    source: str, target: str, hardlink: bool = False, max_workers: int = DEFAULT_TREE_WORKERS
+) -> Dict[str, int]:
+    """Stage all files below the directory ``source`` to ``target`` with :func:`stage_file`.
+
+    Symbolic links are followed like :func:`shutil.copytree` does by default.
+    Return the number of files staged by each method.
+    """
+    files: List[Tuple[str, str]] = []
+    directories: List[Tuple[str, str]] = []
+    for root, _, filenames in os.walk(source, followlinks=True):
+        target_root = os.path.normpath(os.path.join(target, os.path.relpath(root, source)))
+        os.makedirs(target_root, exist_ok=True)
+        directories.append((root, target_root))
+        files.extend((os.path.join(root, name), os.path.join(target_root, name)) for name in filenames)
+
+    def stage(paths: Tuple[str, str]) -> str:
+        return stage_file(paths[0], paths[1], hardlink=hardlink)
+
+    if max_workers > 1 and len(files) >= PARALLEL_TREE_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            methods = list(executor.map(stage, files))
+    else:
+        methods = [stage(paths) for paths in files]
+    for source_directory, target_directory in reversed(directories):
+        shutil.copystat(source_directory, target_directory)
+    return dict(Counter(methods))
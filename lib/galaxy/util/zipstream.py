@@ -1,6 +1,12 @@
+import logging
 import os
 import zlib
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
 from typing import (
+    Callable,
     Dict,
     Iterator,
     List,
@@ -13,13 +19,60 @@ import zipstream
 
 from .path import safe_walk
 
+log = logging.getLogger(__name__)
+
 CRC32_MIN = 1444
 CRC32_MAX = 1459
+# Number of threads resolving paths of upcoming lazy entries (e.g. pulling datasets
+# into the object store cache) and how far ahead of the entry being streamed they may run.
+DEFAULT_PREFETCH_WORKERS = 4
+DEFAULT_PREFETCH_LOOKAHEAD = 8
+CHUNK_SIZE = 2**16
+
+
+class PathPrefetcher:
+    """Resolve the paths of lazy archive entries ahead of the entry being streamed.
+
+    At most ``lookahead`` paths are resolved (and thus possibly held in a cache) beyond
+    the entry currently being read, entries are still handed out in order.
+    """
+
+    def __init__(
+        self,
+        get_paths: List[Callable[[], str]],
+        workers: int = DEFAULT_PREFETCH_WORKERS,
+        lookahead: int = DEFAULT_PREFETCH_LOOKAHEAD,
+    ) -> None:
+        self.get_paths = get_paths
+        self.lookahead = lookahead
+        self.futures: Dict[int, Future] = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def get(self, index: int) -> str:
+        if self.executor is None:
+            return self.get_paths[index]()
+        for i in range(index, min(index + self.lookahead + 1, len(self.get_paths))):
+            if i not in self.futures:
+                self.futures[i] = self.executor.submit(self.get_paths[i])
+        return self.futures.pop(index).result()
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            # The download may have been aborted, don't fetch entries nobody is waiting for.
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+            self.executor.shutdown(wait=False)
 
 
 class ZipstreamWrapper:
     def __init__(
-        self, archive_name: Optional[str] = None, upstream_mod_zip: bool = False, upstream_gzip: bool = False
+        self,
+        archive_name: Optional[str] = None,
+        upstream_mod_zip: bool = False,
+        upstream_gzip: bool = False,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+        prefetch_lookahead: int = DEFAULT_PREFETCH_LOOKAHEAD,
     ) -> None:
         self.upstream_mod_zip = upstream_mod_zip
         self.archive_name = archive_name
@@ -30,13 +83,22 @@ class ZipstreamWrapper:
         self.files: List[str] = []
         self.directories: Set[str] = set()
         self.size = 0
+        self.prefetch_workers = prefetch_workers
+        self.prefetch_lookahead = prefetch_lookahead
+        self._lazy_paths: List[Callable[[], str]] = []
+        self._prefetcher: Optional[PathPrefetcher] = None
 
     def response(self) -> Iterator[bytes]:
         if self.upstream_mod_zip:
             dir_lines = [f"0 0 @directory {directory}" for directory in self.directories]
             yield "\n".join(dir_lines + self.files).encode()
         else:
-            yield from iter(self.archive)
+            self._prefetcher = PathPrefetcher(self._lazy_paths, self.prefetch_workers, self.prefetch_lookahead)
+            try:
+                yield from iter(self.archive)
+            finally:
+                self._prefetcher.shutdown()
+                self._prefetcher = None
 
     def get_headers(self) -> Dict[str, str]:
         headers = {}
@@ -80,3 +142,31 @@ class ZipstreamWrapper:
                     self.add_path(file_path, os.path.relpath(file_path, pardir))
         else:
             self.add_path(path, archive_name or os.path.basename(path))
+
+    def write_lazy(self, get_path: Callable[[], str], archive_name: str) -> None:
+        """Add a file whose path is only resolved while the archive is streamed.
+
+        ``get_path`` is called from a prefetch thread, so it must not rely on
+        thread-local state such as a database session. As the response has
+        started by then, the caller should make sure the file exists, if
+        ``get_path`` fails the archive is aborted.
+        """
+        if self.upstream_mod_zip:
+            # nginx reads the files, the paths have to be known now.
+            self.add_path(get_path(), archive_name)
+        else:
+            index = len(self._lazy_paths)
+            self._lazy_paths.append(get_path)
+            self.archive.write_iter(archive_name, self._iter_lazy_path(index, archive_name))
+
+    def _iter_lazy_path(self, index: int, archive_name: str) -> Iterator[bytes]:
+        assert self._prefetcher is not None
+        path = self._prefetcher.get(index)
+        if not path:
+            # Part of the archive has already been sent, abort the download rather than
+            # silently writing an empty entry. Callers check that files exist beforehand.
+            log.error("Failed to determine file name for archive entry %s, aborting archive", archive_name)
+            raise FileNotFoundError(f"Failed to determine file name for archive entry {archive_name}")
+        self.size += os.stat(path).st_size
+        with open(path, "rb") as contents:
+            yield from iter(lambda: contents.read(CHUNK_SIZE), b"")
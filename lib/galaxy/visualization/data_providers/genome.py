@@ -8,11 +8,15 @@ import os
 import random
 import re
 import sys
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from json import loads
 from typing import (
     Any,
+    Callable,
     Dict,
+    Hashable,
     IO,
     Iterator,
     List,
@@ -41,6 +45,7 @@ from galaxy.datatypes.util.gff_util import (
 from galaxy.model import DatasetInstance
 from galaxy.visualization.data_providers.basic import BaseDataProvider
 from galaxy.visualization.data_providers.cigar import get_ref_based_read_seq_and_cigar
+from galaxy.visualization.genomes import GenomeRegion
 
 #
 # Utility functions.
@@ -96,6 +101,184 @@ def _chrom_naming_matches(chrom1, chrom2):
     )
 
 
+def _dataset_file_key(dataset) -> Optional[Tuple[str, float, int]]:
+    """
+    Returns a key identifying the on-disk state of a dataset's file: path,
+    modification time and size. Returns None if the dataset has no file.
+    """
+    if dataset is None:
+        return None
+    file_name = dataset.file_name
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return (file_name, 0, 0)
+    return (file_name, stat.st_mtime, stat.st_size)
+
+
+class DataFileHandlePool:
+    """
+    Bounded, per-process pool of open data file handles (pysam files, BBI
+    readers) keyed by the data file and index they were opened with.
+
+    Handles are checked out exclusively for the duration of a request and
+    returned to the pool afterwards, so concurrent requests never share a
+    handle. At most ``max_size`` idle handles are kept; the least recently
+    used ones are closed first.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._idle: "OrderedDict[Tuple[Hashable, int], Tuple[Any, Callable[[Any], None]]]" = OrderedDict()
+        self._counter = 0
+
+    @contextmanager
+    def checkout(self, key: Hashable, opener: Callable[[], Any], closer: Callable[[Any], None]):
+        handle = self._acquire(key)
+        if handle is None:
+            handle = opener()
+        try:
+            yield handle
+        except BaseException:
+            # Handle may be in an inconsistent state, don't reuse it.
+            closer(handle)
+            raise
+        self._release(key, handle, closer)
+
+    def clear(self):
+        with self._lock:
+            idle = list(self._idle.values())
+            self._idle.clear()
+        for handle, closer in idle:
+            closer(handle)
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _acquire(self, key: Hashable):
+        with self._lock:
+            for pool_key in reversed(self._idle):
+                if pool_key[0] == key:
+                    handle, _ = self._idle.pop(pool_key)
+                    return handle
+        return None
+
+    def _release(self, key: Hashable, handle, closer: Callable[[Any], None]):
+        evicted = []
+        with self._lock:
+            self._counter += 1
+            self._idle[(key, self._counter)] = (handle, closer)
+            while len(self._idle) > self.max_size:
+                evicted.append(self._idle.popitem(last=False)[1])
+        for evicted_handle, evicted_closer in evicted:
+            evicted_closer(evicted_handle)
+
+
+class ChromNameCache:
+    """
+    Memoizes which chromosome name (as requested or converted between UCSC and
+    Ensembl naming) a dataset actually uses, so the alternative name is not
+    retried on every region request.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._names: "OrderedDict[Tuple[Hashable, str], Optional[str]]" = OrderedDict()
+
+    def resolve(self, key: Hashable, chrom: str, contigs) -> Optional[str]:
+        """
+        Returns the name under which ``chrom`` is found in ``contigs``, or None
+        if neither naming convention matches.
+        """
+        cache_key = (key, chrom)
+        with self._lock:
+            if cache_key in self._names:
+                self._names.move_to_end(cache_key)
+                return self._names[cache_key]
+        resolved: Optional[str] = None
+        contigs = set(contigs)
+        if chrom in contigs:
+            resolved = chrom
+        else:
+            alternative = _convert_between_ucsc_and_ensemble_naming(chrom)
+            if alternative in contigs:
+                resolved = alternative
+        self.record(key, chrom, resolved)
+        return resolved
+
+    def lookup(self, key: Hashable, chrom: str) -> Optional[str]:
+        """
+        Returns the previously recorded name for ``chrom`` or None if unknown.
+        """
+        with self._lock:
+            return self._names.get((key, chrom))
+
+    def record(self, key: Hashable, chrom: str, resolved: Optional[str]):
+        with self._lock:
+            self._names[(key, chrom)] = resolved
+            self._names.move_to_end((key, chrom))
+            while len(self._names) > self.max_size:
+                self._names.popitem(last=False)
+
+
+class TileCache:
+    """
+    Small LRU cache of rendered ``get_data`` results keyed by dataset files and
+    request window, so that repeated windows (e.g. when scrolling back and
+    forth in the track browser) are not re-read from disk.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._tiles: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+
+    def get_or_compute(self, key: Optional[Hashable], compute: Callable[[], Any]):
+        if key is None:
+            return compute()
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+        if tile is not None:
+            # Callers annotate the returned dictionary, hand out a copy.
+            return dict(tile)
+        data = compute()
+        if isinstance(data, dict):
+            with self._lock:
+                self._tiles[key] = dict(data)
+                while len(self._tiles) > self.max_size:
+                    self._tiles.popitem(last=False)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+
+
+def _tile_key_value(value) -> Hashable:
+    if isinstance(value, GenomeRegion):
+        # Reference sequence is fully determined by the region.
+        return ("region", str(value))
+    hash(value)
+    return value
+
+
+def _close_handle(handle):
+    handle.close()
+
+
+def _close_bbi_handle(handle):
+    handle[0].close()
+
+
+data_file_handle_pool = DataFileHandlePool()
+chrom_name_cache = ChromNameCache()
+tile_cache = TileCache()
+
+
 class FeatureLocationIndexDataProvider(BaseDataProvider):
     """
     Reads/writes/queries feature location index (FLI) datasets.
@@ -221,10 +404,37 @@ class GenomeDataProvider(BaseDataProvider):
             dataset_type, data
         """
         start, end = int(low), int(high)
-        with self.open_data_file() as data_file:
-            iterator = self.get_iterator(data_file, chrom, start, end, **kwargs)
-            data = self.process_data(iterator, start_val, max_vals, start=start, end=end, **kwargs)
-        return data
+
+        def compute():
+            with self.open_data_file() as data_file:
+                iterator = self.get_iterator(data_file, chrom, start, end, **kwargs)
+                return self.process_data(iterator, start_val, max_vals, start=start, end=end, **kwargs)
+
+        return tile_cache.get_or_compute(self._tile_key(chrom, start, end, start_val, max_vals, **kwargs), compute)
+
+    def _data_files_key(self) -> Hashable:
+        """
+        Returns a key identifying the files this provider reads from. Used to
+        key pooled file handles, memoized chromosome names and cached tiles.
+        """
+        dependencies = self.dependencies or {}
+        return (
+            type(self).__name__,
+            _dataset_file_key(self.original_dataset),
+            _dataset_file_key(self.converted_dataset),
+            tuple((name, _dataset_file_key(dep)) for name, dep in sorted(dependencies.items())),
+        )
+
+    def _tile_key(self, chrom, start, end, start_val, max_vals, **kwargs) -> Optional[Hashable]:
+        """
+        Returns the tile cache key for a request or None if the request
+        cannot be cached.
+        """
+        try:
+            request_key = tuple((name, _tile_key_value(value)) for name, value in sorted(kwargs.items()))
+        except TypeError:
+            return None
+        return (self._data_files_key(), str(chrom), start, end, start_val, max_vals, request_key)
 
     def get_genome_data(self, chroms_info, **kwargs):
         """
@@ -349,7 +559,10 @@ class TabixDataProvider(GenomeDataProvider, FilterableMixin):
         # We create a symlink to the index file. This is
         # required until https://github.com/pysam-developers/pysam/pull/586 is merged.
         index_path = self.converted_dataset.file_name
-        with pysam.TabixFile(self.dependencies["bgzip"].file_name, index=index_path) as f:
+        data_path = self.dependencies["bgzip"].file_name
+        with data_file_handle_pool.checkout(
+            self._data_files_key(), lambda: pysam.TabixFile(data_path, index=index_path), _close_handle
+        ) as f:
             yield f
 
     def get_iterator(self, data_file, chrom, start, end, **kwargs) -> Iterator[str]:
@@ -362,13 +575,9 @@ class TabixDataProvider(GenomeDataProvider, FilterableMixin):
             end = 2 << 29 - 1  # Tabix-enforced maximum
         # Get iterator using either naming scheme.
         iterator: Iterator[str] = iter([])
-        if chrom in data_file.contigs:
-            iterator = data_file.fetch(reference=chrom, start=start, end=end)
-        else:
-            # Try alternative naming scheme.
-            chrom = _convert_between_ucsc_and_ensemble_naming(chrom)
-            if chrom in data_file.contigs:
-                iterator = data_file.fetch(reference=chrom, start=start, end=end)
+        resolved_chrom = chrom_name_cache.resolve(self._data_files_key(), chrom, data_file.contigs)
+        if resolved_chrom is not None:
+            iterator = data_file.fetch(reference=resolved_chrom, start=start, end=end)
 
         return iterator
 
@@ -872,8 +1081,12 @@ class BamDataProvider(GenomeDataProvider, FilterableMixin):
     @contextmanager
     def open_data_file(self):
         # Attempt to open the BAM file with index
-        with pysam.AlignmentFile(
-            self.original_dataset.file_name, mode="rb", index_filename=self.converted_dataset.file_name
+        data_path = self.original_dataset.file_name
+        index_path = self.converted_dataset.file_name
+        with data_file_handle_pool.checkout(
+            self._data_files_key(),
+            lambda: pysam.AlignmentFile(data_path, mode="rb", index_filename=index_path),
+            _close_handle,
         ) as f:
             yield f
 
@@ -886,15 +1099,14 @@ class BamDataProvider(GenomeDataProvider, FilterableMixin):
         chrom = str(chrom)
         start = int(start)
         end = int(end)
+        # Use whichever chrom naming the BAM header uses.
+        resolved_chrom = chrom_name_cache.resolve(self._data_files_key(), chrom, data_file.references)
+        if resolved_chrom is None:
+            return iter([])
         try:
-            data = data_file.fetch(start=start, end=end, reference=chrom)
+            data = data_file.fetch(start=start, end=end, reference=resolved_chrom)
         except ValueError:
-            # Try alternative chrom naming.
-            chrom = _convert_between_ucsc_and_ensemble_naming(chrom)
-            try:
-                data = data_file.fetch(start=start, end=end, reference=chrom)
-            except ValueError:
-                return iter([])
+            return iter([])
         return data
 
     def process_data(
@@ -1170,36 +1382,59 @@ class BBIDataProvider(GenomeDataProvider):
         # No way to return this info as of now
         return None
 
+    @contextmanager
+    def open_data_file(self):
+        with data_file_handle_pool.checkout(self._data_files_key(), self._get_dataset, _close_bbi_handle) as handle:
+            yield handle
+
+    def _query_bbi(self, chrom, query):
+        """
+        Runs ``query`` against ``chrom`` using whichever chromosome naming the
+        file uses; the naming that last produced data is tried first.
+        """
+        key = self._data_files_key()
+        known_chrom = chrom_name_cache.lookup(key, chrom)
+        names = [chrom, _convert_between_ucsc_and_ensemble_naming(chrom)]
+        if known_chrom is not None and known_chrom != chrom:
+            names.reverse()
+        for name in names:
+            result = query(name)
+            if result:
+                chrom_name_cache.record(key, chrom, name)
+                return result
+        return result
+
     def has_data(self, chrom):
-        f, bbi = self._get_dataset()
-        all_dat = bbi.query(chrom, 0, 2147483647, 1) or bbi.query(
-            _convert_between_ucsc_and_ensemble_naming(chrom), 0, 2147483647, 1
-        )
-        f.close()
+        with self.open_data_file() as (_, bbi):
+            all_dat = self._query_bbi(chrom, lambda name: bbi.query(name, 0, 2147483647, 1))
         return all_dat is not None
 
     def get_data(self, chrom, start, end, start_val=0, max_vals=None, num_samples=1000, **kwargs):
         start = int(start)
         end = int(end)
 
+        def compute():
+            # Bigwig can be a standalone bigwig file, in which case we use
+            # original_dataset, or coming from wig->bigwig conversion in
+            # which we use converted_dataset
+            with self.open_data_file() as (_, bbi):
+                return self._get_bbi_data(bbi, chrom, start, end, num_samples, **kwargs)
+
+        return tile_cache.get_or_compute(
+            self._tile_key(chrom, start, end, start_val, max_vals, num_samples=num_samples, **kwargs), compute
+        )
+
+    def _get_bbi_data(self, bbi, chrom, start, end, num_samples, **kwargs):
         # Helper function for getting summary data regardless of chromosome
         # naming convention.
         def _summarize_bbi(bbi, chrom, start, end, num_points):
-            return bbi.summarize(chrom, start, end, num_points) or bbi.summarize(
-                _convert_between_ucsc_and_ensemble_naming(chrom), start, end, num_points
-            )
-
-        # Bigwig can be a standalone bigwig file, in which case we use
-        # original_dataset, or coming from wig->bigwig conversion in
-        # which we use converted_dataset
-        f, bbi = self._get_dataset()
+            return self._query_bbi(chrom, lambda name: bbi.summarize(name, start, end, num_points))
 
         # If stats requested, compute overall summary data for the range
         # start:endbut no reduced data. This is currently used by client
         # to determine the default range.
         if "stats" in kwargs:
             summary = _summarize_bbi(bbi, chrom, start, end, 1)
-            f.close()
 
             min_val = 0
             max_val = 0
@@ -1282,9 +1517,6 @@ class BBIDataProvider(GenomeDataProvider):
             num_points += additional_points
 
         result = summarize_region(bbi, chrom, start, end, num_points)
-
-        # Cleanup and return.
-        f.close()
         return {"data": result, "dataset_type": self.dataset_type}
 
 
@@ -13,6 +13,7 @@ from galaxy.exceptions import (
 )
 from galaxy.structured_app import StructuredApp
 from galaxy.util.bunch import Bunch
+from galaxy.util.chrom_info import ChromLengths
 
 log = logging.getLogger(__name__)
 
@@ -78,11 +79,12 @@ class Genome:
     Encapsulates information about a known genome/dbkey.
     """
 
-    def __init__(self, key, description, len_file=None, twobit_file=None):
+    def __init__(self, key, description, len_file=None, twobit_file=None, chrom_info_store=None):
         self.key = key
         self.description = description
         self.len_file = len_file
         self.twobit_file = twobit_file
+        self.chrom_info_store = chrom_info_store
 
     def to_dict(self, num=None, chrom=None, low=None):
         """
@@ -121,71 +123,58 @@ class Genome:
         #   (a) chrom name, len;
         #   (b) whether there are previous, next chroms;
         #   (c) index of start chrom.
+        # Line numbers of the len file are used as chrom indices.
         #
-        with open(self.len_file) as f:
-            len_file_enumerate = enumerate(f)
-            chroms = {}
-            prev_chroms = False
-            start_index = 0
-            if chrom:
-                # Use starting chrom to start list.
-                found = False
-                count = 0
-                for line_num, line in len_file_enumerate:
-                    if line.startswith("#"):
-                        continue
-                    name, len = line.split("\t")
-                    if found:
-                        chroms[name] = int(len)
-                        count += 1
-                    elif name == chrom:
-                        # Found starting chrom.
-                        chroms[name] = int(len)
-                        count += 1
-                        found = True
+        chrom_lengths = self.chrom_lengths()
+        chroms = {}
+        prev_chroms = False
+        next_chroms = False
+        start_index = 0
+        if chrom:
+            # Use starting chrom to start list.
+            first = chrom_lengths.index(chrom)
+            if first is not None:
+                last = min(first + num, len(chrom_lengths))
+                for i in range(first, last):
+                    name, length, line_num = chrom_lengths.record(i)
+                    chroms[name] = length
+                    if i == first:
                         start_index = line_num
-                        if line_num != 0:
-                            prev_chroms = True
-                    if count >= num:
-                        break
-            else:
-                # Use low to start list.
-                high = low + int(num)
-                prev_chroms = low != 0
-                start_index = low
-
-                # Read chrom data from len file.
-                for line_num, line in len_file_enumerate:
-                    if line_num < low:
-                        continue
-                    if line_num >= high:
-                        break
-                    if line.startswith("#"):
-                        continue
-                    # LEN files have format:
-                    #   <chrom_name><tab><chrom_length>
-                    fields = line.split("\t")
-                    chroms[fields[0]] = int(fields[1])
-
-            # Set flag to indicate whether there are more chroms after list.
-            next_chroms = False
-            try:
-                next(len_file_enumerate)
-                next_chroms = True
-            except StopIteration:
-                # No more chroms to read.
-                pass
-
-            to_sort = [{"chrom": chrm, "len": length} for chrm, length in chroms.items()]
-            to_sort.sort(key=lambda _: split_by_number(_["chrom"]))
-            return {
-                "id": self.key,
-                "reference": self.twobit_file is not None,
-                "chrom_info": to_sort,
-                "prev_chroms": prev_chroms,
-                "next_chroms": next_chroms,
-                "start_index": start_index,
-            }
+                        prev_chroms = line_num != 0
+                # Set flag to indicate whether there are more chroms after list.
+                next_chroms = last - first >= num and line_num + 1 < chrom_lengths.line_count
+        else:
+            # Use low to start list.
+            high = low + int(num)
+            prev_chroms = low != 0
+            start_index = low
+            for i in range(chrom_lengths.index_at_line(low), len(chrom_lengths)):
+                name, length, line_num = chrom_lengths.record(i)
+                if line_num >= high:
+                    break
+                chroms[name] = length
+            # The line at ``high`` ends the list, more chroms follow it.
+            next_chroms = chrom_lengths.line_count > high + 1
+
+        to_sort = [{"chrom": chrm, "len": length} for chrm, length in chroms.items()]
+        to_sort.sort(key=lambda _: split_by_number(_["chrom"]))
+        return {
+            "id": self.key,
+            "reference": self.twobit_file is not None,
+            "chrom_info": to_sort,
+            "prev_chroms": prev_chroms,
+            "next_chroms": next_chroms,
+            "start_index": start_index,
+        }
+
+    def chrom_lengths(self):
+        """Return the indexed chromosome lengths of ``len_file``."""
+        chrom_lengths = None
+        if self.chrom_info_store is not None:
+            chrom_lengths = self.chrom_info_store.get(self.len_file)
+        if chrom_lengths is None:
+            chrom_lengths = ChromLengths.from_len_file(self.len_file)
+        return chrom_lengths
 
 
 class Genomes:
@@ -227,7 +216,7 @@ class Genomes:
                 # Thrown if twobit.loc does not exist.
                 log.exception("Error reading twobit.loc")
         for key, description in self.app.genome_builds.get_genome_build_names():
-            self.genomes[key] = Genome(key, description)
+            self.genomes[key] = Genome(key, description, chrom_info_store=self.app.genome_builds.chrom_info_store)
             # Add len files to genomes.
             self.genomes[key].len_file = self.app.genome_builds.get_chrom_info(key)[0]
             if self.genomes[key].len_file:
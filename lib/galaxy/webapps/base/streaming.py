@@ -0,0 +1,92 @@
+"""Incrementally serialized JSON responses for large API lists.
+
+Instead of building the whole list of dictionaries and serializing it in one
+go, :func:`streaming_json_response` encodes items as they are produced and
+writes them out as a chunked JSON array - byte for byte what a
+``JSONResponse`` of the same list would contain - or, if the client accepts
+``application/x-ndjson``, as newline delimited JSON. Peak memory is bounded
+by the batch the producer works on rather than by the size of the response.
+"""
+import json
+from itertools import chain
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+)
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+JSON_MEDIA_TYPE = "application/json"
+
+# Encoded items are written out once they add up to this many bytes.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def accepts_ndjson(accept: Optional[str]) -> bool:
+    """Return True if the ``Accept`` header value ``accept`` lists the NDJSON media type."""
+    if not accept:
+        return False
+    return NDJSON_MEDIA_TYPE in (media_range.split(";")[0].strip() for media_range in accept.split(","))
+
+
+def encode_json(item: Any) -> bytes:
+    """Encode ``item`` like FastAPI's ``jsonable_encoder`` and starlette's ``JSONResponse`` do.
+
+    Plain JSON data is dumped directly, ``jsonable_encoder`` - which is slow
+    on large structures - only runs for items holding other types.
+    """
+    try:
+        encoded = json.dumps(item, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+    except TypeError:
+        encoded = json.dumps(
+            jsonable_encoder(item), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        )
+    return encoded.encode("utf-8")
+
+
+def json_chunks(items: Iterable[Any], ndjson: bool = False, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield ``items`` encoded as a JSON array (or NDJSON), in chunks of about ``chunk_size`` bytes."""
+    buffer = []
+    buffered = 0
+    if not ndjson:
+        buffer.append(b"[")
+    first = True
+    for item in items:
+        encoded = encode_json(item)
+        if ndjson:
+            buffer.append(encoded)
+            buffer.append(b"\n")
+        else:
+            if not first:
+                buffer.append(b",")
+            buffer.append(encoded)
+        first = False
+        buffered += len(encoded) + 1
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if not ndjson:
+        buffer.append(b"]")
+    if buffer:
+        yield b"".join(buffer)
+
+
+def streaming_json_response(
+    items: Iterable[Any], accept: Optional[str] = None, chunk_size: int = STREAM_CHUNK_SIZE
+) -> StreamingResponse:
+    """Return a response streaming ``items`` as a JSON array, or as NDJSON if ``accept`` asks for it.
+
+    The first chunk is produced right away, so that errors raised while
+    fetching or serializing the first items are reported with the usual
+    error response instead of a truncated body.
+    """
+    ndjson = accepts_ndjson(accept)
+    chunks = json_chunks(items, ndjson=ndjson, chunk_size=chunk_size)
+    first_chunk = next(chunks, None)
+    content = chain([first_chunk], chunks) if first_chunk is not None else iter(())
+    return StreamingResponse(content, media_type=NDJSON_MEDIA_TYPE if ndjson else JSON_MEDIA_TYPE)
@@ -104,7 +104,10 @@ class ContainerResolutionAPIController(BaseGalaxyAPIController):
         kwds.update(payload)
         kwds["install"] = True
         kwds["session"] = requests.session()
-        return self._view.resolve_toolbox(**kwds)
+        rval = self._view.resolve_toolbox(**kwds)
+        # Newly installed images may resolve requirements memoized without a container.
+        self._view.invalidate_requirements_cache()
+        return rval
 
     @expose_api
     @require_admin
@@ -123,4 +126,33 @@ class ContainerResolutionAPIController(BaseGalaxyAPIController):
         """
         kwds.update(payload)
         kwds["install"] = True
-        return self._view.resolve(**kwds)
+        rval = self._view.resolve(**kwds)
+        self._view.invalidate_requirements_cache()
+        return rval
+
+    @expose_api
+    @require_admin
+    def requirements_cache(self, trans, **kwds):
+        """
+        GET /api/container_resolvers/cache
+
+        Describe the memoized container and dependency resolutions of the answering
+        Galaxy process.
+
+        :rtype:     dict
+        :returns:   size, hits, misses and hit rate of the container (``containers``)
+                    and dependency (``dependencies``) resolution caches.
+        """
+        return self._view.requirements_cache()
+
+    @expose_api
+    @require_admin
+    def invalidate_requirements_cache(self, trans, **kwds):
+        """
+        DELETE /api/container_resolvers/cache
+
+        Forget memoized container and dependency resolutions in all Galaxy processes,
+        e.g. after images have been pulled outside of Galaxy.
+        """
+        self._view.invalidate_requirements_cache()
+        return self._view.requirements_cache()
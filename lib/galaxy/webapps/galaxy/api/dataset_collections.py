@@ -3,6 +3,7 @@ from typing import Optional
 
 from fastapi import (
     Body,
+    Header,
     Path,
     Query,
 )
@@ -15,6 +16,7 @@ from galaxy.schema.schema import (
     DatasetCollectionInstanceType,
     HDCADetailed,
 )
+from galaxy.webapps.base.streaming import streaming_json_response
 from galaxy.webapps.galaxy.api import (
     depends,
     DependsOnTrans,
@@ -127,5 +129,8 @@ class FastAPIDatasetCollections:
             default=None,
             description="The number of content elements that will be skipped before returning.",
         ),
+        accept: str = Header(default="application/json", include_in_schema=False),
     ) -> DatasetCollectionContentElements:
-        return self.service.contents(trans, hdca_id, parent_id, instance_type, limit, offset)
+        """The list is streamed as it is serialized; request `application/x-ndjson` to receive one element per line."""
+        elements = self.service.contents_iter(trans, hdca_id, parent_id, instance_type, limit, offset)
+        return streaming_json_response(elements, accept)  # type: ignore[return-value]
@@ -59,6 +59,10 @@ from galaxy.schema.schema import (
     WriteStoreToPayload,
 )
 from galaxy.web.framework.decorators import validation_error_to_message_exception
+from galaxy.webapps.base.streaming import (
+    NDJSON_MEDIA_TYPE,
+    streaming_json_response,
+)
 from galaxy.webapps.galaxy.api import (
     depends,
     DependsOnTrans,
@@ -356,6 +360,9 @@ class FastAPIHistoryContents:
                             "ref": "#/components/schemas/HistoryContentsWithStatsResult"
                         },
                     },
+                    NDJSON_MEDIA_TYPE: {
+                        "schema": {"type": "string", "description": "One history item as JSON per line."},
+                    },
                 },
             },
         },
@@ -377,17 +384,29 @@ class FastAPIHistoryContents:
         - The amount of information returned for each item can be customized.
 
         **Note**: Anonymous users are allowed to get their current history contents.
+
+        The list is streamed as it is serialized; request `application/x-ndjson`
+        to receive one item per line instead of a JSON array.
         """
-        items = self.service.index(
+        if accept == HistoryContentsWithStatsResult.__accept_type__:
+            return self.service.index(
+                trans,
+                history_id,
+                index_params,
+                legacy_params,
+                serialization_params,
+                filter_query_params,
+                accept,
+            )
+        items = self.service.index_iter(
             trans,
             history_id,
             index_params,
             legacy_params,
             serialization_params,
             filter_query_params,
-            accept,
         )
-        return items
+        return streaming_json_response(items, accept)  # type: ignore[return-value]
 
     @router.get(
         "/api/histories/{history_id}/contents/{type}s/{id}/jobs_summary",
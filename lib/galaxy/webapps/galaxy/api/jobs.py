@@ -19,6 +19,7 @@ from typing import (
 
 from fastapi import (
     Depends,
+    Header,
     Query,
 )
 
@@ -48,6 +49,7 @@ from galaxy.web import (
     require_admin,
 )
 from galaxy.webapps.base.controller import UsesVisualizationMixin
+from galaxy.webapps.base.streaming import streaming_json_response
 from galaxy.webapps.galaxy.api import (
     BaseGalaxyAPIController,
     depends,
@@ -207,7 +209,9 @@ class FastAPIJobs:
         search: Optional[str] = SearchQueryParam,
         limit: int = LimitQueryParam,
         offset: int = OffsetQueryParam,
+        accept: str = Header(default="application/json", include_in_schema=False),
     ) -> List[Dict[str, Any]]:
+        """The list is streamed as it is serialized; request `application/x-ndjson` to receive one job per line."""
         payload = JobIndexPayload.construct(
             states=states,
             user_details=user_details,
@@ -225,7 +229,7 @@ class FastAPIJobs:
             limit=limit,
             offset=offset,
         )
-        return self.service.index(trans, payload)
+        return streaming_json_response(self.service.index_iter(trans, payload), accept)  # type: ignore[return-value]
 
 
 class JobController(BaseGalaxyAPIController, UsesVisualizationMixin):
@@ -520,6 +520,18 @@ def populate_api_routes(webapp, app):
     webapp.mapper.connect(
         "/api/container_resolvers", action="index", controller="container_resolution", conditions=dict(method=["GET"])
     )
+    webapp.mapper.connect(
+        "/api/container_resolvers/cache",
+        action="requirements_cache",
+        controller="container_resolution",
+        conditions=dict(method=["GET"]),
+    )
+    webapp.mapper.connect(
+        "/api/container_resolvers/cache",
+        action="invalidate_requirements_cache",
+        controller="container_resolution",
+        conditions=dict(method=["DELETE"]),
+    )
     webapp.mapper.connect(
         "/api/container_resolvers/resolve",
         action="resolve",
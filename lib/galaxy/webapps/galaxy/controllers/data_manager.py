@@ -186,7 +186,7 @@ class DataManager(BaseUIController):
             "dataTable": {
                 "name": data_table.name,
                 "columns": data_table.get_column_name_list(),
-                "data": data_table.data,
+                "data": list(data_table.data),
             },
             "viewOnly": not_is_admin,
             "message": message,
@@ -8,6 +8,7 @@ from galaxy import (
     util,
     web,
 )
+from galaxy.managers.users import invalidate_api_key_cache
 from galaxy.webapps.base.controller import (
     BaseUIController,
     UsesFormDefinitionsMixin,
@@ -32,6 +33,7 @@ class User(BaseUIController, UsesFormDefinitionsMixin):
         new_key.key = trans.app.security.get_new_guid()
         trans.sa_session.add(new_key)
         trans.sa_session.flush()
+        invalidate_api_key_cache(trans.app, new_key.user_id)
         return self.get_all_users(trans)
 
     @web.expose
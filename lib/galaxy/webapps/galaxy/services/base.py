@@ -71,7 +71,7 @@ class ServiceBase:
         """
         Decodes all encoded IDs in the given list.
         """
-        return [self.decode_id(id) for id in ids]
+        return self.security.decode_ids([str(id) for id in ids])
 
     def encode_all_ids(self, rval, recursive: bool = False):
         """
@@ -1,5 +1,8 @@
 from logging import getLogger
 from typing import (
+    Any,
+    Dict,
+    Iterator,
     List,
     Optional,
     Set,
@@ -230,6 +233,39 @@ class DatasetCollectionsService(ServiceBase, UsesLibraryMixinItems):
         :rtype:     list
         :returns:   list of dataset collection elements and contents
         """
+        hdca, rval = self._contents_iter(trans, hdca_id, parent_id, instance_type, limit, offset)
+        try:
+            return DatasetCollectionContentElements.construct(__root__=list(rval))
+        except ValidationError:
+            log.exception(
+                f"Serializing DatasetCollectionContentsElements failed. Collection is populated: {hdca.collection.populated}"
+            )
+            raise
+
+    def contents_iter(
+        self,
+        trans: ProvidesHistoryContext,
+        hdca_id: DecodedDatabaseIdField,
+        parent_id: DecodedDatabaseIdField,
+        instance_type: DatasetCollectionInstanceType = "history",
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like `contents`, but fetches and serializes the elements as the
+        returned iterator is consumed. Permissions are checked right away.
+        """
+        return self._contents_iter(trans, hdca_id, parent_id, instance_type, limit, offset)[1]
+
+    def _contents_iter(
+        self,
+        trans: ProvidesHistoryContext,
+        hdca_id: DecodedDatabaseIdField,
+        parent_id: DecodedDatabaseIdField,
+        instance_type: DatasetCollectionInstanceType,
+        limit: Optional[int],
+        offset: Optional[int],
+    ):
         # validate HDCA for current user, will throw error if not permitted
         # TODO: refactor get_dataset_collection_instance
         if instance_type != "history":
@@ -247,7 +283,7 @@ class DatasetCollectionsService(ServiceBase, UsesLibraryMixinItems):
             )
 
         # retrieve contents
-        contents = self.collection_manager.get_collection_contents(trans, parent_id, limit=limit, offset=offset)
+        contents = self.collection_manager.iter_collection_contents(trans, parent_id, limit=limit, offset=offset)
 
         # dictify and tack on a collection_url for drilling down into nested collections
         def serialize_element(dsc_element) -> DCESummary:
@@ -262,11 +298,4 @@ class DatasetCollectionsService(ServiceBase, UsesLibraryMixinItems):
             trans.security.encode_all_ids(result, recursive=True)
             return result
 
-        rval = [serialize_element(el) for el in contents]
-        try:
-            return DatasetCollectionContentElements.construct(__root__=rval)
-        except ValidationError:
-            log.exception(
-                f"Serializing DatasetCollectionContentsElements failed. Collection is populated: {hdca.collection.populated}"
-            )
-            raise
+        return hdca, (serialize_element(el) for el in contents)
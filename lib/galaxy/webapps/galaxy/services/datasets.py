@@ -281,6 +281,7 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
             order_by=order_by,
             user_id=user.id,
         )
+        self.hda_serializer.prefetch_encoded_ids(contents)
         return [
             self.serializer_by_type[content.history_content_type].serialize_to_view(
                 content, user=user, trans=trans, **serialization_params.dict()
@@ -5,12 +5,15 @@ import re
 from enum import Enum
 from typing import (
     Any,
+    Callable,
     cast,
     Dict,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
+    Tuple,
     Union,
 )
 
@@ -317,6 +320,26 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             return self.__index_v2(trans, history_id, params, serialization_params, filter_query_params, accept)
         return self.__index_legacy(trans, history_id, legacy_params)
 
+    def index_iter(
+        self,
+        trans,
+        history_id: DecodedDatabaseIdField,
+        params: HistoryContentsIndexParams,
+        legacy_params: LegacyHistoryContentsIndexParams,
+        serialization_params: SerializationParams,
+        filter_query_params: FilterQueryParams,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like `index`, but returns an iterator over the serialized contents,
+        fetching and serializing them in batches as it is consumed.
+
+        The history and parameters are validated right away. Requesting
+        contents with stats is not supported.
+        """
+        if params.v == "dev":
+            return self.__index_v2_iter(trans, history_id, params, serialization_params, filter_query_params)
+        return self.__index_legacy_iter(trans, history_id, legacy_params)
+
     def show(
         self,
         trans,
@@ -792,7 +815,7 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         archive_base_name = filename or name_to_filename(history.name)
 
         # this is the fn applied to each dataset contained in the query
-        paths_and_files = []
+        paths_and_files: List[Tuple[Union[str, Callable[[], str]], str]] = []
 
         def build_archive_files_and_paths(content, *parents):
             archive_path = archive_base_name
@@ -833,7 +856,11 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
                 # some dataset names can contain their original file extensions, don't repeat
                 if not archive_path.endswith(f".{content.extension}"):
                     archive_path += f".{content.extension}"
-                paths_and_files.append((content.file_name, archive_path))
+                if dry_run:
+                    paths_and_files.append((content.file_name, archive_path))
+                else:
+                    # resolved while streaming, so that datasets can be fetched in parallel
+                    paths_and_files.append((hdas.dataset_file_name_getter(content), archive_path))
 
         # filter the contents that contain datasets using any filters possible from index above and map the datasets
         filters = self.history_contents_filters.parse_query_filters(filter_query_params)
@@ -850,7 +877,10 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             upstream_gzip=trans.app.config.upstream_gzip,
         )
         for file_path, archive_path in paths_and_files:
-            archive.write(file_path, archive_path)
+            if callable(file_path):
+                archive.write_lazy(file_path, archive_path)
+            else:
+                archive.write(file_path, archive_path)
         return archive
 
     def contents_near(
@@ -997,6 +1027,7 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
     # as a proc or view.
     def _expand_contents(self, trans, contents, serialization_params: SerializationParams):
         rval = []
+        self.hda_serializer.prefetch_encoded_ids(contents)
         for content in contents:
             if isinstance(content, HistoryDatasetAssociation):
                 dataset = self.hda_serializer.serialize_to_view(
@@ -1106,17 +1137,25 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         legacy_params: LegacyHistoryContentsIndexParams,
     ) -> HistoryContentsResult:
         """Legacy implementation of the `index` action."""
+        items = list(self.__index_legacy_iter(trans, history_id, legacy_params))
+        return HistoryContentsResult.construct(__root__=items)
+
+    def __index_legacy_iter(
+        self,
+        trans,
+        history_id: DecodedDatabaseIdField,
+        legacy_params: LegacyHistoryContentsIndexParams,
+    ) -> Iterator[Dict[str, Any]]:
         history = self._get_history(trans, history_id)
         legacy_params_dict = legacy_params.dict(exclude_defaults=True)
         ids = legacy_params_dict.get("ids")
         if ids:
             legacy_params_dict["ids"] = self.decode_ids(ids)
         contents = history.contents_iter(**legacy_params_dict)
-        items = [
+        return (
             self._serialize_legacy_content_item(trans, content, legacy_params_dict.get("dataset_details"))
             for content in contents
-        ]
-        return HistoryContentsResult.construct(__root__=items)
+        )
 
     def __index_v2(
         self,
@@ -1142,25 +1181,9 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             )
 
         serialization_params = self._handle_extra_serialization_for_media_type(serialization_params, accept)
-        filter_query_params.order = filter_query_params.order or "hid-asc"
-        order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
-        contents = self.history_contents_manager.contents(
-            history,
-            filters=filters,
-            limit=filter_query_params.limit,
-            offset=filter_query_params.offset,
-            order_by=order_by,
-            serialization_params=serialization_params,
+        items = list(
+            self.__serialize_contents(trans, history, filters, params, serialization_params, filter_query_params)
         )
-        items = [
-            self._serialize_content_item(
-                trans,
-                content,
-                dataset_details=params.dataset_details,
-                serialization_params=serialization_params,
-            )
-            for content in contents
-        ]
         if stats_requested:
             total_matches = self.history_contents_manager.contents_count(
                 history,
@@ -1170,6 +1193,47 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             return HistoryContentsWithStatsResult.construct(contents=items, stats=stats)
         return HistoryContentsResult.construct(__root__=items)
 
+    def __index_v2_iter(
+        self,
+        trans,
+        history_id: DecodedDatabaseIdField,
+        params: HistoryContentsIndexParams,
+        serialization_params: SerializationParams,
+        filter_query_params: FilterQueryParams,
+    ) -> Iterator[Dict[str, Any]]:
+        history = self._get_history(trans, history_id)
+        filters = self.history_contents_filters.parse_query_filters(filter_query_params)
+        return self.__serialize_contents(trans, history, filters, params, serialization_params, filter_query_params)
+
+    def __serialize_contents(
+        self,
+        trans,
+        history,
+        filters,
+        params: HistoryContentsIndexParams,
+        serialization_params: SerializationParams,
+        filter_query_params: FilterQueryParams,
+    ) -> Iterator[Dict[str, Any]]:
+        filter_query_params.order = filter_query_params.order or "hid-asc"
+        order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
+        contents_batches = self.history_contents_manager.contents_batches(
+            history,
+            filters=filters,
+            limit=filter_query_params.limit,
+            offset=filter_query_params.offset,
+            order_by=order_by,
+            serialization_params=serialization_params,
+        )
+        for contents in contents_batches:
+            self.hda_serializer.prefetch_encoded_ids(contents)
+            for content in contents:
+                yield self._serialize_content_item(
+                    trans,
+                    content,
+                    dataset_details=params.dataset_details,
+                    serialization_params=serialization_params,
+                )
+
     def _handle_extra_serialization_for_media_type(
         self,
         serialization_params: SerializationParams,
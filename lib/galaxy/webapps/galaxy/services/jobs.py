@@ -2,6 +2,7 @@ from enum import Enum
 from typing import (
     Any,
     Dict,
+    Iterator,
 )
 
 from galaxy import (
@@ -57,6 +58,17 @@ class JobsService:
         trans: ProvidesUserContext,
         payload: JobIndexPayload,
     ):
+        return list(self.index_iter(trans, payload))
+
+    def index_iter(
+        self,
+        trans: ProvidesUserContext,
+        payload: JobIndexPayload,
+    ) -> Iterator[Dict[str, Any]]:
+        """Like `index`, but serialize the jobs as the returned iterator is consumed.
+
+        Permissions are checked right away, the jobs are fetched with a server side cursor.
+        """
         security = trans.security
         is_admin = trans.user_is_admin
         if payload.view == JobIndexViewEnum.admin_job_list:
@@ -65,15 +77,15 @@ class JobsService:
         if payload.view == JobIndexViewEnum.admin_job_list and not is_admin:
             raise exceptions.AdminRequiredException("Only admins can use the admin_job_list view")
         query = self.job_manager.index_query(trans, payload)
-        out = []
         view = payload.view
-        for job in query.yield_per(model.YIELD_PER_ROWS):
+
+        def serialize(job):
             job_dict = job.to_dict(view, system_details=is_admin)
             j = security.encode_all_ids(job_dict, True)
             if view == JobIndexViewEnum.admin_job_list:
                 j["decoded_job_id"] = job.id
             if user_details:
                 j["user_email"] = job.get_user_email()
-            out.append(j)
+            return j
 
-        return out
+        return (serialize(job) for job in query.yield_per(model.YIELD_PER_ROWS))
@@ -539,9 +539,11 @@ class SubWorkflowModule(WorkflowModule):
         outputs = []
         self.post_job_actions = {}
         if hasattr(self.subworkflow, "workflow_outputs"):
-            from galaxy.managers.workflows import WorkflowContentsManager
+            workflow_contents_manager = getattr(self.trans.app, "workflow_contents_manager", None)
+            if workflow_contents_manager is None:
+                from galaxy.managers.workflows import WorkflowContentsManager
 
-            workflow_contents_manager = WorkflowContentsManager(self.trans.app)
+                workflow_contents_manager = WorkflowContentsManager(self.trans.app)
             subworkflow_dict = workflow_contents_manager._workflow_to_dict_editor(
                 trans=self.trans,
                 stored=self.subworkflow.stored_workflow,
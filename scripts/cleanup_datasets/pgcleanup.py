@@ -8,6 +8,7 @@ pgcleanup.py - A script for cleaning up datasets in Galaxy efficiently, by
 import argparse
 import datetime
 import inspect
+import json
 import logging
 import os
 import string
@@ -15,6 +16,7 @@ import sys
 import time
 import uuid
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import psycopg2
@@ -26,7 +28,10 @@ sys.path.insert(1, os.path.join(galaxy_root, "lib"))
 
 import galaxy.config
 from galaxy.exceptions import ObjectNotFound
-from galaxy.objectstore import build_object_store_from_config
+from galaxy.objectstore import (
+    build_object_store_from_config,
+    DEFAULT_DELETE_WORKERS,
+)
 from galaxy.util.script import (
     app_properties_from_args,
     populate_config_args,
@@ -34,6 +39,7 @@ from galaxy.util.script import (
 )
 
 DEFAULT_LOG_DIR = os.path.join(galaxy_root, "scripts", "cleanup_datasets")
+DEFAULT_DELETE_BATCH_SIZE = 1000
 
 log = logging.getLogger(__name__)
 
@@ -110,6 +116,8 @@ class Action:
         self._force_retry = app.args.force_retry
         self._epoch_time = str(int(time.time()))
         self._days = app.args.days
+        self._delete_workers = app.args.delete_workers
+        self._delete_batch_size = app.args.delete_batch_size
         self._config = app.config
         self._update = app._update
         self.__log = None
@@ -246,15 +254,22 @@ class Action:
 
 
 class RemovesObjects:
-    """Base class for mixins that remove objects from object stores."""
+    """Base class for mixins that remove objects from object stores.
+
+    Objects are removed in batches of ``--delete-batch-size``, up to ``--delete-workers`` at a time (or in bulk requests
+    if the object store supports them). The objects left to remove are recorded in a checkpoint file in the log
+    directory, so that a run interrupted after the database changes were committed resumes removing them.
+    """
 
     def _init(self):
         self.objects_to_remove = set()
         log.info("Initializing object store for action %s", self.name)
         self.object_store = build_object_store_from_config(self._config)
+        self._checkpoint_file = os.path.join(self._log_dir, self.name + ".checkpoint")
         self._register_row_method(self.collect_removed_object_info)
         self._register_post_method(self.remove_objects)
         self._register_exit_method(self.object_store.shutdown)
+        self.load_checkpoint()
 
     def collect_removed_object_info(self, row):
         object_id = getattr(row, self.id_column, None)
@@ -264,29 +279,88 @@ class RemovesObjects:
         if object_id:
             self.objects_to_remove.add(self.object_class(object_id, row.object_store_id, object_uuid))
 
-    def remove_objects(self):
-        for object_to_remove in sorted(self.objects_to_remove):
-            self.remove_object(object_to_remove)
+    def load_checkpoint(self):
+        """Add the objects an interrupted run did not get to remove to ``objects_to_remove``."""
+        if not os.path.exists(self._checkpoint_file):
+            return
+        objects, completed = [], 0
+        with open(self._checkpoint_file) as fh:
+            for line in fh:
+                entry = json.loads(line)
+                if "completed" in entry:
+                    completed = entry["completed"]
+                else:
+                    objects.append(self.object_class(**entry))
+        log.info("Resuming removal of %d objects from checkpoint: %s", len(objects) - completed, self._checkpoint_file)
+        self.objects_to_remove.update(objects[completed:])
 
-    def remove_from_object_store(self, object_to_remove, object_store_kwargs, entire_dir=False, check_exists=False):
+    def remove_objects(self):
+        objects = sorted(self.objects_to_remove)
+        checkpoint = None
+        if objects and not self._dry_run:
+            checkpoint = open(self._checkpoint_file, "w")
+            for object_to_remove in objects:
+                checkpoint.write(json.dumps(object_to_remove._asdict()) + "\n")
+            checkpoint.flush()
+        try:
+            start_time = time.time()
+            for start in range(0, len(objects), self._delete_batch_size):
+                batch = objects[start : start + self._delete_batch_size]
+                self.remove_from_object_store(
+                    [(o, *removal) for o in batch for removal in self.object_store_removals(o)]
+                )
+                completed = start + len(batch)
+                if checkpoint:
+                    checkpoint.write(json.dumps({"completed": completed}) + "\n")
+                    checkpoint.flush()
+                elapsed = time.time() - start_time
+                log.info("Removed %d/%d objects (%.1f objects/s)", completed, len(objects), completed / (elapsed or 1))
+        finally:
+            if checkpoint:
+                checkpoint.close()
+        if checkpoint:
+            os.unlink(self._checkpoint_file)
+
+    def remove_from_object_store(self, removals):
+        """Remove objects from the object store.
+
+        ``removals`` is a list of ``(object, object_store_kwargs, entire_dir, check_exists)`` tuples.
+        """
         # only remove the "object store path" - if it's at an external_filename, that file will be untouched anyway
         # (which is what we want)
         loggers = (self.log, log)
-        try:
-            # TODO: get_filename() can do stuff like cache locally from S3, but we want the filename for logging
-            # purposes; this isn't ideal, object stores should probably have a noop way to get the "object store native
-            # identifier" which in the case of Disk would be the path
-            if not check_exists or self.object_store.exists(object_to_remove, **object_store_kwargs):
-                filename = self.object_store.get_filename(object_to_remove, **object_store_kwargs)
-                self.log.info("removing %s at: %s", object_to_remove, filename)
-                if not self._dry_run:
-                    self.object_store.delete(object_to_remove, entire_dir=entire_dir, **object_store_kwargs)
-        except ObjectNotFound as e:
-            [log_.warning("object store failure: %s: %s", object_to_remove, e) for log_ in loggers]
-        except Exception as e:
-            [log_.error("delete failure: %s: %s", object_to_remove, e) for log_ in loggers]
-
-    def remove_object(self, object_to_remove):
+
+        def log_failure(object_to_remove, e):
+            if isinstance(e, ObjectNotFound):
+                [log_.warning("object store failure: %s: %s", object_to_remove, e) for log_ in loggers]
+            else:
+                [log_.error("delete failure: %s: %s", object_to_remove, e) for log_ in loggers]
+
+        def prepare(removal):
+            object_to_remove, object_store_kwargs, entire_dir, check_exists = removal
+            try:
+                # TODO: get_filename() can do stuff like cache locally from S3, but we want the filename for logging
+                # purposes; this isn't ideal, object stores should probably have a noop way to get the "object store
+                # native identifier" which in the case of Disk would be the path
+                if not check_exists or self.object_store.exists(object_to_remove, **object_store_kwargs):
+                    filename = self.object_store.get_filename(object_to_remove, **object_store_kwargs)
+                    self.log.info("removing %s at: %s", object_to_remove, filename)
+                    return object_to_remove, dict(object_store_kwargs, entire_dir=entire_dir)
+            except Exception as e:
+                log_failure(object_to_remove, e)
+            return None
+
+        with ThreadPoolExecutor(max_workers=max(self._delete_workers, 1)) as executor:
+            to_delete = [r for r in executor.map(prepare, removals) if r is not None]
+        if self._dry_run or not to_delete:
+            return
+        results = self.object_store.delete_many(to_delete, max_workers=self._delete_workers)
+        for (object_to_remove, _), result in zip(to_delete, results):
+            if isinstance(result, Exception):
+                log_failure(object_to_remove, result)
+
+    def object_store_removals(self, object_to_remove):
+        """Return the ``(object_store_kwargs, entire_dir, check_exists)`` removals needed to remove an object."""
         raise NotImplementedError()
 
 
@@ -418,15 +492,13 @@ class RemovesMetadataFiles(RemovesObjects):
     id_column = "deleted_metadata_file_id"
     uuid_column = "deleted_metadata_file_uuid"
 
-    def remove_object(self, metadata_file):
+    def object_store_removals(self, metadata_file):
         store_by = self.object_store.get_store_by(metadata_file)
         if store_by == "uuid":
             alt_name = f"metadata_{metadata_file.uuid}.dat"
         else:
             alt_name = f"metadata_{metadata_file.id}.dat"
-        self.remove_from_object_store(
-            metadata_file, dict(extra_dir="_metadata_files", extra_dir_at_root=True, alt_name=alt_name)
-        )
+        return [(dict(extra_dir="_metadata_files", extra_dir_at_root=True, alt_name=alt_name), False, False)]
 
 
 class RemovesDatasets(RemovesObjects):
@@ -439,16 +511,16 @@ class RemovesDatasets(RemovesObjects):
     id_column = "purged_dataset_id"
     uuid_column = "purged_dataset_uuid"
 
-    def remove_object(self, dataset):
+    def object_store_removals(self, dataset):
         store_by = self.object_store.get_store_by(dataset)
         if store_by == "uuid":
             extra_dir = f"dataset_{dataset.uuid}_files"
         else:
             extra_dir = f"dataset_{dataset.id}_files"
-        self.remove_from_object_store(dataset, dict())
-        self.remove_from_object_store(
-            dataset, dict(dir_only=True, extra_dir=extra_dir), entire_dir=True, check_exists=True
-        )
+        return [
+            (dict(), False, False),
+            (dict(dir_only=True, extra_dir=extra_dir), True, True),
+        ]
 
 
 #
@@ -1197,6 +1269,18 @@ class Cleanup:
         parser.add_argument(
             "-w", "--work-mem", dest="work_mem", default=None, help="Set PostgreSQL work_mem for this connection"
         )
+        parser.add_argument(
+            "--delete-workers",
+            type=int,
+            default=DEFAULT_DELETE_WORKERS,
+            help="Number of objects removed from the object store concurrently",
+        )
+        parser.add_argument(
+            "--delete-batch-size",
+            type=int,
+            default=DEFAULT_DELETE_BATCH_SIZE,
+            help="Number of objects removed from the object store between progress checkpoints",
+        )
         parser.add_argument("-l", "--log-dir", default=DEFAULT_LOG_DIR, help="Log file directory")
         parser.add_argument("-g", "--log-file", default=None, help="Log file name")
         parser.add_argument(
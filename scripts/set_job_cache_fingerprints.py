@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Backfill ``job.cache_fingerprint`` for successful jobs that finished before
+job cache fingerprints were recorded, so that the job cache finds them with
+an index lookup instead of comparing all of their parameters. Jobs whose
+input datasets have a different version than the one the jobs consumed are
+skipped, their fingerprints would describe inputs they did not consume.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "lib")))
+
+import galaxy.config
+from galaxy.model.job_fingerprint import set_job_fingerprint
+from galaxy.model.mapping import init_models_from_config
+from galaxy.util.script import (
+    app_properties_from_args,
+    populate_config_args,
+)
+
+parser = argparse.ArgumentParser()
+populate_config_args(parser)
+parser.add_argument("--tool_id", default=None, help="only fingerprint jobs of this tool")
+args = parser.parse_args()
+
+
+def init():
+    app_properties = app_properties_from_args(args)
+    config = galaxy.config.Configuration(**app_properties)
+    return init_models_from_config(config)
+
+
+if __name__ == "__main__":
+    print("Loading Galaxy model...")
+    model = init()
+    sa_session = model.context.current
+
+    query = sa_session.query(model.Job).filter(
+        model.Job.state == model.Job.states.OK,
+        model.Job.copied_from_job_id.is_(None),
+        model.Job.cache_fingerprint.is_(None),
+    )
+    if args.tool_id:
+        query = query.filter(model.Job.tool_id == args.tool_id)
+    job_count = query.count()
+    print("Processing %i jobs..." % job_count)
+    set = 0
+    percent = 0
+    print("Completed %i%%" % percent, end=" ")
+    sys.stdout.flush()
+    for i, job in enumerate(query.enable_eagerloads(False).order_by(model.Job.id).yield_per(1000)):
+        set_job_fingerprint(sa_session, job)
+        if job.cache_fingerprint is not None:
+            set += 1
+            if not set % 1000:
+                sa_session.flush()
+        new_percent = int(float(i) / job_count * 100)
+        if new_percent != percent:
+            percent = new_percent
+            print("\rCompleted %i%%" % percent, end=" ")
+            sys.stdout.flush()
+    sa_session.flush()
+    print("\rCompleted 100%%, fingerprinted %i jobs" % set)
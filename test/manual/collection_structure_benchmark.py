@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""A small script to compare loading the structure of nested collections lazily and as one tree.
+
+It creates a ``list:paired`` collection with ``--pair_count`` pairs and then
+computes its structure, matches it against itself and splits it into pairs
+the way mapping a tool over it does - once walking the ``elements`` and
+``child_collection`` relationships lazily and once after loading the whole
+collection tree with one query. The number of SQL statements is reported
+for both.
+
+% .venv/bin/python test/manual/collection_structure_benchmark.py --pair_count 50000
+% .venv/bin/python test/manual/collection_structure_benchmark.py --database_connection postgresql://galaxy@localhost/collection_bench
+"""
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+from sqlalchemy import event
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.app_unittest_utils.galaxy_mock import MockTrans
+from galaxy.model.dataset_collections import (
+    matching,
+    registry,
+    subcollections,
+    type_description,
+)
+from galaxy.model.dataset_collections.element_tree import load_collection_element_tree
+from galaxy.model.dataset_collections.structure import Tree
+
+DESCRIPTION = "Script to compare loading the structure of nested collections lazily and as one tree."
+TYPE_DESCRIPTION_FACTORY = type_description.CollectionTypeDescriptionFactory(registry.DatasetCollectionTypesRegistry())
+
+
+def populate(trans, args):
+    sa_session = trans.sa_session
+    history = model.History(user=trans.user, name="collection structure benchmark")
+    sa_session.add(history)
+    outer = model.DatasetCollection(collection_type="list:paired")
+    for i in range(args.pair_count):
+        pair = model.DatasetCollection(collection_type="paired")
+        for j, identifier in enumerate(("forward", "reverse")):
+            hda = model.HistoryDatasetAssociation(history=history, create_dataset=True, sa_session=sa_session)
+            model.DatasetCollectionElement(collection=pair, element=hda, element_identifier=identifier, element_index=j)
+        model.DatasetCollectionElement(collection=outer, element=pair, element_identifier=f"pair{i}", element_index=i)
+    hdca = model.HistoryDatasetCollectionAssociation(collection=outer, history=history, name="pairs")
+    sa_session.add(hdca)
+    sa_session.flush()
+    return hdca.id
+
+
+def map_over(hdca, preload):
+    if preload:
+        load_collection_element_tree(hdca.collection, load_dataset_instances=True)
+    collection_type_description = TYPE_DESCRIPTION_FACTORY.for_collection_type(hdca.collection.collection_type)
+    structure = Tree.for_dataset_collection(hdca.collection, collection_type_description)
+    to_match = matching.CollectionsToMatch()
+    to_match.add("input1", hdca, subcollection_type="paired")
+    to_match.add("input2", hdca, subcollection_type="paired")
+    matching_collections = matching.MatchingCollections.for_collections(to_match, TYPE_DESCRIPTION_FACTORY)
+    pairs = subcollections.split_dataset_collection_instance(hdca, "paired")
+    datasets = [element.hda.dataset.id for pair in pairs for element in pair.child_collection.elements]
+    return len(structure), len(list(matching_collections.slice_collections())), len(datasets)
+
+
+def measure(label, trans, hdca_id, preload):
+    sa_session = trans.sa_session
+    sa_session.expunge_all()
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args)
+
+    engine = sa_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        start = time.perf_counter()
+        hdca = sa_session.query(model.HistoryDatasetCollectionAssociation).get(hdca_id)
+        sizes = map_over(hdca, preload)
+        total = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    print(f"{label:>5}: {total:.3f}s, {len(statements)} SQL statements (structure, slices, datasets: {sizes})")
+
+
+def main(argv=None):
+    """Entry point for the collection structure benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--pair_count", type=int, default=5000)
+    arg_parser.add_argument("--database_connection", default=None, help="defaults to an in-memory sqlite database")
+    args = arg_parser.parse_args(argv)
+
+    kwds = {"database_connection": args.database_connection} if args.database_connection else {}
+    trans = MockTrans(**kwds)
+    trans.set_user(model.User(email="bench@example.org", password="password"))
+    trans.sa_session.add(trans.user)
+    trans.sa_session.flush()
+
+    print(f"Creating a list:paired collection with {args.pair_count} pairs...")
+    hdca_id = populate(trans, args)
+    measure("lazy", trans, hdca_id, preload=False)
+    measure("tree", trans, hdca_id, preload=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""A small script to measure how job output discovery scales with the number of files.
+
+Discovers a list collection of ``--file_count`` files from a temporary job working
+directory against an in-memory sqlite database and reports the time spent finding
+the files, creating the datasets and flushing them.
+
+% .venv/bin/python test/manual/discovered_datasets_scaling.py --file_count 10000
+% .venv/bin/python test/manual/discovered_datasets_scaling.py --file_count 100000 --flush_per_n_datasets 1000
+"""
+import os
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.job_execution.output_collect import (
+    dataset_collector,
+    JobContext,
+    MetadataSourceProvider,
+    PermissionProvider,
+)
+from galaxy.model.dataset_collections import builder
+from galaxy.model.unittest_utils import GalaxyDataTestApp
+from galaxy.tool_util.parser.output_collection_def import FilePatternDatasetCollectionDescription
+from galaxy.tool_util.provided_metadata import NullToolProvidedMetadata
+from galaxy.util import ExecutionTimer
+
+DESCRIPTION = "Script to measure job output discovery for large numbers of files."
+
+
+class Tool:
+    def __init__(self, app):
+        self.app = app
+        self.sa_session = app.model.context
+
+
+def main(argv=None):
+    """Entry point for the discovery benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--file_count", type=int, default=10000)
+    arg_parser.add_argument("--flush_per_n_datasets", type=int, default=None)
+    arg_parser.add_argument("--object_store_update_workers", type=int, default=None)
+    args = arg_parser.parse_args(argv)
+
+    app = GalaxyDataTestApp()
+    sa_session = app.model.context
+    user = model.User(email="discovery@example.com", password="password")
+    history = model.History(name="Discovery Benchmark", user=user)
+    job = model.Job()
+    job.user = user
+    job.history = history
+    sa_session.add(job)
+    sa_session.flush()
+
+    job_working_directory = tempfile.mkdtemp()
+    timer = ExecutionTimer()
+    for i in range(args.file_count):
+        with open(os.path.join(job_working_directory, f"split_{i}.txt"), "w") as out:
+            out.write(f"{i}\n")
+    print(f"Wrote {args.file_count} files {timer}")
+
+    job_context = JobContext(
+        Tool(app),
+        NullToolProvidedMetadata(),
+        job,
+        job_working_directory,
+        PermissionProvider({}, app.security_agent, job),
+        MetadataSourceProvider({}),
+        "?",
+        app.object_store,
+        "ok",
+        max_discovered_files=None,
+        flush_per_n_datasets=args.flush_per_n_datasets,
+    )
+    if args.object_store_update_workers is not None:
+        job_context.object_store_update_workers = args.object_store_update_workers
+    collection = model.DatasetCollection(collection_type="list", populated=False)
+    sa_session.add(collection)
+    collection_builder = builder.BoundCollectionBuilder(collection)
+    collectors = [dataset_collector(FilePatternDatasetCollectionDescription(pattern="__name__"))]
+
+    timer = ExecutionTimer()
+    discovered_files = job_context.find_files("output", collection, collectors)
+    print(f"Found {len(discovered_files)} files {timer}")
+
+    timer = ExecutionTimer()
+    job_context.populate_collection_elements(
+        collection,
+        collection_builder,
+        discovered_files,
+        name="output",
+        final_job_state=job_context.final_job_state,
+    )
+    collection_builder.populate()
+    print(f"Created {len(discovered_files)} datasets {timer}")
+
+    timer = ExecutionTimer()
+    sa_session.flush()
+    print(f"Flushed session {timer}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""A small script to measure encoding and decoding of large numbers of database ids.
+
+% .venv/bin/python test/manual/id_encoding_scaling.py --id_count 100000
+"""
+import os
+import sys
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.security.idencoding import IdEncodingHelper
+from galaxy.util import ExecutionTimer
+
+DESCRIPTION = "Script to measure id encoding and decoding for large numbers of ids."
+
+
+def main(argv=None):
+    """Entry point for the id encoding benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--id_count", type=int, default=100000)
+    arg_parser.add_argument("--id_offset", type=int, default=1000000)
+    args = arg_parser.parse_args(argv)
+
+    ids = list(range(args.id_offset, args.id_offset + args.id_count))
+
+    uncached = IdEncodingHelper(id_secret="benchmarksecret", id_cache_size=0)
+    timer = ExecutionTimer()
+    encoded_ids = [uncached.encode_id(i) for i in ids]
+    print(f"Encoded {len(ids)} ids one at a time without cache {timer}")
+    timer = ExecutionTimer()
+    uncached.encode_ids(ids)
+    print(f"Encoded {len(ids)} ids in one batch without cache {timer}")
+    timer = ExecutionTimer()
+    decoded_ids = [uncached.decode_id(i) for i in encoded_ids]
+    print(f"Decoded {len(ids)} ids one at a time without cache {timer}")
+    timer = ExecutionTimer()
+    assert uncached.decode_ids(encoded_ids) == decoded_ids == ids
+    print(f"Decoded {len(ids)} ids in one batch without cache {timer}")
+
+    cached = IdEncodingHelper(id_secret="benchmarksecret", id_cache_size=len(ids))
+    cached.encode_ids(ids)
+    cached.decode_ids(encoded_ids)
+    timer = ExecutionTimer()
+    for i in ids:
+        cached.encode_id(i)
+    print(f"Encoded {len(ids)} cached ids one at a time {timer}")
+    timer = ExecutionTimer()
+    cached.encode_ids(ids)
+    print(f"Encoded {len(ids)} cached ids in one batch {timer}")
+    timer = ExecutionTimer()
+    cached.decode_ids(encoded_ids)
+    print(f"Decoded {len(ids)} cached ids in one batch {timer}")
+
+    rval = {"contents": [{"id": i, "history_id": 1, "dataset_id": i, "job_ids": [i, i + 1]} for i in ids]}
+    timer = ExecutionTimer()
+    uncached.encode_all_ids(rval, recursive=True)
+    print(f"Encoded nested dictionaries with {len(ids) * 4} ids {timer}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""A small script to compare job cache lookups by fingerprint with the full parameter search.
+
+It creates ``--job_count`` finished jobs of one tool that each take a dataset
+and ``--parameter_count`` parameters, differing in one parameter, and then
+times ``JobSearch.by_tool_input`` for ``--search_count`` searches that hit a
+random job - once with fingerprints recorded and once without, which falls
+back to comparing all job parameters.
+
+% .venv/bin/python test/manual/job_cache_search_benchmark.py --job_count 2000 --parameter_count 30
+% .venv/bin/python test/manual/job_cache_search_benchmark.py --database_connection postgresql://galaxy@localhost/job_cache_bench
+"""
+import json
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.app_unittest_utils.galaxy_mock import MockTrans
+from galaxy.managers.jobs import JobSearch
+from galaxy.model.job_fingerprint import set_job_fingerprint
+
+DESCRIPTION = "Script to compare job cache lookups by fingerprint with the full parameter search."
+TOOL_ID = "job_cache_bench"
+TOOL_VERSION = "1.0.0"
+
+
+def parameters(i, parameter_count):
+    return {f"param_{p}": (i if p == 0 else f"value {p}") for p in range(parameter_count)}
+
+
+def populate(trans, args):
+    sa_session = trans.sa_session
+    history = model.History(user=trans.user, name="job cache benchmark")
+    dataset = model.Dataset(state=model.Dataset.states.OK)
+    hda = model.HistoryDatasetAssociation(
+        history=history, dataset=dataset, name="input.txt", extension="txt", sa_session=sa_session
+    )
+    # the parameter search compares metadata, which must not be NULL
+    hda.init_meta()
+    sa_session.add_all([history, hda])
+    sa_session.flush()
+    for i in range(args.job_count):
+        job = model.Job()
+        job.tool_id = TOOL_ID
+        job.tool_version = TOOL_VERSION
+        job.user = trans.user
+        job.state = model.Job.states.OK
+        job.add_parameter("input1", json.dumps({"values": [{"src": "hda", "id": hda.id}]}, sort_keys=True))
+        for name, value in parameters(i, args.parameter_count).items():
+            job.add_parameter(name, json.dumps(value))
+        job.add_input_dataset("input1", hda)
+        sa_session.add(job)
+    sa_session.flush()
+    return hda
+
+
+def measure(label, trans, job_search, hda, args):
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    found = 0
+    for _ in range(args.search_count):
+        params = parameters(rng.randrange(args.job_count), args.parameter_count)
+        job = job_search.by_tool_input(
+            trans=trans,
+            tool_id=TOOL_ID,
+            tool_version=TOOL_VERSION,
+            param={"input1": [hda], **params},
+            param_dump={"input1": {"values": [{"src": "hda", "id": hda.id}]}, **params},
+        )
+        found += job is not None
+    total = time.perf_counter() - start
+    print(
+        f"{label:>11}: {args.search_count} searches in {total:.3f}s "
+        f"({total / args.search_count * 1000:.2f} ms per search), {found} cached jobs found"
+    )
+
+
+def main(argv=None):
+    """Entry point for the job cache search benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--job_count", type=int, default=1000)
+    arg_parser.add_argument("--parameter_count", type=int, default=20)
+    arg_parser.add_argument("--search_count", type=int, default=50)
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--database_connection", default=None, help="defaults to an in-memory sqlite database")
+    args = arg_parser.parse_args(argv)
+
+    kwds = {"database_connection": args.database_connection} if args.database_connection else {}
+    trans = MockTrans(**kwds)
+    trans.set_user(model.User(email="bench@example.org", password="password"))
+    trans.sa_session.add(trans.user)
+    trans.sa_session.flush()
+    job_search = trans.app[JobSearch]
+
+    print(f"Creating {args.job_count} jobs with {args.parameter_count} parameters...")
+    hda = populate(trans, args)
+    measure("parameters", trans, job_search, hda, args)
+    for job in trans.sa_session.query(model.Job).filter(model.Job.tool_id == TOOL_ID).yield_per(1000):
+        set_job_fingerprint(trans.sa_session, job)
+    trans.sa_session.flush()
+    measure("fingerprint", trans, job_search, hda, args)
+
+
+if __name__ == "__main__":
+    main()
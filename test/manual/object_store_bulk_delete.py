@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""A small script to measure object store deletion throughput.
+
+Creates ``--object_count`` small objects in an object store and deletes them, one at a time
+or with ``delete_many`` (the path ``scripts/cleanup_datasets/pgcleanup.py`` uses), reporting
+deleted objects per second. Without ``--object_store_config_file`` a temporary disk object
+store is used; to measure S3, point it at a config for a local S3 stand-in such as MinIO or
+``moto_server``, e.g. a ``swift`` object store with ``<connection host="localhost" port="9000"
+is_secure="False"/>``.
+
+% .venv/bin/python test/manual/object_store_bulk_delete.py --object_count 10000
+% .venv/bin/python test/manual/object_store_bulk_delete.py --object_store_config_file s3_stand_in.xml --serial
+"""
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.objectstore import (
+    build_object_store_from_config,
+    DEFAULT_DELETE_WORKERS,
+)
+from galaxy.objectstore.unittest_utils import (
+    DISK_TEST_CONFIG,
+    MockConfig,
+)
+from galaxy.util import ExecutionTimer
+
+DESCRIPTION = "Script to measure object store deletion throughput."
+
+
+class Dataset:
+    def __init__(self, id):
+        self.id = id
+        self.object_store_id = None
+        self.uuid = uuid.uuid4()
+
+
+def main(argv=None):
+    """Entry point for the deletion benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--object_count", type=int, default=1000)
+    arg_parser.add_argument("--object_store_config_file", default=None)
+    arg_parser.add_argument("--delete_workers", type=int, default=DEFAULT_DELETE_WORKERS)
+    arg_parser.add_argument("--serial", action="store_true", help="delete objects one at a time")
+    args = arg_parser.parse_args(argv)
+
+    temp_directory = tempfile.mkdtemp()
+    try:
+        if args.object_store_config_file:
+            config_file = os.path.abspath(args.object_store_config_file)
+        else:
+            config_file = os.path.join(temp_directory, "store.xml")
+            with open(config_file, "w") as f:
+                f.write(DISK_TEST_CONFIG.replace("${temp_directory}", temp_directory))
+        object_store = build_object_store_from_config(MockConfig(temp_directory, config_file))
+        source = os.path.join(temp_directory, "source.txt")
+        with open(source, "w") as f:
+            f.write("benchmark\n")
+
+        datasets = [Dataset(i) for i in range(1, args.object_count + 1)]
+        timer = ExecutionTimer()
+        for dataset in datasets:
+            object_store.update_from_file(dataset, file_name=source, create=True)
+        print(f"Created {len(datasets)} objects {timer}")
+
+        timer = ExecutionTimer()
+        if args.serial:
+            for dataset in datasets:
+                object_store.delete(dataset)
+        else:
+            object_store.delete_many([(dataset, {}) for dataset in datasets], max_workers=args.delete_workers)
+        print(f"Deleted {len(datasets)} objects {timer} ({len(datasets) / timer.elapsed:.0f} objects/s)")
+        object_store.shutdown()
+    finally:
+        shutil.rmtree(temp_directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""A small script to simulate how the distributed object store fills its backends.
+
+Writes ``--object_count`` objects of random size to synthetic backends of differing
+capacity, initial fill and write throughput - by default two partly filled backends
+and a newly added empty one - once with the plain ``weighted`` placement and once
+with the ``capacity`` placement, and reports how evenly the backends filled up and
+how long the writes took. Backends are synthetic so no files are written.
+
+% .venv/bin/python test/manual/object_store_placement_simulation.py
+% .venv/bin/python test/manual/object_store_placement_simulation.py --object_count 100000 --capacities 100,100,400
+"""
+import os
+import random
+import statistics
+import sys
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.objectstore.placement import (
+    BackendPlacement,
+    PLACEMENT_CAPACITY,
+    PLACEMENT_STRATEGIES,
+)
+
+DESCRIPTION = "Script to simulate distributed object store placement over synthetic backends."
+GB = 1024**3
+
+
+class SyntheticBackend:
+    def __init__(self, backend_id, capacity_gb, throughput_mb, weight, initial_percent):
+        self.id = backend_id
+        self.capacity = capacity_gb * GB
+        self.throughput = throughput_mb * 1024 * 1024
+        self.weight = weight
+        self.used = self.capacity * initial_percent / 100
+
+    @property
+    def percent_used(self):
+        return 100.0 * self.used / self.capacity
+
+
+def _split(value, cast):
+    return [cast(v) for v in value.split(",")]
+
+
+def simulate(strategy, args, rng):
+    backends = {
+        f"backend{i}": SyntheticBackend(f"backend{i}", *backend_args)
+        for i, backend_args in enumerate(zip(args.capacities, args.throughputs, args.weights, args.initial_percents))
+    }
+    placement = BackendPlacement({b.id: b.weight for b in backends.values()}, rng=rng)
+    write_seconds = 0.0
+    failed = 0
+    for i in range(args.object_count):
+        if i % args.monitor_every == 0:
+            for backend in backends.values():
+                placement.update_usage(backend.id, backend.percent_used, args.max_percent_full)
+        eligible = [b.id for b in backends.values() if b.percent_used <= args.max_percent_full]
+        if strategy == PLACEMENT_CAPACITY:
+            backend_id = placement.choose(eligible)
+        else:
+            weights = [backends[b].weight for b in eligible]
+            backend_id = rng.choices(eligible, weights=weights)[0] if sum(weights) else None
+        if backend_id is None:
+            failed += 1
+            continue
+        backend = backends[backend_id]
+        size = int(rng.expovariate(1.0 / (args.mean_size_mb * 1024 * 1024)))
+        seconds = size / backend.throughput
+        backend.used += size
+        write_seconds += seconds
+        placement.record_write(backend_id, size, seconds)
+    return backends, write_seconds, failed
+
+
+def main(argv=None):
+    """Entry point for the placement simulation."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--object_count", type=int, default=20000)
+    arg_parser.add_argument("--mean_size_mb", type=float, default=10)
+    arg_parser.add_argument("--capacities", type=lambda v: _split(v, float), default=[100, 200, 400], help="GB")
+    arg_parser.add_argument("--throughputs", type=lambda v: _split(v, float), default=[400, 200, 100], help="MB/s")
+    arg_parser.add_argument("--weights", type=lambda v: _split(v, int), default=[1, 2, 4])
+    arg_parser.add_argument("--initial_percents", type=lambda v: _split(v, float), default=[60, 40, 0])
+    arg_parser.add_argument("--max_percent_full", type=float, default=90)
+    arg_parser.add_argument("--monitor_every", type=int, default=100, help="writes between free space updates")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args(argv)
+
+    for strategy in PLACEMENT_STRATEGIES:
+        backends, write_seconds, failed = simulate(strategy, args, random.Random(args.seed))
+        percents = [b.percent_used for b in backends.values()]
+        print(f"Placement '{strategy}':")
+        for backend in backends.values():
+            print(f"  {backend.id}: {backend.percent_used:.1f}% used")
+        print(f"  fill spread {max(percents) - min(percents):.1f}%, stdev {statistics.pstdev(percents):.1f}%")
+        print(f"  total write time {write_seconds:.0f}s, {failed} writes found no backend")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""A small script to measure memory use and time to first byte of streamed JSON list responses.
+
+Without ``--url`` it serializes ``--item_count`` synthetic history items once the way list
+endpoints used to (build the whole list, encode and render it like FastAPI does) and once with
+``galaxy.webapps.base.streaming.json_chunks``, and reports peak Python memory, time to the
+first byte and total time. With ``--url`` it requests a running Galaxy's endpoint instead,
+as JSON and as NDJSON, and reports time to first byte, total time and response size.
+
+% .venv/bin/python test/manual/streaming_json_benchmark.py --item_count 100000
+% .venv/bin/python test/manual/streaming_json_benchmark.py --url http://localhost:8080/api/histories/<id>/contents?v=dev --api_key <key>
+"""
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from galaxy.webapps.base.streaming import (
+    json_chunks,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+)
+
+DESCRIPTION = "Script to measure memory use and time to first byte of streamed JSON list responses."
+
+
+def synthetic_item(i):
+    return {
+        "id": f"{i:016x}",
+        "hid": i,
+        "name": f"dataset {i}.fastqsanger.gz",
+        "history_content_type": "dataset",
+        "state": "ok",
+        "deleted": False,
+        "visible": True,
+        "extension": "fastqsanger.gz",
+        "tags": ["name:sample", f"group:lane{i % 8}"],
+        "create_time": "2022-10-19T10:42:21.201725",
+        "update_time": "2022-10-19T10:42:25.490225",
+        "url": f"/api/histories/f2db41e1fa331b3e/contents/{i:016x}",
+    }
+
+
+def measure(label, produce_chunks):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+    for chunk in produce_chunks():
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:>6}: peak memory {peak / 1024 / 1024:.1f} MB, first byte after {first_byte:.3f}s, "
+        f"total {total:.3f}s, {size / 1024 / 1024:.1f} MB"
+    )
+
+
+def benchmark_local(args):
+    def as_list():
+        items = [synthetic_item(i) for i in range(args.item_count)]
+        yield JSONResponse(jsonable_encoder(items)).body
+
+    def streamed():
+        yield from json_chunks(synthetic_item(i) for i in range(args.item_count))
+
+    measure("list", as_list)
+    measure("stream", streamed)
+
+
+def benchmark_url(args):
+    import requests
+
+    headers = {"x-api-key": args.api_key} if args.api_key else {}
+    for accept in (JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE):
+        start = time.perf_counter()
+        response = requests.get(args.url, headers={**headers, "accept": accept}, stream=True)
+        response.raise_for_status()
+        first_byte = None
+        size = 0
+        for chunk in response.iter_content(chunk_size=None):
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+        total = time.perf_counter() - start
+        print(f"{accept}: first byte after {first_byte or 0:.3f}s, total {total:.3f}s, {size / 1024 / 1024:.1f} MB")
+
+
+def main(argv=None):
+    """Entry point for the streaming benchmark."""
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--item_count", type=int, default=100000)
+    arg_parser.add_argument("--url", default=None, help="list endpoint of a running Galaxy to request")
+    arg_parser.add_argument("--api_key", default=None)
+    args = arg_parser.parse_args(argv)
+    if args.url:
+        benchmark_url(args)
+    else:
+        benchmark_local(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import os
 import tempfile
+import threading
+
+import pytest
 
 from galaxy import model
 from galaxy.job_execution.output_collect import (
@@ -7,6 +10,7 @@ from galaxy.job_execution.output_collect import (
     JobContext,
 )
 from galaxy.model.dataset_collections import builder
+from galaxy.objectstore.unittest_utils import Config as TestConfig
 from galaxy.tool_util.parser.output_collection_def import FilePatternDatasetCollectionDescription
 from galaxy.tool_util.provided_metadata import NullToolProvidedMetadata
 from ..tools.test_history_imp_exp import _mock_app
@@ -19,6 +23,9 @@ class PermissionProvider:
     def set_default_hda_permissions(self, primary_data):
         pass
 
+    def set_default_hda_permissions_for_datasets(self, datasets):
+        pass
+
     def copy_dataset_permissions(self, init_from, primary_data):
         pass
 
@@ -40,10 +47,11 @@ def setup_data(job_working_directory):
             out.write(str(i))
 
 
-def test_job_context_discover_outputs_flushes_once(mocker):
+def _setup_job_context(object_store=None):
     app = _mock_app()
+    if object_store is not None:
+        app.object_store = object_store
     sa_session = app.model.context
-    # mocker is a pytest-mock fixture
 
     u = model.User(email="collection@example.com", password="password")
     h = model.History(name="Test History", user=u)
@@ -76,6 +84,30 @@ def test_job_context_discover_outputs_flushes_once(mocker):
         final_job_state,
         max_discovered_files=100,
     )
+    return app, job_context, collection, collection_description
+
+
+def _populate_collection(job_context, collection, collection_description):
+    collection_builder = builder.BoundCollectionBuilder(collection)
+    dataset_collectors = [dataset_collector(collection_description)]
+    output_name = "output"
+    filenames = job_context.find_files(output_name, collection, dataset_collectors)
+    assert len(filenames) == 10
+    job_context.populate_collection_elements(
+        collection,
+        collection_builder,
+        filenames,
+        name=output_name,
+        metadata_source_name="",
+        final_job_state=job_context.final_job_state,
+    )
+    collection_builder.populate()
+
+
+def test_job_context_discover_outputs_flushes_once(mocker):
+    # mocker is a pytest-mock fixture
+    app, job_context, collection, collection_description = _setup_job_context()
+    sa_session = app.model.context
     collection_builder = builder.BoundCollectionBuilder(collection)
     dataset_collectors = [dataset_collector(collection_description)]
     output_name = "output"
@@ -95,3 +127,94 @@ def test_job_context_discover_outputs_flushes_once(mocker):
     sa_session.flush()
     assert len(collection.dataset_instances) == 10
     assert collection.dataset_instances[0].dataset.file_size == 1
+
+
+def test_job_context_updates_object_store_concurrently():
+    app, job_context, collection, collection_description = _setup_job_context()
+    job_context.object_store_update_workers = 4
+    object_store = app.object_store
+    update_from_file = object_store.update_from_file
+    threads = set()
+    updated = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def record_update_from_file(dataset, file_name=None, **kwargs):
+        with lock:
+            threads.add(threading.get_ident())
+            updated.append(dataset)
+            call_index = len(updated)
+        if call_index in (2, 3):
+            # the first two updates handed to workers only proceed if they run at the same time
+            barrier.wait()
+        return update_from_file(dataset, file_name=file_name, **kwargs)
+
+    object_store.update_from_file = record_update_from_file
+    _populate_collection(job_context, collection, collection_description)
+    app.model.context.flush()
+    datasets = [hda.dataset for hda in collection.dataset_instances]
+    assert {id(dataset) for dataset in updated} == {id(dataset) for dataset in datasets}
+    assert len(updated) == len(datasets)
+    assert threading.get_ident() in threads
+    assert len(threads) > 1
+    for hda in collection.dataset_instances:
+        assert object_store.exists(hda.dataset)
+        with open(hda.get_file_name()) as fh:
+            assert fh.read() == os.path.splitext(hda.name)[0].split("_")[-1]
+        assert hda.dataset.file_size == 1
+
+
+def test_job_context_object_store_worker_error_raised():
+    app, job_context, collection, collection_description = _setup_job_context()
+    job_context.object_store_update_workers = 4
+    object_store = app.object_store
+    update_from_file = object_store.update_from_file
+    calls = []
+
+    def failing_update_from_file(dataset, file_name=None, **kwargs):
+        calls.append(threading.get_ident())
+        if len(calls) == 5:
+            raise OSError("object store unavailable")
+        return update_from_file(dataset, file_name=file_name, **kwargs)
+
+    object_store.update_from_file = failing_update_from_file
+    with pytest.raises(OSError, match="object store unavailable"):
+        _populate_collection(job_context, collection, collection_description)
+
+
+DISTRIBUTED_TEST_CONFIG = """<?xml version="1.0"?>
+<object_store type="distributed">
+    <backends>
+        <backend id="files1" type="disk" weight="1">
+            <files_dir path="${temp_directory}/files1"/>
+        </backend>
+        <backend id="files2" type="disk" weight="1">
+            <files_dir path="${temp_directory}/files2"/>
+        </backend>
+    </backends>
+</object_store>
+"""
+
+
+def test_job_context_distributed_object_store_ids_assigned_on_calling_thread(monkeypatch):
+    with TestConfig(DISTRIBUTED_TEST_CONFIG) as (_, object_store):
+        app, job_context, collection, collection_description = _setup_job_context(object_store)
+        monkeypatch.setattr(model.Dataset, "object_store", object_store)
+        job_context.object_store_update_workers = 4
+        select_backend_id = object_store._select_backend_id
+        selected_from = set()
+
+        def record_select_backend_id():
+            selected_from.add(threading.get_ident())
+            return select_backend_id()
+
+        monkeypatch.setattr(object_store, "_select_backend_id", record_select_backend_id)
+        _populate_collection(job_context, collection, collection_description)
+        app.model.context.flush()
+        # backends are selected (and the datasets modified) on the thread owning the session only
+        assert selected_from == {threading.get_ident()}
+        for hda in collection.dataset_instances:
+            assert hda.dataset.object_store_id in ("files1", "files2")
+            with open(object_store.get_filename(hda.dataset)) as fh:
+                assert fh.read() == os.path.splitext(hda.name)[0].split("_")[-1]
+            assert hda.dataset.file_size == 1
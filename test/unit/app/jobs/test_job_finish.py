@@ -0,0 +1,45 @@
+from galaxy.jobs import finish
+from galaxy.util import StructuredExecutionTimer
+from galaxy.util.bunch import Bunch
+
+
+def test_output_file_sizes(tmp_path, monkeypatch):
+    monkeypatch.setattr(finish, "OUTPUT_RETRY_INTERVAL", 0)
+    paths = {}
+    for i in range(5):
+        path = tmp_path / f"dataset_{i}.dat"
+        path.write_text("a" * i)
+        paths[i] = str(path)
+    paths[5] = str(tmp_path / "missing.dat")
+    assert finish.output_file_sizes(paths, retries=2) == {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 0}
+    assert finish.output_file_sizes(paths, retries=2, max_workers=1) == {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 0}
+
+
+def test_extra_files_sizes(tmp_path):
+    extra_files = tmp_path / "dataset_1_files"
+    (extra_files / "sub").mkdir(parents=True)
+    (extra_files / "a.txt").write_text("abc")
+    (extra_files / "sub" / "b.txt").write_text("de")
+    empty = tmp_path / "dataset_2_files"
+    empty.mkdir()
+    assert finish.extra_files_sizes({1: str(extra_files), 2: str(empty)}) == {1: 5, 2: 0}
+
+
+def test_finish_phase_timers():
+    timer_ids = []
+
+    def get_timer(timer_id, template):
+        timer_ids.append(timer_id)
+        return StructuredExecutionTimer(timer_id, template)
+
+    phase_timers = finish.FinishPhaseTimers(Bunch(get_timer=get_timer), job_id=1)
+    phase_timers.start("check_output")
+    phase_timers.start("cleanup")
+    phase_timers.stop()
+    phase_timers.stop()
+    assert timer_ids == [
+        "internals.galaxy.jobs.job_wrapper_finish.check_output",
+        "internals.galaxy.jobs.job_wrapper_finish.cleanup",
+    ]
+    assert len(phase_timers.timings) == 2
+    assert str(phase_timers).startswith("check_output (")
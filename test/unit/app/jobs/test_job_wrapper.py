@@ -20,6 +20,7 @@ from galaxy.model import (
 )
 from galaxy.objectstore import BaseObjectStore
 from galaxy.tools import ToolBox
+from galaxy.util import StructuredExecutionTimer
 from galaxy.util.bunch import Bunch
 from galaxy.util.unittest import TestCase
 
@@ -90,6 +91,25 @@ class TestJobWrapper(AbstractTestCases.BaseWrapperTestCase):
     def _wrapper(self):
         return JobWrapper(self.job, self.queue)  # type: ignore[arg-type]
 
+    def test_finish_reports_timers_of_failed_job(self):
+        reported = []
+
+        class RecordingTimer(StructuredExecutionTimer):
+            def to_str(self, **kwd):
+                reported.append(self.timer_id)
+                return super().to_str(**kwd)
+
+        self.app.execution_timer_factory = Bunch(get_timer=RecordingTimer)
+        self.job.state = Job.states.DELETED
+        wrapper = self._wrapper()
+        wrapper.reclaim_ownership = lambda: None  # type: ignore[assignment]
+        wrapper.fail = lambda *args, **kwds: None  # type: ignore[assignment]
+        wrapper.finish("", "")
+        assert reported == [
+            "internals.galaxy.jobs.job_wrapper_finish.check_output",
+            "internals.galaxy.jobs.job_wrapper_finish",
+        ]
+
 
 class TestTaskWrapper(AbstractTestCases.BaseWrapperTestCase):
     def setUp(self):
@@ -1,6 +1,7 @@
 import os
 import threading
 import time
+from queue import Queue
 from typing import Optional
 
 import psutil
@@ -10,7 +11,10 @@ from galaxy import (
     model,
 )
 from galaxy.app_unittest_utils.tools_support import UsesTools
-from galaxy.jobs.runners import local
+from galaxy.jobs.runners import (
+    JobPreparationPool,
+    local,
+)
 from galaxy.util import bunch
 from galaxy.util.unittest import TestCase
 
@@ -58,6 +62,37 @@ class TestLocalJobRunner(TestCase, UsesTools):
         runner.queue_job(self.job_wrapper)
         assert self.job_wrapper.exit_code == 4
 
+    def test_preparation_pool(self):
+        runner = local.LocalJobRunner(self.app, 1)
+        runner.work_queue = Queue()
+        pool = JobPreparationPool(self.app, 1, 1)
+        pool.start()
+        try:
+            runner.preparation_pool = pool
+            runner.mark_as_queued(self.job_wrapper)
+            method, job_wrapper = runner.work_queue.get(timeout=5)
+        finally:
+            pool.shutdown()
+        assert method == runner.queue_job
+        assert job_wrapper.prepare_called
+        assert job_wrapper.prepared
+        # the job isn't prepared again before it is run
+        job_wrapper.prepare_called = False
+        method(job_wrapper)
+        assert not job_wrapper.prepare_called
+        assert job_wrapper.stdout.strip() == "HelloWorld"
+
+    def test_preparation_pool_failure(self):
+        def prepare():
+            raise Exception("Failed to stage inputs")
+
+        self.job_wrapper.prepare = prepare
+        runner = local.LocalJobRunner(self.app, 1)
+        runner.prepare_job_wrapper(self.job_wrapper)
+        assert self.job_wrapper.prepared
+        runner.queue_job(self.job_wrapper)
+        assert self.job_wrapper.fail_message == "Failed to stage inputs"
+
     def test_metadata_gets_set(self):
         runner = local.LocalJobRunner(self.app, 1)
         runner.queue_job(self.job_wrapper)
@@ -128,6 +163,8 @@ class MockJobWrapper:
         self.environment_variables = []
         self.commands_in_new_shell = False
         self.prepare_called = False
+        self.prepared = False
+        self.preparation_exception: Optional[Exception] = None
         self.dependency_shell_commands = None
         self.working_directory = working_directory
         self.tool_working_directory = tool_working_directory
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 """
 """
-from galaxy import model
+from galaxy import (
+    exceptions,
+    model,
+)
 from galaxy.managers.collections import DatasetCollectionManager
 from galaxy.managers.datasets import DatasetManager
 from galaxy.managers.hdas import HDAManager
@@ -78,6 +81,82 @@ class TestDatasetCollectionManager(BaseTestCase, CreatesCollectionsMixin):
         hdca2 = self.collection_manager.create(self.trans, history, "test collection 2", "list", elements=elements)
         assert isinstance(hdca2, model.HistoryDatasetCollectionAssociation)
 
+    def test_create_copied_and_hidden_elements(self):
+        owner = self.user_manager.create(**user2_data)
+        self.trans.set_user(owner)
+
+        history = self.history_manager.create(name="history1", user=owner)
+        hdas = [
+            self.hda_manager.create(name=name, history=history, dataset=self.dataset_manager.create())
+            for name in ("one", "two", "three")
+        ]
+
+        self.log("should copy and tag the elements and hide the source datasets")
+        element_identifiers = self.build_element_identifiers(hdas)
+        element_identifiers[0]["tags"] = ["name:first"]
+        element_identifiers[1]["id"] = self.trans.security.encode_id(hdas[1].id)
+        hdca = self.collection_manager.create(
+            self.trans,
+            history,
+            "test collection",
+            "list",
+            element_identifiers=element_identifiers,
+            copy_elements=True,
+            hide_source_items=True,
+        )
+        elements = hdca.collection.elements
+        assert [e.element_identifier for e in elements] == ["one", "two", "three"]
+        for hda, element in zip(hdas, elements):
+            assert not hda.visible
+            copied_hda = element.element_object
+            assert copied_hda.id != hda.id
+            assert copied_hda.dataset == hda.dataset
+        assert elements[0].element_object.make_tag_string_list() == ["name:first"]
+        assert not elements[1].element_object.tags
+
+        self.log("should refuse elements that do not exist or are not accessible")
+        user3 = self.user_manager.create(**user3_data)
+        self.trans.set_user(user3)
+        hdas[0].dataset.actions.append(
+            model.DatasetPermissions(
+                self.app.security_agent.permitted_actions.DATASET_ACCESS.action,
+                hdas[0].dataset,
+                self.app.security_agent.get_private_user_role(owner, auto_create=True),
+            )
+        )
+        self.trans.sa_session.flush()
+        with self.assertRaises(exceptions.ItemAccessibilityException):
+            self.collection_manager.create(
+                self.trans,
+                history,
+                "test collection",
+                "list",
+                element_identifiers=self.build_element_identifiers(hdas[:1]),
+            )
+        with self.assertRaises(exceptions.ObjectNotFound):
+            self.collection_manager.create(
+                self.trans,
+                history,
+                "test collection",
+                "list",
+                element_identifiers=[dict(src="hda", name="missing", id=hdas[2].id + 100)],
+            )
+        self.log("should report the id of missing elements as requested")
+        for src, exception_class in (
+            ("ldda", exceptions.MessageException),
+            ("hdca", exceptions.RequestParameterInvalidException),
+        ):
+            missing_id = self.trans.security.encode_id(hdas[2].id + 100)
+            with self.assertRaises(exception_class) as context:
+                self.collection_manager.create(
+                    self.trans,
+                    history,
+                    "test collection",
+                    "list",
+                    element_identifiers=[dict(src=src, name="missing", id=missing_id)],
+                )
+            assert missing_id in str(context.value)
+
     def test_update_from_dict(self):
         owner = self.user_manager.create(**user2_data)
 
@@ -194,6 +194,21 @@ class TestHDAManager(HDATestCase):
         assert not item1.deleted
         assert not item1.purged
 
+    def test_dataset_file_name_getter(self):
+        owner = self.user_manager.create(**user2_data)
+        history1 = self.history_manager.create(name="history1", user=owner)
+        item1 = self.hda_manager.create(history=history1, dataset=self.dataset_manager.create())
+        self.trans.sa_session.flush()
+
+        self.log("should fail before the file name is needed if the dataset has no file")
+        with self.assertRaises(exceptions.ObjectNotFound):
+            hdas.dataset_file_name_getter(item1)
+        self.app.object_store.update_from_file(item1.dataset, file_name=__file__, create=True)
+        assert hdas.dataset_file_name_getter(item1)() == item1.get_file_name()
+        item1.dataset.purged = True
+        with self.assertRaises(exceptions.ObjectNotFound):
+            hdas.dataset_file_name_getter(item1)
+
     def test_ownable(self):
         owner = self.user_manager.create(**user2_data)
         non_owner = self.user_manager.create(**user3_data)
@@ -126,6 +126,19 @@ class TestHistoryAsContainer(HistoryAsContainerBaseTestCase):
         assert self.contents_manager.contents(history, limit=0) == []
         assert self.contents_manager.contents(history, offset=len(contents)) == []
 
+    def test_contents_batches(self):
+        user2 = self.user_manager.create(**user2_data)
+        history = self.history_manager.create(name="history", user=user2)
+        contents = [self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(5)]
+        contents.append(self.add_list_collection_to_history(history, contents[:2]))
+
+        batches = list(self.contents_manager.contents_batches(history, batch_size=4))
+        assert [len(batch) for batch in batches] == [4, 2]
+        assert [content for batch in batches for content in batch] == contents
+        batches = list(self.contents_manager.contents_batches(history, offset=2, limit=3, batch_size=2))
+        assert [content for batch in batches for content in batch] == contents[2:5]
+        assert list(self.contents_manager.contents_batches(history, limit=0)) == []
+
     def test_orm_filtering(self):
         parse_filter = self.history_contents_filters.parse_filter
         user2 = self.user_manager.create(**user2_data)
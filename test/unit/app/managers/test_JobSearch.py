@@ -0,0 +1,157 @@
+import json
+from unittest import mock
+
+from galaxy import model
+from galaxy.managers.datasets import DatasetManager
+from galaxy.managers.hdas import HDAManager
+from galaxy.managers.histories import HistoryManager
+from galaxy.managers.jobs import JobSearch
+from galaxy.model.job_fingerprint import (
+    job_fingerprint,
+    set_job_fingerprint,
+)
+from .base import BaseTestCase
+
+
+class TestJobSearch(BaseTestCase):
+    def set_up_managers(self):
+        super().set_up_managers()
+        self.hda_manager = self.app[HDAManager]
+        self.history_manager = self.app[HistoryManager]
+        self.dataset_manager = self.app[DatasetManager]
+        self.job_search = self.app[JobSearch]
+
+    def _create_hda(self, history):
+        dataset = self.dataset_manager.create()
+        dataset.state = model.Dataset.states.OK
+        hda = self.hda_manager.create(history=history, dataset=dataset, name="input.txt")
+        hda.extension = "txt"
+        hda.init_meta()
+        hda.metadata.data_lines = 0
+        hda.metadata.dbkey = ["?"]
+        self.trans.sa_session.flush()
+        return hda
+
+    def _create_job(self, hda, parameters, state=model.Job.states.OK):
+        job = model.Job()
+        job.tool_id = "cat1"
+        job.tool_version = "1.0.0"
+        job.user = self.trans.user
+        job.state = state
+        job.add_parameter("input1", json.dumps({"values": [{"src": "hda", "id": hda.id}]}, sort_keys=True))
+        for name, value in parameters.items():
+            job.add_parameter(name, json.dumps(value, sort_keys=True))
+        job.add_parameter("chromInfo", json.dumps("/tool-data/shared/ucsc/chrom/?.len"))
+        job.add_parameter("dbkey", json.dumps("?"))
+        job.add_parameter("__input_ext", json.dumps("txt"))
+        job.add_input_dataset("input1", hda)
+        self.trans.sa_session.add(job)
+        self.trans.sa_session.flush()
+        return job
+
+    def _search(self, hda, parameters, tool_version="1.0.0"):
+        param_dump = {"input1": {"values": [{"src": "hda", "id": hda.id}]}, **parameters}
+        param = {"input1": [hda], **parameters}
+        return self.job_search.by_tool_input(
+            trans=self.trans,
+            tool_id="cat1",
+            tool_version=tool_version,
+            param=param,
+            param_dump=param_dump,
+            job_state=None,
+        )
+
+    def test_job_fingerprint(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        job = self._create_job(hda, {"lines": 10})
+        fingerprint = job_fingerprint(self.trans.sa_session, job)
+        assert fingerprint is not None
+        assert job_fingerprint(self.trans.sa_session, self._create_job(hda, {"lines": 10})) == fingerprint
+        assert job_fingerprint(self.trans.sa_session, self._create_job(hda, {"lines": 11})) != fingerprint
+        # a copy of the input shares the dataset and so the fingerprint
+        copied_hda = hda.copy()
+        history.add_dataset(copied_hda)
+        self.trans.sa_session.flush()
+        assert job_fingerprint(self.trans.sa_session, self._create_job(copied_hda, {"lines": 10})) == fingerprint
+        hda.dataset.state = model.Dataset.states.RUNNING
+        assert job_fingerprint(self.trans.sa_session, job, require_ready=True) is None
+
+    def test_job_fingerprint_inputs_changed(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        job = self._create_job(hda, {"lines": 10})
+        # the job handler records the input versions once the job is ready
+        job.input_datasets[0].dataset_version = hda.version
+        self.trans.sa_session.flush()
+        assert job_fingerprint(self.trans.sa_session, job) is not None
+        # the job consumed the input as txt, its current state must not be fingerprinted
+        hda.extension = "tabular"
+        self.trans.sa_session.flush()
+        assert job_fingerprint(self.trans.sa_session, job) is None
+        set_job_fingerprint(self.trans.sa_session, job)
+        assert job.cache_fingerprint is None
+        # while creating a job its inputs are in the state it will consume
+        assert job_fingerprint(self.trans.sa_session, job, check_inputs_unchanged=False) is not None
+
+    def test_job_fingerprint_input_ready_after_job_creation(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        hda.dataset.state = model.Dataset.states.RUNNING
+        self.trans.sa_session.flush()
+        job = self._create_job(hda, {"lines": 10}, state=model.Job.states.NEW)
+        set_job_fingerprint(self.trans.sa_session, job, require_ready=True, check_inputs_unchanged=False)
+        assert job.cache_fingerprint is None
+        # the upstream job finishes the input after this job was created
+        hda.dataset.state = model.Dataset.states.OK
+        hda.info = "finished"
+        self.trans.sa_session.flush()
+        assert hda.update_time >= job.create_time
+        job.input_datasets[0].dataset_version = hda.version
+        job.state = model.Job.states.OK
+        self.trans.sa_session.flush()
+        set_job_fingerprint(self.trans.sa_session, job)
+        assert job.cache_fingerprint is not None
+        assert self._search(hda, {"lines": 10}) == job
+
+    def test_search_by_fingerprint(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        job = self._create_job(hda, {"lines": 10})
+        set_job_fingerprint(self.trans.sa_session, job)
+        self.trans.sa_session.flush()
+        assert job.cache_fingerprint
+        with mock.patch.object(JobSearch, "_JobSearch__search", return_value=None) as search:
+            assert self._search(hda, {"lines": 10}) == job
+            assert search.call_count == 0
+            assert self._search(hda, {"lines": 11}) is None
+            assert search.call_count == 1
+            # jobs with a fingerprint have already been compared
+            assert search.call_args.kwargs["unfingerprinted_only"]
+            assert self._search(hda, {"lines": 10, "__job_resource": {"cores": 2}}) is None
+
+    def test_search_without_tool_version(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        job = self._create_job(hda, {"lines": 10})
+        set_job_fingerprint(self.trans.sa_session, job)
+        self.trans.sa_session.flush()
+        assert job.cache_fingerprint
+        # jobs of any version match, so fingerprinted jobs are compared by their parameters
+        with mock.patch.object(JobSearch, "_JobSearch__search", return_value=None) as search:
+            self._search(hda, {"lines": 10}, tool_version=None)
+            assert not search.call_args.kwargs["unfingerprinted_only"]
+        assert self._search(hda, {"lines": 10}, tool_version=None) == job
+        assert self._search(hda, {"lines": 11}, tool_version=None) is None
+
+    def test_search_falls_back_without_fingerprint(self):
+        history = self.history_manager.create(name="history", user=self.trans.user)
+        hda = self._create_hda(history)
+        job = self._create_job(hda, {"lines": 10})
+        assert job.cache_fingerprint is None
+        assert self._search(hda, {"lines": 10}) == job
+        assert self._search(hda, {"lines": 11}) is None
+        # the legacy search skips jobs that have a different fingerprint
+        job.cache_fingerprint = "0" * 64
+        self.trans.sa_session.flush()
+        assert self._search(hda, {"lines": 10}) is None
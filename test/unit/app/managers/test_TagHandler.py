@@ -1,3 +1,5 @@
+from sqlalchemy import inspect
+
 from galaxy.managers import hdas
 from galaxy.managers.histories import HistoryManager
 from galaxy.model.tags import GalaxyTagHandler
@@ -112,3 +114,32 @@ class TestTagHandler(BaseTestCase):
         # Tag
         assert self.tag_handler.item_has_tag(self.user, item=hda, tag=hda.tags[0].tag)
         assert not self.tag_handler.item_has_tag(self.user, item=hda, tag="tag2")
+
+    def test_add_tags_from_lists(self):
+        hdas = [self._create_vanilla_hda() for _ in range(3)]
+        self.tag_handler.add_tags_from_list(self.user, hdas[0], ["tag1"])
+        self.tag_handler.add_tags_from_lists(self.user, hdas, [["tag2", "name:foo"], ["group:bar", "tag2"], []])
+        self._check_tag_list(hdas[0].tags, ["tag1", "tag2", "name:foo"])
+        self._check_tag_list(hdas[1].tags, ["group:bar", "tag2"])
+        self._check_tag_list(hdas[2].tags, [])
+        sa_session = self.trans.sa_session
+        sa_session.flush()
+        for hda in hdas:
+            sa_session.expire(hda, ["tags"])
+        self.tag_handler.load_item_tags(hdas)
+        assert all("tags" not in inspect(hda).unloaded for hda in hdas)
+        self._check_tag_list(hdas[0].tags, ["tag1", "tag2", "name:foo"])
+        self._check_tag_list(hdas[2].tags, [])
+
+    def test_get_or_create_tags(self):
+        tags = self.tag_handler.get_or_create_tags(["Batch.A.b", "batch", " other ", "", "batch.a"])
+        assert set(tags) == {"batch.a.b", "batch", "other", "batch.a"}
+        assert tags["batch.a.b"].name == "batch.a.b"
+        assert tags["batch.a.b"].parent.id == tags["batch.a"].id
+        assert tags["batch.a"].parent.id == tags["batch"].id
+        assert self.tag_handler.tag_id_cache.get("other") == tags["other"].id
+        # Handler sessions share the tag id cache, and existing tags are not created again.
+        tag_handler_session = self.tag_handler.create_tag_handler_session()
+        assert tag_handler_session.tag_id_cache is self.tag_handler.tag_id_cache
+        assert tag_handler_session.get_or_create_tags(["other"])["other"].id == tags["other"].id
+        assert self.tag_handler._create_tag_instance("other").id == tags["other"].id
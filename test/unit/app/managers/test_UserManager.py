@@ -3,6 +3,7 @@ User Manager testing.
 
 Executable directly using: python -m test.unit.managers.test_UserManager
 """
+import time
 from datetime import datetime
 
 from sqlalchemy import desc
@@ -12,6 +13,7 @@ from galaxy import (
     model,
 )
 from galaxy.managers import (
+    api_keys,
     base as base_manager,
     histories,
     users,
@@ -217,6 +219,35 @@ class TestUserManager(BaseTestCase):
             == ignore_email_capitalization_user
         )
 
+    def test_api_key_cache(self):
+        user_manager = self.app.user_manager
+        user_manager.api_key_cache = users.ApiKeyCache(ttl=60)
+        api_key_manager = api_keys.ApiKeyManager(self.app)
+        user2 = self.user_manager.create(**user2_data)
+        key = api_key_manager.create_api_key(user2).key
+
+        self.log("should cache the user of an API key")
+        assert user_manager.by_api_key(key) == user2
+        assert user_manager.by_api_key(key) == user2
+        assert user_manager.api_key_cache.hits == 1
+        assert user_manager.api_key_cache.misses == 1
+
+        self.log("should not authenticate with a replaced API key")
+        new_key = api_key_manager.create_api_key(user2).key
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            user_manager.by_api_key(key)
+        assert user_manager.by_api_key(new_key) == user2
+
+        self.log("should drop cached keys of the user when deleting keys")
+        api_key_manager.delete_api_key(user2)
+        assert user_manager.api_key_cache.get(new_key) is None
+
+        self.log("should expire entries")
+        user_manager.api_key_cache.ttl = 0.0001
+        user_manager.api_key_cache.set("key", user2.id)
+        time.sleep(0.001)
+        assert user_manager.api_key_cache.get("key") is None
+
     def test_register_user_activation(self):
         pass
 
@@ -0,0 +1,60 @@
+from galaxy.app_unittest_utils.galaxy_mock import MockApp
+from galaxy.managers.workflows import (
+    WorkflowContentsManager,
+    WorkflowViewCache,
+)
+from galaxy.util.bunch import Bunch
+
+
+def test_workflow_view_cache_hands_out_copies():
+    cache = WorkflowViewCache(max_size=1)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"steps": {0: {"name": "cat1"}}}
+
+    cache.get_or_build("a", build)["steps"][0]["name"] = "changed"
+    assert cache.get_or_build("a", build)["steps"][0]["name"] == "cat1"
+    assert len(calls) == 1
+    cache.get_or_build("b", build)
+    assert len(cache) == 1
+    cache.get_or_build("a", build)
+    assert len(calls) == 3
+    cache.get_or_build(None, build)
+    assert len(calls) == 4
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_workflow_view_cache_key():
+    app = MockApp()
+    app.toolbox = Bunch(_reload_count=0)
+    manager = WorkflowContentsManager(app)
+    trans = Bunch(user=Bunch(id=3))
+    workflow = Bunch(id=7)
+    key = manager._view_cache_key(trans, workflow, "editor", True)
+    assert key == manager._view_cache_key(trans, Bunch(id=7), "editor", True)
+    assert key != manager._view_cache_key(trans, workflow, "export", True)
+    assert key != manager._view_cache_key(Bunch(user=None), workflow, "editor", True)
+    assert manager._view_cache_key(trans, Bunch(id=None), "editor", True) is None
+    app.toolbox._reload_count += 1
+    assert key != manager._view_cache_key(trans, workflow, "editor", True)
+
+
+def test_workflow_view_cache_key_tool_data_tables():
+    app = MockApp()
+    app.toolbox = Bunch(_reload_count=0)
+    data_table = Bunch(_loaded_content_version=1)
+    app.tool_data_tables.data_tables["all_fasta"] = data_table
+    manager = WorkflowContentsManager(app)
+    trans = Bunch(user=Bunch(id=3))
+    workflow = Bunch(id=7)
+    key = manager._view_cache_key(trans, workflow, "run", None)
+    assert key == manager._view_cache_key(trans, workflow, "run", None)
+    # a data manager run adds entries listed by the tool forms of the view
+    data_table._loaded_content_version += 1
+    changed_key = manager._view_cache_key(trans, workflow, "run", None)
+    assert changed_key != key
+    # reloading the tables replaces them
+    app.tool_data_tables.data_tables["all_fasta"] = Bunch(_loaded_content_version=2)
+    assert manager._view_cache_key(trans, workflow, "run", None) != changed_key
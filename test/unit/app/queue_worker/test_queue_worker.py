@@ -1,12 +1,14 @@
 import datetime
 import time
 from math import inf
+from unittest import mock
 
 import pytest
 
 from galaxy.model.database_heartbeat import DatabaseHeartbeat
 from galaxy.queue_worker import (
     GalaxyQueueWorker,
+    rebuild_toolbox_search_index,
     send_control_task,
     send_local_control_task,
 )
@@ -114,6 +116,21 @@ def test_send_control_task_noop_self(queue_worker_factory):
     assert len(app.tasks_executed) == 0
 
 
+@pytest.mark.parametrize("is_webapp", [True, False])
+def test_rebuild_toolbox_search_index_only_in_designated_builder(is_webapp):
+    app = mock.Mock(is_webapp=is_webapp, builds_tool_search_index=False)
+    app.toolbox_search.index_count = -1
+    app.toolbox._reload_count = 0
+    rebuild_toolbox_search_index(app)
+    app.reindex_tool_search.assert_not_called()
+    assert app.tool_cache.reset_status.called is is_webapp
+
+    # The designated builder may be a job handler
+    app.builds_tool_search_index = True
+    rebuild_toolbox_search_index(app)
+    app.reindex_tool_search.assert_called_once_with()
+
+
 def wait_for_var(obj, var, value, tries=10, sleep=0.25):
     while getattr(obj, var) != value and tries >= 0:
         tries -= 1
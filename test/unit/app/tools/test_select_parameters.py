@@ -1,9 +1,12 @@
+import datetime
+import os
 from unittest.mock import Mock
 
 import pytest
 
 from galaxy import model
 from galaxy.tools.parameters import basic
+from galaxy.util import bunch
 from .util import BaseParameterTestCase
 
 
@@ -52,6 +55,64 @@ class TestSelectToolParameter(BaseParameterTestCase):
         assert ("testname2", "testpath2", False) in self.param.get_options(self.trans, {"input_bam": "testpath2"})
         assert len(self.param.get_options(self.trans, {"input_bam": "testpath3"})) == 0
 
+    def test_form_cache_key(self):
+        self.options_xml = """<options from_data_table="test_table"><filter type="sort_by" column="0" /></options>"""
+        cache_key = self.param.get_form_cache_key(self.trans, {})
+        assert cache_key is not None
+        assert self.param.get_form_cache_key(self.trans, {}) == cache_key
+        self.app.tool_data_tables["test_table"]._loaded_content_version += 1
+        assert self.param.get_form_cache_key(self.trans, {}) != cache_key
+
+    def test_form_cache_key_request_dependent(self):
+        self.options_xml = """<options from_data_table="test_table"><filter type="param_value" ref="input_bam" column="0" /></options>"""
+        assert self.param.get_form_cache_key(self.trans, {}) is None
+        self._param = None
+        self.options_xml = """<options from_data_table="test_table"><filter type="static_value" column="0" value="$__user_email__" /></options>"""
+        assert self.param.get_form_cache_key(self.trans, {}) is None
+        self._param = None
+        self.options_xml = """<options from_data_table="missing_table"/>"""
+        assert self.param.get_form_cache_key(self.trans, {}) is None
+
+    def test_filter_data_meta_does_not_modify_cache(self):
+        self.options_xml = """<options><filter type="data_meta" ref="input_bam" key="dbkey"/></options>"""
+        for dbkey in ["hg19", "mm10"]:
+            hda = model.HistoryDatasetAssociation(extension="interval", sa_session=self.app.model.context)
+            hda.dbkey = dbkey
+            assert self.param.options.get_fields(self.trans, {"input_bam": hda}) == [(dbkey, dbkey, False)]
+
+    def test_filter_param_value_discard(self):
+        self.options_xml = """<options from_data_table="test_table"><filter type="param_value" ref="input_bam" column="0" keep="false" /></options>"""
+        assert self.param.get_options(self.trans, {"input_bam": "testname1"}) == [("testname2", "testpath2", False)]
+        assert len(self.param.get_options(self.trans, {"input_bam": ["testname1", "testname2"]})) == 0
+
+    def test_from_file_reloaded(self):
+        os.makedirs(self.app.config.tool_data_path, exist_ok=True)
+        path = os.path.join(self.app.config.tool_data_path, "test_options.loc")
+        with open(path, "w") as fh:
+            fh.write("b\tname_b\na\tname_a\n")
+        self.options_xml = """<options from_file="test_options.loc"><column name="value" index="0"/><column name="name" index="1"/><filter type="sort_by" column="0"/></options>"""
+        assert self.param.get_options(self.trans, {}) == [("name_a", "a", False), ("name_b", "b", False)]
+        cache_key = self.param.get_form_cache_key(self.trans, {})
+        with open(path, "a") as fh:
+            fh.write("c\tname_c\n")
+        os.utime(path, ns=(0, 0))
+        assert self.param.get_options(self.trans, {})[-1] == ("name_c", "c", False)
+        assert self.param.get_form_cache_key(self.trans, {}) != cache_key
+
+    def test_from_dataset_cached(self):
+        path = os.path.join(self.app.config.tool_data_path, "test_dataset.txt")
+        os.makedirs(self.app.config.tool_data_path, exist_ok=True)
+        with open(path, "w") as fh:
+            fh.write("a\nb\n")
+        self.options_xml = """<options from_dataset="input_bam"><column name="value" index="0"/></options>"""
+        dataset = bunch.Bunch(id=1, update_time=datetime.datetime.now(), file_name=path)
+        assert self.param.options._get_dataset_fields(dataset) == [["a"], ["b"]]
+        with open(path, "w") as fh:
+            fh.write("c\n")
+        assert self.param.options._get_dataset_fields(dataset) == [["a"], ["b"]]
+        dataset.update_time = datetime.datetime.now() + datetime.timedelta(seconds=1)
+        assert self.param.options._get_dataset_fields(dataset) == [["c"]]
+
     # TODO: Good deal of overlap here with TestDataToolParameter, refactor.
     def setUp(self):
         super().setUp()
@@ -99,6 +160,7 @@ class MockToolDataTable:
             value=1,
         )
         self.missing_index_file = None
+        self._loaded_content_version = 1
 
     def get_fields(self):
         return [["testname1", "testpath1"], ["testname2", "testpath2"]]
@@ -0,0 +1,154 @@
+from unittest import mock
+
+import pytest
+
+from galaxy.tools.search import ToolPanelViewSearch
+from galaxy.util.bunch import Bunch
+
+CONFIG = Bunch(
+    tool_id_boost=20.0,
+    tool_name_boost=20.0,
+    tool_name_exact_multiplier=10.0,
+    tool_stub_boost=2.0,
+    tool_section_boost=3.0,
+    tool_description_boost=8.0,
+    tool_help_boost=1.0,
+    tool_label_boost=1.0,
+    tool_enable_ngram_search=False,
+    tool_help_bm25f_k1=0.5,
+)
+
+
+class MockTool:
+    tool_type = "default"
+    is_latest_version = True
+    hidden = False
+    lineage = None
+    guid = None
+    labels = None
+    edam_operations = ""
+    edam_topics = ""
+    raw_help = None
+
+    def __init__(self, id, name, description=""):
+        self.id = id
+        self.name = name
+        self.description = description
+
+    def get_panel_section(self):
+        return ("section", "Section")
+
+
+class MockToolBox:
+    def __init__(self, tools):
+        self._tools = tools
+
+    def tools(self):
+        return [(tool.id, tool) for tool in self._tools]
+
+    def panel_has_tool(self, tool, panel_view_id):
+        return True
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return str(tmp_path / "index")
+
+
+def _search(index_dir):
+    return ToolPanelViewSearch("default", index_dir, config=CONFIG)
+
+
+def _indexed_hashes(search):
+    with search.index.reader() as reader:
+        return {fields["id"]: fields["tool_hash"] for fields in reader.all_stored_fields()}
+
+
+def test_build_index_incremental(index_dir):
+    search = _search(index_dir)
+    cat, sort = MockTool("cat1", "Concatenate"), MockTool("sort1", "Sort")
+    search.build_index(None, MockToolBox([cat, sort]))
+    hashes = _indexed_hashes(search)
+    assert set(hashes) == {"cat1", "sort1"}
+    assert search.search("Concatenate", CONFIG) == ["cat1"]
+
+    # Unchanged tools are neither turned into documents nor written again
+    with mock.patch.object(search, "_create_doc", wraps=search._create_doc) as create_doc:
+        search.build_index(None, MockToolBox([cat, sort]))
+        assert create_doc.call_count == 0
+        generation = search.index.latest_generation()
+        new_sort = MockTool("sort1", "Sort", description="sorts lines")
+        search.build_index(None, MockToolBox([cat, new_sort]))
+        assert [call.kwargs["tool"] for call in create_doc.call_args_list] == [new_sort]
+    assert search.index.latest_generation() == generation + 1
+    new_hashes = _indexed_hashes(search)
+    assert new_hashes["cat1"] == hashes["cat1"]
+    assert new_hashes["sort1"] != hashes["sort1"]
+
+    search.build_index(None, MockToolBox([cat]))
+    assert set(_indexed_hashes(search)) == {"cat1"}
+    assert search.search("Sort", CONFIG) == []
+
+
+def test_searcher_swapped_after_update_by_other_process(index_dir):
+    search = _search(index_dir)
+    search.build_index(None, MockToolBox([MockTool("cat1", "Concatenate")]))
+    assert search.search("Sort", CONFIG) == []
+    searcher = search._searcher
+    assert searcher is not None
+    # Another process updates the shared index
+    _search(index_dir).build_index(None, MockToolBox([MockTool("cat1", "Concatenate"), MockTool("sort1", "Sort")]))
+    assert search.search("Sort", CONFIG) == ["sort1"]
+    assert search._searcher is not searcher
+    assert searcher.is_closed
+    assert search.search("Concatenate", CONFIG) == ["cat1"]
+    assert not search._searcher.is_closed
+    assert search._searcher_users == {}
+
+
+def test_replaced_searcher_closed_after_last_search(index_dir):
+    search = _search(index_dir)
+    search.build_index(None, MockToolBox([MockTool("cat1", "Concatenate")]))
+    searcher = search._acquire_searcher()
+    _search(index_dir).build_index(None, MockToolBox([MockTool("sort1", "Sort")]))
+    # A search started before the update keeps its searcher open
+    assert search.search("Sort", CONFIG) == ["sort1"]
+    assert not searcher.is_closed
+    search._release_searcher(searcher)
+    assert searcher.is_closed
+    assert search._searcher_users == {}
+
+
+def test_build_index_rereads_index_under_lock(index_dir):
+    search = _search(index_dir)
+    toolbox = MockToolBox([MockTool("cat1", "Concatenate"), MockTool("sort1", "Sort")])
+    other_search = _search(index_dir)
+    index_writer = search.index.writer
+
+    def writer(*args, **kwds):
+        # Another process updates the index between reading it and locking it
+        other_search.build_index(None, toolbox)
+        return index_writer(*args, **kwds)
+
+    with mock.patch.object(search.index, "writer", side_effect=writer):
+        search.build_index(None, toolbox)
+        generation = search.index.latest_generation()
+    assert generation == 1
+    assert search.search("Sort", CONFIG) == ["sort1"]
+
+
+def test_locked_index_update_retried(index_dir):
+    search = _search(index_dir)
+    search.build_index(None, MockToolBox([MockTool("cat1", "Concatenate")]))
+    toolbox = MockToolBox([MockTool("cat1", "Concatenate"), MockTool("sort1", "Sort")])
+    writer = search.index.writer()
+    try:
+        search.build_index(None, toolbox, lock_timeout=0)
+        assert search._pending_update is not None
+        # still locked, the update stays pending
+        assert search.search("Sort", CONFIG) == []
+        assert search._pending_update is not None
+    finally:
+        writer.cancel()
+    assert search.search("Sort", CONFIG) == ["sort1"]
+    assert search._pending_update is None
@@ -0,0 +1,109 @@
+"""
+Test lib/galaxy/visualization/data_providers/genome.
+"""
+import os
+
+import pysam
+
+from galaxy.util.bunch import Bunch
+from galaxy.visualization.data_providers import genome
+from galaxy.visualization.genomes import GenomeRegion
+
+
+class MockHandle:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_handle_pool_reuses_idle_handles():
+    pool = genome.DataFileHandlePool(max_size=2)
+    opened = []
+
+    def opener():
+        opened.append(MockHandle())
+        return opened[-1]
+
+    with pool.checkout("a", opener, genome._close_handle) as first:
+        # A handle in use is never handed out twice.
+        with pool.checkout("a", opener, genome._close_handle) as second:
+            assert first is not second
+    assert len(opened) == 2
+    with pool.checkout("a", opener, genome._close_handle) as third:
+        assert third in opened
+    assert len(opened) == 2
+    assert not any(handle.closed for handle in opened)
+
+
+def test_handle_pool_evicts_least_recently_used():
+    pool = genome.DataFileHandlePool(max_size=1)
+    handles = {}
+
+    for key in ("a", "b"):
+        with pool.checkout(key, MockHandle, genome._close_handle) as handle:
+            handles[key] = handle
+    assert len(pool) == 1
+    assert handles["a"].closed
+    assert not handles["b"].closed
+    pool.clear()
+    assert handles["b"].closed
+
+
+def test_handle_pool_discards_handle_on_error():
+    pool = genome.DataFileHandlePool()
+    try:
+        with pool.checkout("a", MockHandle, genome._close_handle) as handle:
+            raise ValueError()
+    except ValueError:
+        pass
+    assert handle.closed
+    assert len(pool) == 0
+
+
+def test_chrom_name_cache():
+    cache = genome.ChromNameCache()
+    assert cache.resolve("ds", "chr1", ["1", "2"]) == "1"
+    assert cache.resolve("ds", "2", ["chr1", "chr2"]) == "chr2"
+    assert cache.resolve("ds", "3", ["1", "2"]) is None
+    assert cache.lookup("ds", "chr1") == "1"
+    assert cache.lookup("other", "chr1") is None
+
+
+def test_tile_cache_hands_out_copies():
+    cache = genome.TileCache(max_size=1)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"data": [1, 2, 3]}
+
+    cache.get_or_compute("tile", compute)["region"] = "chr1:0-10"
+    tile = cache.get_or_compute("tile", compute)
+    assert len(calls) == 1
+    assert "region" not in tile
+    cache.get_or_compute(None, compute)
+    assert len(calls) == 2
+
+
+def test_tile_key_value():
+    assert genome._tile_key_value(GenomeRegion("chr1", 0, 10, "ACGT")) == ("region", "chr1:0-10")
+    assert genome._tile_key_value(1.5) == 1.5
+
+
+def test_tabix_provider_pools_handles(tmp_path):
+    bed_path = os.path.join(tmp_path, "test.bed")
+    with open(bed_path, "w") as out:
+        out.write("1\t10\t20\tfeature1\n1\t30\t40\tfeature2\n2\t10\t20\tfeature3\n")
+    bgzip_path = pysam.tabix_index(bed_path, preset="bed", keep_original=True)
+    provider = genome.TabixDataProvider(
+        converted_dataset=Bunch(file_name=f"{bgzip_path}.tbi"),
+        dependencies={"bgzip": Bunch(file_name=bgzip_path)},
+    )
+    for _ in range(2):
+        with provider.open_data_file() as data_file:
+            lines = list(provider.get_iterator(data_file, "chr1", 0, 100))
+        assert [line.split("\t")[3] for line in lines] == ["feature1", "feature2"]
+    assert genome.chrom_name_cache.lookup(provider._data_files_key(), "chr1") == "1"
+    genome.data_file_handle_pool.clear()
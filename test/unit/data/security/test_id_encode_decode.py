@@ -1,3 +1,4 @@
+from galaxy.exceptions import MalformedId
 from galaxy.security import idencoding
 
 test_helper_1 = idencoding.IdEncodingHelper(id_secret="secu1")
@@ -139,3 +140,34 @@ def test_encode_decode_guid():
     encoded_key = test_helper_1.encode_guid(session_key)
     decoded_key = test_helper_1.decode_guid(encoded_key)
     assert session_key == decoded_key, f"{session_key} != {decoded_key}"
+
+
+def test_encode_decode_ids():
+    ids = [1, 2, 12345678, 123456789012345678, 2]
+    encoded_ids = test_helper_1.encode_ids(ids)
+    assert encoded_ids == [test_helper_1.encode_id(i) for i in ids]
+    assert test_helper_1.decode_ids(encoded_ids) == ids
+    # Uncached ids are batched as well
+    helper = idencoding.IdEncodingHelper(id_secret="secu1", id_cache_size=0)
+    assert helper.encode_ids(ids) == encoded_ids
+    assert helper.decode_ids(encoded_ids) == ids
+    assert helper.encode_ids(ids, kind="k1") == [test_helper_1.encode_id(i, kind="k1") for i in ids]
+
+
+def test_decode_ids_malformed():
+    encoded_id = test_helper_1.encode_id(1)
+    for malformed_id in ("abc", encoded_id[:-1] + "x", None):
+        threw_exception = False
+        try:
+            test_helper_1.decode_ids([encoded_id, malformed_id])
+        except MalformedId:
+            threw_exception = True
+        assert threw_exception
+
+
+def test_id_cache_is_bounded():
+    helper = idencoding.IdEncodingHelper(id_secret="secu1", id_cache_size=2)
+    helper.encode_ids([1, 2, 3])
+    assert len(helper._encoded_id_cache) == 2
+    # True == 1, but they are not the same id
+    assert helper.encode_id(True) != helper.encode_id(1)
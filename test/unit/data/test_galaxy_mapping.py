@@ -16,6 +16,7 @@ import galaxy.model
 import galaxy.model.mapping as mapping
 from galaxy import model
 from galaxy.model.database_utils import create_database
+from galaxy.model.dataset_collections.element_tree import load_collection_element_tree
 from galaxy.model.metadata import MetadataTempFile
 from galaxy.model.orm.util import (
     add_object_to_object_session,
@@ -409,6 +410,39 @@ class TestMappings(BaseModelTestCase):
             (("outer_list", "inner_list", "reverse"), "txt", "mock_dataset_14.dat"),
         ]
 
+    def test_collection_element_tree(self):
+        u = model.User(email="mary2@example.com", password="password")
+        h1 = model.History(name="History 1", user=u)
+        outer = model.DatasetCollection(collection_type="list:paired")
+        hdas = []
+        for i in range(3):
+            pair = model.DatasetCollection(collection_type="paired")
+            for j, identifier in enumerate(("forward", "reverse")):
+                hda = model.HistoryDatasetAssociation(history=h1, create_dataset=True, sa_session=self.model.session)
+                model.DatasetCollectionElement(
+                    collection=pair, element=hda, element_identifier=identifier, element_index=j
+                )
+                hdas.append(hda)
+            model.DatasetCollectionElement(
+                collection=outer, element=pair, element_identifier=f"pair{i}", element_index=i
+            )
+        self.persist(u, h1, outer)
+        outer_id = outer.id
+        hda_ids = [hda.id for hda in hdas]
+        self.expunge()
+
+        outer = self.model.session.query(model.DatasetCollection).get(outer_id)
+        element_tree = load_collection_element_tree(outer, load_dataset_instances=True)
+        assert load_collection_element_tree(outer) is element_tree
+        assert len(element_tree.elements) == 9
+        assert [e.element_identifier for e in element_tree.children(outer_id)] == ["pair0", "pair1", "pair2"]
+        assert [e.hda.id for e in element_tree.dataset_elements()] == hda_ids
+        assert "elements" not in inspect(outer).unloaded
+        for element in outer.elements:
+            assert "elements" not in inspect(element.child_collection).unloaded
+            assert [e.element_identifier for e in element.child_collection.elements] == ["forward", "reverse"]
+        assert load_collection_element_tree(model.DatasetCollection(collection_type="list")) is None
+
     def test_dataset_dbkeys_and_extensions_summary(self):
         u = model.User(email="mary2@example.com", password="password")
         h1 = model.History(name="History 1", user=u)
@@ -549,6 +583,47 @@ class TestMappings(BaseModelTestCase):
         loaded_job = self.model.session.query(model.Job).filter(model.Job.user == u).first()
         assert loaded_job.tool_id == "cat1"
 
+    def test_job_state_count(self):
+        u = model.User(email="jobstatecount@foo.bar.baz", password="password")
+        self.persist(u)
+        user_id = u.id
+
+        def job_counts():
+            self.expunge()
+            rows = (
+                self.model.session.query(model.JobStateCount)
+                .filter(model.JobStateCount.user_id == user_id, model.JobStateCount.job_count > 0)
+                .all()
+            )
+            return {(row.destination_id, row.state): row.job_count for row in rows}
+
+        jobs = []
+        for _ in range(3):
+            job = model.Job()
+            job.user = u
+            job.tool_id = "cat1"
+            job.state = model.Job.states.QUEUED
+            job.destination_id = "local"
+            jobs.append(job)
+        self.persist(*jobs)
+        job_ids = [job.id for job in jobs]
+        assert job_counts() == {("local", "queued"): 3}
+
+        job = self.model.session.query(model.Job).get(job_ids[0])
+        job.state = model.Job.states.RUNNING
+        self.persist(job)
+        job = self.model.session.query(model.Job).get(job_ids[1])
+        job.destination_id = "cluster"
+        self.persist(job)
+        assert job_counts() == {("local", "queued"): 1, ("local", "running"): 1, ("cluster", "queued"): 1}
+
+        for job_id in job_ids[:2]:
+            job = self.model.session.query(model.Job).get(job_id)
+            job.state = model.Job.states.OK
+            self.persist(job)
+        self.model.session.delete(self.model.session.query(model.Job).get(job_ids[2]))
+        assert job_counts() == {}
+
     def test_job_metrics(self):
         u = model.User(email="jobtest@foo.bar.baz", password="password")
         job = model.Job()
@@ -906,6 +981,38 @@ class TestMappings(BaseModelTestCase):
         )
         assert not security_agent.can_access_dataset(u_other.all_roles(), d1.dataset)
 
+    def test_set_new_datasets_permissions(self):
+        security_agent = GalaxyRBACAgent(self.model)
+        u_from, u_to, _ = self._three_users("set_new_perms")
+
+        h = model.History(name="History for batched permissions", user=u_from)
+        hdas = [
+            model.HistoryDatasetAssociation(
+                extension="txt", history=h, create_dataset=True, sa_session=self.model.session
+            )
+            for _ in range(3)
+        ]
+        self.persist(h, *hdas)
+
+        role = security_agent.get_private_user_role(u_from, auto_create=True)
+        access_action = security_agent.permitted_actions.DATASET_ACCESS
+        manage_action = security_agent.permitted_actions.DATASET_MANAGE_PERMISSIONS.action
+        permissions = {access_action: [role], manage_action: [role.id]}
+        security_agent.set_all_dataset_permissions(hdas[0].dataset, permissions, new=True)
+        assert security_agent.set_new_datasets_permissions([hda.dataset for hda in hdas[1:]], permissions) == ""
+        self.model.session.flush()
+
+        def permission_rows(dataset):
+            self.model.session.refresh(dataset)
+            return sorted((dp.action, dp.role_id) for dp in dataset.actions)
+
+        expected = permission_rows(hdas[0].dataset)
+        assert expected == sorted([(access_action.action, role.id), (manage_action, role.id)])
+        for hda in hdas[1:]:
+            assert permission_rows(hda.dataset) == expected
+        assert not security_agent.can_access_dataset(u_to.all_roles(), hdas[2].dataset)
+        assert security_agent.set_new_datasets_permissions([hdas[0].dataset], {access_action: [role]}) != ""
+
     def test_can_manage_privately_shared_dataset(self):
         security_agent = GalaxyRBACAgent(self.model)
         u_from, u_to, u_other = self._three_users("can_manage_dataset")
@@ -1,4 +1,5 @@
 import os
+import random
 from tempfile import (
     mkdtemp,
     mkstemp,
@@ -11,6 +12,11 @@ from galaxy.exceptions import ObjectInvalid
 from galaxy.objectstore.azure_blob import AzureBlobObjectStore
 from galaxy.objectstore.cloud import Cloud
 from galaxy.objectstore.pithos import PithosObjectStore
+from galaxy.objectstore.placement import (
+    BackendLookupCache,
+    BackendPlacement,
+    MIN_THROUGHPUT_SAMPLE_BYTES,
+)
 from galaxy.objectstore.s3 import S3ObjectStore
 from galaxy.objectstore.unittest_utils import (
     Config as TestConfig,
@@ -40,6 +46,7 @@ def test_disk_store():
             # Test no dataset with id 1 exists.
             absent_dataset = MockDataset(1)
             assert not object_store.exists(absent_dataset)
+            assert not object_store.colocates_outputs()
 
             # Write empty dataset 2 in second backend, ensure it is empty and
             # exists.
@@ -103,6 +110,69 @@ extra_dirs:
 """
 
 
+def test_disk_store_delete_many():
+    with TestConfig(DISK_TEST_CONFIG) as (directory, object_store):
+        datasets = [MockDataset(i) for i in range(1, 11)]
+        for dataset in datasets:
+            object_store.create(dataset)
+        extra_dir = "dataset_1_files"
+        directory.write("extra", f"files1/000/{extra_dir}/extra.txt")
+        results = object_store.delete_many(
+            [(dataset, {}) for dataset in datasets]
+            + [(datasets[0], dict(dir_only=True, extra_dir=extra_dir, entire_dir=True))],
+            max_workers=4,
+        )
+        assert results == [True] * 11
+        assert not any(object_store.exists(dataset) for dataset in datasets)
+        assert not os.path.exists(os.path.join(directory.temp_directory, "files1", "000", extra_dir))
+
+
+def test_disk_store_path_cache():
+    with TestConfig(DISK_TEST_CONFIG) as (directory, object_store):
+        object_store.check_old_style = True
+        path_cache = object_store.path_cache
+        dataset = MockDataset(1)
+        assert not object_store.exists(dataset)
+        old_style_path = os.path.join(directory.temp_directory, "files1", "dataset_1.dat")
+        assert path_cache.is_missing(old_style_path)
+        hits = path_cache.hits
+        assert not object_store.exists(dataset)
+        assert path_cache.hits == hits + 2
+        object_store.create(dataset)
+        assert object_store.exists(dataset)
+        assert object_store.get_filename(dataset) == os.path.join(
+            directory.temp_directory, "files1", "000", "dataset_1.dat"
+        )
+        with pytest.raises(ObjectInvalid):
+            object_store.get_filename(dataset, extra_dir="dataset_1_files/../other")
+        with pytest.raises(ObjectInvalid):
+            object_store.get_filename(dataset, alt_name="../../dataset_2.dat")
+        assert object_store.delete(dataset)
+        assert not object_store.exists(dataset)
+
+        # Missing hashed paths are only remembered when missing_ttl is set
+        object_store.missing_ttl = 60
+        other = MockDataset(2)
+        assert not object_store.exists(other)
+        directory.write("", "files1/000/dataset_2.dat")
+        assert not object_store.exists(other)
+        object_store.update_from_file(
+            other, file_name=os.path.join(directory.temp_directory, "files1/000/dataset_2.dat")
+        )
+        assert object_store.exists(other)
+
+
+def test_disk_store_bulk_lookups():
+    with TestConfig(DISK_TEST_CONFIG) as (directory, object_store):
+        datasets = [MockDataset(i) for i in range(1, 5)]
+        for dataset in datasets[:2]:
+            object_store.create(dataset)
+        assert object_store.exists_many(datasets) == [True, True, False, False]
+        filenames = object_store.get_filenames(datasets)
+        assert filenames[:2] == [object_store.get_filename(dataset) for dataset in datasets[:2]]
+        assert filenames[2:] == [None, None]
+
+
 def test_disk_store_by_uuid():
     for config_str in [DISK_TEST_CONFIG_BY_UUID_YAML]:
         with TestConfig(config_str) as (directory, object_store):
@@ -400,6 +470,120 @@ def test_distributed_store():
             assert len(extra_dirs) == 2
 
 
+DISTRIBUTED_CAPACITY_TEST_CONFIG = """<?xml version="1.0"?>
+<object_store type="distributed">
+    <backends placement="capacity" colocate_outputs="true">
+        <backend id="files1" type="disk" weight="1" maxpctfull="90">
+            <files_dir path="${temp_directory}/files1"/>
+        </backend>
+        <backend id="files2" type="disk" weight="1" maxpctfull="90">
+            <files_dir path="${temp_directory}/files2"/>
+        </backend>
+    </backends>
+</object_store>
+"""
+
+
+def test_distributed_store_capacity_placement():
+    with TestConfig(DISTRIBUTED_CAPACITY_TEST_CONFIG) as (directory, object_store):
+        as_dict = object_store.to_dict()
+        _assert_key_has_value(as_dict, "placement", "capacity")
+        _assert_key_has_value(as_dict, "colocate_outputs", True)
+
+        # A backend at its maximum fill percentage receives no new objects.
+        object_store.placement.update_usage("files1", 10, 90)
+        object_store.placement.update_usage("files2", 90, 90)
+        for i in range(20):
+            dataset = MockDataset(100 + i)
+            object_store.create(dataset)
+            assert dataset.object_store_id == "files1"
+
+        assert object_store.colocates_outputs()
+        assert object_store.select_colocated_store_id(["files2", "files2", "files1"]) == "files2"
+        assert object_store.select_colocated_store_id(["other", None]) is None
+        object_store.weighted_backend_ids = ["files1"]
+        assert object_store.select_colocated_store_id(["files2", "files2", "files1"]) == "files1"
+
+
+def test_distributed_store_lookup_cache():
+    with TestConfig(DISTRIBUTED_TEST_CONFIG) as (directory, object_store):
+        dataset = MockDataset(1)
+        object_store.create(dataset)
+        backend_id = dataset.object_store_id
+
+        missing_id = MockDataset(1)
+        assert object_store.exists(missing_id)
+        assert missing_id.object_store_id == backend_id
+        missing_id = MockDataset(1)
+        assert object_store.exists(missing_id)
+        assert object_store.lookup_cache.hits == 1
+
+        assert not object_store.exists(MockDataset(2))
+        assert not object_store.exists(MockDataset(2))
+        assert object_store.lookup_cache.hits == 2
+        # Creating the object drops the cached miss.
+        object_store.create(MockDataset(2))
+        assert object_store.exists(MockDataset(2))
+
+
+def test_distributed_store_delete_many():
+    with TestConfig(DISTRIBUTED_TEST_CONFIG) as (directory, object_store):
+        datasets = [MockDataset(i) for i in range(1, 21)]
+        for dataset in datasets:
+            object_store.create(dataset)
+        assert {dataset.object_store_id for dataset in datasets} == {"files1", "files2"}
+        unknown = MockDataset(21)
+        unknown.object_store_id = "unknown"
+        results = object_store.delete_many([(dataset, {}) for dataset in datasets + [unknown]])
+        assert results == [True] * 20 + [False]
+        assert not any(object_store.exists(dataset) for dataset in datasets)
+
+
+def test_distributed_store_bulk_lookups():
+    with TestConfig(DISTRIBUTED_TEST_CONFIG) as (directory, object_store):
+        datasets = [MockDataset(i) for i in range(1, 21)]
+        for dataset in datasets:
+            object_store.create(dataset)
+        unknown = MockDataset(21)
+        unknown.object_store_id = "unknown"
+        assert object_store.exists_many(datasets + [unknown]) == [True] * 20 + [False]
+        filenames = object_store.get_filenames(datasets + [unknown])
+        assert filenames == [object_store.get_filename(dataset) for dataset in datasets] + [None]
+
+
+def test_backend_placement():
+    placement = BackendPlacement({"a": 1, "b": 1}, rng=random.Random(1))
+    placement.update_usage("a", 50, 0)
+    placement.update_usage("b", 95, 90)
+    assert placement.effective_weights() == {"a": 0.25, "b": 0.0}
+    assert {placement.choose() for _ in range(10)} == {"a"}
+    assert placement.choose(["b"]) is None
+
+    placement.update_usage("b", 0, 0)
+    placement.record_write("a", 4 * MIN_THROUGHPUT_SAMPLE_BYTES, 1.0)
+    placement.record_write("b", 12 * MIN_THROUGHPUT_SAMPLE_BYTES, 1.0)
+    # Small writes do not count towards throughput.
+    placement.record_write("a", 1, 100.0)
+    weights = placement.effective_weights()
+    assert weights["a"] == pytest.approx(0.25 * 0.5**0.5)
+    assert weights["b"] == pytest.approx(1.5**0.5)
+
+
+def test_backend_lookup_cache():
+    cache = BackendLookupCache(max_size=2, negative_ttl=60)
+    assert cache.get(("D", 1)) is BackendLookupCache.MISSING
+    cache.set(("D", 1), None, lookup_key=())
+    assert cache.get(("D", 1), ()) is None
+    assert cache.get(("D", 1), (("extra_dir", "x"),)) is BackendLookupCache.MISSING
+    cache.set(("D", 1), "files1")
+    assert cache.get(("D", 1), (("extra_dir", "x"),)) == "files1"
+    cache.set(("D", 2), "files1")
+    cache.set(("D", 3), "files2")
+    assert cache.get(("D", 1)) is BackendLookupCache.MISSING
+    cache.invalidate(("D", 3))
+    assert len(cache) == 1
+
+
 # Unit testing the cloud and advanced infrastructure object stores is difficult, but
 # we can at least stub out initializing and test the configuration of these things from
 # XML and dicts.
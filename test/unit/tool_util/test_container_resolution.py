@@ -8,12 +8,19 @@ from galaxy.tool_util.deps.container_resolvers.mulled import (
     CachedMulledSingularityContainerResolver,
     MulledDockerContainerResolver,
 )
-from galaxy.tool_util.deps.containers import ContainerRegistry
+from galaxy.tool_util.deps.containers import (
+    ContainerRegistry,
+    ResolvedContainerDescription,
+)
 from galaxy.tool_util.deps.dependencies import (
     AppInfo,
     ToolInfo,
 )
-from galaxy.tool_util.deps.requirements import ToolRequirement
+from galaxy.tool_util.deps.requirements import (
+    ContainerDescription,
+    ToolRequirement,
+)
+from galaxy.tool_util.deps.requirements_cache import RequirementsResolutionCache
 
 SINGULARITY_IMAGES = (
     "foo:1.0--bar",
@@ -44,6 +51,47 @@ def test_container_registry(container_registry, mocker):
     assert "samtools:1.10" in container_description.identifier
 
 
+def test_container_registry_memoizes_resolution(mocker):
+    requirements_cache = RequirementsResolutionCache()
+    container_registry = ContainerRegistry(
+        AppInfo(container_image_cache_path="."), requirements_cache=requirements_cache
+    )
+    container_description = ContainerDescription("quay.io/biocontainers/samtools:1.10", type=DOCKER_CONTAINER_TYPE)
+    resolve = mocker.patch.object(
+        container_registry, "resolve", return_value=ResolvedContainerDescription(None, container_description)
+    )
+    tool_info = ToolInfo(requirements=[ToolRequirement(name="samtools", version="1.10", type="package")])
+    for _ in range(2):
+        assert (
+            container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], tool_info)
+            is container_description
+        )
+    assert resolve.call_count == 1
+    assert requirements_cache.hit_rate == 0.5
+    other_tool_info = ToolInfo(requirements=[ToolRequirement(name="samtools", version="1.9", type="package")])
+    container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info)
+    assert resolve.call_count == 2
+    requirements_cache.invalidate()
+    container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], tool_info)
+    assert resolve.call_count == 3
+    # failed resolutions are not remembered
+    resolve.side_effect = Exception("docker daemon unavailable")
+    assert container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info) is None
+    assert container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info) is None
+    assert resolve.call_count == 5
+    # neither is not finding a container, the image may become available later
+    resolve.side_effect = None
+    resolve.return_value = None
+    assert container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info) is None
+    assert container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info) is None
+    assert resolve.call_count == 7
+    resolve.return_value = ResolvedContainerDescription(None, container_description)
+    assert (
+        container_registry.find_best_container_description([DOCKER_CONTAINER_TYPE], other_tool_info)
+        is container_description
+    )
+
+
 def test_docker_container_resolver_detects_docker_cli_absent(mocker):
     mocker.patch("galaxy.tool_util.deps.container_resolvers.mulled.which", return_value=None)
     resolver = CachedMulledDockerContainerResolver()
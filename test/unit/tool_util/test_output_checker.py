@@ -1,8 +1,12 @@
+import os
+import shutil
+import tempfile
 from unittest.mock import Mock
 
 from galaxy.tool_util.output_checker import (
     check_output,
     DETECTED_JOB_STATE,
+    search_stream_file,
 )
 from galaxy.tool_util.parser.stdio import (
     StdioErrorLevel,
@@ -20,6 +24,12 @@ class TestOutputChecker(TestCase):
         self.stdout = ""
         self.stderr = ""
         self.tool_exit_code = None
+        self.stdout_path = None
+        self.stderr_path = None
+        self.temp_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
 
     def test_default_no_stderr_success(self):
         self.__assertSuccessful()
@@ -88,6 +98,51 @@ class TestOutputChecker(TestCase):
         self.stderr = "foobar"
         self.__assertSuccessful()
 
+    def test_stderr_regex_matches_complete_file(self):
+        regex = ToolStdioRegex()
+        regex.stderr_match = True
+        regex.match = "foo"
+        self.__add_regex(regex)
+        # the stderr string is shrunk for the database, the file is authoritative
+        self.stderr = "bar"
+        self.stderr_path = self.__write_file("bar\n" * 1000 + "foobar\n")
+        self.__assertNotSuccessful()
+        assert self.__check_output()[3][0]["match"] == "foo"
+
+    def test_stdout_regex_negative_match_complete_file(self):
+        regex = ToolStdioRegex()
+        regex.stdout_match = True
+        regex.match = "foo"
+        self.__add_regex(regex)
+        self.stdout = "foobar"
+        self.stdout_path = self.__write_file("bar\n")
+        self.__assertSuccessful()
+
+    def test_search_stream_file_chunk_boundaries(self):
+        path = self.__write_file("x" * 10 + "Error: out of memory\n" + "y" * 10)
+        regexes = [
+            ToolStdioRegex({"match": "error: out of memory"}),
+            ToolStdioRegex({"match": "^x+"}),
+            ToolStdioRegex({"match": "^y+"}),
+            ToolStdioRegex({"match": "y+$"}),
+            ToolStdioRegex({"match": "not there"}),
+            ToolStdioRegex({"match": "memory$"}),
+        ]
+        for chunk_size in (1, 4, 7, 64):
+            matches = search_stream_file(path, regexes, chunk_size=chunk_size, overlap=32)
+            assert matches[0].group(0) == "Error: out of memory"
+            assert matches[1].group(0) == "x" * 10
+            assert matches[2] is None
+            assert matches[3].group(0) == "y" * 10
+            assert matches[4] is None
+            assert matches[5] is None
+
+    def __write_file(self, contents):
+        fd, path = tempfile.mkstemp(dir=self.temp_directory)
+        with os.fdopen(fd, "w") as f:
+            f.write(contents)
+        return path
+
     def __add_regex(self, regex):
         self.tool.stdio_regexes.append(regex)
 
@@ -99,5 +154,12 @@ class TestOutputChecker(TestCase):
 
     def __check_output(self):
         return check_output(
-            self.tool.stdio_regexes, self.tool.stdio_exit_codes, self.stdout, self.stderr, self.tool_exit_code, "job_id"
+            self.tool.stdio_regexes,
+            self.tool.stdio_exit_codes,
+            self.stdout,
+            self.stderr,
+            self.tool_exit_code,
+            "job_id",
+            stdout_path=self.stdout_path,
+            stderr_path=self.stderr_path,
         )
@@ -1,6 +1,12 @@
+import json
+
 import pytest
 
 from galaxy.tool_util.data import ToolDataTableManager
+from galaxy.tool_util.data.columnar import (
+    ColumnarFields,
+    SIDECAR_SUFFIX,
+)
 
 LOC_ALPHA_CONTENTS = """
 data1	data1name	${__HERE__}/data1/entry.txt
@@ -161,3 +167,63 @@ def test_to_json(merged_tdt_manager, tmp_path):
     assert not json_path.exists()
     merged_tdt_manager.to_json(json_path)
     assert json_path.exists()
+
+
+def test_to_json_after_reload(tdt_manager, tmp_path):
+    json_path = tmp_path / "as_json.json"
+    tdt_manager.to_json(json_path)
+    assert len(json.loads(json_path.read_text())["testalpha"]["data"]) == 2
+    loc1 = tmp_path / "testalpha.loc"
+    loc1.write_text(LOC_ALPHA_CONTENTS_V2)
+    tdt_manager.reload_tables("testalpha")
+    tdt_manager.to_json(json_path)
+    assert len(json.loads(json_path.read_text())["testalpha"]["data"]) == 3
+
+
+@pytest.fixture
+def columnar_tdt_manager(tmp_path) -> ToolDataTableManager:
+    _write_loc_files(tmp_path)
+    conf = tmp_path / "tool_data_table_conf.xml"
+    conf.write_text(TOOL_DATA_TABLE_CONF_XML)
+    return ToolDataTableManager(tmp_path, conf, other_config_dict={"tool_data_table_columnar_cache": True})
+
+
+def test_columnar_fields():
+    rows = [["a", "", "ü"], ["b", "a", "path/a"], ["a", "a", "", "extra"], ["", "b", "ü"]]
+    fields = ColumnarFields.from_rows(rows, metadata={"errors": ["bad line"]})
+    assert len(fields) == 4
+    assert list(fields) == rows
+    assert fields[-1] == rows[-1]
+    assert fields.metadata == {"errors": ["bad line"]}
+    assert list(fields.find(0, "a")) == [rows[0], rows[2]]
+    assert list(fields.find(1, "")) == [rows[0]]
+    assert list(fields.find(2, "path/a")) == [rows[1]]
+    assert list(fields.find(3, "extra")) == [rows[2]]
+    assert list(fields.find(0, "path")) == []
+
+
+def test_columnar_cache(columnar_tdt_manager, tmp_path):
+    table = columnar_tdt_manager["testalpha"]
+    sidecar = tmp_path / f"testalpha.loc{SIDECAR_SUFFIX}"
+    assert sidecar.exists()
+    assert table.get_fields() == [
+        ["data1", "data1name", f"{tmp_path}/data1/entry.txt"],
+        ["data2", "data2name", f"{tmp_path}/data2/entry.txt"],
+    ]
+    assert table.get_entry("value", "data2", "name") == "data2name"
+    assert table.get_entries("name", "data1name", None) == [
+        {"value": "data1", "name": "data1name", "path": f"{tmp_path}/data1/entry.txt"}
+    ]
+    table.add_entry(["data4", "data4name", "data4/entry.txt"])
+    assert table.get_entry("value", "data4", "name") == "data4name"
+    assert columnar_tdt_manager.to_dict()["testalpha"]["data"][-1] == ["data4", "data4name", "data4/entry.txt"]
+
+    # an unchanged file reuses the sidecar, a changed one rebuilds it
+    mtime = sidecar.stat().st_mtime_ns
+    columnar_tdt_manager.reload_tables()
+    assert sidecar.stat().st_mtime_ns == mtime
+    assert len(columnar_tdt_manager["testalpha"].data) == 2
+    (tmp_path / "testalpha.loc").write_text(LOC_ALPHA_CONTENTS_V2)
+    columnar_tdt_manager.reload_tables()
+    assert len(columnar_tdt_manager["testalpha"].data) == 3
+    assert columnar_tdt_manager["testalpha"].get_entry("value", "data3", "name") == "data3name"
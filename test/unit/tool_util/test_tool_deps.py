@@ -543,6 +543,40 @@ def test_shell_commands_built():
         __assert_foo_exported(commands)
 
 
+def test_shell_commands_memoized():
+    with __test_base_path() as base_path:
+        dm = __dependency_manager_for_base_path(default_base_path=base_path)
+        __setup_galaxy_package_dep(base_path, TEST_REPO_NAME, TEST_VERSION, contents='export FOO="bar"')
+        mock_requirements = ToolRequirements([{"type": "package", "version": TEST_VERSION, "name": TEST_REPO_NAME}])
+        commands = dm.dependency_shell_commands(mock_requirements)
+        assert dm.dependency_shell_commands(mock_requirements) == commands
+        assert (dm.requirements_cache.hits, dm.requirements_cache.misses) == (1, 1)
+        # installing dependencies into the base path invalidates memoized resolutions
+        __setup_galaxy_package_dep(base_path, "other", TEST_VERSION)
+        __assert_foo_exported(dm.dependency_shell_commands(mock_requirements))
+        assert (dm.requirements_cache.hits, dm.requirements_cache.misses) == (1, 2)
+
+
+def test_shell_commands_memoized_package_directory_watched():
+    with __test_base_path() as base_path:
+        dm = __dependency_manager_for_base_path(default_base_path=base_path)
+        __setup_galaxy_package_dep(base_path, TEST_REPO_NAME, "0.9", contents='export FOO="old"')
+        mock_requirements = ToolRequirements([{"type": "package", "version": TEST_VERSION, "name": TEST_REPO_NAME}])
+        # unresolved requirements are not remembered
+        assert dm.dependency_shell_commands(mock_requirements) == []
+        assert dm.dependency_shell_commands(mock_requirements) == []
+        assert (dm.requirements_cache.hits, dm.requirements_cache.misses) == (0, 2)
+        # a new version installed below an existing package directory is picked up
+        old_requirements = ToolRequirements([{"type": "package", "version": "0.9", "name": TEST_REPO_NAME}])
+        dm.dependency_shell_commands(old_requirements)
+        dm.dependency_shell_commands(old_requirements)
+        assert dm.requirements_cache.hits == 1
+        __setup_galaxy_package_dep(base_path, TEST_REPO_NAME, TEST_VERSION, contents='export FOO="bar"')
+        dm.dependency_shell_commands(old_requirements)
+        assert dm.requirements_cache.hits == 1
+        __assert_foo_exported(dm.dependency_shell_commands(mock_requirements))
+
+
 def __assert_foo_exported(commands):
     command = ["bash", "-c", '%s; echo "$FOO"' % "".join(commands)]
     process = Popen(command, stdout=PIPE)
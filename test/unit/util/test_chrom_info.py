@@ -0,0 +1,72 @@
+import os
+
+from galaxy.util.bunch import Bunch
+from galaxy.util.chrom_info import (
+    ChromInfoStore,
+    ChromLengths,
+)
+from galaxy.util.dbkeys import GenomeBuilds
+
+LEN_CONTENTS = "chr2\t200\n# comment\nchr10\t1000\nchr1\t100\nchr2\t222\n"
+
+
+def test_chrom_lengths(tmp_path):
+    len_file = tmp_path / "hg.len"
+    len_file.write_text(LEN_CONTENTS)
+    chrom_lengths = ChromLengths.from_len_file(str(len_file))
+    assert len(chrom_lengths) == 4
+    assert chrom_lengths.line_count == 5
+    assert list(chrom_lengths.items()) == [("chr2", 200), ("chr10", 1000), ("chr1", 100), ("chr2", 222)]
+    assert chrom_lengths.get("chr2") == 200
+    assert chrom_lengths.get("chrX") is None
+    assert "chr1" in chrom_lengths
+    assert chrom_lengths.record(1) == ("chr10", 1000, 2)
+    assert chrom_lengths.index_at_line(1) == 1
+    assert chrom_lengths.index_at_line(5) == 4
+
+
+def test_chrom_info_store(tmp_path):
+    len_file = tmp_path / "hg.len"
+    len_file.write_text(LEN_CONTENTS)
+    cache_dir = str(tmp_path / "cache")
+    store = ChromInfoStore(cache_dir=cache_dir)
+    chrom_lengths = store.get(str(len_file))
+    assert store.get(str(len_file)) is chrom_lengths
+    assert (store.hits, store.misses) == (1, 1)
+    assert os.listdir(cache_dir) == [os.path.basename(store.index_path(str(len_file)))]
+    assert store.get(str(tmp_path / "missing.len")) is None
+
+    # another process maps the existing index
+    other_store = ChromInfoStore(cache_dir=cache_dir)
+    assert list(other_store.get(str(len_file)).items()) == list(chrom_lengths.items())
+
+    len_file.write_text("chrM\t16569\n")
+    os.utime(len_file, ns=(0, 0))
+    assert list(store.get(str(len_file)).items()) == [("chrM", 16569)]
+    assert list(other_store.get(str(len_file)).items()) == [("chrM", 16569)]
+
+
+def test_genome_builds_dbkey_table_reload(tmp_path):
+    len_file = tmp_path / "hg.len"
+    len_file.write_text(LEN_CONTENTS)
+    table = Bunch(
+        _loaded_content_version=1,
+        get_named_fields_list=lambda: [{"value": "hg", "name": "Human", "len_path": str(len_file)}],
+    )
+    config = Bunch(len_file_path=str(tmp_path), chrom_info_cache_dir=str(tmp_path / "cache"))
+    app = Bunch(config=config, tool_data_tables={"__dbkeys__": table})
+    genome_builds = GenomeBuilds(app, load_old_style=False)
+    assert genome_builds.get_genome_build_names() == [("?", "unspecified (?)"), ("hg", "Human")]
+    assert genome_builds.get_chrom_info("hg")[0] == str(len_file)
+    assert genome_builds.get_chrom_lengths("hg").get("chr10") == 1000
+    assert genome_builds.get_chrom_lengths("mm") is None
+
+    # a data manager adds a dbkey
+    table.get_named_fields_list = lambda: [
+        {"value": "hg", "name": "Human", "len_path": str(len_file)},
+        {"value": "mm", "name": "Mouse", "len_path": str(len_file)},
+    ]
+    assert len(genome_builds.get_genome_build_names()) == 2
+    table._loaded_content_version += 1
+    assert genome_builds.get_genome_build_names()[-1] == ("mm", "Mouse")
+    assert genome_builds.get_chrom_lengths("mm").get("chr1") == 100
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from galaxy.util import staging
+
+
+@pytest.fixture
+def no_reflink(monkeypatch):
+    def reflink(source, target):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(staging, "reflink", reflink)
+
+
+def test_stage_file(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("content")
+    target = tmp_path / "target.txt"
+    target.write_text("old content")
+    method = staging.stage_file(str(source), str(target))
+    assert method in (staging.REFLINK, staging.COPY)
+    assert target.read_text() == "content"
+    assert not os.path.samefile(source, target)
+    assert sorted(os.listdir(tmp_path)) == ["source.txt", "target.txt"]
+    assert staging.stage_file(str(target), str(target)) == staging.SAME_FILE
+
+
+def test_stage_file_hardlink_fallback(tmp_path, no_reflink):
+    source = tmp_path / "source.txt"
+    source.write_text("content")
+    target = tmp_path / "target.txt"
+    assert staging.stage_file(str(source), str(target), hardlink=True) == staging.HARDLINK
+    assert os.path.samefile(source, target)
+    copy_target = tmp_path / "copy.txt"
+    assert staging.stage_file(str(source), str(copy_target)) == staging.COPY
+    assert copy_target.read_text() == "content"
+
+
+def test_stage_tree(tmp_path, no_reflink):
+    source = tmp_path / "source"
+    for i in range(staging.PARALLEL_TREE_THRESHOLD + 1):
+        directory = source / f"dir{i % 3}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{i}").write_text(str(i))
+    target = tmp_path / "target"
+    counts = staging.stage_tree(str(source), str(target), hardlink=True)
+    assert counts == {staging.HARDLINK: staging.PARALLEL_TREE_THRESHOLD + 1}
+    assert (target / "dir1" / "file1").read_text() == "1"
+    assert len(list(target.glob("*/*"))) == staging.PARALLEL_TREE_THRESHOLD + 1
@@ -0,0 +1,67 @@
+import io
+import os
+import threading
+import zipfile
+
+import pytest
+
+from galaxy.util.zipstream import ZipstreamWrapper
+
+
+def _write_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(tmp_path, f"file_{i}.txt")
+        with open(path, "w") as out:
+            out.write(f"{i}\n" * (i + 1))
+        paths.append(path)
+    return paths
+
+
+def test_lazy_entries_keep_order(tmp_path):
+    paths = _write_files(tmp_path, 20)
+    resolved_from = set()
+
+    def getter(path):
+        def get_path():
+            resolved_from.add(threading.get_ident())
+            return path
+
+        return get_path
+
+    archive = ZipstreamWrapper(archive_name="test", prefetch_workers=4, prefetch_lookahead=3)
+    archive.write(paths[0], "eager.txt")
+    for i, path in enumerate(paths):
+        archive.write_lazy(getter(path), f"lazy/{i}.txt")
+    with zipfile.ZipFile(io.BytesIO(b"".join(archive.response()))) as zf:
+        assert zf.namelist() == ["eager.txt"] + [f"lazy/{i}.txt" for i in range(20)]
+        for i in range(20):
+            assert zf.read(f"lazy/{i}.txt") == f"{i}\n".encode() * (i + 1)
+    assert threading.get_ident() not in resolved_from
+
+
+def test_lazy_entry_without_path(tmp_path):
+    (path,) = _write_files(tmp_path, 1)
+    archive = ZipstreamWrapper(prefetch_workers=1)
+    archive.write_lazy(lambda: path, "first.txt")
+    archive.write_lazy(lambda: "", "missing.txt")
+    with pytest.raises(FileNotFoundError, match="missing.txt"):
+        b"".join(archive.response())
+
+
+def test_lazy_entry_resolution_error(tmp_path):
+    def get_path():
+        raise OSError("object store unavailable")
+
+    archive = ZipstreamWrapper(prefetch_workers=4)
+    archive.write_lazy(get_path, "failing.txt")
+    with pytest.raises(OSError, match="object store unavailable"):
+        b"".join(archive.response())
+
+
+def test_lazy_entries_with_mod_zip(tmp_path):
+    (path,) = _write_files(tmp_path, 1)
+    archive = ZipstreamWrapper(upstream_mod_zip=True)
+    archive.write_lazy(lambda: path, "dir/file.txt")
+    assert archive.files == [f"- 2 {path} dir/file.txt"]
+    assert archive.directories == {"dir"}
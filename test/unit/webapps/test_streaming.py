@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import (
+    FastAPI,
+    Header,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from galaxy.webapps.base.streaming import (
+    accepts_ndjson,
+    json_chunks,
+    NDJSON_MEDIA_TYPE,
+    streaming_json_response,
+)
+
+ITEMS = [{"id": i, "name": f"dataset ü {i}", "tags": ["a", "b"], "size": None} for i in range(50)]
+
+
+def test_json_chunks_match_json_response():
+    expected = JSONResponse(ITEMS).body
+    chunks = list(json_chunks(iter(ITEMS), chunk_size=256))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == expected
+    assert b"".join(json_chunks(iter([]))) == JSONResponse([]).body
+    # Items that are not plain JSON data are run through jsonable_encoder
+    items = [{"create_time": datetime(2022, 10, 19, 10, 42), "ids": {1, 2}}, *ITEMS[:2]]
+    assert b"".join(json_chunks(iter(items))) == JSONResponse(jsonable_encoder(items)).body
+
+
+def test_json_chunks_ndjson():
+    lines = b"".join(json_chunks(iter(ITEMS), ndjson=True)).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == ITEMS
+    assert list(json_chunks(iter([]), ndjson=True)) == []
+
+
+def test_accepts_ndjson():
+    assert accepts_ndjson(NDJSON_MEDIA_TYPE)
+    assert accepts_ndjson(f"application/json;q=0.5, {NDJSON_MEDIA_TYPE}")
+    assert not accepts_ndjson("application/json")
+    assert not accepts_ndjson(None)
+
+
+def test_streaming_json_response_reports_early_errors():
+    def failing_items():
+        raise ValueError("first batch failed")
+        yield
+
+    with pytest.raises(ValueError):
+        streaming_json_response(failing_items())
+
+
+def test_streaming_json_response_endpoint():
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(accept: str = Header(default="application/json")):
+        return streaming_json_response(iter(ITEMS), accept)
+
+    client = TestClient(app)
+    response = client.get("/items")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == ITEMS
+    response = client.get("/items", headers={"accept": NDJSON_MEDIA_TYPE})
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    assert [json.loads(line) for line in response.text.splitlines()] == ITEMS